@@ -109,3 +109,49 @@ def get_writable_attributes(entity, readonly_fields=None):
         writable.append(attr)
 
     return writable
+
+
+def get_binary_passthrough_attribute(entity):
+    """
+    Name of the attribute through which an entity serves its REST source's
+    body unchanged, if any: the entity has no parents, a direct REST source
+    and a single schema-only `binary` attribute. Reads of such entities are
+    streamed from the source instead of being buffered and re-serialized.
+    """
+    source = getattr(entity, "source", None)
+    attributes = getattr(entity, "attributes", []) or []
+    if source is None or getattr(source, "kind", None) != "REST":
+        return None
+    if getattr(entity, "parents", None) or len(attributes) != 1:
+        return None
+
+    attr = attributes[0]
+    if getattr(attr, "expr", None) is not None:
+        return None
+    if getattr(getattr(attr, "type", None), "baseType", None) != "binary":
+        return None
+    return attr.name
+
+
+def get_streamed_array_attribute(entity):
+    """
+    Name of the attribute through which an entity serves the JSON array of a
+    `stream: true` REST source, if any: the entity has no parents and a single
+    schema-only `array` / `array<Entity>` attribute (enforced by validation).
+    Reads of such entities parse the source body item by item and stream the
+    response instead of buffering either.
+    """
+    source = getattr(entity, "source", None)
+    attributes = getattr(entity, "attributes", []) or []
+    if source is None or getattr(source, "kind", None) != "REST" or not getattr(source, "stream", False):
+        return None
+    if getattr(entity, "parents", None) or len(attributes) != 1:
+        return None
+
+    attr = attributes[0]
+    type_spec = getattr(attr, "type", None)
+    if getattr(attr, "expr", None) is not None or type_spec is None:
+        return None
+    if getattr(type_spec, "baseType", None) != "array" and getattr(type_spec, "itemEntity", None) is None:
+        return None
+    return attr.name
@@ -6,8 +6,9 @@ REST paths are flat: /api/{entity_name_lower}
 Operations: read, create, update, delete (NO list operation)
 """
 
+import hashlib
 import re
-from textx import get_children_of_type
+from textx import get_children_of_type, get_model
 
 
 def _extract_source_params(source):
@@ -31,7 +32,7 @@ def _extract_source_params(source):
 
     # Extract {placeholder} names from URL
     url = getattr(source, "url", "") or ""
-    path_params = list(set(re.findall(r'\{(\w+)\}', url)))
+    path_params = list(dict.fromkeys(re.findall(r'\{(\w+)\}', url)))
 
     # Query params are those not in URL path
     query_params = [p for p in all_params if p not in path_params]
@@ -179,9 +180,10 @@ def build_exposure_map(model):
         # Each parent may have different params (e.g., Post needs post_id, User needs user_id)
         parent_params_map = {}  # {parent_name: {all_params, path_params, query_params}}
         if is_composite:
-            all_params_combined = set(all_params)  # Start with direct source params
-            path_params_combined = set(path_params)
-            query_params_combined = set(query_params)
+            # Ordered de-duplication (dicts) keeps generated signatures stable between runs
+            all_params_combined = dict.fromkeys(all_params)  # Start with direct source params
+            path_params_combined = dict.fromkeys(path_params)
+            query_params_combined = dict.fromkeys(query_params)
 
             for parent in parents:
                 parent_source = getattr(parent, "source", None)
@@ -196,9 +198,9 @@ def build_exposure_map(model):
                         "path_params": p_path,
                         "query_params": p_query,
                     }
-                    all_params_combined.update(p_all)
-                    path_params_combined.update(p_path)
-                    query_params_combined.update(p_query)
+                    all_params_combined.update(dict.fromkeys(p_all))
+                    path_params_combined.update(dict.fromkeys(p_path))
+                    query_params_combined.update(dict.fromkeys(p_query))
 
             # Update combined params
             all_params = list(all_params_combined)
@@ -372,3 +374,110 @@ def _get_declared_operations(entity, source):
             return ['read', 'create', 'update', 'delete']
 
     return []
+
+
+# ------------------------------------------------------------------------------
+# Change detection between runs (fdsl generate --watch)
+
+# Blocks every entity's generated code may depend on (server config, auth, roles)
+_GLOBAL_BLOCKS = ("servers", "auth", "authdb", "roles")
+
+
+def _source_text(obj):
+    """The model text an object was parsed from."""
+    return get_model(obj)._tx_parser.input[obj._tx_position:obj._tx_position_end]
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _global_text(model):
+    return "".join(
+        _source_text(block)
+        for name in _GLOBAL_BLOCKS
+        for block in getattr(model, name, []) or []
+    )
+
+
+def entity_signatures(model):
+    """
+    Hash, per entity, of the model text its generated files depend on: the
+    entity itself, its direct source, its parents (recursively) and the
+    global blocks (servers, auth, roles). Entities whose signature is
+    unchanged between two parses generate identical code.
+
+    Returns:
+        dict: entity name -> hex digest
+    """
+    global_text = _global_text(model)
+    signatures = {}
+
+    def signature(entity):
+        if entity.name in signatures:
+            return signatures[entity.name]
+        signatures[entity.name] = ""  # guards against parent cycles
+        source = getattr(entity, "source", None)
+        parents = [ref.entity for ref in getattr(entity, "parents", []) or []]
+        signatures[entity.name] = _digest(
+            global_text,
+            _source_text(entity),
+            _source_text(source) if source else "",
+            *(signature(parent) for parent in parents),
+        )
+        return signatures[entity.name]
+
+    for entity in get_children_of_type("Entity", model):
+        signature(entity)
+    return signatures
+
+
+def source_signatures(model, exposure_map, entity_sigs):
+    """
+    Hash, per source, of the source block, the global blocks and the
+    signatures of every entity bound to it (directly or through parents).
+
+    Returns:
+        dict: source name -> hex digest
+    """
+    global_text = _global_text(model)
+    users = {}
+    for entity in get_children_of_type("Entity", model):
+        source = getattr(entity, "source", None)
+        if source:
+            users.setdefault(source.name, set()).add(entity.name)
+    for entity_name, config in exposure_map.items():
+        source = config.get("source")
+        if source:
+            users.setdefault(source.name, set()).add(entity_name)
+
+    sources = get_children_of_type("SourceREST", model) + get_children_of_type("SourceWS", model)
+    return {
+        source.name: _digest(
+            global_text,
+            _source_text(source),
+            *(entity_sigs[name] for name in sorted(users.get(source.name, ()))),
+        )
+        for source in sources
+    }
+
+
+def diff_exposure(previous, current):
+    """
+    Compare two {entity name: signature} maps of exposed entities.
+
+    Returns:
+        dict with sorted "added", "removed" and "changed" entity names
+    """
+    return {
+        "added": sorted(current.keys() - previous.keys()),
+        "removed": sorted(previous.keys() - current.keys()),
+        "changed": sorted(
+            name for name in current.keys() & previous.keys()
+            if current[name] != previous[name]
+        ),
+    }
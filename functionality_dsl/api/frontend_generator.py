@@ -2,13 +2,13 @@ from __future__ import annotations
 
 
 from pathlib import Path
-from shutil import copytree
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
 from bs4 import BeautifulSoup
 
 from textx import get_children_of_type
 
 from functionality_dsl.lib.component_types import COMPONENT_TYPES
+from functionality_dsl.api.manifest import copy_output_tree, write_output
+from functionality_dsl.api.templating import get_environment
 
 
 # ---------- helpers ----------
@@ -118,15 +118,6 @@ def _get_server_ctx(model):
         "roles": roles,
     }
 
-def _jinja_env(*, loader):
-    return Environment(
-        loader=loader,
-        autoescape=select_autoescape(disabled_extensions=("jinja",)),
-        trim_blocks=True,
-        lstrip_blocks=True,
-        undefined=StrictUndefined,
-    )
-
 # ---------- scaffold ----------
 def scaffold_frontend_from_model(model, *, base_frontend_dir: Path, templates_frontend_dir: Path, out_dir: Path, jwt_secret_value: str = None) -> Path:
     ctx = _get_server_ctx(model)
@@ -135,15 +126,15 @@ def scaffold_frontend_from_model(model, *, base_frontend_dir: Path, templates_fr
     if jwt_secret_value:
         ctx["jwt_secret_value"] = jwt_secret_value
 
-    copytree(base_frontend_dir, out_dir, dirs_exist_ok=True)
-    env = _jinja_env(loader=FileSystemLoader(str(templates_frontend_dir)))
+    copy_output_tree(base_frontend_dir, out_dir)
+    env = get_environment(templates_frontend_dir, trim=True, strict=True)
     for target, tpl_name in {
         "vite.config.ts": "vite.config.ts.jinja",
         "Dockerfile":     "Dockerfile.jinja",
         ".env":           "env.jinja",
     }.items():
         tpl = env.get_template(tpl_name)
-        (out_dir / target).write_text(tpl.render(**ctx), encoding="utf-8")
+        write_output(out_dir / target, tpl.render(**ctx))
     return out_dir
 
 # ---------- page render ----------
@@ -161,27 +152,12 @@ def _is_computed_with_ws(ent) -> bool:
             return True
     return False
 
-def _tojson_unicode(value):
-    """
-    Custom tojson filter that preserves unicode characters.
-    Uses ensure_ascii=False to keep special characters like °, ñ, etc.
-    """
-    import json
-    return json.dumps(value, ensure_ascii=False)
-
-
 def render_frontend_files(model, templates_dir: Path, out_dir: Path):
-    env = Environment(
-        loader=FileSystemLoader([str(templates_dir / "components"), str(templates_dir)]),
-        autoescape=select_autoescape(disabled_extensions=("jinja",)),
-        trim_blocks=True,
-        lstrip_blocks=True,
-        undefined=StrictUndefined,
+    # tojson preserves unicode characters (°, ñ, etc.)
+    env = get_environment(
+        [templates_dir / "components", templates_dir], trim=True, strict=True, filters=("tojson",)
     )
 
-    # Override tojson filter to preserve unicode characters (°, ñ, etc.)
-    env.filters['tojson'] = _tojson_unicode
-
     components = _components(model)
     ctx = _get_server_ctx(model)
 
@@ -244,7 +220,8 @@ def render_frontend_files(model, templates_dir: Path, out_dir: Path):
 
     (out_dir / "src" / "routes").mkdir(parents=True, exist_ok=True)
     page_tpl = env.get_template("+page.svelte.jinja")
-    (out_dir / "src" / "routes" / "+page.svelte").write_text(
+    write_output(
+        out_dir / "src" / "routes" / "+page.svelte",
         page_tpl.render(
             components=components,
             ws_entities=ws_entities,
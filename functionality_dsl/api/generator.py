@@ -13,7 +13,11 @@ Architecture:
     - utils/: Utility functions (formatting, headers, paths)
 """
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 from .gen_logging import get_logger
 
@@ -37,20 +41,232 @@ from .generators import (
     generate_openapi_spec,
     generate_asyncapi_spec,
 )
-from .generators.core.auth_generator import generate_auth_module
+from .generators.core.auth_generator import generate_auth_module, generate_access_table
 from .generators.core.postman_generator import generate_postman_collection
 from .generators.core.database_generator import (
     generate_database_module,
     generate_password_module,
     generate_auth_routes,
 )
-from .exposure_map import build_exposure_map
+from .generators.entity.websocket_router_generator import generate_combined_websocket_router
+from .exposure_map import build_exposure_map, entity_signatures, source_signatures
+from .manifest import capture_outputs, write_output
+from .templating import get_environment, preload_templates
 from textx import get_children_of_type
 
 logger = get_logger(__name__)
 
+# Below this many files per phase the pool costs more than it saves
+PARALLEL_MIN_TASKS = 32
 
-def render_domain_files(model, templates_dir: Path, out_dir: Path):
+# Templates rendered once per source/entity/channel
+PHASE_TEMPLATES = (
+    "source_client.py.jinja",
+    "websocket_source_client.py.jinja",
+    "entity_service.py.jinja",
+    "entity_router.py.jinja",
+    "combined_websocket_router.py.jinja",
+)
+
+# Generation inputs of the current run, inherited by forked workers
+_WORKER_STATE = None
+
+
+def _group_ws_channels(exposure_map):
+    """Group WebSocket-exposed entities by channel, in exposure-map order."""
+    ws_channels = {}
+    for entity_name, config in exposure_map.items():
+        ws_channel = config.get("ws_channel")
+        if ws_channel:
+            ws_channels.setdefault(ws_channel, []).append((entity_name, config))
+    return ws_channels
+
+
+def _render_task(task):
+    """Render one per-entity artifact. Task is (kind, name); see _PhaseRunner."""
+    state = _WORKER_STATE
+    model, exposure_map = state["model"], state["exposure_map"]
+    templates_dir, out_dir = state["templates_dir"], state["out_dir"]
+    kind, name = task
+    if kind == "rest_source":
+        generate_source_client(state["sources"][name], model, templates_dir, out_dir, exposure_map)
+    elif kind == "ws_source":
+        generate_websocket_source_client(state["sources"][name], model, templates_dir, out_dir, exposure_map)
+    elif kind == "service":
+        generate_entity_service(name, exposure_map[name], model, templates_dir, out_dir, exposure_map)
+    elif kind == "router":
+        generate_entity_router(name, exposure_map[name], model, templates_dir, out_dir)
+    elif kind == "ws_router":
+        entities = state["ws_channels"][name]
+        generate_combined_websocket_router(name, entities, model, templates_dir, out_dir)
+    else:
+        raise ValueError(f"Unknown generation task: {kind}")
+
+
+def _render_captured(task):
+    """Worker entry point: render a task and return its outputs instead of writing them."""
+    with capture_outputs() as outputs:
+        _render_task(task)
+    return outputs
+
+
+class _PhaseRunner:
+    """
+    Runs the per-entity generation phases, in a forked process pool when the
+    model is large enough. Workers inherit the parsed model through fork (it
+    is not picklable) and return their rendered files; the parent writes them
+    in task order, so the output and manifest do not depend on scheduling.
+    Without fork (Windows, macOS spawn default) everything runs serially.
+
+    With a render_cache (kept by the caller across runs, e.g. watch mode),
+    tasks whose inputs hash the same as last time reuse their rendered files
+    instead of rendering again. The hash covers the model text only, not the
+    templates.
+    """
+
+    def __init__(self, model, exposure_map, templates_dir, out_dir, workers=None, render_cache=None):
+        global _WORKER_STATE
+        self.rest_sources = get_children_of_type("SourceREST", model)
+        self.ws_sources = get_children_of_type("SourceWS", model)
+        self.ws_channels = _group_ws_channels(exposure_map)
+        _WORKER_STATE = {
+            "model": model,
+            "exposure_map": exposure_map,
+            "templates_dir": templates_dir,
+            "out_dir": out_dir,
+            "sources": {s.name: s for s in self.rest_sources + self.ws_sources},
+            "ws_channels": self.ws_channels,
+        }
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if "fork" not in multiprocessing.get_all_start_methods():
+            workers = 1
+        # Compiled once here, shared by every entity (and every forked worker)
+        preload_templates(get_environment(templates_dir), PHASE_TEMPLATES)
+        self.workers = workers
+        self._pool = None
+
+        self.render_cache = render_cache
+        self.rendered = 0
+        self.reused = 0
+        self._signatures = {}
+        if render_cache is not None:
+            self._entity_sigs = entity_signatures(model)
+            self._source_sigs = source_signatures(model, exposure_map, self._entity_sigs)
+            self._run_key = f"{Path(templates_dir).resolve()}\0{Path(out_dir).resolve()}"
+
+    def _signature(self, task):
+        kind, name = task
+        if kind in ("rest_source", "ws_source"):
+            inputs = self._source_sigs[name]
+        elif kind == "ws_router":
+            inputs = "".join(self._entity_sigs[entity_name] for entity_name, _ in self.ws_channels[name])
+        else:
+            inputs = self._entity_sigs[name]
+        return f"{self._run_key}\0{inputs}"
+
+    def run(self, tasks):
+        outputs = {}
+        pending = []
+        for task in tasks:
+            if self.render_cache is None:
+                pending.append(task)
+                continue
+            self._signatures[task] = self._signature(task)
+            cached = self.render_cache.get(task)
+            if cached is not None and cached[0] == self._signatures[task]:
+                outputs[task] = cached[1]
+            else:
+                pending.append(task)
+
+        for task, rendered in zip(pending, self._render(pending)):
+            outputs[task] = rendered
+            if self.render_cache is not None:
+                self.render_cache[task] = (self._signatures[task], rendered)
+        self.rendered += len(pending)
+        self.reused += len(tasks) - len(pending)
+
+        for task in tasks:
+            for path, data in outputs[task]:
+                write_output(path, data)
+
+    def _render(self, tasks):
+        if self.workers <= 1 or len(tasks) < PARALLEL_MIN_TASKS:
+            return [_render_captured(task) for task in tasks]
+
+        if self._pool is None:
+            logger.info(f"  Rendering with {self.workers} worker processes")
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+            )
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        return self._pool.map(_render_captured, tasks, chunksize=chunksize)
+
+    def close(self):
+        global _WORKER_STATE
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        _WORKER_STATE = None
+        if self.render_cache is not None:
+            # Forget sources/entities/channels that no longer exist
+            for task in set(self.render_cache) - set(self._signatures):
+                del self.render_cache[task]
+            logger.info(f"  Rendered {self.rendered} per-entity files, reused {self.reused} unchanged")
+
+
+def _render_entity_phases(runner, exposure_map):
+    """Phases 3.1-3.4: source clients, services, REST and WebSocket routers."""
+    # Generate source clients (operations inferred from entities)
+    logger.info("  [3.1] Generating source clients...")
+    runner.run(
+        [("rest_source", s.name) for s in runner.rest_sources]
+        + [("ws_source", s.name) for s in runner.ws_sources]
+    )
+
+    # ======================================================================
+    # [3.2] GENERATE ENTITY SERVICES (shared by both REST and WebSocket)
+    # ======================================================================
+    logger.info("  [3.2] Generating entity services...")
+    runner.run([("service", entity_name) for entity_name in exposure_map])
+
+    # ======================================================================
+    # [3.3] GENERATE REST ROUTERS
+    # ======================================================================
+    logger.info("  [3.3] Generating REST entity routers...")
+
+    # Filter entities with REST exposure
+    rest_entities = [
+        name for name, config in exposure_map.items()
+        if config.get("rest_path")
+    ]
+
+    if rest_entities:
+        runner.run([("router", entity_name) for entity_name in rest_entities])
+    else:
+        logger.debug("  No REST entities found")
+
+    # ======================================================================
+    # [3.4] GENERATE WEBSOCKET ROUTERS
+    # ======================================================================
+    logger.info("  [3.4] Generating WebSocket entity routers...")
+
+    # One router per unique channel; multiple entities can share a channel
+    # for bidirectional communication
+    if runner.ws_channels:
+        runner.run([("ws_router", ws_channel) for ws_channel in runner.ws_channels])
+    else:
+        logger.debug("  No WebSocket entities found")
+
+
+def render_domain_files(
+    model,
+    templates_dir: Path,
+    out_dir: Path,
+    workers: Optional[int] = None,
+    render_cache: Optional[dict] = None,
+):
     """
     Main entry point for code generation.
     Generates domain models and API routers from the DSL model.
@@ -59,6 +275,10 @@ def render_domain_files(model, templates_dir: Path, out_dir: Path):
         model: The parsed FDSL model
         templates_dir: Path to Jinja2 templates directory
         out_dir: Path to output directory for generated code
+        workers: Worker processes for the per-entity phases (default: CPU count,
+            1 disables the pool)
+        render_cache: Per-entity render results to reuse across calls; pass the
+            same dict on every run (see _PhaseRunner)
 
     Generates:
         - Domain models (Pydantic models with validation)
@@ -99,70 +319,19 @@ def render_domain_files(model, templates_dir: Path, out_dir: Path):
     if exposure_map:
         logger.info(f"  Found {len(exposure_map)} exposed entities")
 
-        # Generate source clients (operations inferred from entities)
-        logger.info("  [3.1] Generating source clients...")
-        # REST sources
-        rest_sources = get_children_of_type("SourceREST", model)
-        for source in rest_sources:
-            generate_source_client(source, model, templates_dir, out_dir, exposure_map)
+        # Precompute per-operation RBAC decisions (used by multi-auth routes)
+        if auth_generated:
+            logger.info("  [3.0] Generating RBAC decision table...")
+            generate_access_table(model, exposure_map, templates_dir, out_dir)
 
-        # WebSocket sources
-        ws_sources = get_children_of_type("SourceWS", model)
-        for source in ws_sources:
-            generate_websocket_source_client(source, model, templates_dir, out_dir, exposure_map)
+        # Phases 3.1-3.4 render one file per source/entity/channel; they run in
+        # a worker pool on large models (see _PhaseRunner)
+        runner = _PhaseRunner(model, exposure_map, templates_dir, out_dir, workers, render_cache)
 
-        # ======================================================================
-        # [3.2] GENERATE ENTITY SERVICES (shared by both REST and WebSocket)
-        # ======================================================================
-        logger.info("  [3.2] Generating entity services...")
-        for entity_name, config in exposure_map.items():
-            generate_entity_service(entity_name, config, model, templates_dir, out_dir)
-
-        # ======================================================================
-        # [3.3] GENERATE REST ROUTERS
-        # ======================================================================
-        logger.info("  [3.3] Generating REST entity routers...")
-
-        # Filter entities with REST exposure
-        rest_entities = {
-            name: config for name, config in exposure_map.items()
-            if config.get("rest_path")
-        }
-
-        if rest_entities:
-            for entity_name, config in rest_entities.items():
-                generate_entity_router(entity_name, config, model, templates_dir, out_dir)
-        else:
-            logger.debug("  No REST entities found")
-
-        # ======================================================================
-        # [3.4] GENERATE WEBSOCKET ROUTERS
-        # ======================================================================
-        logger.info("  [3.4] Generating WebSocket entity routers...")
-
-        # Filter entities with WebSocket exposure
-        ws_entities = {
-            name: config for name, config in exposure_map.items()
-            if config.get("ws_channel")
-        }
-
-        if ws_entities:
-            # Group entities by WebSocket channel for combined router generation
-            # (Multiple entities can share the same channel for bidirectional communication)
-            ws_channels = {}
-            for entity_name, config in ws_entities.items():
-                ws_channel = config["ws_channel"]
-                if ws_channel not in ws_channels:
-                    ws_channels[ws_channel] = []
-                ws_channels[ws_channel].append((entity_name, config))
-
-            # Generate one router per unique channel
-            # Each router handles all entities (subscribe/publish) on that channel
-            from .generators.entity.websocket_router_generator import generate_combined_websocket_router
-            for ws_channel, entities in ws_channels.items():
-                generate_combined_websocket_router(ws_channel, entities, model, templates_dir, out_dir)
-        else:
-            logger.debug("  No WebSocket entities found")
+        try:
+            _render_entity_phases(runner, exposure_map)
+        finally:
+            runner.close()
 
         # ======================================================================
         # [3.5] GENERATE API SPECIFICATIONS
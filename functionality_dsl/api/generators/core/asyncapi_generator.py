@@ -12,6 +12,7 @@ from typing import Dict, Any, List
 from ...exposure_map import build_exposure_map
 from ...extractors import get_entities, map_to_openapi_type
 from ...gen_logging import get_logger
+from ...manifest import write_output
 
 logger = get_logger(__name__)
 
@@ -117,10 +118,9 @@ def generate_asyncapi_spec(model, output_dir: Path, server_config: Dict[str, Any
             if parent.name in all_entities:
                 collect_referenced_entities(all_entities[parent.name], ws_related_entities)
 
-    # Generate schemas only for WebSocket-related entities
-    for entity_name in ws_related_entities:
-        if entity_name in all_entities:
-            entity = all_entities[entity_name]
+    # Generate schemas only for WebSocket-related entities (in model order, so output is stable)
+    for entity_name, entity in all_entities.items():
+        if entity_name in ws_related_entities:
             spec["components"]["schemas"][entity_name] = _generate_entity_schema(entity)
 
     # Group entities by WebSocket channel
@@ -218,8 +218,7 @@ def generate_asyncapi_spec(model, output_dir: Path, server_config: Dict[str, Any
     api_dir.mkdir(parents=True, exist_ok=True)
 
     asyncapi_file = api_dir / "asyncapi.yaml"
-    with open(asyncapi_file, "w") as f:
-        yaml.dump(spec, f, default_flow_style=False, sort_keys=False)
+    write_output(asyncapi_file, yaml.dump(spec, default_flow_style=False, sort_keys=False))
 
     logger.debug(f"[GENERATED] AsyncAPI spec: {asyncapi_file}")
 
@@ -15,10 +15,12 @@ AuthDB is optional for BYODB (Bring Your Own Database) mode.
 Without AuthDB, a default Postgres database is used.
 """
 
+import weakref
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
 from textx import get_children_of_type
 from ...gen_logging import get_logger
+from ...manifest import write_output
+from ...templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -61,7 +63,7 @@ def generate_auth_modules(model, templates_dir, out_dir):
                 roles_by_auth[auth_name] = []
             roles_by_auth[auth_name].append(role.name)
 
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     core_dir = out_dir / "app" / "core"
     core_dir.mkdir(parents=True, exist_ok=True)
 
@@ -102,7 +104,7 @@ def generate_auth_modules(model, templates_dir, out_dir):
 
         # Write to app/core/auth_{name}.py (lowercase)
         auth_file = core_dir / f"auth_{auth_name.lower()}.py"
-        auth_file.write_text(rendered, encoding="utf-8")
+        write_output(auth_file, rendered)
 
         logger.debug(f"    [OK] {auth_file.relative_to(out_dir)}")
 
@@ -126,7 +128,7 @@ def _generate_auth_base(env, core_dir, out_dir):
     rendered = template.render()
 
     auth_base_file = core_dir / "auth_base.py"
-    auth_base_file.write_text(rendered, encoding="utf-8")
+    write_output(auth_base_file, rendered)
     logger.debug(f"    [OK] {auth_base_file.relative_to(out_dir)}")
 
 
@@ -263,7 +265,7 @@ def _generate_unified_auth_module(auth_configs, core_dir, out_dir):
     lines.append("")
 
     auth_file = core_dir / "auth.py"
-    auth_file.write_text("\n".join(lines), encoding="utf-8")
+    write_output(auth_file, "\n".join(lines))
     logger.debug(f"    [OK] {auth_file.relative_to(out_dir)}")
 
 
@@ -310,7 +312,7 @@ def _generate_auth_context(auth_configs, env, core_dir, out_dir):
     )
 
     auth_context_file = core_dir / "auth_context.py"
-    auth_context_file.write_text(rendered, encoding="utf-8")
+    write_output(auth_context_file, rendered)
     logger.debug(f"    [OK] {auth_context_file.relative_to(out_dir)}")
 
 
@@ -388,6 +390,21 @@ def _extract_auth_config(auth, roles, global_authdb=None):
     return config
 
 
+# role -> auth name per model; get_permission_dependencies runs once per entity
+_ROLE_TO_AUTH = weakref.WeakKeyDictionary()
+
+
+def _role_to_auth(model):
+    """Map each role name to the name of its auth (cached per model)."""
+    try:
+        return _ROLE_TO_AUTH[model]
+    except KeyError:
+        role_blocks = get_children_of_type("Role", model)
+        mapping = {role.name: role.auth.name for role in role_blocks if role.auth}
+        _ROLE_TO_AUTH[model] = mapping
+        return mapping
+
+
 def get_permission_dependencies(entity, model, operations=None):
     """
     Get permission requirements for each operation of an entity.
@@ -405,9 +422,7 @@ def get_permission_dependencies(entity, model, operations=None):
     Returns:
         dict: Mapping of operation -> access requirement
     """
-    # Build role -> auth mapping
-    role_blocks = get_children_of_type("Role", model)
-    role_to_auth = {role.name: role.auth.name for role in role_blocks if role.auth}
+    role_to_auth = _role_to_auth(model)
 
     # Get default operations
     if operations is None:
@@ -522,6 +537,80 @@ def _parse_access_items(access_items, role_to_auth):
         return results
 
 
+# Credential check cost per auth kind. Basic auth runs a password hash on every
+# request, so it is tried last when an operation accepts several schemes.
+_AUTH_CHECK_COST = {"http/bearer": 0, "apikey": 0, "http/basic": 1}
+
+
+def build_access_table(model, exposure_map):
+    """
+    Precompute the access decision for every exposed entity operation.
+
+    Args:
+        model: FDSL model
+        exposure_map: Exposure map from build_exposure_map()
+
+    Returns:
+        dict: entity_name -> {operation -> None (public) or list of options}
+              Each option: {"auth": str, "roles": list or None}, ordered so the
+              cheapest credential check is tried first.
+    """
+    auth_cost = {}
+    for auth in getattr(model, "auth", []) or []:
+        kind = getattr(auth, "kind", None)
+        key = f"http/{getattr(auth, 'scheme', 'bearer')}" if kind == "http" else kind
+        auth_cost[auth.name] = _AUTH_CHECK_COST.get(key, 0)
+
+    table = {}
+    for entity_name, config in exposure_map.items():
+        permission_map = get_permission_dependencies(
+            config["entity"], model, config.get("operations") or None
+        )
+        entity_rules = {}
+        for op, access_req in permission_map.items():
+            if access_req == "public":
+                entity_rules[op] = None
+                continue
+            options = access_req if isinstance(access_req, list) else [access_req]
+            options = [
+                {"auth": opt["auth"], "roles": opt.get("roles") or None}
+                for opt in options if opt.get("auth")
+            ]
+            options.sort(key=lambda opt: auth_cost.get(opt["auth"], 0))
+            entity_rules[op] = options or None
+        table[entity_name] = entity_rules
+
+    return table
+
+
+def generate_access_table(model, exposure_map, templates_dir, out_dir):
+    """
+    Generate app/core/rbac.py with the precomputed access decision table.
+
+    Multi-auth routes resolve their requirement from this table and stop at the
+    first scheme that authenticates with an allowed role.
+    """
+    table = build_access_table(model, exposure_map)
+    auth_names = sorted({
+        opt["auth"]
+        for rules in table.values()
+        for options in rules.values() if options
+        for opt in options
+    })
+
+    env = get_environment(templates_dir)
+    template = env.get_template("rbac.py.jinja")
+    rendered = template.render(table=table, auth_names=auth_names)
+
+    core_dir = out_dir / "app" / "core"
+    core_dir.mkdir(parents=True, exist_ok=True)
+    rbac_file = core_dir / "rbac.py"
+    write_output(rbac_file, rendered)
+    logger.debug(f"    [OK] {rbac_file.relative_to(out_dir)}")
+
+    return table
+
+
 # Keep old function name for backwards compatibility during transition
 def generate_auth_module(model, templates_dir, out_dir):
     """Deprecated: Use generate_auth_modules instead."""
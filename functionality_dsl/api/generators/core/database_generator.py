@@ -17,9 +17,10 @@ AuthDB Configuration (BYODB):
 """
 
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
 from textx import get_children_of_type
 from ...gen_logging import get_logger
+from ...manifest import write_output
+from ...templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -163,20 +164,20 @@ def generate_database_module(model, templates_dir: Path, out_dir: Path) -> bool:
     db_dir = out_dir / "app" / "db"
     db_dir.mkdir(parents=True, exist_ok=True)
 
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
 
     # Render and write database.py
     template = env.get_template("db/database.py.jinja")
     rendered = template.render(**db_config)
     db_file = db_dir / "database.py"
-    db_file.write_text(rendered, encoding="utf-8")
+    write_output(db_file, rendered)
     logger.debug(f"    [OK] {db_file.relative_to(out_dir)}")
 
     # Render and write __init__.py
     init_template = env.get_template("db/__init__.py.jinja")
     init_rendered = init_template.render(**db_config)
     init_file = db_dir / "__init__.py"
-    init_file.write_text(init_rendered, encoding="utf-8")
+    write_output(init_file, init_rendered)
     logger.debug(f"    [OK] {init_file.relative_to(out_dir)}")
 
     return True
@@ -202,7 +203,7 @@ def generate_password_module(model, templates_dir: Path, out_dir: Path) -> bool:
     logger.debug("  Generating password utilities...")
 
     # Render password template (no context needed)
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("db/password.py.jinja")
     rendered = template.render()
 
@@ -211,7 +212,7 @@ def generate_password_module(model, templates_dir: Path, out_dir: Path) -> bool:
     db_dir.mkdir(parents=True, exist_ok=True)
 
     password_file = db_dir / "password.py"
-    password_file.write_text(rendered, encoding="utf-8")
+    write_output(password_file, rendered)
     logger.debug(f"    [OK] {password_file.relative_to(out_dir)}")
 
     return True
@@ -254,7 +255,7 @@ def generate_auth_routes(model, templates_dir: Path, out_dir: Path) -> bool:
     routes_config = _extract_auth_routes_config(model, auth_type)
 
     # Render auth routes template
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("auth_routes.py.jinja")
     rendered = template.render(**routes_config)
 
@@ -263,7 +264,7 @@ def generate_auth_routes(model, templates_dir: Path, out_dir: Path) -> bool:
     routers_dir.mkdir(parents=True, exist_ok=True)
 
     auth_routes_file = routers_dir / "auth.py"
-    auth_routes_file.write_text(rendered, encoding="utf-8")
+    write_output(auth_routes_file, rendered)
     logger.debug(f"    [OK] {auth_routes_file.relative_to(out_dir)}")
 
     return True
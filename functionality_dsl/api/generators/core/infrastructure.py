@@ -2,15 +2,15 @@
 
 import re
 import secrets
-import shutil
 import string
 from pathlib import Path
-from shutil import copytree
-from jinja2 import Environment, FileSystemLoader, select_autoescape
 from textx import get_children_of_type
 
 from ...extractors import extract_server_config
+from .database_generator import _needs_database
 from ...gen_logging import get_logger
+from ...manifest import copy_output, copy_output_tree, write_output
+from ...templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -35,12 +35,7 @@ def render_infrastructure_files(context, templates_dir, output_dir, target="all"
     """
     # Add target to context for conditional rendering
     context["target"] = target
-    env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
-        autoescape=select_autoescape(disabled_extensions=("jinja",)),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
+    env = get_environment(templates_dir, trim=True)
 
     # Entity auth is DB-backed - no env vars needed for entity auth secrets
     # Source auth uses env vars for static credentials to external APIs
@@ -64,7 +59,7 @@ def render_infrastructure_files(context, templates_dir, output_dir, target="all"
     for output_file, template_name in file_mappings.items():
         template = env.get_template(template_name)
         content = template.render(**context)
-        (output_dir / output_file).write_text(content, encoding="utf-8")
+        write_output(output_dir / output_file, content)
         logger.debug(f"[GENERATED] {output_file}")
 
 
@@ -86,13 +81,15 @@ def _copy_runtime_libs(lib_root: Path, backend_core_dir: Path, templates_dir: Pa
         if not src.exists():
             logger.warning(f"  [WARN] Missing {src}, skipping.")
             continue
-        copytree(src, dest, dirs_exist_ok=True)
+        # safe_eval.py is written patched below
+        copy_output_tree(src, dest, exclude=("safe_eval.py",))
         logger.debug(f"  [OK] Copied {d}/")
 
     # --- Patch safe_eval.py to remove absolute import ---
+    safe_eval_src = lib_root / "runtime" / "safe_eval.py"
     safe_eval_dest = backend_core_dir / "runtime" / "safe_eval.py"
-    if safe_eval_dest.exists():
-        text = safe_eval_dest.read_text(encoding="utf-8")
+    if safe_eval_src.exists():
+        text = safe_eval_src.read_text(encoding="utf-8")
 
         # Replace import from generator to local backend core
         patched = re.sub(
@@ -101,12 +98,13 @@ def _copy_runtime_libs(lib_root: Path, backend_core_dir: Path, templates_dir: Pa
             text,
         )
 
-        safe_eval_dest.write_text(patched, encoding="utf-8")
+        write_output(safe_eval_dest, patched)
         logger.debug("  [PATCH] Updated import in runtime/safe_eval.py")
 
     # --- Create a lightweight computed.py facade ---
     computed_dest = backend_core_dir / "computed.py"
-    computed_dest.write_text(
+    write_output(
+        computed_dest,
         "# Auto-generated DSL runtime bridge\n\n"
         "from app.core.builtins.registry import (\n"
         "    DSL_FUNCTIONS,\n"
@@ -114,7 +112,6 @@ def _copy_runtime_libs(lib_root: Path, backend_core_dir: Path, templates_dir: Pa
         "    DSL_FUNCTION_SIG,\n"
         ")\n"
         "from app.core.compiler.expr_compiler import compile_expr_to_python\n",
-        encoding="utf-8",
     )
     logger.debug("  [OK] Created app/core/computed.py")
 
@@ -123,7 +120,7 @@ def _copy_runtime_libs(lib_root: Path, backend_core_dir: Path, templates_dir: Pa
         error_handlers_src = templates_dir / "core" / "error_handlers.py"
         error_handlers_dest = backend_core_dir / "error_handlers.py"
         if error_handlers_src.exists():
-            shutil.copy2(error_handlers_src, error_handlers_dest)
+            copy_output(error_handlers_src, error_handlers_dest)
             logger.debug("  [OK] Created app/core/error_handlers.py")
         else:
             logger.warning("  [WARN] error_handlers.py template not found")
@@ -131,6 +128,74 @@ def _copy_runtime_libs(lib_root: Path, backend_core_dir: Path, templates_dir: Pa
         logger.warning("  [WARN] templates_dir not provided, skipping error_handlers.py")
 
 
+def collect_model_builtins(model) -> set:
+    """
+    Names of the builtins a model calls. Entity attributes are read from the
+    compiled expressions, so rewrites such as fused image chains
+    (image_pipeline) are counted; calls elsewhere in the model are taken as
+    written.
+    """
+    from functionality_dsl.lib.builtins.registry import DSL_FUNCTIONS
+    from functionality_dsl.lib.compiler.expr_compiler import called_builtins, compile_expr_to_python
+
+    names = {call.func for call in get_children_of_type("Call", model)}
+    for entity in get_children_of_type("Entity", model):
+        for attr in getattr(entity, "attributes", []) or []:
+            expr = getattr(attr, "expr", None)
+            if expr is not None:
+                names |= called_builtins(compile_expr_to_python(expr))
+    return names & DSL_FUNCTIONS.keys()
+
+
+# Backend dependencies only generated auth/database code imports
+_AUTH_REQUIREMENTS = ("pyjwt", "sqlmodel", "psycopg2-binary", "bcrypt")
+
+
+def _prune_backend_builtins(model, base_backend_dir: Path, backend_dir: Path):
+    """
+    Trim the generated backend to the builtins the model uses:
+    - app/core/builtins/selection.py lists the builtin groups to load, so
+      unused groups are never imported
+    - pyproject.toml drops optional distributions no used builtin needs, and
+      the auth/database stack when the model declares no auth
+    """
+    from functionality_dsl.lib.builtins.registry import (
+        BUILTIN_GROUPS,
+        BUILTIN_REQUIREMENTS,
+        DSL_FUNCTION_GROUP,
+    )
+
+    used = collect_model_builtins(model)
+    enabled = {"core_funcs"} | {DSL_FUNCTION_GROUP[name] for name in used}
+    groups = [module_name for module_name, _ in BUILTIN_GROUPS if module_name in enabled]
+
+    selection = backend_dir / "app" / "core" / "builtins" / "selection.py"
+    write_output(
+        selection,
+        "# Auto-generated by FDSL - builtin groups referenced by the model\n\n"
+        f"ENABLED_GROUPS = {tuple(groups)!r}\n",
+    )
+
+    dropped = [dist for dist, names in BUILTIN_REQUIREMENTS.items() if not used & names]
+    if not _needs_database(model):
+        dropped.extend(_AUTH_REQUIREMENTS)
+
+    text = (base_backend_dir / "pyproject.toml").read_text(encoding="utf-8")
+    for dist in dropped:
+        text = re.sub(
+            rf'^[ \t]*"{re.escape(dist)}(?:[\[<>=!~;][^"]*)?",?[ \t]*\n',
+            "",
+            text,
+            flags=re.MULTILINE | re.IGNORECASE,
+        )
+    write_output(backend_dir / "pyproject.toml", text)
+
+    logger.debug(
+        f"[SCAFFOLD] Builtin groups: {', '.join(groups)}"
+        + (f"; dropped dependencies: {', '.join(dropped)}" if dropped else "")
+    )
+
+
 def _extract_auth_configs(model):
     """
     Extract auth configurations from the model.
@@ -203,12 +268,7 @@ def generate_test_infrastructure(model, templates_dir: Path, out_dir: Path, expo
     logger.info("[TEST] Generating test infrastructure...")
 
     # Setup Jinja environment
-    env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
-        autoescape=select_autoescape(disabled_extensions=("jinja",)),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
+    env = get_environment(templates_dir, trim=True)
 
     # Extract auth configuration for test fixtures
     auth_configs = _extract_auth_configs(model)
@@ -265,24 +325,21 @@ def generate_test_infrastructure(model, templates_dir: Path, out_dir: Path, expo
 
     conftest_template = env.get_template("tests/conftest.py.jinja")
     conftest_content = conftest_template.render(**test_context)
-    (tests_dir / "conftest.py").write_text(conftest_content, encoding="utf-8")
+    write_output(tests_dir / "conftest.py", conftest_content)
     logger.debug("[TEST] Generated tests/conftest.py")
 
     # Create __init__.py files
-    (tests_dir / "__init__.py").write_text('"""Tests for the generated FDSL application."""', encoding="utf-8")
-    (tests_api_dir / "__init__.py").write_text('"""API route tests."""', encoding="utf-8")
+    write_output(tests_dir / "__init__.py", '"""Tests for the generated FDSL application."""')
+    write_output(tests_api_dir / "__init__.py", '"""API route tests."""')
 
     # 2. Generate test_{entity}.py for each entity
     entity_test_template = env.get_template("tests/api/test_entity.py.jinja")
 
+    entities_by_name = {e.name: e for e in get_children_of_type("Entity", model)}
+
     for entity_name, config in exposure_map.items():
         # Get entity from model
-        entity = None
-        entities = get_children_of_type("Entity", model)
-        for e in entities:
-            if e.name == entity_name:
-                entity = e
-                break
+        entity = entities_by_name.get(entity_name)
 
         if not entity:
             continue
@@ -400,7 +457,7 @@ def generate_test_infrastructure(model, templates_dir: Path, out_dir: Path, expo
 
         test_content = entity_test_template.render(**entity_context)
         test_file = tests_api_dir / f"test_{entity_name.lower()}.py"
-        test_file.write_text(test_content, encoding="utf-8")
+        write_output(test_file, test_content)
         logger.debug(f"[TEST] Generated tests/api/test_{entity_name.lower()}.py")
 
     # 3. Generate CI/CD workflows
@@ -410,19 +467,19 @@ def generate_test_infrastructure(model, templates_dir: Path, out_dir: Path, expo
     # Test workflow
     test_workflow_template = env.get_template(".github/workflows/test.yml.jinja")
     test_workflow_content = test_workflow_template.render(**test_context)
-    (github_dir / "test.yml").write_text(test_workflow_content, encoding="utf-8")
+    write_output(github_dir / "test.yml", test_workflow_content)
     logger.debug("[TEST] Generated .github/workflows/test.yml")
 
     # Lint workflow
     lint_workflow_template = env.get_template(".github/workflows/lint.yml.jinja")
     lint_workflow_content = lint_workflow_template.render(**test_context)
-    (github_dir / "lint.yml").write_text(lint_workflow_content, encoding="utf-8")
+    write_output(github_dir / "lint.yml", lint_workflow_content)
     logger.debug("[TEST] Generated .github/workflows/lint.yml")
 
     # 4. Generate pre-commit configuration
     precommit_template = env.get_template(".pre-commit-config.yaml.jinja")
     precommit_content = precommit_template.render(**test_context)
-    (out_dir / ".pre-commit-config.yaml").write_text(precommit_content, encoding="utf-8")
+    write_output(out_dir / ".pre-commit-config.yaml", precommit_content)
     logger.debug("[TEST] Generated .pre-commit-config.yaml")
 
     # 5. Generate scripts
@@ -432,7 +489,7 @@ def generate_test_infrastructure(model, templates_dir: Path, out_dir: Path, expo
     # Copy test.sh (static file)
     test_sh_src = templates_dir / "scripts" / "test.sh"
     if test_sh_src.exists():
-        shutil.copy2(test_sh_src, scripts_dir / "test.sh")
+        copy_output(test_sh_src, scripts_dir / "test.sh")
         (scripts_dir / "test.sh").chmod(0o755)  # Make executable
         logger.debug("[TEST] Generated scripts/test.sh")
 
@@ -441,7 +498,7 @@ def generate_test_infrastructure(model, templates_dir: Path, out_dir: Path, expo
     if test_context["uses_default_db"] or test_context["has_auth"]:
         prestart_template = env.get_template("scripts/prestart.py.jinja")
         prestart_content = prestart_template.render(**test_context)
-        (scripts_dir / "prestart.py").write_text(prestart_content, encoding="utf-8")
+        write_output(scripts_dir / "prestart.py", prestart_content)
         logger.debug("[TEST] Generated scripts/prestart.py")
 
     logger.info("[TEST] Test infrastructure generation complete!")
@@ -521,7 +578,8 @@ def scaffold_backend_from_model(model, base_backend_dir: Path, templates_backend
         context["jwt_secret_value"] = jwt_secret_value
 
     # Copy base backend files
-    copytree(base_backend_dir, out_dir, dirs_exist_ok=True)
+    # pyproject.toml is written pruned to the model's builtins below
+    copy_output_tree(base_backend_dir, out_dir, exclude=("pyproject.toml",))
     logger.debug(f"[SCAFFOLD] Copied base files to {out_dir}")
 
     # ---  Copy DSL runtime ---
@@ -529,6 +587,7 @@ def scaffold_backend_from_model(model, base_backend_dir: Path, templates_backend
     lib_root = Path(builtins.__file__).parent.parent  # functionality_dsl/lib/
     backend_core_dir = out_dir / "app" / "core"
     _copy_runtime_libs(lib_root, backend_core_dir, templates_backend_dir)
+    _prune_backend_builtins(model, base_backend_dir, out_dir)
 
     # Render infrastructure files
     render_infrastructure_files(context, templates_backend_dir, out_dir, target=target, db_context=db_context)
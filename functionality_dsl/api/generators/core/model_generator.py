@@ -2,8 +2,9 @@
 
 import re
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
 from ...gen_logging import get_logger
+from ...manifest import write_output
+from ...templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -106,13 +107,7 @@ def generate_domain_models(model, templates_dir, output_dir):
         })
 
     # Render template
-    env = Environment(
-        loader=FileSystemLoader(str(templates_dir)),
-        autoescape=select_autoescape(disabled_extensions=("jinja",)),
-        trim_blocks=True,
-        lstrip_blocks=True,
-        undefined=StrictUndefined,
-    )
+    env = get_environment(templates_dir, trim=True, strict=True)
     template = env.get_template("models.jinja")
 
     # Generate CRUD schemas for exposed entities (NEW SYNTAX)
@@ -184,5 +179,5 @@ def generate_domain_models(model, templates_dir, output_dir):
 
     output_file = Path(output_dir) / "app" / "domain" / "models.py"
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    output_file.write_text(models_code, encoding="utf-8")
+    write_output(output_file, models_code)
     logger.debug(f"[GENERATED] Domain models: {output_file}")
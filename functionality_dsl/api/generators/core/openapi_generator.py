@@ -14,6 +14,7 @@ from typing import Dict, Any, List
 from ...exposure_map import build_exposure_map
 from ...extractors import get_entities, map_to_openapi_type
 from ...gen_logging import get_logger
+from ...manifest import write_output
 from ...crud_helpers import (
     get_operation_http_method,
     get_operation_status_code,
@@ -125,8 +126,7 @@ def generate_openapi_spec(model, output_dir: Path, server_config: Dict[str, Any]
     # Write to file in app/api/ directory
     output_file = Path(output_dir) / "app" / "api" / "openapi.yaml"
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, "w", encoding="utf-8") as f:
-        yaml.dump(spec, f, sort_keys=False, default_flow_style=False, allow_unicode=True)
+    write_output(output_file, yaml.dump(spec, sort_keys=False, default_flow_style=False, allow_unicode=True))
 
     logger.debug(f"[GENERATED] OpenAPI spec: {output_file}")
 
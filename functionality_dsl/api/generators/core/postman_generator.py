@@ -9,6 +9,7 @@ import json
 import yaml
 from pathlib import Path
 from ...gen_logging import get_logger
+from ...manifest import write_output
 
 logger = get_logger(__name__)
 from typing import Dict, Any, List
@@ -83,8 +84,7 @@ def generate_postman_collection(openapi_file: Path, output_dir: Path):
     output_file = output_dir / "app" / "api" / "postman_collection.json"
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(collection, f, indent=2)
+    write_output(output_file, json.dumps(collection, indent=2))
 
     logger.debug(f"[GENERATED] Postman collection: {output_file}")
 
@@ -11,16 +11,19 @@ NEW AUTH MODEL:
 """
 
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
 from textx import get_children_of_type
 from functionality_dsl.api.crud_helpers import (
     get_operation_http_method,
     get_operation_status_code,
     requires_request_body,
     derive_request_schema_name,
+    get_binary_passthrough_attribute,
+    get_streamed_array_attribute,
 )
 from functionality_dsl.api.generators.core.auth_generator import get_permission_dependencies
 from functionality_dsl.api.gen_logging import get_logger
+from functionality_dsl.api.manifest import write_output
+from functionality_dsl.api.templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -59,6 +62,11 @@ def generate_entity_router(entity_name, config, model, templates_dir, out_dir):
     # Collect all auth modules needed for this router
     auth_modules_needed = set()
 
+    # Binary entities backed directly by a REST source stream their reads
+    binary_attr = get_binary_passthrough_attribute(entity) if "read" in operations else None
+    # ... and array entities of `stream: true` sources stream their items
+    stream_attr = get_streamed_array_attribute(entity) if "read" in operations else None
+
     # Build operation configs
     operation_configs = []
     for op in operations:
@@ -94,6 +102,8 @@ def generate_entity_router(entity_name, config, model, templates_dir, out_dir):
             "required_roles_list": auth_info["roles"] if auth_info["roles"] else [],
             # Multi-auth support (OR logic across different auth types)
             "multi_auth": auth_info["multi_auth"],
+            "streams_binary": op == "read" and binary_attr is not None,
+            "streams_items": op == "read" and stream_attr is not None,
         }
 
         # Determine request/response models
@@ -115,8 +125,11 @@ def generate_entity_router(entity_name, config, model, templates_dir, out_dir):
     path_params = config.get("path_params", [])
     query_params = config.get("query_params", [])
 
+    # Entities rendering a PDF can serve reads as background jobs (?job=true)
+    pdf_attr = _find_pdf_attribute(entity) if "read" in operations else None
+
     # Render template
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("entity_router.py.jinja")
 
     rendered = template.render(
@@ -127,12 +140,15 @@ def generate_entity_router(entity_name, config, model, templates_dir, out_dir):
         id_field=None,
         source_name=source.name,
         has_auth=has_auth,
-        auth_modules=list(auth_modules_needed),
+        auth_modules=sorted(auth_modules_needed),
         # Source params for parameterized sources
         has_params=has_params,
         all_params=all_params,
         path_params=path_params,
         query_params=query_params,
+        pdf_attr=pdf_attr,
+        binary_attr=binary_attr,
+        stream_attr=stream_attr,
     )
 
     # Write to file
@@ -140,11 +156,22 @@ def generate_entity_router(entity_name, config, model, templates_dir, out_dir):
     routers_dir.mkdir(parents=True, exist_ok=True)
 
     router_file = routers_dir / f"{entity_name.lower()}_router.py"
-    router_file.write_text(rendered)
+    write_output(router_file, rendered)
 
     logger.debug(f"    [OK] {router_file.relative_to(out_dir)}")
 
 
+def _find_pdf_attribute(entity):
+    """Name of the first computed attribute that calls toPdf(), if any."""
+    from functionality_dsl.lib.compiler.expr_compiler import called_builtins, compile_expr_to_python
+
+    for attr in getattr(entity, "attributes", []) or []:
+        expr = getattr(attr, "expr", None)
+        if expr is not None and "toPdf" in called_builtins(compile_expr_to_python(expr)):
+            return attr.name
+    return None
+
+
 def _parse_access_requirement(access_req):
     """
     Parse access requirement into auth info.
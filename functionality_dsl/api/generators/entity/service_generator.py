@@ -4,8 +4,10 @@ Generates service layer that orchestrates CRUD operations and entity transformat
 """
 
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from functionality_dsl.api.crud_helpers import get_binary_passthrough_attribute, get_streamed_array_attribute
 from functionality_dsl.api.gen_logging import get_logger
+from functionality_dsl.api.manifest import write_output
+from functionality_dsl.api.templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -55,7 +57,7 @@ def _validate_mutation_operations(entity_name, operations, has_multiple_parents,
         # 'delete' and 'read' operations are always OK
 
 
-def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
+def generate_entity_service(entity_name, config, model, templates_dir, out_dir, exposure_map=None):
     """
     Generate a service class for an exposed entity.
 
@@ -65,6 +67,7 @@ def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
         model: FDSL model
         templates_dir: Templates directory path
         out_dir: Output directory path
+        exposure_map: Exposure map of the model (built here if not given)
     """
     entity = config["entity"]
     operations = config["operations"]
@@ -89,6 +92,22 @@ def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
                 "expr": compiled_expr
             })
 
+    # Evaluate subexpressions repeated across attributes once per transform
+    if computed_attrs:
+        from functionality_dsl.lib.compiler.expr_compiler import hoist_common_subexpressions
+        computed_attrs = hoist_common_subexpressions(entity_name, computed_attrs)
+
+    # Transforms calling CPU-heavy builtins run in the transform pool, off the event loop
+    from functionality_dsl.lib.compiler.expr_compiler import called_builtins
+    from functionality_dsl.lib.builtins.registry import HEAVY_FUNCTIONS
+    heavy_builtins = sorted({
+        name
+        for attr in computed_attrs
+        for name in called_builtins(attr["expr"])
+        if name in HEAVY_FUNCTIONS
+    })
+    offload_transform = bool(heavy_builtins)
+
     # Check if entity has parent entities
     # Extract parent entities from ParentRef objects
     parent_refs = getattr(entity, "parents", []) or []
@@ -108,7 +127,8 @@ def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
     from ...exposure_map import build_exposure_map
     from ...extractors import find_source_for_entity
 
-    exposure_map = build_exposure_map(model)
+    if exposure_map is None:
+        exposure_map = build_exposure_map(model)
 
     parent_services = []
     parent_sources = []
@@ -216,8 +236,13 @@ def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
                 wrapper_attr_name = single_attr.name
                 wrapper_attr_type = "array"
 
+    # Binary entities backed directly by a REST source can stream their body
+    binary_attr = get_binary_passthrough_attribute(entity) if "read" in operations else None
+    # Array entities of `stream: true` sources parse and hand on their items in batches
+    stream_attr = get_streamed_array_attribute(entity) if "read" in operations else None
+
     # Render template
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("entity_service.py.jinja")
 
     rendered = template.render(
@@ -228,6 +253,8 @@ def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
         has_parents=has_parents,
         parents=parent_names,
         computed_attrs=computed_attrs,
+        offload_transform=offload_transform,
+        heavy_builtins=heavy_builtins,
         has_parent_services=has_parent_services,
         parent_services=parent_services,
         has_multiple_parent_sources=has_multiple_parent_sources,
@@ -241,6 +268,8 @@ def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
         is_wrapper_entity=is_wrapper_entity,
         wrapper_attr_name=wrapper_attr_name,
         wrapper_attr_type=wrapper_attr_type,
+        binary_attr=binary_attr,
+        stream_attr=stream_attr,
     )
 
     # Write to file
@@ -248,6 +277,6 @@ def generate_entity_service(entity_name, config, model, templates_dir, out_dir):
     services_dir.mkdir(parents=True, exist_ok=True)
 
     service_file = services_dir / f"{entity_name.lower()}_service.py"
-    service_file.write_text(rendered)
+    write_output(service_file, rendered)
 
     logger.debug(f"    [OK] {service_file.relative_to(out_dir)}")
@@ -5,10 +5,11 @@ Supports parameterized WebSocket sources with query params.
 """
 
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
 
 from functionality_dsl.api.generators.core.auth_generator import get_permission_dependencies
 from functionality_dsl.api.gen_logging import get_logger
+from functionality_dsl.api.manifest import write_output
+from functionality_dsl.api.templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -32,6 +33,21 @@ def _extract_ws_source_params(source):
     return all_params
 
 
+def _replay_window(replay):
+    """
+    Split an entity's `replay:` value into the replay buffer bounds.
+
+    Returns:
+        dict: replay_count (for "500") or replay_seconds (for "300s", "5m", "1h")
+    """
+    if not replay:
+        return {"replay_count": None, "replay_seconds": None}
+    if replay[-1].isdigit():
+        return {"replay_count": int(replay), "replay_seconds": None}
+    seconds = int(replay[:-1]) * {"s": 1, "m": 60, "h": 3600}[replay[-1]]
+    return {"replay_count": None, "replay_seconds": seconds}
+
+
 def generate_entity_websocket_router(entity_name, config, model, templates_dir, out_dir):
     """
     Generate a FastAPI WebSocket router for an exposed entity.
@@ -103,7 +119,7 @@ def generate_entity_websocket_router(entity_name, config, model, templates_dir,
         logger.debug(f"    Target params: {ws_target_params}")
 
     # Render template
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("entity_websocket_router.py.jinja")
 
     rendered = template.render(
@@ -128,7 +144,7 @@ def generate_entity_websocket_router(entity_name, config, model, templates_dir,
     routers_dir.mkdir(parents=True, exist_ok=True)
 
     router_file = routers_dir / f"{entity_name.lower()}_ws_router.py"
-    router_file.write_text(rendered)
+    write_output(router_file, rendered)
 
     logger.debug(f"    [OK] {router_file.relative_to(out_dir)}")
 
@@ -257,6 +273,19 @@ def generate_combined_websocket_router(ws_channel, entities, model, templates_di
             # Params for parameterized WebSocket sources
             "has_subscribe_params": has_subscribe_params,
             "subscribe_source_params": subscribe_source_params,
+            # Delta frames (patch | keys) instead of the full entity per message
+            "delta_mode": getattr(entity, "delta", None),
+            # Rate control: frames per second, latest-value-wins key, batch window
+            "max_rate": getattr(entity, "maxRate", None) or None,
+            "conflate_key": getattr(entity, "conflate", None) or None,
+            "batch_ms": getattr(entity, "batchMs", None) or None,
+            # How messages of several WebSocket sources are joined (shared by all subscribers)
+            "join_mode": getattr(entity, "join", None) or "latest",
+            "join_window_ms": getattr(entity, "joinWindowMs", None) or None,
+            # Attributes subscribers can filter on (?field=..., ?field.gte=...)
+            "subscribe_filters": list(getattr(entity, "filters", None) or []),
+            # Recent messages kept for late joiners (?replay=...): a count or an age in seconds
+            **_replay_window(getattr(entity, "replay", None)),
         })
 
     # Add publish entity details
@@ -383,7 +412,7 @@ def generate_combined_websocket_router(ws_channel, entities, model, templates_di
     })
 
     # Render template
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("combined_websocket_router.py.jinja")
 
     rendered = template.render(**context)
@@ -399,6 +428,6 @@ def generate_combined_websocket_router(ws_channel, entities, model, templates_di
         channel_path = channel_path[3:]  # Remove "ws/" prefix
     channel_name = channel_path.replace("/", "_")
     router_file = routers_dir / f"{channel_name}_ws.py"
-    router_file.write_text(rendered)
+    write_output(router_file, rendered)
 
     logger.debug(f"    [OK] {router_file.relative_to(out_dir)}")
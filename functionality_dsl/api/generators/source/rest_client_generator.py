@@ -7,8 +7,14 @@ Supports source-level authentication for outbound requests.
 
 import re
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from functionality_dsl.api.crud_helpers import (
+    OPERATION_HTTP_METHOD,
+    get_binary_passthrough_attribute,
+    get_streamed_array_attribute,
+)
 from functionality_dsl.api.gen_logging import get_logger
+from functionality_dsl.api.manifest import write_output
+from functionality_dsl.api.templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -128,6 +134,11 @@ def generate_source_client(source, model, templates_dir, out_dir, exposure_map=N
 
     # Infer operations from entities that bind to this source
     operations = set()
+    # Source bodies served unchanged by a binary entity can be read raw (and streamed);
+    # read(raw=True) is only passed by that entity's service, other entities still get JSON
+    binary_body = False
+    # `stream: true` sources are also opened as streamed responses, parsed item by item
+    streamed_array = False
 
     if exposure_map:
         for entity_name, config in exposure_map.items():
@@ -135,13 +146,19 @@ def generate_source_client(source, model, templates_dir, out_dir, exposure_map=N
             if entity_source and entity_source.name == source.name:
                 entity_ops = config.get("operations", [])
                 operations.update(entity_ops)
+                if "read" in entity_ops and get_binary_passthrough_attribute(config["entity"]):
+                    binary_body = True
+                if "read" in entity_ops and get_streamed_array_attribute(config["entity"]):
+                    streamed_array = True
 
     # If no operations found, skip
     if not operations:
         logger.warning(f"  No operations found for source {source.name}, skipping client generation")
         return
 
-    operations = list(operations)
+    # Fixed CRUD order keeps the generated client stable between runs
+    crud_order = list(OPERATION_HTTP_METHOD)
+    operations = sorted(operations, key=lambda op: (crud_order.index(op) if op in crud_order else len(crud_order), op))
 
     # All entities are snapshots - no ID parameters ever
     # Build operation method configs
@@ -185,7 +202,7 @@ def generate_source_client(source, model, templates_dir, out_dir, exposure_map=N
             })
 
     # Render template
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("source_client.py.jinja")
 
     rendered = template.render(
@@ -196,9 +213,11 @@ def generate_source_client(source, model, templates_dir, out_dir, exposure_map=N
         has_params=has_params,
         all_params=all_params,
         path_params=list(path_params),
-        query_params=list(query_params),
+        query_params=[p for p in all_params if p in query_params],
         # Auth config for outbound requests
         auth_config=auth_config,
+        binary_body=binary_body,
+        streamed_array=streamed_array,
     )
 
     # Write to file
@@ -206,6 +225,6 @@ def generate_source_client(source, model, templates_dir, out_dir, exposure_map=N
     sources_dir.mkdir(parents=True, exist_ok=True)
 
     source_file = sources_dir / f"{source.name.lower()}_source.py"
-    source_file.write_text(rendered)
+    write_output(source_file, rendered)
 
     logger.debug(f"    [OK] {source_file.relative_to(out_dir)}")
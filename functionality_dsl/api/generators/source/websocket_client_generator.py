@@ -7,9 +7,10 @@ Supports source-level authentication for outbound WebSocket requests.
 
 import re
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
 from textx import get_children_of_type
 from functionality_dsl.api.gen_logging import get_logger
+from functionality_dsl.api.manifest import write_output
+from functionality_dsl.api.templating import get_environment
 
 logger = get_logger(__name__)
 
@@ -132,7 +133,7 @@ def generate_websocket_source_client(source, model, templates_dir, out_dir, expo
                 if entity_source and entity_source.name == source_name:
                     bound_entity = config.get("entity")
 
-    operations = list(operations)
+    operations = sorted(operations)
 
     # Find binary attribute in bound entity (for automatic binary message wrapping)
     # Look in ALL entities that bind to this source (including unexposed base entities)
@@ -192,7 +193,7 @@ def generate_websocket_source_client(source, model, templates_dir, out_dir, expo
         logger.debug(f"      Auth: {auth_config['kind']}")
 
     # Render template
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
+    env = get_environment(templates_dir)
     template = env.get_template("websocket_source_client.py.jinja")
 
     rendered = template.render(
@@ -208,6 +209,8 @@ def generate_websocket_source_client(source, model, templates_dir, out_dir, expo
         query_params=query_params,
         # Auth config for outbound requests
         auth_config=auth_config,
+        # Sent after every (re)connect, with {param} placeholders filled in
+        subscribe_messages=list(getattr(source, "subscribeMessages", None) or []),
     )
 
     # Write to file
@@ -215,6 +218,6 @@ def generate_websocket_source_client(source, model, templates_dir, out_dir, expo
     sources_dir.mkdir(parents=True, exist_ok=True)
 
     source_file = sources_dir / f"{source_name.lower()}_source.py"
-    source_file.write_text(rendered)
+    write_output(source_file, rendered)
 
     logger.debug(f"      [OK] {source_file.relative_to(out_dir)}")
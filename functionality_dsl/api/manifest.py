@@ -0,0 +1,246 @@
+"""
+Incremental output writing for `fdsl generate`.
+
+Generators write every file through write_output() / copy_output_tree().
+Inside a generation_session():
+
+- A file whose content is unchanged is not rewritten, so its mtime stays put
+  (Docker layer caches, uvicorn --reload).
+- The content hash of every output is recorded in <out>/.fdsl/manifest.json,
+  together with a fingerprint of the inputs (model sources, generator
+  package, options). When the fingerprint matches and no output was touched
+  since, the CLI skips generation entirely.
+- Outputs recorded by the previous run but not produced by this one are
+  removed, unless they were edited by hand.
+
+Outside a session the helpers simply write. Generator worker processes use
+capture_outputs() instead: writes are collected and handed back to the
+parent, which writes them in a deterministic order.
+"""
+
+import hashlib
+import json
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .gen_logging import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_PATH = Path(".fdsl") / "manifest.json"
+MANIFEST_VERSION = 1
+
+# Never copied from base trees or hashed into fingerprints
+_IGNORED_DIRS = {"__pycache__", "node_modules", ".git"}
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _iter_files(root: Path) -> Iterator[Path]:
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and not _IGNORED_DIRS.intersection(path.relative_to(root).parts):
+            yield path
+
+
+def input_fingerprint(*parts: str) -> str:
+    """
+    Hash of everything that determines the generated output: the given parts
+    (expanded model source, options) plus every file of the generator package.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for path in _iter_files(PACKAGE_DIR):
+        digest.update(path.relative_to(PACKAGE_DIR).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class GenerationSession:
+    """Tracks the outputs of one generator run against the previous manifest."""
+
+    def __init__(self, out_dir: Path, fingerprint: Optional[str] = None, force: bool = False):
+        self.out_dir = Path(out_dir).resolve()
+        self.fingerprint = fingerprint
+        self.force = force
+        self.previous = load_manifest(self.out_dir)
+        self.files: Dict[str, Dict[str, Union[str, int]]] = {}
+        self.created: list = []
+        self.updated: list = []
+        self.unchanged: list = []
+        self.removed: list = []
+        self._lock = threading.Lock()
+
+    def _key(self, path: Path) -> Optional[str]:
+        try:
+            return Path(path).resolve().relative_to(self.out_dir).as_posix()
+        except ValueError:
+            return None
+
+    def _is_current(self, path: Path, key: str, digest: str, data: bytes) -> bool:
+        """True if `path` already holds `data` (checked via the manifest stat first)."""
+        if self.force or not path.exists():
+            return False
+        record = self.previous.get("files", {}).get(key)
+        if record and record["sha256"] == digest:
+            stat = path.stat()
+            if stat.st_size == record["size"] and stat.st_mtime_ns == record["mtime_ns"]:
+                return True
+        return path.read_bytes() == data
+
+    def write(self, path: Path, data: bytes):
+        path = Path(path)
+        key = self._key(path)
+        if key is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+            return
+
+        digest = _sha256(data)
+        existed = path.exists()
+        current = self._is_current(path, key, digest, data)
+        if not current:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+
+        stat = path.stat()
+        with self._lock:
+            self.files[key] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if current:
+                self.unchanged.append(key)
+            elif existed:
+                self.updated.append(key)
+            else:
+                self.created.append(key)
+
+    def remove_stale(self):
+        """Delete outputs of the previous run this run did not produce."""
+        for key, record in self.previous.get("files", {}).items():
+            if key in self.files:
+                continue
+            path = self.out_dir / key
+            if not path.exists():
+                continue
+            if _sha256(path.read_bytes()) != record["sha256"]:
+                logger.warning(f"[MANIFEST] Keeping {key}: no longer generated but edited by hand")
+                continue
+            path.unlink()
+            self.removed.append(key)
+
+    def save(self):
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "fingerprint": self.fingerprint,
+            "files": dict(sorted(self.files.items())),
+        }
+        path = self.out_dir / MANIFEST_PATH
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    def summary(self) -> Dict[str, list]:
+        return {
+            "created": sorted(self.created),
+            "updated": sorted(self.updated),
+            "unchanged": sorted(self.unchanged),
+            "removed": sorted(self.removed),
+        }
+
+
+_session: Optional[GenerationSession] = None
+_captured: Optional[List[Tuple[Path, bytes]]] = None
+
+
+def load_manifest(out_dir: Path) -> dict:
+    path = Path(out_dir) / MANIFEST_PATH
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def outputs_up_to_date(out_dir: Path, fingerprint: str) -> bool:
+    """True if the last run had this fingerprint and none of its outputs changed since."""
+    manifest = load_manifest(out_dir)
+    if not manifest.get("files") or manifest.get("fingerprint") != fingerprint:
+        return False
+    out_dir = Path(out_dir)
+    for key, record in manifest["files"].items():
+        try:
+            stat = (out_dir / key).stat()
+        except OSError:
+            return False
+        if stat.st_size != record["size"] or stat.st_mtime_ns != record["mtime_ns"]:
+            return False
+    return True
+
+
+@contextmanager
+def generation_session(out_dir: Path, fingerprint: Optional[str] = None, force: bool = False):
+    """
+    Route write_output() through a manifest for `out_dir`. The manifest is
+    only saved (and stale outputs removed) if generation succeeds.
+    """
+    global _session
+    session = GenerationSession(out_dir, fingerprint=fingerprint, force=force)
+    _session = session
+    try:
+        yield session
+        session.remove_stale()
+        session.save()
+    finally:
+        _session = None
+
+
+@contextmanager
+def capture_outputs():
+    """Collect write_output() calls as (path, bytes) instead of writing them."""
+    global _captured
+    outputs: List[Tuple[Path, bytes]] = []
+    _captured = outputs
+    try:
+        yield outputs
+    finally:
+        _captured = None
+
+
+def write_output(path: Path, content: Union[str, bytes], encoding: str = "utf-8"):
+    """Write a generated file, skipping the write if it is unchanged."""
+    data = content.encode(encoding) if isinstance(content, str) else content
+    if _captured is not None:
+        _captured.append((Path(path), data))
+        return
+    if _session is None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        return
+    _session.write(path, data)
+
+
+def copy_output(src: Path, dst: Path):
+    """Copy a static file into the output, preserving its mode."""
+    write_output(dst, Path(src).read_bytes())
+    if _captured is None:
+        shutil.copymode(src, dst)
+
+
+def copy_output_tree(src: Path, dst: Path, exclude: Iterable[str] = ()):
+    """
+    Copy a static tree into the output. `exclude` lists paths relative to
+    `src` (POSIX style) that the caller writes itself.
+    """
+    src, dst = Path(src), Path(dst)
+    skipped = set(exclude)
+    for path in _iter_files(src):
+        rel = path.relative_to(src).as_posix()
+        if rel not in skipped:
+            copy_output(path, dst / rel)
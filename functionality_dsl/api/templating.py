@@ -0,0 +1,129 @@
+"""
+Shared Jinja environments for the generators.
+
+Every generator asks get_environment() for its environment instead of
+building one, so each template is parsed and compiled once per process and
+shared by all entities (and inherited by forked generator workers).
+
+Compiled templates are also kept in a FileSystemBytecodeCache under the
+user cache dir (functionality_dsl.cache), so repeated `fdsl generate` runs
+skip template compilation.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, Union
+
+import jinja2
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    TemplateError,
+    select_autoescape,
+)
+
+from ..cache import cache_dir
+from .gen_logging import get_logger
+
+logger = get_logger(__name__)
+
+TemplatePath = Union[Path, str, Sequence[Union[Path, str]]]
+
+_ENVIRONMENTS: Dict[tuple, Environment] = {}
+
+
+def _tojson_unicode(value):
+    """JSON-encode for templates, keeping non-ASCII characters (°, ñ, ...) as-is."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+# Filters an environment can opt into by name (replacing Jinja's builtin of
+# the same name)
+SHARED_FILTERS: Dict[str, Callable] = {
+    "tojson": _tojson_unicode,
+}
+
+
+def _bytecode_cache(options: tuple) -> Optional[FileSystemBytecodeCache]:
+    # Jinja keys cached bytecode by template name and source only, so
+    # environments with different compile options need their own directory
+    root = cache_dir()
+    if root is None:
+        return None
+    signature = hashlib.sha256(repr((jinja2.__version__, options)).encode("utf-8")).hexdigest()[:16]
+    directory = root / "jinja" / signature
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.debug(f"Template bytecode cache disabled: {e}")
+        return None
+    return FileSystemBytecodeCache(str(directory))
+
+
+def get_environment(
+    templates_dir: TemplatePath,
+    *,
+    trim: bool = False,
+    strict: bool = False,
+    filters: Sequence[str] = (),
+) -> Environment:
+    """
+    Return the shared environment for a template search path.
+
+    Args:
+        templates_dir: Template directory, or a list searched in order
+        trim: Use trim_blocks/lstrip_blocks (and autoescape non-.jinja files)
+        strict: Raise on undefined variables (StrictUndefined)
+        filters: Names from SHARED_FILTERS to install
+    """
+    if isinstance(templates_dir, (str, Path)):
+        templates_dir = [templates_dir]
+    search_path = tuple(str(Path(p).resolve()) for p in templates_dir)
+    options = (trim, strict, tuple(sorted(filters)))
+    key = (search_path, options, cache_dir())
+
+    env = _ENVIRONMENTS.get(key)
+    if env is not None:
+        return env
+
+    kwargs = {}
+    if trim:
+        kwargs.update(
+            autoescape=select_autoescape(disabled_extensions=("jinja",)),
+            trim_blocks=True,
+            lstrip_blocks=True,
+        )
+    if strict:
+        kwargs["undefined"] = StrictUndefined
+
+    env = Environment(
+        loader=FileSystemLoader(list(search_path)),
+        bytecode_cache=_bytecode_cache(options),
+        **kwargs,
+    )
+    for name in filters:
+        env.filters[name] = SHARED_FILTERS[name]
+
+    _ENVIRONMENTS[key] = env
+    return env
+
+
+def preload_templates(env: Environment, names: Optional[Iterable[str]] = None) -> int:
+    """
+    Compile templates ahead of rendering: `names`, or every .jinja template
+    of `env`. Returns the number of templates loaded.
+    """
+    if names is None:
+        names = env.list_templates(extensions=["jinja"])
+    loaded = 0
+    for name in names:
+        try:
+            env.get_template(name)
+        except TemplateError as e:
+            logger.debug(f"Skipping template {name}: {e}")
+            continue
+        loaded += 1
+    return loaded
@@ -19,6 +19,62 @@ class Settings(BaseSettings):
     SERVER_HOST: str = "localhost"
     SERVER_PORT: int = 8080
 
+    # Session store (caches validated tokens/API keys in front of the auth DB).
+    # Opt-in: credentials revoked directly in the DB stay valid for SESSION_TTL_SECONDS
+    SESSION_STORE_BACKEND: str = "none"  # none | memory | sqlite
+    SESSION_STORE_PATH: str = "sessions.db"
+    SESSION_CACHE_SIZE: int = 10000
+    SESSION_TTL_SECONDS: int = 300
+    SESSION_SWEEP_INTERVAL: int = 60
+
+    # Pool for entity transforms that call CPU-heavy builtins (image, compression, PDF)
+    TRANSFORM_EXECUTOR: str = "thread"  # thread | process | none
+    TRANSFORM_WORKERS: int = 4
+    TRANSFORM_MAX_PENDING: int = 64
+    TRANSFORM_QUEUE_TIMEOUT: float = 10.0
+
+    # Background render jobs (e.g. `?job=true` PDF exports)
+    JOB_CONCURRENCY: int = 4
+    JOB_MAX_ENTRIES: int = 256
+    JOB_TTL_SECONDS: int = 600
+
+    # multipart/form-data uploads: file parts over the spool threshold go to a
+    # temporary file; limits are enforced while the body is being read
+    MULTIPART_SPOOL_THRESHOLD: int = 1024 * 1024
+    MULTIPART_MAX_FILE_SIZE: int = 256 * 1024 * 1024
+    MULTIPART_MAX_FIELD_SIZE: int = 1024 * 1024
+    MULTIPART_MAX_BODY_SIZE: int = 512 * 1024 * 1024
+    MULTIPART_MAX_PARTS: int = 100
+
+    # Sources with `stream: true`: array items are parsed as the body arrives
+    # and handed on in batches; a single item may not exceed the max size
+    SOURCE_STREAM_BATCH_SIZE: int = 500
+    SOURCE_STREAM_MAX_ITEM_SIZE: int = 16 * 1024 * 1024
+
+    # Subscribe channels with `delta:` send a full snapshot every N frames
+    WS_DELTA_SNAPSHOT_EVERY: int = 100
+
+    # Channels with maxRate/conflate/batchMs keep at most this many unsent messages per client
+    WS_OUTBOX_MAX_PENDING: int = 10000
+
+    # Channels with `replay:` buffer at most this many messages (also caps time-based buffers)
+    WS_REPLAY_MAX_FRAMES: int = 10000
+    # ... keep a channel's buffer this long after its last subscriber left, and keep at
+    # most this many buffers (one per channel and source params)
+    WS_REPLAY_GRACE_SECONDS: float = 300.0
+    WS_REPLAY_MAX_BUFFERS: int = 1000
+
+    # Upstream WebSocket sources: reconnect backoff (seconds, full jitter), retries in a
+    # row after a drop (0 = forever) and ping/pong liveness (interval 0 = off)
+    WS_SOURCE_RECONNECT_INITIAL: float = 0.5
+    WS_SOURCE_RECONNECT_MAX: float = 30.0
+    WS_SOURCE_MAX_RETRIES: int = 0
+    WS_SOURCE_PING_INTERVAL: float = 20.0
+    WS_SOURCE_PING_TIMEOUT: float = 20.0
+
+    # Import builtin dependencies (Pillow, reportlab, NumPy) at startup, not on first call
+    BUILTINS_WARMUP: bool = True
+
     def cors_origins(self):
         return [o.strip() for o in self.BACKEND_CORS_RAW_ORIGINS.split(",") if o.strip()]
 
@@ -8,14 +8,26 @@ in REST endpoints and HTTP client requests. It supports:
 - XML (application/xml)
 - Binary data (images, audio, video, octet-stream)
 - Form data (multipart/form-data)
+
+Multipart bodies are parsed incrementally (MultipartParser): request handlers
+feed `request.stream()` through parse_request_stream(), so an upload is never
+held in memory as a whole. File parts up to MULTIPART_SPOOL_THRESHOLD stay in
+memory, larger ones are spooled to a temporary file; both are exposed as
+UploadedFile (zero-copy memoryview or file handle). Size limits are checked
+while reading, before the rest of the body is received.
 """
 
-import json
+import io
 import logging
-from typing import Any, Dict, Optional, Union
+import mmap
+import re
+import tempfile
+from typing import Any, AsyncIterator, Dict, Optional, Union
 from enum import Enum
 import base64
 
+from app.core import json_codec
+
 # Optional XML support (only imported if needed)
 try:
     import xmltodict
@@ -44,6 +56,297 @@ class ContentType(str, Enum):
     MP4 = "video/mp4"
 
 
+class PayloadTooLarge(ValueError):
+    """A request body or one of its parts exceeds a configured size limit."""
+
+
+# Part header parsing (compiled once, not per part)
+_HEADER_NAME = re.compile(rb'^([^:\s]+)\s*:\s*(.*)$')
+_DISPOSITION_NAME = re.compile(rb'\bname="([^"]*)"')
+_DISPOSITION_FILENAME = re.compile(rb'\bfilename="([^"]*)"')
+
+# Part headers larger than this are rejected (they are buffered whole)
+_MAX_PART_HEADER_SIZE = 16 * 1024
+
+
+class UploadedFile:
+    """
+    A file part of a multipart body.
+
+    Content stays in memory up to `spool_threshold` bytes and is moved to an
+    anonymous temporary file beyond that. view() returns the content as a
+    memoryview without copying (the in-memory buffer, or a read-only mmap of
+    the temporary file); `file` is a handle positioned at the start.
+    """
+
+    def __init__(self, filename: str, content_type: str, spool_threshold: int):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = 0
+        self._threshold = spool_threshold
+        self._buffer: Optional[io.BytesIO] = io.BytesIO()
+        self._disk = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    @property
+    def in_memory(self) -> bool:
+        return self._disk is None
+
+    def write(self, data) -> None:
+        if self._disk is None and self.size + len(data) > self._threshold:
+            self._disk = tempfile.TemporaryFile(prefix="fdsl-upload-")
+            self._disk.write(self._buffer.getbuffer())
+            self._buffer = None
+        (self._buffer if self._disk is None else self._disk).write(data)
+        self.size += len(data)
+
+    @property
+    def file(self):
+        handle = self._buffer if self._disk is None else self._disk
+        handle.seek(0)
+        return handle
+
+    def view(self) -> memoryview:
+        if self._disk is None:
+            return self._buffer.getbuffer()
+        if self._mmap is None:
+            self._disk.flush()
+            self._mmap = mmap.mmap(self._disk.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)
+
+    def read(self) -> bytes:
+        """Copy the content into a bytes object (prefer view() for large files)."""
+        return bytes(self.view())
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A memoryview from view() is still alive; the map is released with it
+                pass
+            self._mmap = None
+        if self._disk is not None:
+            self._disk.close()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        where = "memory" if self.in_memory else "disk"
+        return f"UploadedFile({self.filename!r}, {self.size} bytes, {where})"
+
+
+class MultipartParser:
+    """
+    Incremental multipart/form-data parser.
+
+    feed() accepts the body in chunks of any size and close() returns the
+    parsed fields: str for text fields (bytes if not UTF-8), UploadedFile for
+    file parts. Only the unconsumed tail of the current chunk is buffered, so
+    memory use is bounded by the chunk size and the spool threshold.
+
+    Limits (None = unlimited) raise PayloadTooLarge as soon as they are
+    crossed; malformed bodies raise ValueError.
+    """
+
+    _PREAMBLE, _BOUNDARY, _HEADERS, _BODY, _DONE = range(5)
+
+    def __init__(
+        self,
+        boundary: str,
+        *,
+        spool_threshold: int = 1024 * 1024,
+        max_file_size: Optional[int] = None,
+        max_field_size: Optional[int] = None,
+        max_body_size: Optional[int] = None,
+        max_parts: Optional[int] = None,
+    ):
+        # Every delimiter, including the first, is preceded by CRLF; seeding
+        # the buffer with one lets the first boundary match like the others
+        self._delimiter = b'\r\n--' + boundary.encode('utf-8')
+        self._buffer = bytearray(b'\r\n')
+        self._state = self._PREAMBLE
+        self._spool_threshold = spool_threshold
+        self._max_file_size = max_file_size
+        self._max_field_size = max_field_size
+        self._max_body_size = max_body_size
+        self._max_parts = max_parts
+        self._received = 0
+        self._parts = 0
+        self._name: Optional[str] = None
+        self._part: Union[UploadedFile, bytearray, None] = None
+        self.fields: Dict[str, Any] = {}
+
+    @staticmethod
+    def boundary_from(content_type: str) -> str:
+        """Extract the boundary parameter of a multipart Content-Type header."""
+        if 'boundary=' not in content_type:
+            raise ValueError("multipart/form-data missing boundary parameter")
+        boundary = content_type.split('boundary=')[1].split(';')[0].strip()
+        if boundary.startswith('"') and boundary.endswith('"'):
+            boundary = boundary[1:-1]
+        if not boundary:
+            raise ValueError("multipart/form-data has an empty boundary")
+        return boundary
+
+    def feed(self, chunk: bytes) -> None:
+        self._received += len(chunk)
+        if self._max_body_size is not None and self._received > self._max_body_size:
+            raise PayloadTooLarge(f"Request body exceeds {self._max_body_size} bytes")
+        if self._state == self._DONE:
+            return  # epilogue
+        self._buffer += chunk
+        while self._step():
+            pass
+
+    def close(self) -> Dict[str, Any]:
+        if self._state != self._DONE:
+            raise ValueError("Truncated multipart/form-data body")
+        return self.fields
+
+    def abort(self) -> None:
+        """Release the files of a failed parse, including the part being read."""
+        files = [value for value in self.fields.values() if isinstance(value, UploadedFile)]
+        if isinstance(self._part, UploadedFile):
+            files.append(self._part)
+        self._part = self._name = None
+        for upload in files:
+            upload.close()
+
+    def _step(self) -> bool:
+        """Consume as much of the buffer as the current state allows."""
+        buf = self._buffer
+        if self._state == self._PREAMBLE:
+            index = buf.find(self._delimiter)
+            if index < 0:
+                # Keep just enough to match a delimiter split across chunks
+                del buf[:max(0, len(buf) - len(self._delimiter) + 1)]
+                return False
+            del buf[:index + len(self._delimiter)]
+            self._state = self._BOUNDARY
+            return True
+
+        if self._state == self._BOUNDARY:
+            if len(buf) < 2:
+                return False
+            if buf.startswith(b'--'):
+                self._state = self._DONE
+                buf.clear()
+                return False
+            end = buf.find(b'\r\n')
+            if end < 0:
+                return False
+            if buf[:end].strip(b' \t'):
+                raise ValueError("Malformed multipart boundary line")
+            del buf[:end + 2]
+            self._state = self._HEADERS
+            return True
+
+        if self._state == self._HEADERS:
+            if buf.startswith(b'\r\n'):
+                end, headers = 0, b''
+            else:
+                end = buf.find(b'\r\n\r\n')
+                if end < 0:
+                    if len(buf) > _MAX_PART_HEADER_SIZE:
+                        raise ValueError("Multipart part headers too large")
+                    return False
+                headers = bytes(buf[:end])
+                end += 2
+            del buf[:end + 2]
+            self._start_part(headers)
+            self._state = self._BODY
+            return True
+
+        if self._state == self._BODY:
+            index = buf.find(self._delimiter)
+            if index < 0:
+                safe = len(buf) - len(self._delimiter) + 1
+                if safe > 0:
+                    self._write_prefix(safe)
+                    del buf[:safe]
+                return False
+            self._write_prefix(index)
+            del buf[:index + len(self._delimiter)]
+            self._finish_part()
+            self._state = self._BOUNDARY
+            return True
+
+        return False
+
+    def _start_part(self, headers: bytes) -> None:
+        self._parts += 1
+        if self._max_parts is not None and self._parts > self._max_parts:
+            raise PayloadTooLarge(f"More than {self._max_parts} multipart parts")
+
+        name = filename = None
+        part_type = ContentType.OCTET_STREAM.value
+        for line in headers.split(b'\r\n'):
+            match = _HEADER_NAME.match(line)
+            if not match:
+                continue
+            header, value = match.group(1).lower(), match.group(2)
+            if header == b'content-disposition':
+                name_match = _DISPOSITION_NAME.search(value)
+                if name_match:
+                    name = name_match.group(1).decode('utf-8', errors='replace')
+                filename_match = _DISPOSITION_FILENAME.search(value)
+                if filename_match:
+                    filename = filename_match.group(1).decode('utf-8', errors='replace')
+            elif header == b'content-type':
+                part_type = value.decode('latin-1').strip()
+
+        self._name = name
+        if name is None:
+            logger.warning("Multipart part missing field name, skipping")
+            self._part = None
+        elif filename:
+            self._part = UploadedFile(filename, part_type, self._spool_threshold)
+            self.fields['filename'] = filename  # Store filename separately
+        else:
+            self._part = bytearray()
+
+    def _write_prefix(self, length: int) -> None:
+        """Append the first `length` buffered bytes to the current part, without copying them first."""
+        part = self._part
+        if part is None or not length:
+            return
+        with memoryview(self._buffer) as view, view[:length] as data:
+            self._write(part, data)
+
+    def _write(self, part: Union[UploadedFile, bytearray], data: memoryview) -> None:
+        if isinstance(part, UploadedFile):
+            limit = self._max_file_size
+            size = part.size
+        else:
+            limit = self._max_field_size
+            size = len(part)
+        if limit is not None and size + len(data) > limit:
+            raise PayloadTooLarge(f"Multipart field '{self._name}' exceeds {limit} bytes")
+        if isinstance(part, UploadedFile):
+            part.write(data)
+        else:
+            part += data
+
+    def _finish_part(self) -> None:
+        part, name = self._part, self._name
+        self._part = self._name = None
+        if part is None:
+            return
+        if isinstance(part, UploadedFile):
+            self.fields[name] = part
+            logger.debug(f"[MULTIPART] Parsed file field '{name}': {part.filename} ({part.size} bytes)")
+            return
+        try:
+            self.fields[name] = part.decode('utf-8')
+            logger.debug(f"[MULTIPART] Parsed text field '{name}': {self.fields[name][:50]}...")
+        except UnicodeDecodeError:
+            # If decode fails, store as bytes
+            self.fields[name] = bytes(part)
+            logger.debug(f"[MULTIPART] Parsed binary field '{name}' ({len(part)} bytes)")
+
+
 class ContentTypeHandler:
     """
     Handles ingestion and serialization of various content types.
@@ -96,77 +399,66 @@ class ContentTypeHandler:
         Raises:
             ValueError: If parsing fails
         """
-        # Extract boundary from content-type header
-        if 'boundary=' not in content_type:
-            raise ValueError("multipart/form-data missing boundary parameter")
+        parser = MultipartParser(MultipartParser.boundary_from(content_type), spool_threshold=len(body))
+        parser.feed(body)
+        result = {
+            name: value.read() if isinstance(value, UploadedFile) else value
+            for name, value in parser.close().items()
+        }
 
-        boundary = content_type.split('boundary=')[1].strip()
-        if boundary.startswith('"') and boundary.endswith('"'):
-            boundary = boundary[1:-1]
+        if not result:
+            raise ValueError("No valid fields found in multipart/form-data")
 
-        # Convert boundary to bytes
-        boundary_bytes = f'--{boundary}'.encode('utf-8')
-        end_boundary_bytes = f'--{boundary}--'.encode('utf-8')
+        logger.info(f"[MULTIPART] Parsed {len(result)} field(s): {list(result.keys())}")
+        return result
 
-        # Split body by boundary
-        parts = body.split(boundary_bytes)
+    @staticmethod
+    async def parse_multipart_stream(
+        chunks: AsyncIterator[bytes],
+        content_type: str,
+        *,
+        spool_threshold: Optional[int] = None,
+        max_file_size: Optional[int] = None,
+        max_field_size: Optional[int] = None,
+        max_body_size: Optional[int] = None,
+        max_parts: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse a multipart/form-data body as it arrives.
 
-        result = {}
+        Args:
+            chunks: Body chunks (e.g. `request.stream()`)
+            content_type: Full Content-Type header (includes boundary)
+            spool_threshold, max_*: Override the MULTIPART_* settings
 
-        for part in parts:
-            if not part or part == b'\r\n' or part.startswith(b'--'):
-                continue
+        Returns:
+            Dictionary with text fields as str (bytes if not UTF-8) and file
+            fields as UploadedFile; pass `upload.view()` to binary builtins
 
-            # Parse headers and content
-            try:
-                # Split headers from content (separated by \r\n\r\n)
-                if b'\r\n\r\n' not in part:
-                    continue
-
-                headers_section, content = part.split(b'\r\n\r\n', 1)
-
-                # Remove trailing \r\n from content
-                content = content.rstrip(b'\r\n')
-
-                # Parse Content-Disposition header
-                headers_str = headers_section.decode('utf-8', errors='ignore')
-                field_name = None
-                filename = None
-
-                for line in headers_str.split('\r\n'):
-                    if line.lower().startswith('content-disposition:'):
-                        # Extract field name and filename
-                        import re
-                        name_match = re.search(r'name="([^"]+)"', line)
-                        if name_match:
-                            field_name = name_match.group(1)
-
-                        filename_match = re.search(r'filename="([^"]+)"', line)
-                        if filename_match:
-                            filename = filename_match.group(1)
-
-                if not field_name:
-                    logger.warning("Multipart part missing field name, skipping")
-                    continue
-
-                # If this is a file upload, store as bytes
-                if filename:
-                    result[field_name] = content
-                    result['filename'] = filename  # Store filename separately
-                    logger.debug(f"[MULTIPART] Parsed file field '{field_name}': {filename} ({len(content)} bytes)")
-                else:
-                    # Text field - decode to string
-                    try:
-                        result[field_name] = content.decode('utf-8')
-                        logger.debug(f"[MULTIPART] Parsed text field '{field_name}': {result[field_name][:50]}...")
-                    except UnicodeDecodeError:
-                        # If decode fails, store as bytes
-                        result[field_name] = content
-                        logger.debug(f"[MULTIPART] Parsed binary field '{field_name}' ({len(content)} bytes)")
-
-            except Exception as parse_error:
-                logger.warning(f"Failed to parse multipart part: {parse_error}")
-                continue
+        Raises:
+            PayloadTooLarge: As soon as a size limit is exceeded
+            ValueError: If parsing fails
+        """
+        from app.core.config import settings
+
+        def setting(value, default):
+            return default if value is None else value
+
+        parser = MultipartParser(
+            MultipartParser.boundary_from(content_type),
+            spool_threshold=setting(spool_threshold, settings.MULTIPART_SPOOL_THRESHOLD),
+            max_file_size=setting(max_file_size, settings.MULTIPART_MAX_FILE_SIZE),
+            max_field_size=setting(max_field_size, settings.MULTIPART_MAX_FIELD_SIZE),
+            max_body_size=setting(max_body_size, settings.MULTIPART_MAX_BODY_SIZE),
+            max_parts=setting(max_parts, settings.MULTIPART_MAX_PARTS),
+        )
+        try:
+            async for chunk in chunks:
+                parser.feed(chunk)
+            result = parser.close()
+        except Exception:
+            parser.abort()
+            raise
 
         if not result:
             raise ValueError("No valid fields found in multipart/form-data")
@@ -174,6 +466,43 @@ class ContentTypeHandler:
         logger.info(f"[MULTIPART] Parsed {len(result)} field(s): {list(result.keys())}")
         return result
 
+    @staticmethod
+    async def parse_request_stream(request) -> Union[Dict[str, Any], str, bytes]:
+        """
+        Parse an incoming request body by reading `request.stream()`.
+
+        Multipart bodies are parsed incrementally (files spooled, see
+        UploadedFile); other content types are read up to
+        MULTIPART_MAX_BODY_SIZE and parsed with parse_request(). A declared
+        Content-Length over the limit is rejected before reading.
+
+        Raises:
+            HTTPException: 413 if a size limit is exceeded, 400 if parsing fails
+        """
+        from fastapi import HTTPException
+        from app.core.config import settings
+
+        content_type = request.headers.get("content-type", ContentType.JSON.value)
+        max_body_size = settings.MULTIPART_MAX_BODY_SIZE
+        declared = request.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > max_body_size:
+            raise HTTPException(status_code=413, detail=f"Request body exceeds {max_body_size} bytes")
+
+        try:
+            if content_type.split(';')[0].strip() == ContentType.FORM_DATA:
+                return await ContentTypeHandler.parse_multipart_stream(request.stream(), content_type)
+
+            body = bytearray()
+            async for chunk in request.stream():
+                body += chunk
+                if len(body) > max_body_size:
+                    raise PayloadTooLarge(f"Request body exceeds {max_body_size} bytes")
+            return await ContentTypeHandler.parse_request(bytes(body), content_type)
+        except PayloadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     @staticmethod
     def _build_multipart(data: Dict[str, Any]) -> tuple[bytes, Dict[str, str]]:
         """
@@ -206,9 +535,13 @@ class ContentTypeHandler:
             part = b'--' + boundary_bytes + b'\r\n'
 
             # Add Content-Disposition header
-            if isinstance(value, bytes):
-                # Binary file field
+            if isinstance(value, UploadedFile):
+                filename = value.filename
+                value = value.view()
+            else:
                 filename = data.get('filename', 'file')
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                # Binary file field
                 part += f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'.encode('utf-8')
                 part += b'Content-Type: application/octet-stream\r\n\r\n'
                 part += value
@@ -257,7 +590,7 @@ class ContentTypeHandler:
 
         try:
             if content_type_normalized == ContentType.JSON:
-                return json.loads(request_body.decode('utf-8'))
+                return json_codec.loads(request_body)
 
             elif content_type_normalized == ContentType.TEXT:
                 return request_body.decode('utf-8')
@@ -281,7 +614,7 @@ class ContentTypeHandler:
                 # Unknown content type - try JSON first, fall back to text
                 logger.warning(f"Unknown content type '{content_type}', attempting JSON parse")
                 try:
-                    return json.loads(request_body.decode('utf-8'))
+                    return json_codec.loads(request_body)
                 except:
                     return request_body.decode('utf-8')
 
@@ -367,7 +700,7 @@ class ContentTypeHandler:
         try:
             if content_type == ContentType.JSON:
                 headers = {"Content-Type": content_type}
-                body_bytes = json.dumps(data).encode('utf-8')
+                body_bytes = json_codec.dumpb(data)
 
             elif content_type == ContentType.TEXT:
                 headers = {"Content-Type": content_type}
@@ -410,7 +743,7 @@ class ContentTypeHandler:
             else:
                 # Default to JSON
                 headers = {"Content-Type": ContentType.JSON}
-                body_bytes = json.dumps(data).encode('utf-8')
+                body_bytes = json_codec.dumpb(data)
 
             return body_bytes, headers
 
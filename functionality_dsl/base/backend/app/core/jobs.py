@@ -0,0 +1,218 @@
+"""
+Background render jobs (e.g. PDF exports).
+
+A request can hand a slow render to the job store and return immediately
+with a job id; clients poll the job and download the bytes when it is done.
+
+- Jobs run as asyncio tasks, at most JOB_CONCURRENCY at a time. The CPU work
+  inside them still goes through the transform pool (app.core.offload).
+- Finished results are stored once per content hash and shared by every job
+  that produced the same bytes; downloads carry the hash as ETag.
+- Jobs and results expire after JOB_TTL_SECONDS; at most JOB_MAX_ENTRIES
+  jobs are kept.
+- A job submitted by an authenticated user belongs to that user: for anyone
+  else its status and download answer 404, as if it did not exist.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from app.core.config import settings
+
+logger = logging.getLogger("fdsl.jobs")
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    id: str
+    media_type: str
+    filename: str
+    status: str = PENDING
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    content_hash: Optional[str] = None
+    error: Optional[str] = None
+    # User id of the submitter (None for public exports)
+    owner: Optional[str] = None
+
+    def to_dict(self, base_path: str) -> Dict[str, Optional[str]]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "status_url": f"{base_path}/{self.id}",
+            "download_url": f"{base_path}/{self.id}/download",
+        }
+        if self.content_hash:
+            data["content_hash"] = self.content_hash
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class JobStore:
+    """In-process job registry with a content-addressed result cache."""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 600.0, concurrency: int = 4):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._results: Dict[str, bytes] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(concurrency)
+
+    def submit(
+        self,
+        render: Callable[[], Awaitable[bytes]],
+        media_type: str,
+        filename: str,
+        owner: Optional[str] = None,
+    ) -> Job:
+        """Schedule `render` for `owner` and return its job immediately."""
+        self._prune()
+        job = Job(id=uuid.uuid4().hex, media_type=media_type, filename=filename, owner=owner)
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, render))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.finished_at is not None and time.time() - job.finished_at > self.ttl:
+            self._forget(job_id)
+            return None
+        return job
+
+    def result(self, job: Job) -> Optional[bytes]:
+        return self._results.get(job.content_hash) if job.content_hash else None
+
+    async def _run(self, job: Job, render: Callable[[], Awaitable[bytes]]):
+        try:
+            async with self._slots:
+                job.status = RUNNING
+                data = await render()
+            if not isinstance(data, (bytes, bytearray)):
+                raise TypeError(f"render returned {type(data).__name__}, expected bytes")
+            digest = hashlib.sha256(data).hexdigest()
+            # Identical renders share one stored copy
+            self._results.setdefault(digest, bytes(data))
+            job.content_hash = digest
+            job.status = DONE
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "cancelled"
+            raise
+        except HTTPException as exc:
+            job.status = FAILED
+            job.error = str(exc.detail)
+        except Exception as exc:
+            logger.error("job_failed", extra={"job_id": job.id, "err": repr(exc)})
+            job.status = FAILED
+            job.error = "render failed"
+        finally:
+            job.finished_at = time.time()
+            self._tasks.pop(job.id, None)
+
+    def _forget(self, job_id: str):
+        job = self._jobs.pop(job_id, None)
+        if job is None or job.content_hash is None:
+            return
+        if not any(j.content_hash == job.content_hash for j in self._jobs.values()):
+            self._results.pop(job.content_hash, None)
+
+    def _prune(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl
+        ]
+        for job_id in expired:
+            self._forget(job_id)
+        # Over capacity: drop the oldest finished jobs first
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at is not None]:
+            if len(self._jobs) < self.max_entries:
+                break
+            self._forget(job_id)
+        if len(self._jobs) >= self.max_entries:
+            raise HTTPException(status_code=503, detail="Too many pending jobs, retry later")
+
+    async def close(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """Return the process job store (created on first use)."""
+    global _store
+    if _store is None:
+        _store = JobStore(
+            max_entries=settings.JOB_MAX_ENTRIES,
+            ttl=float(settings.JOB_TTL_SECONDS),
+            concurrency=settings.JOB_CONCURRENCY,
+        )
+    return _store
+
+
+def _owned_job(job_id: str, owner: Optional[str]) -> Job:
+    """The job `owner` submitted, or 404 (also for other users' jobs)."""
+    job = get_job_store().get(job_id)
+    if job is None or job.owner != owner:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+def job_status(job_id: str, base_path: str, owner: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """Status payload for a job of `owner`, or 404."""
+    return _owned_job(job_id, owner).to_dict(base_path)
+
+
+def job_download(job_id: str, request: Request, owner: Optional[str] = None) -> Response:
+    """Serve the bytes of a finished job of `owner`; 409 while it is still running."""
+    store = get_job_store()
+    job = _owned_job(job_id, owner)
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job.error}")
+    data = store.result(job)
+    if data is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    etag = f'"{job.content_hash}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=data,
+        media_type=job.media_type,
+        headers={
+            "ETag": etag,
+            "Content-Disposition": f'attachment; filename="{job.filename}"',
+        },
+    )
+
+
+@asynccontextmanager
+async def lifespan_job_store() -> AsyncIterator[None]:
+    """Cancel unfinished jobs on shutdown."""
+    global _store
+    try:
+        yield
+    finally:
+        if _store is not None:
+            await _store.close()
+            _store = None
@@ -0,0 +1,139 @@
+"""
+JSON codec for the generated backend.
+
+Every JSON hot path goes through this module: request bodies
+(ContentTypeHandler), REST source responses and request bodies, WebSocket
+source frames, WebSocket sends to clients and HTTP responses (JSONResponse is
+the app's default response class).
+
+orjson is used when it is installed; otherwise the standard library. Set
+FDSL_JSON_BACKEND=stdlib to force the standard library (e.g. to compare).
+
+Both backends produce compact UTF-8 JSON (no spaces after separators,
+non-ASCII characters kept) and agree on the edge cases where their defaults
+differ: NaN and Infinity are written as null, integers beyond 64 bits are
+written in full (orjson rejects them, so such values fall back to the
+standard library), and NaN/Infinity literals are rejected when parsing. The
+only remaining difference is the spelling of float exponents (orjson writes
+1e16, the standard library 1e+16); both parse to the same value.
+"""
+
+import json
+import math
+import os
+from decimal import Decimal
+from typing import Any, Union
+from uuid import UUID
+
+from fastapi.responses import JSONResponse as _StarletteJSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if os.getenv("FDSL_JSON_BACKEND", "").lower() == "stdlib":
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "stdlib"
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+JSONInput = Union[str, bytes, bytearray, memoryview]
+
+
+def _default(value: Any) -> Any:
+    """Encode types neither backend handles natively (Pydantic models, sets, Decimal)."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value) if value.is_finite() else None
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _finite(value: Any) -> Any:
+    """Copy of `value` with NaN and Infinity replaced by None (what orjson writes)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+# The C encoder cannot write non-finite floats as null; it raises instead, and
+# only those (rare) payloads are cleaned and encoded again
+_encoder = json.JSONEncoder(default=_default, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+_finite_encoder = json.JSONEncoder(
+    default=lambda value: _finite(_default(value)), ensure_ascii=False, separators=(",", ":"), allow_nan=False
+)
+
+
+def _stdlib_dumps(value: Any) -> str:
+    try:
+        return _encoder.encode(value)
+    except ValueError as e:
+        if not str(e).startswith("Out of range float"):
+            raise
+        return _finite_encoder.encode(_finite(value))
+
+
+def _reject_constant(name: str) -> Any:
+    raise JSONDecodeError(f"Invalid JSON literal {name}", name, 0)
+
+
+_decoder = json.JSONDecoder(parse_constant=_reject_constant)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: JSONInput) -> Any:
+        """Parse JSON from text or UTF-8 bytes (bytes are not decoded first)."""
+        return orjson.loads(data)
+
+    def dumpb(value: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(value, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError as e:
+            if "64-bit" not in str(e):
+                raise
+            return _stdlib_dumps(value).encode("utf-8")
+
+    def dumps(value: Any) -> str:
+        """Serialize to a compact JSON string (WebSocket text frames)."""
+        return dumpb(value).decode("utf-8")
+
+else:
+    def loads(data: JSONInput) -> Any:
+        """Parse JSON from text or UTF-8 bytes."""
+        if not isinstance(data, str):
+            try:
+                data = bytes(data).decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise JSONDecodeError(f"Invalid UTF-8: {e.reason}", "", e.start) from None
+        return _decoder.decode(data)
+
+    def dumps(value: Any) -> str:
+        """Serialize to a compact JSON string (WebSocket text frames)."""
+        return _stdlib_dumps(value)
+
+    def dumpb(value: Any) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes."""
+        return _stdlib_dumps(value).encode("utf-8")
+
+
+class JSONResponse(_StarletteJSONResponse):
+    """JSON response rendered with the codec (FastAPI's ORJSONResponse, with a stdlib fallback)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumpb(content)
@@ -0,0 +1,191 @@
+"""
+Incremental parsing of JSON arrays from streamed REST source responses.
+
+Sources declared with `stream: true` do not buffer the upstream body:
+JSONArrayParser is fed the bytes as they arrive and hands out each array item
+as soon as it is complete (ijson-style), so memory use is bounded by the
+chunk and batch size instead of the size of the response. Items are decoded
+by the C scanner of the json module, straight from the buffered text.
+
+A top-level object (e.g. {"items": [...]}) cannot be split this way; it is
+buffered and its `key` member is returned instead, so wrapper entities accept
+the same two shapes as buffered reads do.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, List, Optional
+
+from app.core import json_codec
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters a number can continue with ("12" -> "12.5e-3")
+_NUMBER_TAIL = re.compile(r"[-+.eE0-9]*")
+_decoder = json.JSONDecoder()
+
+
+class JSONArrayParser:
+    """
+    Incremental parser for a JSON document whose top level is an array.
+
+    feed() accepts UTF-8 chunks of any size and returns the items completed
+    by that chunk; close() returns the remaining items and checks that the
+    document ended. Only the unconsumed tail (at most one partial item) is
+    buffered.
+
+    Malformed JSON raises ValueError; so does an item larger than
+    `max_item_size` characters (None = unlimited).
+    """
+
+    _START, _FIRST, _ITEM, _SEPARATOR, _OBJECT, _DONE = range(6)
+
+    def __init__(self, *, key: Optional[str] = None, max_item_size: Optional[int] = None):
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        # Unconsumed text, joined only when there is something to parse
+        self._parts: List[str] = []
+        self._size = 0
+        self._state = self._START
+        self._key = key
+        self._max_item_size = max_item_size
+        # Length the pending item must reach before it is parsed again; grows
+        # geometrically so a large item is not rescanned on every chunk
+        self._retry_size = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        return self._consume(self._text.decode(chunk), final=False)
+
+    def close(self) -> List[Any]:
+        items = self._consume(self._text.decode(b"", final=True), final=True)
+        if self._state == self._OBJECT:
+            items = self._object_items(json_codec.loads("".join(self._parts)))
+            self._parts = []
+            self._state = self._DONE
+        if self._state != self._DONE:
+            raise ValueError("JSON array is incomplete")
+        return items
+
+    def _consume(self, text: str, final: bool) -> List[Any]:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._state == self._OBJECT or (self._size < self._retry_size and not final):
+            return []
+
+        buffer = "".join(self._parts)
+        end = len(buffer)
+        pos = 0
+        items = []
+
+        while self._state != self._OBJECT:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == end:
+                break
+            state = self._state
+
+            if state == self._ITEM:
+                pending = end - pos
+                try:
+                    item, item_end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # Most likely cut off by the chunk boundary
+                    if self._max_item_size is not None and pending > self._max_item_size:
+                        raise ValueError(
+                            f"JSON array item exceeds {self._max_item_size} characters"
+                        )
+                    self._retry_size = 2 * pending
+                    break
+                if (
+                    not final
+                    and isinstance(item, (int, float))
+                    and not isinstance(item, bool)
+                    and _NUMBER_TAIL.match(buffer, item_end).end() == end
+                ):
+                    # A number running into the end of the buffer ("12.", "3e")
+                    # may continue in the next chunk: wait for its delimiter
+                    self._retry_size = pending + 1
+                    break
+                items.append(item)
+                pos = item_end
+                self._retry_size = 0
+                self._state = self._SEPARATOR
+
+            elif state == self._SEPARATOR:
+                char = buffer[pos]
+                pos += 1
+                if char == ",":
+                    self._state = self._ITEM
+                elif char == "]":
+                    self._state = self._DONE
+                else:
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+
+            elif state == self._START:
+                char = buffer[pos]
+                if char == "[":
+                    pos += 1
+                    self._state = self._FIRST
+                elif char == "{" and self._key is not None:
+                    self._state = self._OBJECT
+                else:
+                    raise ValueError(f"Expected a JSON array, got {char!r}")
+
+            elif state == self._FIRST:
+                if buffer[pos] == "]":
+                    pos += 1
+                    self._state = self._DONE
+                else:
+                    self._state = self._ITEM
+
+            else:
+                raise ValueError("Unexpected data after the JSON array")
+
+        tail = buffer[pos:]
+        self._parts = [tail]
+        self._size = len(tail)
+        return items
+
+    def _object_items(self, document: Any) -> List[Any]:
+        if not isinstance(document, dict) or not isinstance(document.get(self._key), list):
+            raise ValueError(f"Expected a JSON array or an object with a '{self._key}' array")
+        return document[self._key]
+
+
+async def iter_json_array(
+    chunks: AsyncIterator[bytes],
+    *,
+    key: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    max_item_size: Optional[int] = None,
+) -> AsyncIterator[List[Any]]:
+    """
+    Yield the items of a streamed JSON array in lists of up to `batch_size`.
+
+    Args:
+        chunks: Body chunks (e.g. `response.aiter_bytes()`)
+        key: Member holding the array if the body is an object instead
+        batch_size, max_item_size: Override the SOURCE_STREAM_* settings
+
+    Raises:
+        ValueError: If the body is not a JSON array (or an object with `key`)
+    """
+    if batch_size is None or max_item_size is None:
+        from app.core.config import settings
+
+        if batch_size is None:
+            batch_size = settings.SOURCE_STREAM_BATCH_SIZE
+        if max_item_size is None:
+            max_item_size = settings.SOURCE_STREAM_MAX_ITEM_SIZE
+
+    parser = JSONArrayParser(key=key, max_item_size=max_item_size)
+    batch: List[Any] = []
+    async for chunk in chunks:
+        batch.extend(parser.feed(chunk))
+        while len(batch) >= batch_size:
+            yield batch[:batch_size]
+            del batch[:batch_size]
+
+    batch.extend(parser.close())
+    for start in range(0, len(batch), batch_size):
+        yield batch[start:start + batch_size]
@@ -0,0 +1,111 @@
+"""
+Executor offload for CPU-heavy entity transforms.
+
+Computed attributes are evaluated synchronously. When an entity calls a
+builtin tagged "heavy" in the registry (image processing, compression, PDF
+rendering), its generated service runs the transform here instead of on the
+event loop, so one slow transform does not stall every other request and
+WebSocket stream on the process.
+
+- TRANSFORM_EXECUTOR: "thread" (default) or "process"
+- TRANSFORM_WORKERS: pool size
+- TRANSFORM_MAX_PENDING: transforms running or queued at once; callers
+  beyond that wait for a slot (back-pressure)
+- TRANSFORM_QUEUE_TIMEOUT: seconds to wait for a slot before answering 503
+- BUILTINS_WARMUP: process workers import builtin dependencies on start
+
+Process pools need the transform to be importable by reference: generated
+services pass their static `_transform_entity`, never a bound method.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Optional
+
+from fastapi import HTTPException
+
+from app.core.builtins.registry import warm_up_builtins
+from app.core.config import settings
+
+logger = logging.getLogger("fdsl.offload")
+
+_executor: Optional[Executor] = None
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def _build_executor() -> Optional[Executor]:
+    kind = settings.TRANSFORM_EXECUTOR.lower()
+    workers = settings.TRANSFORM_WORKERS
+    if kind == "none":
+        return None
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fdsl-transform")
+    if kind == "process":
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=warm_up_builtins if settings.BUILTINS_WARMUP else None,
+        )
+    raise ValueError(f"Unknown TRANSFORM_EXECUTOR: {settings.TRANSFORM_EXECUTOR}")
+
+
+def _call_in_worker(fn: Callable[[Any], Any], data: Any) -> Any:
+    """
+    Run a transform in the pool. HTTPException does not survive pickling, so
+    it is returned as a marker and re-raised by the caller.
+    """
+    try:
+        return False, fn(data)
+    except HTTPException as exc:
+        return True, (exc.status_code, exc.detail)
+
+
+async def run_transform(fn: Callable[[Any], Any], data: Any) -> Any:
+    """
+    Run `fn(data)` in the transform pool, waiting for a free slot first.
+    Runs inline when the pool is disabled or the app has not started.
+    """
+    if _executor is None:
+        return fn(data)
+
+    try:
+        await asyncio.wait_for(_slots.acquire(), timeout=settings.TRANSFORM_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("transform_pool_saturated", extra={"pending": settings.TRANSFORM_MAX_PENDING})
+        raise HTTPException(status_code=503, detail="Server busy, retry later")
+
+    try:
+        loop = asyncio.get_running_loop()
+        failed, result = await loop.run_in_executor(_executor, _call_in_worker, fn, data)
+    finally:
+        _slots.release()
+
+    if failed:
+        status_code, detail = result
+        raise HTTPException(status_code=status_code, detail=detail)
+    return result
+
+
+@asynccontextmanager
+async def lifespan_transform_pool() -> AsyncIterator[Optional[Executor]]:
+    """Create the transform pool for the app lifetime."""
+    global _executor, _slots
+    _executor = _build_executor()
+    if _executor is None:
+        yield None
+        return
+
+    _slots = asyncio.Semaphore(max(settings.TRANSFORM_MAX_PENDING, settings.TRANSFORM_WORKERS))
+    logger.info(
+        "transform_pool_started",
+        extra={"executor": settings.TRANSFORM_EXECUTOR, "workers": settings.TRANSFORM_WORKERS},
+    )
+    try:
+        yield _executor
+    finally:
+        executor, _executor, _slots = _executor, None, None
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -10,7 +10,9 @@ This module provides reusable utilities for service functions to:
 
 import json
 import logging
-from typing import Any, Dict
+import types
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Set
 from urllib.parse import urlencode
 
 from fastapi import HTTPException
@@ -27,10 +29,12 @@ def _sanitize_for_logging(data: Any, max_bytes_preview: int = 100) -> Any:
     Returns:
         Sanitized data safe for JSON serialization
     """
-    if isinstance(data, bytes):
-        # Binary data - show metadata instead of raw bytes
-        size = len(data)
-        preview = data[:max_bytes_preview].hex() if size > 0 else ""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        # Binary data - show metadata instead of raw bytes; the preview is
+        # hexed from a view of the first bytes, the payload is not copied
+        with memoryview(data) as view:
+            size = view.nbytes
+            preview = view[:max_bytes_preview].hex() if size > 0 else ""
         return {
             "_type": "binary",
             "size_bytes": size,
@@ -44,6 +48,14 @@ def _sanitize_for_logging(data: Any, max_bytes_preview: int = 100) -> Any:
         return data
 
 
+def _preview(data: Any, limit: int) -> str:
+    """JSON preview of sanitized data, truncated to `limit` characters."""
+    text = json.dumps(_sanitize_for_logging(data), indent=2)
+    if len(text) > limit:
+        return text[:limit] + "\n  ... (truncated)"
+    return text
+
+
 def log_incoming_request(
     logger: logging.Logger,
     path_params: Dict[str, str] = None,
@@ -51,6 +63,8 @@ def log_incoming_request(
     request_body: Dict[str, Any] = None
 ) -> None:
     """Log incoming request parameters in a structured format."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     incoming_data = {}
     if path_params:
         incoming_data["path"] = path_params
@@ -61,10 +75,7 @@ def log_incoming_request(
 
     if incoming_data:
         # Sanitize data to handle binary content
-        sanitized_data = _sanitize_for_logging(incoming_data)
-        incoming_preview = json.dumps(sanitized_data, indent=2)[:400]
-        if len(json.dumps(sanitized_data)) > 400:
-            incoming_preview += "\n  ... (truncated)"
+        incoming_preview = _preview(incoming_data, 400)
         logger.info(f"[REQUEST] ← Incoming request:\n{incoming_preview}")
     else:
         logger.info("[REQUEST] ← No request parameters")
@@ -72,10 +83,9 @@ def log_incoming_request(
 
 def log_outgoing_response(logger: logging.Logger, response_data: Any) -> None:
     """Log outgoing response data in a structured format."""
-    sanitized_data = _sanitize_for_logging(response_data)
-    response_preview = json.dumps(sanitized_data, indent=2)[:400]
-    if len(json.dumps(sanitized_data)) > 400:
-        response_preview += "\n  ... (truncated)"
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    response_preview = _preview(response_data, 400)
     logger.info(f"[RESPONSE] -> Outgoing response:\n{response_preview}")
 
 
@@ -91,10 +101,9 @@ def log_fetch_request(logger: logging.Logger, method: str, url: str, entity_name
 
 def log_fetch_success(logger: logging.Logger, entity_name: str, payload: Any) -> None:
     """Log successful fetch from external source."""
-    sanitized_payload = _sanitize_for_logging(payload)
-    payload_preview = json.dumps(sanitized_payload, indent=2)[:300]
-    if len(json.dumps(sanitized_payload)) > 300:
-        payload_preview += "\n  ... (truncated)"
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    payload_preview = _preview(payload, 300)
     logger.info(f"[FETCH] OK Received data from {entity_name}:\n{payload_preview}")
 
 
@@ -105,19 +114,17 @@ def log_fetch_error(logger: logging.Logger, entity_name: str, status_code: int)
 
 def log_write_request(logger: logging.Logger, method: str, url: str, payload: Any) -> None:
     """Log write request to external target."""
-    sanitized_payload = _sanitize_for_logging(payload)
-    payload_preview = json.dumps(sanitized_payload, indent=2)[:300]
-    if len(json.dumps(sanitized_payload)) > 300:
-        payload_preview += "\n  ... (truncated)"
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    payload_preview = _preview(payload, 300)
     logger.info(f"[WRITE] -> {method} {url}\nPayload:\n{payload_preview}")
 
 
 def log_write_success(logger: logging.Logger, target_name: str, response: Any) -> None:
     """Log successful write to external target."""
-    sanitized_response = _sanitize_for_logging(response)
-    response_preview = json.dumps(sanitized_response, indent=2)[:300]
-    if len(json.dumps(sanitized_response)) > 300:
-        response_preview += "\n  ... (truncated)"
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    response_preview = _preview(response, 300)
     logger.info(f"[WRITE] OK Response from {target_name}:\n{response_preview}")
 
 
@@ -127,24 +134,64 @@ def log_write_error(logger: logging.Logger, target_name: str, status_code: int,
     logger.error(f"[WRITE] - Response: {response_text[:500]}")
 
 
+@lru_cache(maxsize=1024)
+def _referenced_names(code: types.CodeType) -> FrozenSet[str]:
+    """Names a compiled expression reads, including inside comprehensions and lambdas."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _referenced_names(const)
+    return frozenset(names)
+
+
+def _string_constants(code: types.CodeType) -> Set[str]:
+    consts = {const for const in code.co_consts if isinstance(const, str)}
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            consts |= _string_constants(const)
+    return consts
+
+
+@lru_cache(maxsize=1024)
+def _calls_impure(code: types.CodeType) -> bool:
+    """Whether a compiled expression calls a builtin tagged "impure" (now(), sample(), ...)."""
+    if "dsl_funcs" not in _referenced_names(code):
+        return False
+    from app.core.builtins.registry import IMPURE_FUNCTIONS
+
+    # Builtins are called as dsl_funcs['name'](...), so their names are constants
+    return not IMPURE_FUNCTIONS.isdisjoint(_string_constants(code))
+
+
 def transform_entity_data(
     entity_name: str,
     attributes: list,
     context: Dict[str, Any],
     safe_globals: Dict[str, Any],
     compile_safe_fn: callable,
-    logger: logging.Logger
+    logger: logging.Logger,
+    changed: Optional[Set[str]] = None,
+    cache: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Transform entity data by evaluating attribute expressions.
 
     Args:
         entity_name: Name of the entity being transformed
-        attributes: List of attribute configs with 'name' and 'expr' fields
+        attributes: List of attribute configs with 'name' and 'expr' fields.
+                    Configs marked 'temp' are shared subexpressions hoisted by the
+                    compiler: they are stored in the context, not in the entity,
+                    and their errors are reported against 'used_by'.
         context: Runtime context containing all entity data
         safe_globals: Safe globals for expression evaluation
         compile_safe_fn: Function to compile expressions safely
         logger: Logger instance for debug output
+        changed: Context names whose values changed since the previous call
+                 (stream joins). With `cache`, attributes that read none of
+                 them keep their previous value instead of being re-evaluated.
+                 Attributes calling impure builtins (now(), sample(), ...) are
+                 always re-evaluated.
+        cache: Attribute values of the previous call, updated in place
 
     Returns:
         Dictionary of transformed entity attributes
@@ -153,6 +200,9 @@ def transform_entity_data(
         HTTPException: If attribute evaluation fails
     """
     transformed_data: Dict[str, Any] = {}
+    incremental = changed is not None and cache is not None
+    if incremental:
+        changed = set(changed)
 
     # Add partial entity to context so attributes can reference earlier attributes
     # (e.g., LoginMatch.token can reference LoginMatch.user)
@@ -164,8 +214,24 @@ def transform_entity_data(
 
         try:
             compiled_expr = compile_safe_fn(attr_expr)
-            eval_globals = {**safe_globals, **context}
-            transformed_data[attr_name] = eval(compiled_expr, eval_globals, {})
+            if (
+                incremental
+                and attr_name in cache
+                and changed.isdisjoint(_referenced_names(compiled_expr))
+                and not _calls_impure(compiled_expr)
+            ):
+                value = cache[attr_name]
+            else:
+                eval_globals = {**safe_globals, **context}
+                value = eval(compiled_expr, eval_globals, {})
+                if incremental and (attr_name not in cache or cache[attr_name] != value):
+                    # Attributes reading this one (or the entity) are re-evaluated too
+                    cache[attr_name] = value
+                    changed.update((attr_name, entity_name))
+            if attr_config.get("temp"):
+                context[attr_name] = value
+                continue
+            transformed_data[attr_name] = value
             logger.debug(f"[TRANSFORM] - {entity_name}.{attr_name} computed successfully")
         except HTTPException:
             raise
@@ -184,6 +250,8 @@ def transform_entity_data(
                     detail=f"Request validation failed: required data '{missing_name}' not provided"
                 )
 
+            # A hoisted subexpression fails on behalf of the attribute that needs it
+            attr_name = attr_config.get("used_by", attr_name)
             logger.error(f"[TRANSFORM] - Error computing {entity_name}.{attr_name}: {eval_error}", exc_info=True)
             raise HTTPException(
                 status_code=500,
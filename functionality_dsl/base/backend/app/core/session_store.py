@@ -0,0 +1,262 @@
+"""
+Session store for validated credentials.
+
+Bearer tokens and API keys (including cookie-based sessions) are validated
+against the auth database on every request. The store sits in front of that
+lookup so a hot credential is resolved from process memory instead:
+
+- InMemorySessionStore: bounded LRU with per-entry TTL (front cache)
+- SQLiteSessionStore: local SQLite file in WAL mode, shared by workers on
+  the same host and surviving restarts
+- TieredSessionStore: LRU front backed by SQLite; writes reach SQLite
+  write-behind, flushed together with the expiry sweep
+
+Backend is selected with SESSION_STORE_BACKEND ("none", "memory", "sqlite");
+caching is off unless one is chosen. While a credential is cached it is not
+checked against the database again, so deactivating a key or token (or
+deleting its user) directly in the database takes effect only after
+SESSION_TTL_SECONDS. The generated auth modules' revoke_* helpers delete the
+cached entry as well and take effect at once.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger("fdsl.session_store")
+
+
+class SessionStore(ABC):
+    """Interface for session stores. Values must be JSON-serializable."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def sweep(self) -> int:
+        """Drop expired entries (and flush pending writes). Returns entries removed."""
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """Bounded LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def sweep(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (expires_at, _) in self._data.items() if expires_at <= now]
+            for k in expired:
+                del self._data[k]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Local SQLite store in WAL mode (concurrent readers, single writer)."""
+
+    def __init__(self, path: str, ttl: float = 300.0):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)"
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM sessions WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.set_many({key: (value, self.ttl if ttl is None else ttl)})
+
+    def set_many(self, items: Dict[str, Tuple[Any, float]]) -> None:
+        now = time.time()
+        rows = [(k, json.dumps(v), now + ttl) for k, (v, ttl) in items.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sessions (key, value, expires_at) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+
+    def sweep(self) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class TieredSessionStore(SessionStore):
+    """
+    LRU front cache over a persistent backend.
+
+    Reads hit the front first and fall back to the backend (populating the
+    front). Writes land in the front immediately and are queued for the
+    backend; the queue is flushed by sweep(). Deletes go straight through so
+    a revoked credential is never served from the backend afterwards.
+    """
+
+    def __init__(self, front: InMemorySessionStore, back: SQLiteSessionStore):
+        self.front = front
+        self.back = back
+        self._pending: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.front.get(key)
+        if value is not None:
+            return value
+        value = self.back.get(key)
+        if value is not None:
+            self.front.set(key, value)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.front.ttl if ttl is None else ttl
+        self.front.set(key, value, ttl)
+        with self._lock:
+            self._pending[key] = (value, ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+        self.front.delete(key)
+        self.back.delete(key)
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if pending:
+            self.back.set_many(pending)
+        return len(pending)
+
+    def sweep(self) -> int:
+        self.flush()
+        return self.front.sweep() + self.back.sweep()
+
+    def close(self) -> None:
+        self.flush()
+        self.back.close()
+
+
+_store: Optional[SessionStore] = None
+
+
+def _build_store() -> Optional[SessionStore]:
+    backend = settings.SESSION_STORE_BACKEND.lower()
+    ttl = float(settings.SESSION_TTL_SECONDS)
+    if backend == "none":
+        return None
+    front = InMemorySessionStore(max_entries=settings.SESSION_CACHE_SIZE, ttl=ttl)
+    if backend == "memory":
+        return front
+    if backend == "sqlite":
+        return TieredSessionStore(front, SQLiteSessionStore(settings.SESSION_STORE_PATH, ttl=ttl))
+    raise ValueError(f"Unknown SESSION_STORE_BACKEND: {settings.SESSION_STORE_BACKEND}")
+
+
+async def _sweep_loop(store: SessionStore, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            removed = await asyncio.to_thread(store.sweep)
+            if removed:
+                logger.debug("session_sweep", extra={"removed": removed})
+        except Exception as ex:
+            logger.warning("session_sweep_failed", extra={"err": repr(ex)})
+
+
+@asynccontextmanager
+async def lifespan_session_store() -> AsyncIterator[Optional[SessionStore]]:
+    """Create the configured store and run the expiry sweeper for the app lifetime."""
+    global _store
+    _store = _build_store()
+    if _store is None:
+        yield None
+        return
+
+    sweeper = asyncio.create_task(_sweep_loop(_store, float(settings.SESSION_SWEEP_INTERVAL)))
+    try:
+        yield _store
+    finally:
+        sweeper.cancel()
+        try:
+            await sweeper
+        except asyncio.CancelledError:
+            pass
+        _store.close()
+        _store = None
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """Return the active store, or None when disabled or before startup."""
+    return _store
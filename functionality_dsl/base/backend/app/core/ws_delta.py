@@ -0,0 +1,148 @@
+"""
+Delta frames for subscribe channels declared with `delta: patch` or `delta: keys`.
+
+Instead of the whole entity on every message, a channel in delta mode sends
+what changed since the previous frame:
+
+    {"$delta": "snapshot", "seq": 0, "data": {...}}             full state
+    {"$delta": "patch", "seq": 1, "patch": [...]}               RFC 6902 operations
+    {"$delta": "keys", "seq": 2, "set": {...}, "unset": [...]}  changed top-level keys
+
+The first frame, every WS_DELTA_SNAPSHOT_EVERY-th frame and any frame whose
+delta would not be smaller are snapshots, so a client that lost track
+resyncs. `seq` grows by one per frame and messages equal to the previous one
+are not sent at all. The frontend (src/lib/ws.ts) applies the frames and
+hands its listeners the full entity, exactly as without delta mode.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from app.core.json_codec import dumps
+
+DELTA_MODES = ("patch", "keys")
+
+# Most items dropped from the front and/or back of an array that are still
+# sent as removals (rolling chart windows) rather than replacing the array
+_MAX_SHIFT = 16
+
+
+def _same(a: Any, b: Any) -> bool:
+    """JSON equality: unlike ==, 1, 1.0 and True are different values."""
+    if type(a) is not type(b) or a != b:
+        return False
+    if isinstance(a, dict):
+        return all(_same(value, b[key]) for key, value in a.items())
+    if isinstance(a, (list, tuple)):
+        return all(_same(x, y) for x, y in zip(a, b))
+    return True
+
+
+def _pointer(path: str, key: Any) -> str:
+    token = str(key).replace("~", "~0").replace("/", "~1")
+    return f"{path}/{token}"
+
+
+def _list_patch(old: list, new: list, path: str) -> Optional[List[Dict[str, Any]]]:
+    """Operations for arrays that only shifted, grew or were truncated, or None."""
+    for shift in range(0, min(len(old), _MAX_SHIFT) + 1):
+        kept = len(old) - shift
+        if kept <= len(new):
+            if not _same(new[:kept], old[shift:]):
+                continue
+            ops = [{"op": "remove", "path": f"{path}/0"} for _ in range(shift)]
+            ops.extend({"op": "add", "path": f"{path}/-", "value": value} for value in new[kept:])
+            return ops
+        if shift + kept - len(new) > _MAX_SHIFT or not _same(old[shift:shift + len(new)], new):
+            continue
+        ops = [{"op": "remove", "path": f"{path}/0"} for _ in range(shift)]
+        ops.extend({"op": "remove", "path": f"{path}/{index}"} for index in range(kept - 1, len(new) - 1, -1))
+        return ops
+    return None
+
+
+def json_patch(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """RFC 6902 operations that turn `old` into `new` (both JSON-like)."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            elif not _same(old[key], value):
+                ops.extend(json_patch(old[key], value, _pointer(path, key)))
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        ops = _list_patch(old, new, path)
+        if ops is not None:
+            return ops
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+class DeltaEncoder:
+    """
+    Turns the messages of one subscriber (or a group fed the same frames)
+    into delta frames. encode() returns the serialized frame, or None when
+    the message equals the previous one.
+
+    Messages are kept by reference as the base of the next delta, so they
+    must not be mutated after being encoded.
+    """
+
+    def __init__(self, mode: str = "patch", snapshot_every: Optional[int] = None):
+        if mode not in DELTA_MODES:
+            raise ValueError(f"Unknown delta mode '{mode}' (expected one of {', '.join(DELTA_MODES)})")
+        if snapshot_every is None:
+            from app.core.config import settings
+
+            snapshot_every = settings.WS_DELTA_SNAPSHOT_EVERY
+        self.mode = mode
+        self.snapshot_every = max(1, snapshot_every)
+        self._last: Optional[Dict[str, Any]] = None
+        self._seq = -1
+        self._since_snapshot = 0
+
+    def reset(self):
+        """Start over: the next frame is a snapshot."""
+        self._last = None
+
+    def encode(self, message: Any) -> Optional[str]:
+        previous = self._last
+        if previous is not None and _same(message, previous):
+            return None
+
+        self._seq += 1
+        self._last = message if isinstance(message, dict) else None
+        if previous is None or self._last is None or self._since_snapshot >= self.snapshot_every - 1:
+            self._since_snapshot = 0
+            return self._snapshot(message)
+
+        if self.mode == "patch":
+            changes = json_patch(previous, message)
+            frame = dumps({"$delta": "patch", "seq": self._seq, "patch": changes})
+        else:
+            changes = [key for key, value in message.items() if key not in previous or not _same(previous[key], value)]
+            unset = [key for key in previous if key not in message]
+            frame = dumps({
+                "$delta": "keys",
+                "seq": self._seq,
+                "set": {key: message[key] for key in changes},
+                "unset": unset,
+            })
+            changes += unset
+
+        # Most of the entity changed: the snapshot may well be smaller
+        if 2 * len(changes) > len(message):
+            snapshot = self._snapshot(message)
+            if len(snapshot) <= len(frame):
+                self._since_snapshot = 0
+                return snapshot
+
+        self._since_snapshot += 1
+        return frame
+
+    def _snapshot(self, message: Any) -> str:
+        return dumps({"$delta": "snapshot", "seq": self._seq, "data": message})
@@ -0,0 +1,169 @@
+"""
+Subscriber filters for subscribe channels declared with `filters: [...]`.
+
+A subscriber picks the messages it receives with query parameters on the
+fields the entity declares:
+
+    ?symbol=AAPL                 equality
+    ?symbol=AAPL,MSFT            set membership
+    ?price.gte=10&price.lt=20    range (gt, gte, lt, lte; numeric)
+
+Values are compared as text, the way they appear in a URL (booleans as
+true/false). A message without a filtered field matches no filter on it.
+
+Filters of all subscribers of a channel are kept in a SubscriptionIndex
+(field -> value -> subscribers), so a message is dispatched with one hash
+lookup per indexed field instead of being checked against every subscriber.
+"""
+
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Mapping, Set, Tuple
+
+_RANGE_OPS = {
+    "gt": lambda value, bound: value > bound,
+    "gte": lambda value, bound: value >= bound,
+    "lt": lambda value, bound: value < bound,
+    "lte": lambda value, bound: value <= bound,
+}
+
+
+def _text(value: Any) -> str:
+    """A field value as it is written in a query parameter."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class SubscriptionFilter:
+    """The filter of one subscriber: accepted values and ranges per field."""
+
+    def __init__(
+        self,
+        values: Dict[str, FrozenSet[str]] = None,
+        ranges: List[Tuple[str, str, float]] = None,
+    ):
+        self.values = values or {}
+        self.ranges = ranges or []
+
+    @classmethod
+    def from_query(cls, params: Mapping[str, str], fields: Iterable[str]) -> "SubscriptionFilter":
+        """
+        Build a filter from query parameters, ignoring fields not in `fields`.
+
+        Raises:
+            ValueError: If a range bound is not a number
+        """
+        values = {}
+        ranges = []
+        for field in fields:
+            raw = params.get(field)
+            if raw:
+                values[field] = frozenset(part.strip() for part in raw.split(","))
+            for op in _RANGE_OPS:
+                bound = params.get(f"{field}.{op}")
+                if bound is None:
+                    continue
+                try:
+                    ranges.append((field, op, float(bound)))
+                except ValueError:
+                    raise ValueError(f"Filter '{field}.{op}' must be a number, got '{bound}'")
+        return cls(values, ranges)
+
+    def __bool__(self) -> bool:
+        return bool(self.values or self.ranges)
+
+    def __repr__(self) -> str:
+        return f"SubscriptionFilter(values={self.values}, ranges={self.ranges})"
+
+    def matches(self, message: Any) -> bool:
+        if not self:
+            return True
+        if not isinstance(message, dict):
+            return False
+        for field, accepted in self.values.items():
+            if field not in message or _text(message[field]) not in accepted:
+                return False
+        for field, op, bound in self.ranges:
+            value = message.get(field)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return False
+            if not _RANGE_OPS[op](value, bound):
+                return False
+        return True
+
+
+class SubscriptionIndex:
+    """
+    Subscribers of one channel, indexed by their filters.
+
+    A subscriber with equality or set filters is indexed under the accepted
+    values of one of those fields; the rest of its filter is checked only
+    when that lookup hits. Subscribers without filters get every message;
+    only those with range filters alone are checked one by one.
+    """
+
+    def __init__(self):
+        self._filters: Dict[Hashable, SubscriptionFilter] = {}
+        # field -> value text -> subscribers
+        self._by_value: Dict[str, Dict[str, Set[Hashable]]] = {}
+        self._unfiltered: Set[Hashable] = set()
+        self._unindexed: Set[Hashable] = set()
+
+    def __len__(self) -> int:
+        return len(self._filters)
+
+    def __iter__(self):
+        return iter(self._filters)
+
+    def add(self, subscriber: Hashable, subscription_filter: SubscriptionFilter = None):
+        subscription_filter = subscription_filter or SubscriptionFilter()
+        self._filters[subscriber] = subscription_filter
+        if not subscription_filter:
+            self._unfiltered.add(subscriber)
+            return
+        if not subscription_filter.values:
+            self._unindexed.add(subscriber)
+            return
+        field, accepted = next(iter(subscription_filter.values.items()))
+        by_value = self._by_value.setdefault(field, {})
+        for value in accepted:
+            by_value.setdefault(value, set()).add(subscriber)
+
+    def remove(self, subscriber: Hashable):
+        subscription_filter = self._filters.pop(subscriber, None)
+        if subscription_filter is None:
+            return
+        if not subscription_filter:
+            self._unfiltered.discard(subscriber)
+            return
+        if not subscription_filter.values:
+            self._unindexed.discard(subscriber)
+            return
+        field, accepted = next(iter(subscription_filter.values.items()))
+        by_value = self._by_value[field]
+        for value in accepted:
+            subscribers = by_value[value]
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del by_value[value]
+        if not by_value:
+            del self._by_value[field]
+
+    def match(self, message: Any) -> List[Hashable]:
+        """Subscribers whose filter accepts `message`."""
+        matched = list(self._unfiltered)
+        matched.extend(s for s in self._unindexed if self._filters[s].matches(message))
+        if not self._by_value or not isinstance(message, dict):
+            return matched
+        for field, by_value in self._by_value.items():
+            if field not in message:
+                continue
+            for subscriber in by_value.get(_text(message[field]), ()):
+                subscription_filter = self._filters[subscriber]
+                # The indexed field matched; check any other fields and ranges
+                if len(subscription_filter.values) == 1 and not subscription_filter.ranges:
+                    matched.append(subscriber)
+                elif subscription_filter.matches(message):
+                    matched.append(subscriber)
+        return matched
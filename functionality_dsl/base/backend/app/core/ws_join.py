@@ -0,0 +1,286 @@
+"""
+Stream join for subscribe channels composed from several WebSocket sources.
+
+Each source is read by its own task; a single join task decides when the
+joined state is emitted:
+
+    join: latest       on every message, once each source has sent one
+    join: zip          when every source has sent a new message (the n-th
+                       messages of all sources are joined together)
+    join: window       like latest, but only while the latest message of
+                       every source is at most joinWindowMs old
+
+For latest and window the readers only record the latest message per source
+and wake the join task, which transforms the current state: messages that
+arrive while a transform runs are coalesced, so a fast source costs nothing
+but the final state. For zip every message counts, so each source has a
+queue of max_pending messages; a source that gets that far ahead of the
+others waits for them.
+
+The transform runs once per emitted state for all subscribers of the channel
+(and source params), not once per connection, and is told which sources
+changed so it can reuse the attributes that do not depend on them. Results
+are dispatched through the channel's SubscriptionIndex to the queues of the
+subscribers whose filter accepts them; each connection sends from its own
+task, so a slow client never holds up the sources or other clients.
+
+A source whose reader fails (its upstream link gave up reconnecting) stops
+the join: the subscribers get the error and then the end of their stream,
+and the join leaves the registry, so the next subscriber starts a fresh one.
+
+Channels with a single source run through a join as well, so they too are
+read and transformed once for all subscribers. A channel with `replay:` also
+hands every result to its ReplayBuffer (app.core.ws_replay); a subscriber
+asking for a replay gets the buffered frames taken at the moment it joins,
+so nothing is missed or sent twice between the replay and the live stream.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+from app.core.ws_filter import SubscriptionFilter, SubscriptionIndex
+from app.core.ws_replay import ReplayBuffer, release_replay_buffer
+
+logger = logging.getLogger("fdsl.ws.join")
+
+JOIN_MODES = ("latest", "zip", "window")
+
+# Channel joins with at least one subscriber, by channel and source params
+_joins: Dict[Hashable, "StreamJoin"] = {}
+
+
+class JoinError:
+    """
+    Delivered to subscribers in place of a message when a source or the transform fails.
+    `fatal` is set when a source failed: the join has stopped and no message follows.
+    """
+
+    def __init__(self, source: str, error: Exception, fatal: bool = False):
+        self.source = source
+        self.error = error
+        self.fatal = fatal
+
+
+class JoinSubscription:
+    """One subscriber's view of a StreamJoin: async-iterates the joined messages."""
+
+    def __init__(self, join: "StreamJoin", max_pending: int):
+        self._join = join
+        self._queue: Deque[Any] = deque(maxlen=max_pending)
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.dropped = 0
+        # Buffered (received at, frame) pairs requested on subscribe
+        self.replayed: List[Tuple[float, str]] = []
+
+    def _push(self, message: Any):
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(message)
+        self._ready.set()
+
+    def _close(self):
+        self._closed = True
+        self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        while not self._queue:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+        return self._queue.popleft()
+
+    async def __aenter__(self) -> "JoinSubscription":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._join._remove(self)
+
+
+class StreamJoin:
+    """
+    Joins several sources into one stream of transformed messages.
+
+    Args:
+        key: Registry key (see get_join)
+        sources: Source name -> factory returning the source's async iterator
+        transform: Called as transform(state, changed, cache) with the latest
+            message per source, the names of the sources that changed since
+            the previous call and a dict the transform may keep values in
+            between calls; returns the message sent to subscribers
+        mode: One of JOIN_MODES
+        window_ms: Maximum message age for mode "window"
+        max_pending: Messages kept per subscriber (and per source for "zip")
+        replay: Buffer keeping the channel's recent messages for late joiners
+    """
+
+    def __init__(
+        self,
+        key: Hashable,
+        sources: Dict[str, Callable[[], AsyncIterator[Any]]],
+        transform: Callable[[Dict[str, Any], Set[str], Dict[str, Any]], Awaitable[Any]],
+        *,
+        mode: str = "latest",
+        window_ms: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        replay: Optional[ReplayBuffer] = None,
+    ):
+        if mode not in JOIN_MODES:
+            raise ValueError(f"Unknown join mode '{mode}' (expected one of {', '.join(JOIN_MODES)})")
+        if mode == "window" and not window_ms:
+            raise ValueError("Join mode 'window' needs window_ms")
+        if max_pending is None:
+            from app.core.config import settings
+
+            max_pending = settings.WS_OUTBOX_MAX_PENDING
+        self.key = key
+        self.mode = mode
+        self._sources = sources
+        self._transform = transform
+        self._window = (window_ms or 0) / 1000.0
+        self._max_pending = max(1, max_pending)
+        self._replay = replay
+
+        self._latest: Dict[str, Any] = {}
+        self._received_at: Dict[str, float] = {}
+        self._unzipped: Dict[str, asyncio.Queue] = {}
+        if mode == "zip":
+            self._unzipped = {name: asyncio.Queue(maxsize=self._max_pending) for name in sources}
+        self._changed: Set[str] = set()
+        self._cache: Dict[str, Any] = {}
+
+        self._wakeup = asyncio.Event()
+        self._failure: Optional[JoinError] = None
+        self._subscribers = SubscriptionIndex()
+        self._tasks = []
+
+    def subscribe(
+        self,
+        subscription_filter: Optional[SubscriptionFilter] = None,
+        replay: Optional[Tuple[Optional[int], Optional[float]]] = None,
+    ) -> JoinSubscription:
+        """
+        Add a subscriber (use as `async with join.subscribe() as messages`);
+        starts the join. Only messages accepted by `subscription_filter` are
+        delivered to it; errors always are. With `replay` (count, seconds) the
+        matching buffered frames are put in `subscription.replayed`.
+        """
+        subscription = JoinSubscription(self, self._max_pending)
+        if replay is not None and self._replay is not None:
+            subscription.replayed = self._replay.frames(*replay, subscription_filter=subscription_filter)
+        self._subscribers.add(subscription, subscription_filter)
+        if not self._tasks:
+            loop = asyncio.get_running_loop()
+            self._tasks = [loop.create_task(self._read(name, factory)) for name, factory in self._sources.items()]
+            self._tasks.append(loop.create_task(self._run()))
+            logger.info(f"Join {self.key} started ({self.mode}, sources: {', '.join(self._sources)})")
+        return subscription
+
+    def _remove(self, subscription: JoinSubscription):
+        self._subscribers.remove(subscription)
+        if len(self._subscribers) or not self._tasks:
+            return
+        # Last subscriber gone: stop reading the sources
+        self._stop()
+        logger.info(f"Join {self.key} stopped")
+
+    def _stop(self):
+        """Cancel the source readers and the join task, and leave the registry."""
+        current = asyncio.current_task()
+        for task in self._tasks:
+            if task is not current:
+                task.cancel()
+        self._tasks = []
+        if _joins.get(self.key) is self:
+            del _joins[self.key]
+        if self._replay is not None:
+            release_replay_buffer(self._replay)
+
+    async def _read(self, name: str, factory: Callable[[], AsyncIterator[Any]]):
+        loop = asyncio.get_running_loop()
+        try:
+            async for message in factory():
+                if message is None:
+                    continue
+                if self._unzipped:
+                    await self._unzipped[name].put(message)
+                else:
+                    self._latest[name] = message
+                    self._received_at[name] = loop.time()
+                    self._changed.add(name)
+                self._wakeup.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error in {name} subscription: {e}")
+            self._failure = JoinError(name, e, fatal=True)
+            self._wakeup.set()
+
+    def _broadcast(self, message: Any):
+        for subscription in self._subscribers:
+            subscription._push(message)
+
+    def _dispatch(self, message: Any):
+        if self._replay is not None:
+            self._replay.append(message)
+        for subscription in self._subscribers.match(message):
+            subscription._push(message)
+
+    def _ready(self, now: float) -> bool:
+        """True when the current state of a latest/window join should be emitted."""
+        if not self._changed or len(self._latest) < len(self._sources):
+            return False
+        if self.mode == "window":
+            return now - min(self._received_at.values()) <= self._window
+        return True
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            if self._unzipped:
+                while all(not pending.empty() for pending in self._unzipped.values()):
+                    for name, pending in self._unzipped.items():
+                        self._latest[name] = pending.get_nowait()
+                    await self._emit(set(self._sources))
+            elif self._ready(loop.time()):
+                changed, self._changed = self._changed, set()
+                await self._emit(changed)
+
+            if self._failure is not None:
+                # A source failed: end every subscription, the next subscriber starts a fresh join
+                self._stop()
+                self._broadcast(self._failure)
+                for subscription in self._subscribers:
+                    subscription._close()
+                logger.info(f"Join {self.key} stopped after {self._failure.source} failed")
+                return
+
+    async def _emit(self, changed: Set[str]):
+        try:
+            result = await self._transform(dict(self._latest), changed, self._cache)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Join {self.key} transform failed: {e}")
+            # Everything is recomputed next time
+            self._cache.clear()
+            self._broadcast(JoinError(", ".join(sorted(changed)), e))
+            return
+        self._dispatch(result)
+
+
+def get_join(key: Hashable, factory: Callable[[], StreamJoin]) -> StreamJoin:
+    """The running join for `key` (channel and source params), created by `factory` if there is none."""
+    join = _joins.get(key)
+    if join is None:
+        join = _joins[key] = factory()
+    return join
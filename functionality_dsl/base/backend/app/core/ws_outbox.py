@@ -0,0 +1,149 @@
+"""
+Rate control for subscribe channels declared with `maxRate:`, `conflate:` or
+`batchMs:`.
+
+Without these options a channel forwards every upstream message as soon as
+it is transformed. With them, messages are handed to a ChannelOutbox, which
+decouples the upstream reader from the client socket:
+
+    maxRate: 30        at most 30 frames per second; while waiting, only the
+                       latest message is kept (or the latest per key)
+    conflate: symbol   latest-value-wins per `symbol`: a message replaces the
+                       pending one with the same key, keeping its place in line
+    batchMs: 100       messages are collected for 100 ms and sent as one
+                       {"$batch": [...]} frame (src/lib/ws.ts unpacks it)
+
+The options combine: `conflate: symbol` with `batchMs: 100` sends, every
+100 ms, a batch holding the latest message of each symbol that changed.
+put() never waits on the client, so a slow browser cannot stall the upstream
+feed; the pending set is bounded by WS_OUTBOX_MAX_PENDING (oldest dropped).
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger("fdsl.ws.outbox")
+
+# Pending key of channels that keep only the latest message (maxRate alone)
+_LATEST = object()
+
+
+class ChannelOutbox:
+    """
+    Per-subscriber send queue. put() stores a message; a background task
+    (start() / close()) sends it through `send` as pacing allows.
+
+    `send` receives one message per call, or a list of messages when
+    batching. An exception raised by `send` (e.g. the client disconnected)
+    stops the outbox and is re-raised by the next put().
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Any], Awaitable[None]],
+        *,
+        max_rate: Optional[float] = None,
+        conflate: Optional[str] = None,
+        batch_ms: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        if max_pending is None:
+            from app.core.config import settings
+
+            max_pending = settings.WS_OUTBOX_MAX_PENDING
+        self._send = send
+        self._interval = 1.0 / max_rate if max_rate else 0.0
+        self._window = batch_ms / 1000.0 if batch_ms else 0.0
+        self._conflate = conflate
+        self._max_pending = max(1, max_pending)
+
+        # Keyed (latest-value-wins) unless every message of a window is sent
+        self._keyed = conflate is not None or not self._window
+        self._pending: Dict[Any, Any] = {}
+        self._queue: Deque[Any] = deque(maxlen=self._max_pending)
+
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._next_send = 0.0
+
+        self.sent = 0
+        self.superseded = 0
+        self.dropped = 0
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def close(self):
+        """Stop sending; pending messages are discarded."""
+        if self._task is not None:
+            self._task.cancel()
+        if self.superseded or self.dropped:
+            logger.debug(
+                f"Outbox closed: {self.sent} frames sent, {self.superseded} messages superseded, "
+                f"{self.dropped} dropped"
+            )
+
+    def put(self, message: Any):
+        if self._task is not None and self._task.done() and not self._task.cancelled():
+            # The sender failed: surface it to the producer (re-raises)
+            self._task.result()
+
+        if self._keyed:
+            key = self._key(message)
+            if key in self._pending:
+                self.superseded += 1
+            elif len(self._pending) >= self._max_pending:
+                del self._pending[next(iter(self._pending))]
+                self.dropped += 1
+            self._pending[key] = message
+        else:
+            if len(self._queue) == self._max_pending:
+                self.dropped += 1
+            self._queue.append(message)
+        self._ready.set()
+
+    def _key(self, message: Any) -> Any:
+        if self._conflate is None:
+            return _LATEST
+        if isinstance(message, dict):
+            return message.get(self._conflate)
+        return None
+
+    def _has_pending(self) -> bool:
+        return bool(self._pending) if self._keyed else bool(self._queue)
+
+    def _take(self):
+        """Next frame: everything pending when batching, else the oldest message."""
+        if self._window:
+            if self._keyed:
+                batch = list(self._pending.values())
+                self._pending.clear()
+            else:
+                batch = list(self._queue)
+                self._queue.clear()
+            return batch
+        return self._pending.pop(next(iter(self._pending)))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._ready.wait()
+            if self._window:
+                # Collect the rest of the window
+                await asyncio.sleep(self._window)
+            if self._interval:
+                delay = self._next_send - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            frame = self._take()
+            if not self._has_pending():
+                self._ready.clear()
+            await self._send(frame)
+            self.sent += 1
+
+            if self._interval:
+                self._next_send = loop.time() + self._interval
@@ -0,0 +1,190 @@
+"""
+Replay buffers for subscribe channels declared with `replay:`.
+
+A channel with a replay buffer keeps its most recent messages, so a client
+that connects mid-stream (or a LiveChart that just mounted) can start from
+recent history instead of waiting for the next upstream message:
+
+    replay: 500        the last 500 messages
+    replay: 300s       the messages of the last 300 seconds (also 5m, 1h)
+
+Clients opt in with a query parameter of the same form, bounded by what the
+channel keeps:
+
+    /ws/ticker?replay=100      the last 100 buffered messages
+    /ws/ticker?replay=60s      the buffered messages of the last minute
+
+Messages are serialized once when they are buffered and stored as text
+frames, and are replayed from memory, so late joiners cost no upstream
+traffic. The replay is sent as one frame before the live stream:
+
+    {"$replay": [message, ...], "at": [epoch_ms, ...]}
+
+with the time each message was received; the frontend (src/lib/ws.ts) hands
+the messages to its listeners one by one. Subscriber filters apply to the
+replay as they do to live messages. Binary messages are not buffered.
+
+A buffer belongs to a channel (and its source params) and outlives the
+channel's join by WS_REPLAY_GRACE_SECONDS, so a page reload still finds it.
+Source params come from clients, so the buffers are bounded too: expired
+buffers are dropped whenever a join starts or stops, and beyond
+WS_REPLAY_MAX_BUFFERS the least recently used ones go first (those without a
+join before those with one). Every buffer is bounded by WS_REPLAY_MAX_FRAMES
+as well.
+"""
+
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from app.core.json_codec import dumps
+from app.core.ws_filter import SubscriptionFilter
+
+_BINARY_TYPES = (bytes, bytearray, memoryview)
+_WINDOW = re.compile(r"^(\d+)([smh]?)$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600}
+
+# Replay buffers by channel and source params, least recently used first
+_buffers: "OrderedDict[Hashable, ReplayBuffer]" = OrderedDict()
+
+
+def parse_window(text: str) -> Tuple[Optional[int], Optional[float]]:
+    """
+    Parse a replay window: "500" -> (500, None), "300s" / "5m" / "1h" -> (None, seconds).
+
+    Raises:
+        ValueError: If `text` is neither a count nor a duration
+    """
+    match = _WINDOW.match(text.strip())
+    if not match:
+        raise ValueError(f"Replay must be a message count or a duration like 300s, 5m or 1h, got '{text}'")
+    value, unit = match.groups()
+    if not unit:
+        return int(value), None
+    return None, float(int(value) * _UNIT_SECONDS[unit])
+
+
+def _is_binary(message: Any) -> bool:
+    if isinstance(message, _BINARY_TYPES):
+        return True
+    return isinstance(message, dict) and any(isinstance(value, _BINARY_TYPES) for value in message.values())
+
+
+class ReplayBuffer:
+    """
+    The recent messages of one channel as pre-serialized frames.
+
+    Args:
+        count: Messages kept (None = bounded by age and WS_REPLAY_MAX_FRAMES only)
+        seconds: Maximum message age (None = bounded by count only)
+        fields: Filter fields whose values are kept next to each frame, so
+            subscriber filters can be applied on replay
+        max_frames: Overrides WS_REPLAY_MAX_FRAMES
+    """
+
+    def __init__(
+        self,
+        count: Optional[int] = None,
+        seconds: Optional[float] = None,
+        *,
+        fields: Iterable[str] = (),
+        max_frames: Optional[int] = None,
+    ):
+        if max_frames is None:
+            from app.core.config import settings
+
+            max_frames = settings.WS_REPLAY_MAX_FRAMES
+        max_frames = max(1, max_frames)
+        # When the last join writing to the buffer stopped (None while one runs)
+        self.released_at: Optional[float] = None
+        self._seconds = seconds
+        self._fields = tuple(fields)
+        # (received at, JSON text, filter field values)
+        self._frames: Deque[Tuple[float, str, Optional[Dict[str, Any]]]] = deque(
+            maxlen=min(count, max_frames) if count else max_frames
+        )
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def append(self, message: Any, now: Optional[float] = None):
+        """Buffer a message sent to the channel's subscribers."""
+        if message is None or _is_binary(message):
+            return
+        now = time.time() if now is None else now
+        values = None
+        if self._fields and isinstance(message, dict):
+            values = {field: message[field] for field in self._fields if field in message}
+        self._frames.append((now, dumps(message), values))
+        self._expire(now)
+
+    def _expire(self, now: float):
+        if self._seconds is None:
+            return
+        cutoff = now - self._seconds
+        while self._frames and self._frames[0][0] < cutoff:
+            self._frames.popleft()
+
+    def frames(
+        self,
+        count: Optional[int] = None,
+        seconds: Optional[float] = None,
+        subscription_filter: Optional[SubscriptionFilter] = None,
+        now: Optional[float] = None,
+    ) -> List[Tuple[float, str]]:
+        """The buffered (received at, frame) pairs within `count` / `seconds`, oldest first."""
+        now = time.time() if now is None else now
+        self._expire(now)
+        cutoff = now - seconds if seconds is not None else None
+        selected = []
+        # Newest first, so a count stops the scan early
+        for received_at, frame, values in reversed(self._frames):
+            if cutoff is not None and received_at < cutoff:
+                break
+            if subscription_filter and not subscription_filter.matches(values or {}):
+                continue
+            selected.append((received_at, frame))
+            if count is not None and len(selected) >= count:
+                break
+        selected.reverse()
+        return selected
+
+
+def replay_frame(frames: List[Tuple[float, str]]) -> str:
+    """One text frame carrying replayed frames and their receive times (epoch ms)."""
+    messages = ",".join(frame for _, frame in frames)
+    received = ",".join(str(int(received_at * 1000)) for received_at, _ in frames)
+    return f'{{"$replay":[{messages}],"at":[{received}]}}'
+
+
+def _evict(now: float):
+    from app.core.config import settings
+
+    grace = settings.WS_REPLAY_GRACE_SECONDS
+    for key, buffer in list(_buffers.items()):
+        if buffer.released_at is not None and now - buffer.released_at >= grace:
+            del _buffers[key]
+    max_buffers = max(1, settings.WS_REPLAY_MAX_BUFFERS)
+    while len(_buffers) > max_buffers:
+        released = (key for key, buffer in _buffers.items() if buffer.released_at is not None)
+        del _buffers[next(released, next(iter(_buffers)))]
+
+
+def get_replay_buffer(key: Hashable, count: Optional[int] = None, seconds: Optional[float] = None,
+                      fields: Iterable[str] = (), now: Optional[float] = None) -> ReplayBuffer:
+    """The replay buffer of `key` (channel and source params) for a starting join, created on first use."""
+    buffer = _buffers.pop(key, None)
+    if buffer is None:
+        buffer = ReplayBuffer(count, seconds, fields=fields)
+    buffer.released_at = None
+    _buffers[key] = buffer
+    _evict(time.time() if now is None else now)
+    return buffer
+
+
+def release_replay_buffer(buffer: ReplayBuffer, now: Optional[float] = None):
+    """Called when the join writing to `buffer` stops: it is dropped after WS_REPLAY_GRACE_SECONDS."""
+    now = time.time() if now is None else now
+    buffer.released_at = now
+    _evict(now)
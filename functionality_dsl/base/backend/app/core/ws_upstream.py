@@ -0,0 +1,251 @@
+"""
+Resilient connections to upstream WebSocket sources.
+
+UpstreamLink keeps one subscription to an external feed alive: when the
+connection drops it reconnects with exponential backoff and full jitter (so
+restarts of a shared feed do not reconnect in lockstep), sends the source's
+subscription messages again and carries on yielding messages. Liveness is
+checked with WebSocket ping/pong; a peer that stops answering is treated as
+disconnected. The channel join reading the source simply sees a pause, so
+downstream clients stay connected.
+
+Only the first connection fails fast (a wrong URL or credentials surface
+immediately); after that, reconnects are retried WS_SOURCE_MAX_RETRIES times
+in a row (0 = forever). A connection only ends the run of retries once it
+delivers a message or stays up for WS_SOURCE_RECONNECT_MAX seconds, so a
+flapping upstream that accepts and drops connections keeps backing off.
+
+Subscription messages are filled in with the source params by
+format_subscribe_message(), which keeps client-supplied values from changing
+the structure of a JSON message.
+
+Every link records its gaps (time without a connection) in UpstreamStats;
+upstream_stats() reports them per source and is included in /healthz.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.json_codec import JSONDecodeError, dumps, loads
+
+logger = logging.getLogger("fdsl.ws.upstream")
+
+# Stats of every link created in this process, by source name
+_stats: Dict[str, List["UpstreamStats"]] = {}
+
+
+class UpstreamStats:
+    """Connection history of one upstream link."""
+
+    def __init__(self):
+        self.connected = False
+        self.connects = 0
+        self.messages = 0
+        self.gaps = 0
+        self.last_gap_seconds = 0.0
+        self.total_gap_seconds = 0.0
+        self.max_gap_seconds = 0.0
+        self.last_error: Optional[str] = None
+        self._disconnected_at: Optional[float] = None
+
+    def on_connect(self):
+        self.connected = True
+        self.connects += 1
+        if self._disconnected_at is not None:
+            gap = time.monotonic() - self._disconnected_at
+            self.gaps += 1
+            self.last_gap_seconds = gap
+            self.total_gap_seconds += gap
+            self.max_gap_seconds = max(self.max_gap_seconds, gap)
+            self._disconnected_at = None
+
+    def on_disconnect(self, error: Optional[BaseException] = None):
+        self.connected = False
+        self._disconnected_at = time.monotonic()
+        if error is not None:
+            self.last_error = repr(error)
+
+    def as_dict(self) -> Dict[str, Any]:
+        current_gap = 0.0
+        if self._disconnected_at is not None:
+            current_gap = time.monotonic() - self._disconnected_at
+        return {
+            "connected": self.connected,
+            "connects": self.connects,
+            "messages": self.messages,
+            "gaps": self.gaps,
+            "current_gap_seconds": round(current_gap, 3),
+            "last_gap_seconds": round(self.last_gap_seconds, 3),
+            "max_gap_seconds": round(self.max_gap_seconds, 3),
+            "total_gap_seconds": round(self.total_gap_seconds, 3),
+            "last_error": self.last_error,
+        }
+
+
+def upstream_stats() -> Dict[str, List[Dict[str, Any]]]:
+    """Stats of the open upstream links, by source name."""
+    return {name: [stats.as_dict() for stats in links] for name, links in _stats.items() if links}
+
+
+def backoff_delay(attempt: int, initial: float, maximum: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(maximum, initial * 2**attempt)]."""
+    return random.uniform(0, min(maximum, initial * (2 ** attempt)))
+
+
+class UpstreamLink:
+    """
+    A reconnecting subscription to one upstream WebSocket.
+
+    Args:
+        name: Source name (logs and stats)
+        connect: Opens the connection (e.g. `lambda: websockets.connect(url, ...)`);
+            pass ping_interval/ping_timeout from ping_options() for liveness
+        on_connect: Called with each new connection before messages are read
+            (sends the subscription messages)
+        max_retries, initial_delay, max_delay: Override the WS_SOURCE_* settings
+    """
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], Awaitable[Any]],
+        *,
+        on_connect: Optional[Callable[[Any], Awaitable[None]]] = None,
+        max_retries: Optional[int] = None,
+        initial_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+    ):
+        if max_retries is None or initial_delay is None or max_delay is None:
+            from app.core.config import settings
+
+            if max_retries is None:
+                max_retries = settings.WS_SOURCE_MAX_RETRIES
+            if initial_delay is None:
+                initial_delay = settings.WS_SOURCE_RECONNECT_INITIAL
+            if max_delay is None:
+                max_delay = settings.WS_SOURCE_RECONNECT_MAX
+        self.name = name
+        self._connect = connect
+        self._on_connect = on_connect
+        self._max_retries = max_retries
+        self._initial_delay = initial_delay
+        self._max_delay = max_delay
+        self.connection = None
+        self.stats = UpstreamStats()
+
+    async def messages(self) -> AsyncIterator[Any]:
+        """Yield raw frames (str or bytes) across reconnects."""
+        links = _stats.setdefault(self.name, [])
+        links.append(self.stats)
+        attempt = 0
+        try:
+            while True:
+                try:
+                    self.connection = await self._connect()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if not self.stats.connects:
+                        raise
+                    attempt = await self._wait_before_retry(attempt, e)
+                    continue
+
+                connected_at = time.monotonic()
+                try:
+                    if self._on_connect is not None:
+                        await self._on_connect(self.connection)
+                    self.stats.on_connect()
+                    if self.stats.gaps:
+                        logger.info(
+                            f"Reconnected to {self.name} after {self.stats.last_gap_seconds:.2f}s "
+                            f"(gap {self.stats.gaps})"
+                        )
+                    async for message in self.connection:
+                        # The link works again: the next drop starts a new run of retries
+                        attempt = 0
+                        self.stats.messages += 1
+                        yield message
+                    # The server closed the connection: reconnect as well
+                    self.stats.on_disconnect()
+                    logger.warning(f"Upstream {self.name} closed the connection")
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Includes ping timeouts (the connection is closed by the client library)
+                    self.stats.on_disconnect(e)
+                    logger.warning(f"Upstream {self.name} connection lost: {e}")
+                finally:
+                    await self._close()
+                if time.monotonic() - connected_at >= self._max_delay:
+                    attempt = 0
+                attempt = await self._wait_before_retry(attempt, None)
+        finally:
+            self.connection = None
+            links.remove(self.stats)
+
+    async def _wait_before_retry(self, attempt: int, error: Optional[Exception]) -> int:
+        if error is not None:
+            self.stats.last_error = repr(error)
+        if self._max_retries and attempt >= self._max_retries:
+            raise ConnectionError(
+                f"Upstream {self.name} unavailable after {attempt} reconnect attempts: {self.stats.last_error}"
+            )
+        delay = backoff_delay(attempt, self._initial_delay, self._max_delay)
+        logger.info(f"Reconnecting to {self.name} in {delay:.2f}s (attempt {attempt + 1})")
+        await asyncio.sleep(delay)
+        return attempt + 1
+
+    async def _close(self):
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                await connection.close()
+            except Exception:
+                pass
+
+
+def ping_options() -> Dict[str, Optional[float]]:
+    """Keyword arguments for websockets.connect() enabling ping/pong liveness checks."""
+    from app.core.config import settings
+
+    interval = settings.WS_SOURCE_PING_INTERVAL or None
+    return {"ping_interval": interval, "ping_timeout": settings.WS_SOURCE_PING_TIMEOUT if interval else None}
+
+
+def _fill(text: str, placeholders: Dict[str, str]) -> str:
+    for placeholder, value in placeholders.items():
+        text = text.replace(placeholder, value)
+    return text
+
+
+def _fill_json(value: Any, placeholders: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        return _fill(value, placeholders)
+    if isinstance(value, dict):
+        return {_fill(key, placeholders): _fill_json(item, placeholders) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill_json(item, placeholders) for item in value]
+    return value
+
+
+def format_subscribe_message(message: str, params: Optional[Dict[str, Any]]) -> str:
+    """
+    Substitute the {param} placeholders of a subscription message.
+
+    A JSON message is filled in inside its strings (keys and values) and
+    serialized again, so a value with quotes or backslashes stays one string.
+    Any other message is filled in as text with the values JSON-escaped.
+    """
+    if not params or "{" not in message:
+        return message
+    try:
+        parsed = loads(message)
+    except JSONDecodeError:
+        # e.g. a placeholder outside a JSON string: escaped values cannot close a string
+        escaped = {"{" + name + "}": dumps(str(value))[1:-1] for name, value in params.items()}
+        return _fill(message, escaped)
+    placeholders = {"{" + name + "}": str(value) for name, value in params.items()}
+    return dumps(_fill_json(parsed, placeholders))
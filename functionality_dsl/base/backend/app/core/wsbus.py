@@ -3,10 +3,14 @@ import logging
 from typing import Any, Dict, Set, Optional
 from fastapi import WebSocket
 
+from app.core.json_codec import dumps
 from app.core.ws_wrapper import WSMessageWrapper
 
 logger = logging.getLogger("fdsl.wsbus")
 
+# Payloads sent as binary frames without conversion (ASGI servers accept any bytes-like)
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
 # global registry of buses
 _buses: Dict[str, "WSBus"] = {}
 
@@ -67,14 +71,14 @@ class WSBus:
 
         # Send based on content type
         if ContentTypeHandler.is_binary(content_type):
-            # Binary data
-            if isinstance(unwrapped_msg, (bytes, bytearray)):
-                await ws.send_bytes(bytes(unwrapped_msg))
+            # Binary data - handed to the transport as-is (bytes-like, no copy)
+            if isinstance(unwrapped_msg, BINARY_TYPES):
+                await ws.send_bytes(unwrapped_msg)
             elif isinstance(msg, dict):
                 # Fallback: extract from dict if unwrapping didn't work
                 binary_data = next(iter(msg.values()), b"")
-                if isinstance(binary_data, (bytes, bytearray)):
-                    await ws.send_bytes(bytes(binary_data))
+                if isinstance(binary_data, BINARY_TYPES):
+                    await ws.send_bytes(binary_data)
             else:
                 logger.warning(f"[WSBUS] Expected binary data, got {type(unwrapped_msg)}")
                 await ws.send_bytes(b"")
@@ -87,9 +91,9 @@ class WSBus:
             # JSON (default)
             # For object types, send the full dict; for primitives, send unwrapped value
             if self.message_type == "object":
-                await ws.send_json(msg)  # Keep object as-is
+                await ws.send_text(dumps(msg))  # Keep object as-is
             else:
-                await ws.send_json(unwrapped_msg)  # Send unwrapped primitive
+                await ws.send_text(dumps(unwrapped_msg))  # Send unwrapped primitive
 
     async def add_ws(self, ws: WebSocket):
         """Register a subscriber and send last message if available."""
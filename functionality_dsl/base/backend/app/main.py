@@ -1,4 +1,5 @@
 # app/main.py
+import asyncio
 import uuid
 import logging
 from fastapi import FastAPI, Request, Response, Cookie
@@ -7,8 +8,13 @@ from contextlib import AsyncExitStack
 from typing import Optional
 
 from app.core.config import settings
+from app.core.builtins.registry import warm_up_builtins
 from app.api.routers import include_generated_routers
 from app.core.http import lifespan_http_client
+from app.core.json_codec import JSONResponse
+from app.core.session_store import lifespan_session_store
+from app.core.offload import lifespan_transform_pool
+from app.core.jobs import lifespan_job_store
 from app.core.logging import configure_logging, set_request_id
 
 # Configure logging FIRST, before anything else
@@ -22,6 +28,7 @@ def create_app() -> FastAPI:
         title=settings.APP_NAME,
         openapi_url=settings.OPENAPI_URL,
         docs_url=settings.DOCS_URL,
+        default_response_class=JSONResponse,
     )
 
     origins = {*settings.BACKEND_CORS_ORIGINS, *settings.cors_origins()}
@@ -47,6 +54,13 @@ def create_app() -> FastAPI:
     async def _startup():
         app.state._stack = AsyncExitStack()
         await app.state._stack.enter_async_context(lifespan_http_client())
+        await app.state._stack.enter_async_context(lifespan_session_store())
+        await app.state._stack.enter_async_context(lifespan_transform_pool())
+        await app.state._stack.enter_async_context(lifespan_job_store())
+
+        if settings.BUILTINS_WARMUP:
+            warmed = await asyncio.to_thread(warm_up_builtins)
+            logger.debug(f"Builtin dependencies warmed up: {', '.join(warmed) or 'none'}")
 
         # Initialize database if db module exists
         try:
@@ -151,7 +165,13 @@ def create_app() -> FastAPI:
 
     @app.get("/healthz")
     def health():
-        return {"status": "OK"}
+        from app.core.ws_upstream import upstream_stats
+
+        upstreams = upstream_stats()
+        if not upstreams:
+            return {"status": "OK"}
+        # Connection gaps of the upstream WebSocket sources currently subscribed to
+        return {"status": "OK", "upstreams": upstreams}
 
     @app.get("/openapi.yaml")
     def get_openapi_yaml():
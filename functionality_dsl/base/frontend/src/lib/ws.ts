@@ -1,6 +1,9 @@
 import { authStore } from './stores/authStore';
 
-type Listener = (data: any) => void;
+/** Extra information about a message: replayed ones carry their receive time (epoch ms). */
+type MessageMeta = { replayedAt?: number };
+
+type Listener = (data: any, meta?: MessageMeta) => void;
 
 type SocketState = {
     key: string;
@@ -11,6 +14,14 @@ type SocketState = {
     reconnects: number;
     closedByUser: boolean;
     timer: any;
+    delta: DeltaState | null;
+    replay: string | null;
+};
+
+/** Last state rebuilt from a delta channel (see applyDelta). */
+type DeltaState = {
+    data: any;
+    seq: number;
 };
 
 const sockets = new Map<string, SocketState>();
@@ -72,17 +83,85 @@ function appendAuthToUrl(url: string): string {
     return url;
 }
 
+function unescapePointer(token: string): string {
+    return token.replace(/~1/g, "/").replace(/~0/g, "~");
+}
+
+/**
+ * Apply one RFC 6902 operation (add / remove / replace) without mutating
+ * `doc`: containers along the path are copied, so listeners that kept the
+ * previous state still see it unchanged.
+ */
+function applyPatchOp(doc: any, op: any): any {
+    const tokens = op.path.split("/").slice(1).map(unescapePointer);
+    if (tokens.length === 0) return op.op === "remove" ? undefined : op.value;
+
+    const copy = (value: any) => (Array.isArray(value) ? value.slice() : { ...value });
+    const root = copy(doc);
+    let node = root;
+    for (const token of tokens.slice(0, -1)) {
+        node[token] = copy(node[token]);
+        node = node[token];
+    }
+
+    const last = tokens[tokens.length - 1];
+    if (Array.isArray(node)) {
+        const index = last === "-" ? node.length : Number(last);
+        if (op.op === "add") node.splice(index, 0, op.value);
+        else if (op.op === "remove") node.splice(index, 1);
+        else node[index] = op.value;
+    } else if (op.op === "remove") {
+        delete node[last];
+    } else {
+        node[last] = op.value;
+    }
+    return root;
+}
+
+/**
+ * Rebuild the entity from a delta channel frame (`delta: patch | keys` in the
+ * DSL). Returns the full entity for listeners, the message itself if it is not
+ * a delta frame, or undefined while waiting for a snapshot after a gap.
+ */
+function applyDelta(state: SocketState, msg: any): any {
+    if (!msg || typeof msg !== "object" || !("$delta" in msg)) return msg;
+
+    if (msg.$delta === "snapshot") {
+        state.delta = { data: msg.data, seq: msg.seq };
+        return msg.data;
+    }
+
+    const current = state.delta;
+    if (!current || msg.seq !== current.seq + 1) {
+        // Missed a frame: drop deltas until the server's next snapshot
+        state.delta = null;
+        return undefined;
+    }
+
+    let data: any;
+    if (msg.$delta === "patch") {
+        data = msg.patch.reduce(applyPatchOp, current.data);
+    } else {
+        data = { ...current.data, ...msg.set };
+        for (const key of msg.unset ?? []) delete data[key];
+    }
+    state.delta = { data, seq: msg.seq };
+    return data;
+}
+
 function connect(state: SocketState): string | undefined {
     if (state.refCount <= 0) return;
 
     try {
         // Append auth token to URL for authenticated WebSocket connections
-        const urlWithAuth = appendAuthToUrl(state.fullUrl);
+        const urlWithAuth = appendAuthToUrl(withReplay(state.fullUrl, state.replay));
         state.ws = new WebSocket(urlWithAuth);
 
         // debugs
         state.ws.onopen = () => {
             state.reconnects = 0;
+            state.delta = null; // a new connection starts with a snapshot
+            state.replay = null; // history is replayed once, not after reconnects
             for (const cb of state.listeners) {
                 try { cb({ __meta: "open" }); } catch {}
             }
@@ -94,10 +173,29 @@ function connect(state: SocketState): string | undefined {
             if (typeof msg === "string") {
                 console.debug("[socket][onmessage]", msg);
                 try { msg = JSON.parse(msg); } catch { /* Ignore non JSON */ }
+                msg = applyDelta(state, msg);
+                if (msg === undefined) return;
             }
 
-            for (const cb of state.listeners) {
-                try { cb(msg); } catch { /* Listener errors are isolated */ }
+            // Channels with replay: recent history arrives as one frame before the live stream
+            if (msg && typeof msg === "object" && Array.isArray(msg.$replay)) {
+                msg.$replay.forEach((item: any, i: number) => {
+                    const meta = { replayedAt: msg.at?.[i] };
+                    for (const cb of state.listeners) {
+                        try { cb(item, meta); } catch { /* Listener errors are isolated */ }
+                    }
+                });
+                return;
+            }
+
+            // Channels with batchMs send {"$batch": [...]} frames; any other value,
+            // arrays included, is one message
+            const isBatch = msg && typeof msg === "object" && Array.isArray(msg.$batch);
+            const messages = isBatch ? msg.$batch : [msg];
+            for (const item of messages) {
+                for (const cb of state.listeners) {
+                    try { cb(item); } catch { /* Listener errors are isolated */ }
+                }
             }
         };
 
@@ -140,23 +238,38 @@ function getOrCreate(rawUrl: string): SocketState {
         reconnects: 0,
         closedByUser: false,
         timer: null,
+        delta: null,
+        replay: null,
     };
     sockets.set(key, st);
     return st;
 }
 
+/**
+ * Append the replay query parameter (channels with `replay:` in the DSL).
+ */
+function withReplay(url: string, replay: string | null): string {
+    if (!replay) return url;
+    const separator = url.includes('?') ? '&' : '?';
+    return `${url}${separator}replay=${encodeURIComponent(replay)}`;
+}
+
 /**
  * Subscribe to a WS url. Opens (or reuses) a shared connection.
  * Returns an unsubscribe function that decrements the ref count and
  * closes the ws when nobody is listening.
+ *
+ * `options.replay` (a count like "100" or an age like "60s") asks the
+ * server for recent history when this call opens the connection.
  */
-export function subscribe(rawUrl: string, onData: Listener): () => void {
+export function subscribe(rawUrl: string, onData: Listener, options: { replay?: string } = {}): () => void {
     const st = getOrCreate(rawUrl);
     st.listeners.add(onData);
     st.refCount++;
 
     if (!st.ws) {
         st.closedByUser = false;
+        st.replay = options.replay ?? null;
         connect(st);
     }
 
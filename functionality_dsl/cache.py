@@ -0,0 +1,78 @@
+"""
+User-level caches shared by the parser and the generators.
+
+Everything lives under one directory:
+
+    $FDSL_CACHE_DIR, else $XDG_CACHE_HOME/fdsl, else ~/.cache/fdsl
+    (%LOCALAPPDATA%\\fdsl on Windows)
+
+Set FDSL_CACHE_DIR to an empty string to disable on-disk caching.
+
+- jinja/   compiled templates (see api.templating)
+- models/  one marker per model text that passed validation (see below)
+"""
+
+import hashlib
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+# Everything that decides whether a model text is valid: the grammar, the
+# object/model processors and validators, and the builtin registry that
+# expression validation checks calls against
+_LANGUAGE_SOURCES = ("language.py", "grammar", "processors", "validation", "lib")
+
+
+def cache_dir() -> Optional[Path]:
+    """Root of the fdsl user cache, or None if disabled."""
+    configured = os.environ.get("FDSL_CACHE_DIR")
+    if configured is not None:
+        return Path(configured).expanduser() if configured else None
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "fdsl"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "fdsl"
+
+
+@lru_cache(maxsize=None)
+def language_version() -> str:
+    """Hash of the grammar and validation code of this installation."""
+    digest = hashlib.sha256()
+    for name in _LANGUAGE_SOURCES:
+        root = PACKAGE_DIR / name
+        paths = [root] if root.is_file() else sorted(root.rglob("*"))
+        for path in paths:
+            if path.suffix in (".py", ".tx") and "__pycache__" not in path.parts:
+                digest.update(path.relative_to(PACKAGE_DIR).as_posix().encode("utf-8"))
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _validated_marker(text: str) -> Optional[Path]:
+    root = cache_dir()
+    if root is None:
+        return None
+    key = hashlib.sha256(f"{language_version()}\0{text}".encode("utf-8")).hexdigest()
+    return root / "models" / key[:2] / key
+
+
+def is_known_valid(text: str) -> bool:
+    """True if this exact model text already passed validation with this grammar."""
+    marker = _validated_marker(text)
+    return marker is not None and marker.exists()
+
+
+def mark_valid(text: str):
+    """Record that a model text passed validation (best effort)."""
+    marker = _validated_marker(text)
+    if marker is None:
+        return
+    try:
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        marker.touch()
+    except OSError:
+        pass
@@ -4,8 +4,9 @@ import sys
 import click
 import os
 import re
+import time
 
-from datetime import date
+from datetime import date, datetime
 from rich import pretty
 from rich.console import Console
 from textx import metamodel_from_file
@@ -14,9 +15,10 @@ from plantuml import PlantUML
 
 from functionality_dsl.api.generator import scaffold_backend_from_model, render_domain_files
 from functionality_dsl.api.gen_logging import configure_gen_logging
+from functionality_dsl.api.manifest import generation_session, input_fingerprint, outputs_up_to_date
 from functionality_dsl.api.frontend_generator import render_frontend_files, scaffold_frontend_from_model
 from functionality_dsl.api.generators.core.database_generator import get_database_context
-from functionality_dsl.language import build_model
+from functionality_dsl.language import build_model, build_model_str, _expand_imports
 from functionality_dsl.language import THIS_DIR as PKG_DIR
 from functionality_dsl.transformers import transform_openapi_to_fdsl
 from textx import get_children_of_type
@@ -264,70 +266,35 @@ def validate(context, model_path, verbose, quiet):
     help="What to generate (default: all)."
 )
 @click.option("--out", "out_dir", default="generated", help="Output directory (default: ./generated)")
+@click.option("--force", is_flag=True, default=False, help="Regenerate and rewrite every file, even if unchanged.")
+@click.option(
+    "--jobs", "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Worker processes for per-entity files (default: CPU count, 1 = serial).",
+)
+@click.option("--watch", "-w", is_flag=True, default=False, help="Keep running and regenerate when the model or its imports change.")
 @click.option("--verbose", "-v", is_flag=True, default=False, help="Enable verbose (DEBUG) output.")
 @click.option("--quiet", "-q", is_flag=True, default=False, help="Suppress info output (warnings and errors only).")
-def generate(context, model_path, target, out_dir, verbose, quiet):
+def generate(context, model_path, target, out_dir, force, jobs, watch, verbose, quiet):
     configure_gen_logging(verbose=verbose, quiet=quiet)
     try:
-        model = build_model(model_path)
         out_path = Path(out_dir).resolve()
 
-        # Generate JWT secret once for both backend and frontend
-        from functionality_dsl.api.generators.core.infrastructure import generate_random_secret
-        from functionality_dsl.api.extractors import extract_server_config
-
-        server_config = extract_server_config(model)
-        jwt_secret_value = None
-        jwt_secret_var = None
-
-        auth_config = server_config.get("auth")
-        if auth_config and auth_config.get("type") == "jwt":
-            jwt_config = auth_config.get("jwt", {})
-            if jwt_config.get("secret"):
-                jwt_secret_var = jwt_config["secret"]
-                jwt_secret_value = generate_random_secret(32)
-                # Store in server_config so backend can use it
-                server_config["jwt_secret_var"] = jwt_secret_var
-                server_config["jwt_secret_value"] = jwt_secret_value
-
-        if target in ("all", "backend"):
-            base_backend_dir = Path(PKG_DIR) / "base" / "backend"
-            templates_backend_dir = Path(PKG_DIR) / "templates" / "backend"
-
-            # Get database context for infrastructure templates
-            db_context = get_database_context(model)
-
-            # Extract source auth secrets (env vars for external API auth)
-            source_auth_secrets = extract_source_auth_secrets(model)
-            if source_auth_secrets:
-                db_context["source_auth_env_vars"] = source_auth_secrets
-
-            scaffold_backend_from_model(
-                model,
-                base_backend_dir=base_backend_dir,
-                templates_backend_dir=templates_backend_dir,
-                out_dir=out_path,
-                jwt_secret_value=jwt_secret_value,
-                db_context=db_context,
-                target=target,
-            )
-            render_domain_files(model, templates_backend_dir, out_path)
-            console.print(f"[{date.today().strftime('%Y-%m-%d')}] Backend emitted to: {out_path}", style="green")
-
-        if target in ("all", "frontend"):
-            base_frontend_dir = Path(PKG_DIR) / "base" / "frontend"
-            templates_frontend_dir = Path(PKG_DIR) / "templates" / "frontend"
-            # copy SvelteKit scaffold + render vite.config.ts & Dockerfile
-            scaffold_frontend_from_model(
-                model,
-                base_frontend_dir=base_frontend_dir,
-                templates_frontend_dir=templates_frontend_dir,
-                out_dir=out_path / "frontend",
-                jwt_secret_value=jwt_secret_value,
-            )
-            # then write generated components
-            render_frontend_files(model, templates_frontend_dir, out_path / "frontend")
-            console.print(f"[{date.today().strftime('%Y-%m-%d')}] Frontend emitted to: {out_path / 'frontend'}", style="green")
+        if watch:
+            _watch_generate(model_path, target, out_path, force=force, workers=jobs)
+            return
+
+        fingerprint = input_fingerprint(_expand_imports(model_path), target)
+
+        if not force and outputs_up_to_date(out_path, fingerprint):
+            console.print(f"[{date.today().strftime('%Y-%m-%d')}] Up to date, nothing to generate: {out_path}", style="green")
+            return
+
+        with generation_session(out_path, fingerprint=fingerprint, force=force) as session:
+            _generate_project(build_model(model_path), target, out_path, workers=jobs)
+
+        _print_generation_summary(session.summary())
 
     except Exception as e:
         import traceback
@@ -345,6 +312,192 @@ def generate(context, model_path, target, out_dir, verbose, quiet):
         context.exit(1)
     else:
         context.exit(0)
+
+
+def _generate_project(model, target, out_path: Path, workers=None, render_cache=None, generated_secrets=None):
+    """
+    Emit the backend and/or frontend for a built model into out_path.
+
+    Watch mode passes the same render_cache and generated_secrets dicts on every
+    run, so unchanged entities are not re-rendered and secrets stay stable.
+    """
+    if generated_secrets is None:
+        generated_secrets = {}
+    # Generate JWT secret once for both backend and frontend
+    from functionality_dsl.api.generators.core.infrastructure import generate_random_secret
+    from functionality_dsl.api.extractors import extract_server_config
+
+    server_config = extract_server_config(model)
+    jwt_secret_value = None
+    jwt_secret_var = None
+
+    auth_config = server_config.get("auth")
+    if auth_config and auth_config.get("type") == "jwt":
+        jwt_config = auth_config.get("jwt", {})
+        if jwt_config.get("secret"):
+            jwt_secret_var = jwt_config["secret"]
+            jwt_secret_value = generated_secrets.setdefault("jwt_secret", generate_random_secret(32))
+            # Store in server_config so backend can use it
+            server_config["jwt_secret_var"] = jwt_secret_var
+            server_config["jwt_secret_value"] = jwt_secret_value
+
+    if target in ("all", "backend"):
+        base_backend_dir = Path(PKG_DIR) / "base" / "backend"
+        templates_backend_dir = Path(PKG_DIR) / "templates" / "backend"
+
+        # Get database context for infrastructure templates
+        db_context = get_database_context(model)
+        if "db_password" in db_context:
+            db_context["db_password"] = generated_secrets.setdefault("db_password", db_context["db_password"])
+
+        # Extract source auth secrets (env vars for external API auth)
+        source_auth_secrets = extract_source_auth_secrets(model)
+        if source_auth_secrets:
+            db_context["source_auth_env_vars"] = source_auth_secrets
+
+        scaffold_backend_from_model(
+            model,
+            base_backend_dir=base_backend_dir,
+            templates_backend_dir=templates_backend_dir,
+            out_dir=out_path,
+            jwt_secret_value=jwt_secret_value,
+            db_context=db_context,
+            target=target,
+        )
+        render_domain_files(model, templates_backend_dir, out_path, workers=workers, render_cache=render_cache)
+        console.print(f"[{date.today().strftime('%Y-%m-%d')}] Backend emitted to: {out_path}", style="green")
+
+    if target in ("all", "frontend"):
+        base_frontend_dir = Path(PKG_DIR) / "base" / "frontend"
+        templates_frontend_dir = Path(PKG_DIR) / "templates" / "frontend"
+        # copy SvelteKit scaffold + render vite.config.ts & Dockerfile
+        scaffold_frontend_from_model(
+            model,
+            base_frontend_dir=base_frontend_dir,
+            templates_frontend_dir=templates_frontend_dir,
+            out_dir=out_path / "frontend",
+            jwt_secret_value=jwt_secret_value,
+        )
+        # then write generated components
+        render_frontend_files(model, templates_frontend_dir, out_path / "frontend")
+        console.print(f"[{date.today().strftime('%Y-%m-%d')}] Frontend emitted to: {out_path / 'frontend'}", style="green")
+
+
+WATCH_INTERVAL = 0.5  # seconds between checks of the model files
+
+
+def _stat_files(paths):
+    """mtime_ns per path (None if missing)."""
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def _watch_generate(model_path, target, out_path: Path, force=False, workers=None):
+    """
+    Regenerate whenever the model file or one of its imports changes, until
+    Ctrl+C. Per run: re-read the sources, reparse only if the expanded text
+    changed, diff the exposed entities against the previous run and re-render
+    only the entity files whose inputs changed; unchanged files are not
+    rewritten (generation manifest).
+    """
+    state = {"expanded": None, "signatures": {}, "render_cache": {}, "secrets": {}}
+    watched = _stat_files([Path(model_path).resolve()])
+    first = True
+
+    console.print(f"Watching {model_path} and its imports (Ctrl+C to stop)", style="cyan")
+    try:
+        while True:
+            if first or _stat_files(watched) != watched:
+                watched = _watch_iteration(model_path, target, out_path, state, force and first, workers, watched)
+                first = False
+            time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        console.print("Stopped watching", style="cyan")
+
+
+def _watch_iteration(model_path, target, out_path: Path, state, force, workers, watched):
+    """One watch-mode regeneration; returns the files to watch next."""
+    from functionality_dsl.api.exposure_map import build_exposure_map, entity_signatures, diff_exposure
+
+    stamp = datetime.now().strftime("%H:%M:%S")
+    timings = {}
+    started = phase_start = time.perf_counter()
+
+    def phase(name):
+        nonlocal phase_start
+        now = time.perf_counter()
+        timings[name] = now - phase_start
+        phase_start = now
+
+    # Stat before reading, so a save during the run triggers another one
+    before = _stat_files(watched)
+    files = set()
+    origins = []
+    try:
+        expanded = _expand_imports(model_path, files, origins)
+    except Exception as e:
+        console.print(f"[{stamp}] {e}", style="red")
+        return before
+    watched = {**_stat_files(files), **{p: m for p, m in before.items() if p in files}}
+    phase("read")
+
+    if expanded == state["expanded"]:
+        console.print(f"[{stamp}] No model changes", style="dim")
+        return watched
+
+    try:
+        model = build_model_str(expanded, origins)
+        phase("parse")
+
+        signatures = entity_signatures(model)
+        exposed = {name: signatures[name] for name in build_exposure_map(model)}
+        changes = diff_exposure(state["signatures"], exposed)
+        phase("diff")
+
+        fingerprint = input_fingerprint(expanded, target)
+        with generation_session(out_path, fingerprint=fingerprint, force=force) as session:
+            _generate_project(
+                model, target, out_path,
+                workers=workers,
+                render_cache=state["render_cache"],
+                generated_secrets=state["secrets"],
+            )
+        phase("generate")
+    except Exception as e:
+        # Keep watching; the next save retries with a full regeneration
+        state["expanded"] = None
+        console.print(f"[{stamp}] Generate failed: {e}", style="red")
+        return watched
+
+    state["expanded"] = expanded
+    state["signatures"] = exposed
+
+    breakdown = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+    console.print(f"[{stamp}] Regenerated in {time.perf_counter() - started:.2f}s ({breakdown})", style="green")
+    for label in ("added", "changed", "removed"):
+        if changes[label]:
+            console.print(f"  {label:<8} {' '.join(changes[label])}", style="yellow")
+    _print_generation_summary(session.summary())
+    return watched
+
+
+def _print_generation_summary(summary: dict):
+    """Print counts of created/updated/unchanged/removed outputs and list the changes."""
+    console.print(
+        f"[{date.today().strftime('%Y-%m-%d')}] "
+        f"{len(summary['created'])} created, {len(summary['updated'])} updated, "
+        f"{len(summary['unchanged'])} unchanged, {len(summary['removed'])} removed",
+        style="green",
+    )
+    for label, style in (("updated", "yellow"), ("removed", "red")):
+        for path in summary[label]:
+            console.print(f"  {label:<8} {path}", style=style)
+
         
 @cli.command("visualize", help="Visualize an FDSL model as a diagram.")
 @click.pass_context
@@ -8,6 +8,7 @@ are in the processors/ package.
 
 import os
 import re
+from functools import wraps
 from os.path import join, dirname, abspath
 from pathlib import Path
 from functionality_dsl.api.gen_logging import get_logger as _get_gen_logger
@@ -17,9 +18,11 @@ from textx import (
     metamodel_from_file,
     get_children_of_type,
     get_location,
+    TextXError,
     TextXSemanticError,
 )
 
+from functionality_dsl.cache import is_known_valid, mark_valid
 from functionality_dsl.lib.component_types import COMPONENT_TYPES
 
 # Import validation functions
@@ -58,14 +61,56 @@ GRAMMAR_DIR = join(THIS_DIR, "grammar")
 def build_model(model_path: str):
     """Parse & validate a model from a file path, resolving imports by inlining."""
     # Expand imports by inlining imported file contents
-    expanded_content = _expand_imports(model_path)
+    origins = []
+    expanded_content = _expand_imports(model_path, origins=origins)
     # Parse the expanded content as a single model
-    return FunctionalityDSLMetaModel.model_from_str(expanded_content)
+    return build_model_str(expanded_content, origins)
 
 
-def build_model_str(model_str: str):
-    """Parse & validate a model from a string."""
-    return FunctionalityDSLMetaModel.model_from_str(model_str)
+def build_model_str(model_str: str, origins=None):
+    """
+    Parse & validate a model from a string.
+
+    For a string produced by _expand_imports(), pass its `origins` so errors
+    name the imported file and line instead of a line of the expanded text.
+    """
+    try:
+        return _model_from_text(model_str)
+    except TextXError as err:
+        _relocate_error(err, origins)
+        raise
+
+
+# True while parsing a text that already passed validation (see _model_from_text)
+_skip_validation = False
+
+
+def _model_from_text(text: str):
+    """
+    Parse a model text. Validation is skipped for a text that already passed
+    it with this grammar and these validators (recorded in the user cache,
+    see functionality_dsl.cache); parsing, reference resolution and the
+    processors that populate the model still run.
+    """
+    global _skip_validation
+    known_valid = is_known_valid(text)
+    _skip_validation = known_valid
+    try:
+        model = FunctionalityDSLMetaModel.model_from_str(text)
+    finally:
+        _skip_validation = False
+    if not known_valid:
+        mark_valid(text)
+    return model
+
+
+def _validator(func):
+    """Register a model-wide validator that is skipped for known-valid texts."""
+    @wraps(func)
+    def processor(model, metamodel=None):
+        if not _skip_validation:
+            func(model, metamodel)
+    return processor
 
 
 # ------------------------------------------------------------------------------
@@ -166,6 +211,13 @@ def model_processor(model, metamodel=None):
 
     Note: Imports are handled in build_model() via _expand_imports() before parsing.
     """
+    if not _skip_validation:
+        _validate_model(model)
+    _populate_aggregates(model)
+
+
+def _validate_model(model):
+    """Cross-object validation; raises TextXSemanticError on the first problem."""
     verify_unique_names(model)
 
     # RBAC validation (must run early, before other validations)
@@ -183,7 +235,6 @@ def model_processor(model, metamodel=None):
     verify_server(model)
     verify_entities(model)
     verify_components(model)
-    _populate_aggregates(model)
 
 
 # ------------------------------------------------------------------------------
@@ -299,52 +350,85 @@ def get_scope_providers():
 # ------------------------------------------------------------------------------
 # Imports
 
-def _expand_imports(model_path: str, visited=None) -> str:
+_IMPORT_LINE = re.compile(r'\s*import\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*')
+
+# Resolved path -> ((mtime_ns, size), lines). A file shared by many models
+# (or re-expanded in watch mode) is read and split once until it changes.
+_SOURCE_CACHE = {}
+
+
+def _read_source_lines(model_file: Path):
+    stat = model_file.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _SOURCE_CACHE.get(model_file)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    # Read the file content with explicit UTF-8 encoding
+    lines = model_file.read_text(encoding="utf-8").split("\n")
+    _SOURCE_CACHE[model_file] = (version, lines)
+    return lines
+
+
+def _expand_imports(model_path: str, visited=None, origins=None) -> str:
     """
     Recursively expand import statements by inlining the content of imported files.
     Returns the fully expanded file content with all imports resolved.
+
+    Each file is inlined once, even if imported from several files. If
+    `origins` is a list, it receives the (file, line) each line of the
+    result comes from, so errors can be reported against the original files.
     """
     if visited is None:
         visited = set()
+    out = []
+    line_origins = []
+    _expand_file(Path(model_path).resolve(), visited, out, line_origins)
+    if origins is not None:
+        origins.extend(line_origins)
+    return "\n".join(out)
 
-    model_file = Path(model_path).resolve()
 
+def _expand_file(model_file: Path, visited, out, origins):
     # Prevent circular imports
     if model_file in visited:
-        return ""
+        return
     visited.add(model_file)
 
     if not model_file.exists():
         raise FileNotFoundError(f"File not found: {model_file}")
 
-    # Read the file content with explicit UTF-8 encoding
-    content = model_file.read_text(encoding="utf-8")
     base_dir = model_file.parent
+    for lineno, line in enumerate(_read_source_lines(model_file), start=1):
+        match = _IMPORT_LINE.fullmatch(line)
+        if not match:
+            out.append(line)
+            origins.append((model_file, lineno))
+            continue
 
-    # Find all import statements
-    import_pattern = r'^\s*import\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*$'
-
-    def replace_import(match):
         imp_uri = match.group(1)
         # Convert "products" -> "products.fdsl", "shop.products" -> "shop/products.fdsl"
         rel_path = imp_uri.replace(".", os.sep) + ".fdsl"
         import_path = (base_dir / rel_path).resolve()
 
         if not import_path.exists():
-            raise FileNotFoundError(f"Import not found: {import_path}")
+            raise FileNotFoundError(f"Import not found: {import_path} (imported at {model_file}:{lineno})")
 
         _logger.debug(f"[IMPORT] Inlining {import_path.name}")
 
-        # Recursively expand the imported file
-        imported_content = _expand_imports(str(import_path), visited)
-
-        # Return the imported content with a comment marking the source
-        return f"// ========== Imported from {import_path.name} ==========\n{imported_content}\n// ========== End of {import_path.name} ==========\n"
+        # Mark the imported content with its source; the markers map back to the import line
+        out.append(f"// ========== Imported from {import_path.name} ==========")
+        origins.append((model_file, lineno))
+        _expand_file(import_path, visited, out, origins)
+        out.append(f"// ========== End of {import_path.name} ==========")
+        origins.append((model_file, lineno))
 
-    # Replace all import statements with the actual file contents
-    expanded = re.sub(import_pattern, replace_import, content, flags=re.MULTILINE)
 
-    return expanded
+def _relocate_error(err: TextXError, origins):
+    """Point a parse/validation error at the original file and line."""
+    if origins and err.line and 1 <= err.line <= len(origins):
+        model_file, line = origins[err.line - 1]
+        err.filename = str(model_file)
+        err.line = line
 
 
 # ------------------------------------------------------------------------------
@@ -371,11 +455,11 @@ def get_metamodel(debug: bool = False, global_repo: bool = True):
 
     # Model processors run after the whole model is built
     mm.register_model_processor(model_processor)
-    mm.register_model_processor(_validate_computed_attrs)
-    mm.register_model_processor(_validate_exposure_blocks)
-    mm.register_model_processor(_validate_ws_entities)
-    mm.register_model_processor(validate_source_syntax)
-    mm.register_model_processor(_validate_entity_access_blocks)
+    mm.register_model_processor(_validator(_validate_computed_attrs))
+    mm.register_model_processor(_validator(_validate_exposure_blocks))
+    mm.register_model_processor(_validator(_validate_ws_entities))
+    mm.register_model_processor(_validator(validate_source_syntax))
+    mm.register_model_processor(_validator(_validate_entity_access_blocks))
 
     return mm
 
@@ -5,8 +5,12 @@ import gzip
 import zlib
 import bz2
 import io
+import os
 from typing import Any, Dict
 
+# Accepted binary inputs; memoryview covers zero-copy views of uploaded files
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
 
 def binary_size(data: bytes) -> int:
     """
@@ -21,8 +25,8 @@ def binary_size(data: bytes) -> int:
     Example:
         binary_size(image_data)  # Returns: 51234
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_size requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_size requires binary data (bytes, bytearray or memoryview)")
     return len(data)
 
 
@@ -39,8 +43,8 @@ def binary_encode_base64(data: bytes) -> str:
     Example:
         binary_encode_base64(image_data)  # Returns: "iVBORw0KGgoAAAANS..."
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_encode_base64 requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_encode_base64 requires binary data (bytes, bytearray or memoryview)")
     return base64.b64encode(data).decode('utf-8')
 
 
@@ -80,8 +84,8 @@ def image_dimensions(data: bytes) -> Dict[str, int]:
     except ImportError:
         raise RuntimeError("PIL/Pillow is required for image processing functions. Install with: pip install Pillow")
 
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("image_dimensions requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("image_dimensions requires binary data (bytes, bytearray or memoryview)")
 
     try:
         img = Image.open(io.BytesIO(data))
@@ -90,84 +94,130 @@ def image_dimensions(data: bytes) -> Dict[str, int]:
         raise ValueError(f"Failed to read image dimensions: {e}")
 
 
-def image_invert(data: bytes) -> bytes:
-    """
-    Invert image colors (negative effect).
+# Encoder settings for image builtins. Format defaults to the source image's
+# format; quality applies to lossy formats (JPEG, WEBP).
+IMAGE_FORMAT = os.getenv("FDSL_IMAGE_FORMAT") or None
+IMAGE_QUALITY = int(os.getenv("FDSL_IMAGE_QUALITY", "95"))
 
-    Args:
-        data: Image binary data (JPEG, PNG, etc.)
 
-    Returns:
-        Processed image as bytes in the same format
-
-    Example:
-        image_invert(image_data)  # Returns inverted image bytes
-    """
+def _require_pil():
     try:
         from PIL import Image, ImageOps
     except ImportError:
         raise RuntimeError("PIL/Pillow is required for image processing functions. Install with: pip install Pillow")
+    return Image, ImageOps
 
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("image_invert requires bytes or bytearray")
 
-    try:
-        img = Image.open(io.BytesIO(data))
+def _decode_image(data: bytes, func_name: str, draft_size=None):
+    """
+    Open image bytes. For JPEG, `draft_size` lets the decoder downscale by a
+    power of two while decoding (never below the requested size).
+    """
+    Image, _ = _require_pil()
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError(f"{func_name} requires binary data (bytes, bytearray or memoryview)")
+    img = Image.open(io.BytesIO(data))
+    source_format = img.format or 'JPEG'
+    if draft_size is not None and source_format == 'JPEG':
+        img.draft(img.mode, draft_size)
+    return img, source_format
+
+
+def _encode_image(img, source_format: str, format: str = None, quality: int = None) -> bytes:
+    fmt = (format or IMAGE_FORMAT or source_format).upper()
+    if fmt == 'JPG':
+        fmt = 'JPEG'
+    if fmt == 'JPEG' and img.mode not in ('RGB', 'L', 'CMYK'):
+        img = img.convert('RGB')
+    output = io.BytesIO()
+    img.save(output, format=fmt, quality=quality if quality is not None else IMAGE_QUALITY)
+    return output.getvalue()
+
+
+def _check_resize_args(width, height):
+    if not isinstance(width, int) or width <= 0:
+        raise ValueError("width must be a positive integer")
+    if not isinstance(height, int) or height <= 0:
+        raise ValueError("height must be a positive integer")
+
+
+def _op_invert(img):
+    # Invert doesn't work on some modes
+    _, ImageOps = _require_pil()
+    return ImageOps.invert(img.convert('RGB'))
+
+
+def _op_grayscale(img):
+    return img.convert('L')
+
 
-        # Store original format
-        original_format = img.format or 'JPEG'
+def _op_resize(img, width, height):
+    Image, _ = _require_pil()
+    _check_resize_args(width, height)
+    # High-quality Lanczos resampling
+    return img.resize((width, height), Image.Resampling.LANCZOS)
 
-        # Convert to RGB if necessary (invert doesn't work on some modes)
-        if img.mode not in ('RGB', 'L'):
-            img = img.convert('RGB')
 
-        # Invert colors
-        inverted = ImageOps.invert(img.convert('RGB'))
+def _op_rotate(img, degrees):
+    Image, _ = _require_pil()
+    if not isinstance(degrees, (int, float)):
+        raise ValueError("degrees must be a number")
+    # expand=True to fit entire rotated image
+    return img.rotate(degrees, expand=True, resample=Image.Resampling.BICUBIC)
 
-        # Save to bytes
-        output = io.BytesIO()
-        inverted.save(output, format=original_format, quality=95)
-        return output.getvalue()
+
+# Image builtins that map a decoded image to a decoded image; chains of these
+# are fused by the expression compiler into a single image_pipeline() call.
+IMAGE_OPS = {
+    "image_invert":    (_op_invert,    "Failed to invert image"),
+    "image_grayscale": (_op_grayscale, "Failed to convert image to grayscale"),
+    "image_resize":    (_op_resize,    "Failed to resize image"),
+    "image_rotate":    (_op_rotate,    "Failed to rotate image"),
+}
+
+
+def _apply_image_op(name: str, data: bytes, *args) -> bytes:
+    op, error = IMAGE_OPS[name]
+    _require_pil()
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError(f"{name} requires binary data (bytes, bytearray or memoryview)")
+    try:
+        img, source_format = _decode_image(data, name)
+        return _encode_image(op(img, *args), source_format)
     except Exception as e:
-        raise ValueError(f"Failed to invert image: {e}")
+        raise ValueError(f"{error}: {e}")
 
 
-def image_grayscale(data: bytes) -> bytes:
+def image_invert(data: bytes) -> bytes:
     """
-    Convert image to grayscale.
+    Invert image colors (negative effect).
 
     Args:
         data: Image binary data (JPEG, PNG, etc.)
 
     Returns:
-        Grayscale image as bytes in the same format
+        Processed image as bytes in the same format
 
     Example:
-        image_grayscale(image_data)  # Returns grayscale image bytes
+        image_invert(image_data)  # Returns inverted image bytes
     """
-    try:
-        from PIL import Image
-    except ImportError:
-        raise RuntimeError("PIL/Pillow is required for image processing functions. Install with: pip install Pillow")
+    return _apply_image_op("image_invert", data)
 
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("image_grayscale requires bytes or bytearray")
 
-    try:
-        img = Image.open(io.BytesIO(data))
+def image_grayscale(data: bytes) -> bytes:
+    """
+    Convert image to grayscale.
 
-        # Store original format
-        original_format = img.format or 'JPEG'
+    Args:
+        data: Image binary data (JPEG, PNG, etc.)
 
-        # Convert to grayscale
-        grayscale = img.convert('L')
+    Returns:
+        Grayscale image as bytes in the same format
 
-        # Save to bytes
-        output = io.BytesIO()
-        grayscale.save(output, format=original_format, quality=95)
-        return output.getvalue()
-    except Exception as e:
-        raise ValueError(f"Failed to convert image to grayscale: {e}")
+    Example:
+        image_grayscale(image_data)  # Returns grayscale image bytes
+    """
+    return _apply_image_op("image_grayscale", data)
 
 
 def image_resize(data: bytes, width: int, height: int) -> bytes:
@@ -185,33 +235,8 @@ def image_resize(data: bytes, width: int, height: int) -> bytes:
     Example:
         image_resize(image_data, 800, 600)  # Returns resized image
     """
-    try:
-        from PIL import Image
-    except ImportError:
-        raise RuntimeError("PIL/Pillow is required for image processing functions. Install with: pip install Pillow")
-
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("image_resize requires bytes or bytearray")
-    if not isinstance(width, int) or width <= 0:
-        raise ValueError("width must be a positive integer")
-    if not isinstance(height, int) or height <= 0:
-        raise ValueError("height must be a positive integer")
-
-    try:
-        img = Image.open(io.BytesIO(data))
-
-        # Store original format
-        original_format = img.format or 'JPEG'
-
-        # Resize using high-quality Lanczos resampling
-        resized = img.resize((width, height), Image.Resampling.LANCZOS)
-
-        # Save to bytes
-        output = io.BytesIO()
-        resized.save(output, format=original_format, quality=95)
-        return output.getvalue()
-    except Exception as e:
-        raise ValueError(f"Failed to resize image: {e}")
+    _check_resize_args(width, height)
+    return _apply_image_op("image_resize", data, width, height)
 
 
 def image_rotate(data: bytes, degrees: float) -> bytes:
@@ -229,31 +254,67 @@ def image_rotate(data: bytes, degrees: float) -> bytes:
         image_rotate(image_data, 90)   # Rotate 90° counter-clockwise
         image_rotate(image_data, -45)  # Rotate 45° clockwise
     """
-    try:
-        from PIL import Image
-    except ImportError:
-        raise RuntimeError("PIL/Pillow is required for image processing functions. Install with: pip install Pillow")
-
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("image_rotate requires bytes or bytearray")
     if not isinstance(degrees, (int, float)):
         raise ValueError("degrees must be a number")
+    return _apply_image_op("image_rotate", data, degrees)
+
 
+def image_encode(data: bytes, format: str = None, quality: int = None) -> bytes:
+    """
+    Re-encode an image in another format and/or quality.
+
+    Args:
+        data: Image binary data (JPEG, PNG, etc.)
+        format: Output format (e.g. "JPEG", "PNG", "WEBP"); defaults to the source format
+        quality: Encoder quality for lossy formats (1-100)
+
+    Returns:
+        Encoded image as bytes
+
+    Example:
+        image_encode(image_data, "WEBP", 80)
+    """
     try:
-        img = Image.open(io.BytesIO(data))
+        img, source_format = _decode_image(data, "image_encode")
+        return _encode_image(img, source_format, format, quality)
+    except Exception as e:
+        raise ValueError(f"Failed to encode image: {e}")
+
+
+def image_pipeline(data: bytes, steps: list, format: str = None, quality: int = None) -> bytes:
+    """
+    Apply several image operations with a single decode and a single encode.
+
+    Each step is [builtin_name, *args] for image_invert, image_grayscale,
+    image_resize or image_rotate. When the first geometric step is a resize
+    of a JPEG, the decoder downscales while decoding (Image.draft).
 
-        # Store original format
-        original_format = img.format or 'JPEG'
+    The compiler emits this for nested image builtins, so
+    image_grayscale(image_resize(Cam.frame, 640, 480)) decodes once.
 
-        # Rotate image (expand=True to fit entire rotated image)
-        rotated = img.rotate(degrees, expand=True, resample=Image.Resampling.BICUBIC)
+    Example:
+        image_pipeline(image_data, [["image_resize", 640, 480], ["image_grayscale"]], "JPEG", 80)
+    """
+    for step in steps:
+        if not step or step[0] not in IMAGE_OPS:
+            raise ValueError(f"image_pipeline: unsupported step {step!r}")
+        if step[0] == "image_resize":
+            _check_resize_args(*step[1:])
+
+    draft_size = None
+    for name, *args in steps:
+        if name == "image_resize":
+            draft_size = tuple(args)
+        if name in ("image_resize", "image_rotate"):
+            break
 
-        # Save to bytes
-        output = io.BytesIO()
-        rotated.save(output, format=original_format, quality=95)
-        return output.getvalue()
+    try:
+        img, source_format = _decode_image(data, "image_pipeline", draft_size)
+        for name, *args in steps:
+            img = IMAGE_OPS[name][0](img, *args)
+        return _encode_image(img, source_format, format, quality)
     except Exception as e:
-        raise ValueError(f"Failed to rotate image: {e}")
+        raise ValueError(f"Failed to process image: {e}")
 
 
 # Compression functions
@@ -272,8 +333,8 @@ def binary_compress_gzip(data: bytes, level: int = 9) -> bytes:
         compressed = binary_compress_gzip(file_data)
         # Original: 157 bytes -> Compressed: 78 bytes
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_compress_gzip requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_compress_gzip requires binary data (bytes, bytearray or memoryview)")
     if not isinstance(level, int) or level < 0 or level > 9:
         raise ValueError("level must be an integer between 0 and 9")
 
@@ -293,8 +354,8 @@ def binary_decompress_gzip(data: bytes) -> bytes:
     Example:
         original = binary_decompress_gzip(compressed_data)
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_decompress_gzip requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_decompress_gzip requires binary data (bytes, bytearray or memoryview)")
 
     try:
         return gzip.decompress(data)
@@ -316,8 +377,8 @@ def binary_compress_zlib(data: bytes, level: int = 9) -> bytes:
     Example:
         compressed = binary_compress_zlib(file_data)
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_compress_zlib requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_compress_zlib requires binary data (bytes, bytearray or memoryview)")
     if not isinstance(level, int) or level < 0 or level > 9:
         raise ValueError("level must be an integer between 0 and 9")
 
@@ -337,8 +398,8 @@ def binary_decompress_zlib(data: bytes) -> bytes:
     Example:
         original = binary_decompress_zlib(compressed_data)
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_decompress_zlib requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_decompress_zlib requires binary data (bytes, bytearray or memoryview)")
 
     try:
         return zlib.decompress(data)
@@ -361,8 +422,8 @@ def binary_compress_bz2(data: bytes, level: int = 9) -> bytes:
         compressed = binary_compress_bz2(file_data)
         # Typically achieves better compression than gzip
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_compress_bz2 requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_compress_bz2 requires binary data (bytes, bytearray or memoryview)")
     if not isinstance(level, int) or level < 1 or level > 9:
         raise ValueError("level must be an integer between 1 and 9")
 
@@ -382,8 +443,8 @@ def binary_decompress_bz2(data: bytes) -> bytes:
     Example:
         original = binary_decompress_bz2(compressed_data)
     """
-    if not isinstance(data, (bytes, bytearray)):
-        raise ValueError("binary_decompress_bz2 requires bytes or bytearray")
+    if not isinstance(data, BINARY_TYPES):
+        raise ValueError("binary_decompress_bz2 requires binary data (bytes, bytearray or memoryview)")
 
     try:
         return bz2.decompress(data)
@@ -391,8 +452,18 @@ def binary_decompress_bz2(data: bytes) -> bytes:
         raise ValueError(f"Failed to decompress bz2 data: {e}")
 
 
+def warm_up():
+    """Import Pillow and register its format plugins ahead of the first image call."""
+    try:
+        Image, _ = _require_pil()
+    except RuntimeError:
+        return
+    Image.init()
+
+
 # Export functions for FDSL registry
-# Format: "function_name": (function_reference, (min_args, max_args))
+# Format: "function_name": (function_reference, (min_args, max_args)[, cost])
+# cost "heavy" marks CPU-bound work; entities calling it transform off the event loop
 DSL_BINARY_FUNCS = {
     # Binary utilities
     "binary_size":           (binary_size,           (1, 1)),
@@ -400,17 +471,19 @@ DSL_BINARY_FUNCS = {
     "binary_decode_base64":  (binary_decode_base64,  (1, 1)),
 
     # Compression (with optional compression level)
-    "binary_compress_gzip":    (binary_compress_gzip,    (1, 2)),
+    "binary_compress_gzip":    (binary_compress_gzip,    (1, 2), "heavy"),
     "binary_decompress_gzip":  (binary_decompress_gzip,  (1, 1)),
-    "binary_compress_zlib":    (binary_compress_zlib,    (1, 2)),
+    "binary_compress_zlib":    (binary_compress_zlib,    (1, 2), "heavy"),
     "binary_decompress_zlib":  (binary_decompress_zlib,  (1, 1)),
-    "binary_compress_bz2":     (binary_compress_bz2,     (1, 2)),
-    "binary_decompress_bz2":   (binary_decompress_bz2,   (1, 1)),
+    "binary_compress_bz2":     (binary_compress_bz2,     (1, 2), "heavy"),
+    "binary_decompress_bz2":   (binary_decompress_bz2,   (1, 1), "heavy"),
 
     # Image processing
     "image_dimensions":  (image_dimensions,  (1, 1)),
-    "image_invert":      (image_invert,      (1, 1)),
-    "image_grayscale":   (image_grayscale,   (1, 1)),
-    "image_resize":      (image_resize,      (3, 3)),
-    "image_rotate":      (image_rotate,      (2, 2)),
+    "image_invert":      (image_invert,      (1, 1), "heavy"),
+    "image_grayscale":   (image_grayscale,   (1, 1), "heavy"),
+    "image_resize":      (image_resize,      (3, 3), "heavy"),
+    "image_rotate":      (image_rotate,      (2, 2), "heavy"),
+    "image_encode":      (image_encode,      (1, 3), "heavy"),
+    "image_pipeline":    (image_pipeline,    (2, 4), "heavy"),
 }
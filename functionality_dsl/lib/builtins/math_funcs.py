@@ -2,6 +2,8 @@ from typing import Optional
 import math
 import statistics
 
+from . import numpy_backend
+
 def _avg(xs) -> Optional[float]:
     xs = list(xs)
     if not xs:
@@ -27,6 +29,10 @@ def _stddev(xs) -> float:
     xs = list(xs)
     if len(xs) < 2:
         raise ValueError("stddev() requires at least 2 values")
+    if numpy_backend.use_numpy(xs):
+        result = numpy_backend.stddev(xs)
+        if result is not None:
+            return result
     return statistics.stdev(xs)
 
 def _variance(xs) -> float:
@@ -115,16 +121,22 @@ def _percentile(xs, p: float) -> float:
     if not (0 <= p <= 100):
         raise ValueError("percentile() p must be between 0 and 100")
 
-    xs_sorted = sorted(xs)
-    k = (len(xs_sorted) - 1) * (p / 100)
+    k = (len(xs) - 1) * (p / 100)
     f = math.floor(k)
     c = math.ceil(k)
 
+    selected = numpy_backend.select_sorted(xs, [f, c]) if numpy_backend.use_numpy(xs) else None
+    if selected is not None:
+        lo, hi = selected
+    else:
+        xs_sorted = sorted(xs)
+        lo, hi = xs_sorted[f], xs_sorted[c]
+
     if f == c:
-        return float(xs_sorted[int(k)])
+        return float(lo)
 
-    d0 = xs_sorted[int(f)] * (c - k)
-    d1 = xs_sorted[int(c)] * (k - f)
+    d0 = lo * (c - k)
+    d1 = hi * (k - f)
     return float(d0 + d1)
 
 def _mode(xs):
@@ -409,6 +421,9 @@ def _exp(x) -> float:
     """
     return math.exp(x)
 
+# Startup warm-up hook (see registry.warm_up_builtins)
+warm_up = numpy_backend.warm_up
+
 DSL_FUNCTIONS = {
     # Legacy names
     "avg":   (_avg, (1, 1)),
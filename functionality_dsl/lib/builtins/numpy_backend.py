@@ -0,0 +1,147 @@
+"""
+Optional NumPy fast paths for numeric builtins.
+
+Each helper returns the exact value the pure-Python builtin would return, or
+None when it cannot guarantee that (unsupported dtype, NaN, values large
+enough to overflow int64 or lose precision as float64). Callers fall back to
+the pure-Python implementation on None.
+
+Elementwise IEEE operations (subtract, divide) give the same bits in NumPy
+and Python; reductions do not (NumPy sums pairwise), so sums are only
+vectorized over integers, where they are exact.
+
+avg() has no fast path: the list -> array conversion alone costs more than
+the builtin sum(). exponentialAvg() is a sequential recurrence with no
+vectorized form that rounds identically.
+
+Fast paths engage when NumPy is installed and the input has at least
+NUMPY_MIN_SIZE items (env: FDSL_NUMPY_MIN_SIZE). NumPy itself is imported on
+the first input that large, or by warm_up().
+"""
+
+import importlib.util
+import math
+import os
+import statistics
+from fractions import Fraction
+
+np = None
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+NUMPY_MIN_SIZE = int(os.getenv("FDSL_NUMPY_MIN_SIZE", "2048"))
+
+# Largest magnitude that survives int -> float64 conversion exactly
+_EXACT_FLOAT_INT = 2 ** 53
+_INT64_MAX = 2 ** 63 - 1
+
+
+def warm_up():
+    """Import NumPy now instead of on the first large input."""
+    global np, NUMPY_AVAILABLE
+    if np is None and NUMPY_AVAILABLE:
+        try:
+            import numpy
+        except ImportError:
+            NUMPY_AVAILABLE = False
+        else:
+            np = numpy
+    return np
+
+
+def use_numpy(xs) -> bool:
+    """True if the NumPy path should be attempted for this input."""
+    return NUMPY_AVAILABLE and len(xs) >= NUMPY_MIN_SIZE and warm_up() is not None
+
+
+def _as_array(xs):
+    """Convert to an int64/float64 array, or None for anything else (bool, object, NaN)."""
+    try:
+        arr = np.asarray(xs)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if arr.ndim != 1 or arr.dtype.kind not in "if":
+        return None
+    if arr.dtype.kind == "f" and not np.isfinite(arr).all():
+        return None
+    return arr
+
+
+def _max_abs(arr) -> int:
+    return max(abs(int(arr.max())), abs(int(arr.min())))
+
+
+def stddev(xs):
+    """
+    Sample standard deviation of an integer list.
+
+    statistics.stdev() computes the exact rational variance and takes a
+    correctly rounded square root; the same rational is built here from
+    int64 sums.
+    """
+    arr = _as_array(xs)
+    if arr is None or arr.dtype.kind != "i":
+        return None
+    n = len(arr)
+    m = _max_abs(arr)
+    if m * m * n > _INT64_MAX:
+        return None
+    s = int(arr.sum())
+    q = int(np.dot(arr, arr))
+    mss = Fraction(n * q - s * s, n * (n - 1))
+    sqrt_of_frac = getattr(statistics, "_float_sqrt_of_frac", None)
+    if sqrt_of_frac is not None:
+        return sqrt_of_frac(mss.numerator, mss.denominator)
+    return math.sqrt(float(mss))
+
+
+def select_sorted(xs, positions):
+    """
+    Values at the given positions of sorted(xs), via an O(n) partition.
+    Returns None if the values cannot be ordered exactly.
+    """
+    arr = _as_array(xs)
+    if arr is None:
+        return None
+    if arr.dtype.kind == "f" and float(np.abs(arr).max()) >= _EXACT_FLOAT_INT:
+        # Mixed int/float input may have been rounded during conversion
+        return None
+    part = np.partition(arr, sorted(set(positions)))
+    return [part[p].item() for p in positions]
+
+
+def moving_avg(xs, window: int):
+    """Trailing moving average of an integer list via exact prefix sums."""
+    arr = _as_array(xs)
+    if arr is None or arr.dtype.kind != "i":
+        return None
+    if _max_abs(arr) * len(arr) >= _EXACT_FLOAT_INT:
+        return None
+    csum = np.concatenate(([0], np.cumsum(arr)))
+    n = len(arr)
+    idx = np.arange(1, n + 1)
+    start = np.maximum(idx - window, 0)
+    sums = csum[idx] - csum[start]
+    counts = idx - start
+    return (sums.astype(np.float64) / counts).tolist()
+
+
+def rate(values, times):
+    """
+    Pairwise (dv / dt) for parallel value/time lists without None entries.
+    Returns int 0 where dt == 0, matching the pure-Python builtin.
+    """
+    v = _as_array(values)
+    t = _as_array(times)
+    if v is None or t is None:
+        return None
+    for arr in (v, t):
+        # Differences must stay exactly representable as float64
+        if _max_abs(arr) * 2 >= _EXACT_FLOAT_INT:
+            return None
+    dv = np.diff(v)
+    dt = np.diff(t)
+    zero = dt == 0
+    result = (dv / np.where(zero, 1, dt)).tolist()
+    for i in np.flatnonzero(zero).tolist():
+        result[i] = 0
+    return result
@@ -1,9 +1,55 @@
 """PDF generation functions for FDSL."""
 
+import hashlib
 import io
 import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any
 
+# Rendered PDFs kept per process, keyed by a hash of (data, title, format)
+PDF_CACHE_SIZE = int(os.getenv("FDSL_PDF_CACHE_SIZE", "32"))
+
+_render_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_render_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _reportlab():
+    """Import reportlab and build the stylesheet once per process."""
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        from reportlab.lib import colors
+    except ImportError:
+        raise ImportError("Install reportlab: pip install reportlab")
+
+    table_style = TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+    ])
+    return {
+        "letter": letter,
+        "styles": getSampleStyleSheet(),
+        "table_style": table_style,
+        "SimpleDocTemplate": SimpleDocTemplate,
+        "Paragraph": Paragraph,
+        "Spacer": Spacer,
+        "Table": Table,
+    }
+
+
+def pdf_content_key(data: Any, title: str = None, format: str = "auto") -> str:
+    """Content hash of a toPdf() input; equal inputs render to equal documents."""
+    payload = json.dumps([data, title, format], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 def _to_pdf(data: Any, title: str = None, format: str = "auto") -> bytes:
     """
@@ -18,19 +64,34 @@ def _to_pdf(data: Any, title: str = None, format: str = "auto") -> bytes:
 
     Returns:
         PDF bytes
+
+    Renders of identical input are served from a per-process LRU cache.
     """
-    try:
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib.styles import getSampleStyleSheet
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib import colors
-    except ImportError:
-        raise ImportError("Install reportlab: pip install reportlab")
+    key = pdf_content_key(data, title, format)
+    with _render_lock:
+        cached = _render_cache.get(key)
+        if cached is not None:
+            _render_cache.move_to_end(key)
+            return cached
+
+    pdf_bytes = _render_pdf(data, title, format)
+
+    if PDF_CACHE_SIZE > 0:
+        with _render_lock:
+            _render_cache[key] = pdf_bytes
+            while len(_render_cache) > PDF_CACHE_SIZE:
+                _render_cache.popitem(last=False)
+    return pdf_bytes
+
+
+def _render_pdf(data: Any, title: str, format: str) -> bytes:
+    rl = _reportlab()
+    Paragraph, Spacer = rl["Paragraph"], rl["Spacer"]
 
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc = rl["SimpleDocTemplate"](buffer, pagesize=rl["letter"])
     story = []
-    styles = getSampleStyleSheet()
+    styles = rl["styles"]
 
     # --- Title ---
     if title:
@@ -81,14 +142,8 @@ def _to_pdf(data: Any, title: str = None, format: str = "auto") -> bytes:
         headers = list(data[0].keys())
         rows = [headers] + [[str(item.get(h, "")) for h in headers] for item in data]
 
-        table = Table(rows, repeatRows=1)
-        table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-            ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-            ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-        ]))
+        table = rl["Table"](rows, repeatRows=1)
+        table.setStyle(rl["table_style"])
 
         story.append(table)
 
@@ -100,6 +155,14 @@ def _to_pdf(data: Any, title: str = None, format: str = "auto") -> bytes:
     return pdf_bytes
 
 
+def warm_up():
+    """Import reportlab and build the stylesheet ahead of the first render."""
+    try:
+        _reportlab()
+    except ImportError:
+        pass
+
+
 DSL_PDF_FUNCS = {
-    "toPdf": (_to_pdf, (1, 3)),  # Allow 1–3 arguments (data, title?, format?)
+    "toPdf": (_to_pdf, (1, 3), "heavy"),  # Allow 1–3 arguments (data, title?, format?)
 }
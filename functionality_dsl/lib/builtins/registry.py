@@ -1,43 +1,93 @@
-from .core_funcs import DSL_FUNCTIONS as CORE_FUNCS
-from .math_funcs import DSL_FUNCTIONS as MATH_FUNCS
-from .string_funcs import DSL_FUNCTIONS as STRING_FUNCS
-from .time_funcs import DSL_FUNCTIONS as TIME_FUNCS
-from .json_funcs import DSL_FUNCTIONS as JSON_FUNCS
-from .collection_funcs import DSL_COLLECTION_FUNCS as COLLECTION_FUNCS
-from .validation_funcs import DSL_VALIDATION_FUNCS as VALIDATION_FUNCS
-from .timeseries_funcs import DSL_TIMESERIES_FUNCS as TIMESERIES_FUNCS
-from .geo_funcs import DSL_GEO_FUNCS as GEO_FUNCS
-from .window_funcs import DSL_WINDOW_FUNCS as WINDOW_FUNCS
-from .url_funcs import DSL_URL_FUNCS as URL_FUNCS
-from .binary_funcs import DSL_BINARY_FUNCS as BINARY_FUNCS
-from .pdf_funcs import DSL_PDF_FUNCS as PDF_FUNCS
+from importlib import import_module
 
+# Builtin groups as (module, table), in registration order
+BUILTIN_GROUPS = (
+    ("core_funcs", "DSL_FUNCTIONS"),
+    ("math_funcs", "DSL_FUNCTIONS"),
+    ("string_funcs", "DSL_FUNCTIONS"),
+    ("time_funcs", "DSL_FUNCTIONS"),
+    ("json_funcs", "DSL_FUNCTIONS"),
+    ("collection_funcs", "DSL_COLLECTION_FUNCS"),
+    ("validation_funcs", "DSL_VALIDATION_FUNCS"),
+    ("timeseries_funcs", "DSL_TIMESERIES_FUNCS"),
+    ("geo_funcs", "DSL_GEO_FUNCS"),
+    ("window_funcs", "DSL_WINDOW_FUNCS"),
+    ("url_funcs", "DSL_URL_FUNCS"),
+    ("binary_funcs", "DSL_BINARY_FUNCS"),
+    ("pdf_funcs", "DSL_PDF_FUNCS"),
+)
+
+# Builtins needing an optional distribution, imported inside the builtin on first call
+BUILTIN_REQUIREMENTS = {
+    "Pillow": frozenset({
+        "image_dimensions", "image_invert", "image_grayscale", "image_resize",
+        "image_rotate", "image_encode", "image_pipeline",
+    }),
+    "reportlab": frozenset({"toPdf"}),
+}
+
+try:
+    # Written into generated backends: only the groups the model calls
+    from .selection import ENABLED_GROUPS
+except ImportError:
+    ENABLED_GROUPS = None
+
+_GROUP_MODULES = {}
 DSL_FUNCTIONS = {}
-for group in [
-    CORE_FUNCS,
-    MATH_FUNCS,
-    STRING_FUNCS,
-    TIME_FUNCS,
-    JSON_FUNCS,
-    COLLECTION_FUNCS,
-    VALIDATION_FUNCS,
-    TIMESERIES_FUNCS,
-    GEO_FUNCS,
-    WINDOW_FUNCS,
-    URL_FUNCS,
-    BINARY_FUNCS,
-    PDF_FUNCS,
-]:
+DSL_FUNCTION_GROUP = {}
+for module_name, table in BUILTIN_GROUPS:
+    if ENABLED_GROUPS is not None and module_name not in ENABLED_GROUPS:
+        continue
+    module = import_module(f".{module_name}", __package__)
+    _GROUP_MODULES[module_name] = module
+    group = getattr(module, table)
     DSL_FUNCTIONS.update(group)
+    DSL_FUNCTION_GROUP.update(dict.fromkeys(group, module_name))
 
 DSL_FUNCTION_REGISTRY = {k: v[0] for k, v in DSL_FUNCTIONS.items()}
 DSL_FUNCTION_SIG = {k: v[1] for k, v in DSL_FUNCTIONS.items()}
 
+# Optional third tuple element: a tag or a tuple of tags
+#   "heavy"   CPU-bound; transforms calling it run in the executor pool
+#   "impure"  result is not a function of the arguments (clock, randomness);
+#             never folded, shared between expressions or reused from a cache
+DSL_FUNCTION_TAGS = {
+    k: frozenset((v[2],) if isinstance(v[2], str) else v[2]) if len(v) > 2 else frozenset()
+    for k, v in DSL_FUNCTIONS.items()
+}
+DSL_FUNCTION_COST = {k: ("heavy" if "heavy" in tags else "light") for k, tags in DSL_FUNCTION_TAGS.items()}
+HEAVY_FUNCTIONS = frozenset(k for k, cost in DSL_FUNCTION_COST.items() if cost == "heavy")
+IMPURE_FUNCTIONS = frozenset(k for k, tags in DSL_FUNCTION_TAGS.items() if "impure" in tags)
+
+
+def warm_up_builtins():
+    """
+    Import the optional dependencies of the loaded groups (Pillow, reportlab,
+    NumPy) now, so the first request does not pay for them. Groups expose this
+    as a module-level warm_up(); missing distributions are skipped.
+    """
+    warmed = []
+    for module_name, module in _GROUP_MODULES.items():
+        hook = getattr(module, "warm_up", None)
+        if hook is not None:
+            hook()
+            warmed.append(module_name)
+    return warmed
+
+
 # Export validators separately for validation-specific use
 __all__ = [
+    'BUILTIN_GROUPS',
+    'BUILTIN_REQUIREMENTS',
     'DSL_FUNCTIONS',
     'DSL_FUNCTION_REGISTRY',
     'DSL_FUNCTION_SIG',
+    'DSL_FUNCTION_COST',
+    'DSL_FUNCTION_TAGS',
+    'DSL_FUNCTION_GROUP',
+    'HEAVY_FUNCTIONS',
+    'IMPURE_FUNCTIONS',
     'VALIDATOR_FUNCTIONS',
     'VALIDATOR_SIGNATURES',
+    'warm_up_builtins',
 ]
@@ -137,10 +137,10 @@ def _addSeconds(timestamp, seconds) -> int:
 
 DSL_FUNCTIONS = {
     # Current time/date
-    "now":       (_now,        (0, 0)),
-    "today":     (_today,      (0, 0)),
-    "time":      (_time,       (0, 0)),
-    "hour":      (_hour,       (0, 0)),
+    "now":       (_now,        (0, 0), "impure"),
+    "today":     (_today,      (0, 0), "impure"),
+    "time":      (_time,       (0, 0), "impure"),
+    "hour":      (_hour,       (0, 0), "impure"),
     
     # Time manipulation
     "daysBetween":   (_daysBetween,   (2, 2)),
@@ -1,5 +1,9 @@
+import math
+from collections import deque
 from typing import Callable, Iterable, Union
 
+from . import numpy_backend
+
 def _timeWindow(xs: Iterable, start_ts: Union[int, float], end_ts: Union[int, float], time_field: str = "ts"):
     """
     Filter array to items within time range.
@@ -38,12 +42,98 @@ def _movingAvg(xs: Iterable, window: int):
     if not xs_list:
         return []
 
+    if numpy_backend.use_numpy(xs_list):
+        result = numpy_backend.moving_avg(xs_list, window)
+        if result is not None:
+            return result
+
+    # Running sum: add the incoming value, subtract the one leaving the window.
+    # Integer sums stay exact; float sums are re-summed once per `window`
+    # steps so rounding error cannot accumulate across the series.
+    result = []
+    total = 0
+    for i, x in enumerate(xs_list):
+        total += x
+        if i >= window:
+            total -= xs_list[i - window]
+            if i % window == 0:
+                total = sum(xs_list[i - window + 1:i + 1])
+        result.append(total / min(i + 1, window))
+
+    return result
+
+def _rollingExtreme(xs: Iterable, window: int, better: Callable, name: str):
+    """Trailing-window min/max via a monotonic deque of (index, value) pairs."""
+    if xs is None:
+        raise TypeError(f"_{name}() received None")
+    if window <= 0:
+        raise ValueError(f"{name}() window must be positive")
+
+    result = []
+    candidates = deque()
+    for i, x in enumerate(xs):
+        # Values that can no longer be the extreme of any later window
+        while candidates and not better(candidates[-1][1], x):
+            candidates.pop()
+        candidates.append((i, x))
+        if candidates[0][0] <= i - window:
+            candidates.popleft()
+        result.append(candidates[0][1])
+
+    return result
+
+def _rollingMin(xs: Iterable, window: int):
+    """
+    Minimum over a trailing window, one value per input item.
+
+    Example: rollingMin([3, 1, 4, 1, 5, 9], 3) => [3, 1, 1, 1, 1, 1]
+    """
+    return _rollingExtreme(xs, window, lambda kept, new: kept < new, "rollingMin")
+
+def _rollingMax(xs: Iterable, window: int):
+    """
+    Maximum over a trailing window, one value per input item.
+
+    Example: rollingMax([3, 1, 4, 1, 5, 9], 3) => [3, 3, 4, 4, 5, 9]
+    """
+    return _rollingExtreme(xs, window, lambda kept, new: kept > new, "rollingMax")
+
+def _rollingStd(xs: Iterable, window: int):
+    """
+    Sample standard deviation over a trailing window (Welford's algorithm).
+    Positions with fewer than 2 values in the window yield None.
+
+    Example: rollingStd([2, 4, 4, 4, 5, 5, 7, 9], 4)
+    """
+    if xs is None:
+        raise TypeError("_rollingStd() received None")
+    if window <= 0:
+        raise ValueError("rollingStd() window must be positive")
+
     result = []
-    for i in range(len(xs_list)):
-        start = max(0, i - window + 1)
-        window_data = xs_list[start:i + 1]
-        avg = sum(window_data) / len(window_data)
-        result.append(avg)
+    buf = deque()
+    mean = 0.0
+    m2 = 0.0
+    for i, x in enumerate(xs):
+        buf.append(x)
+        n = len(buf)
+        if n <= window:
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+        else:
+            # Window is full: replace the oldest value in a single update
+            old = buf.popleft()
+            n -= 1
+            new_mean = mean + (x - old) / n
+            m2 += (x - old) * (x - new_mean + old - mean)
+            mean = new_mean
+            if i % window == 0:
+                # Re-anchor so update error does not accumulate
+                mean = sum(buf) / n
+                m2 = sum((v - mean) ** 2 for v in buf)
+
+        result.append(math.sqrt(max(m2, 0.0) / (n - 1)) if n > 1 else None)
 
     return result
 
@@ -64,10 +154,15 @@ def _exponentialAvg(xs: Iterable, alpha: float):
     if not xs_list:
         return []
 
-    result = [xs_list[0]]
-    for i in range(1, len(xs_list)):
-        ema = alpha * xs_list[i] + (1 - alpha) * result[-1]
-        result.append(ema)
+    # The recurrence is inherently sequential; a vectorized form (e.g. a
+    # cumulative product of weights) rounds differently, so stay in Python.
+    beta = 1 - alpha
+    ema = xs_list[0]
+    result = [ema]
+    append = result.append
+    for x in xs_list[1:]:
+        ema = alpha * x + beta * ema
+        append(ema)
 
     return result
 
@@ -85,6 +180,14 @@ def _rate(xs: Iterable, value_field: str, time_field: str):
     if len(xs_list) < 2:
         return []
 
+    if numpy_backend.use_numpy(xs_list) and all(isinstance(x, dict) for x in xs_list):
+        values = [x.get(value_field) for x in xs_list]
+        times = [x.get(time_field) for x in xs_list]
+        if None not in values and None not in times:
+            result = numpy_backend.rate(values, times)
+            if result is not None:
+                return result
+
     result = []
     for i in range(1, len(xs_list)):
         prev = xs_list[i - 1]
@@ -127,6 +230,8 @@ def _downsample(xs: Iterable, interval: int):
     if interval <= 0:
         raise ValueError("downsample() interval must be positive")
 
+    if isinstance(xs, (list, tuple)):
+        return list(xs[::interval])
     return [x for i, x in enumerate(xs) if i % interval == 0]
 
 def _interpolate(xs: Iterable, target_count: int):
@@ -265,9 +370,15 @@ def _timeGroupBy(xs: Iterable, interval: int, time_field: str = "ts"):
     return result
 
 
+# Startup warm-up hook (see registry.warm_up_builtins)
+warm_up = numpy_backend.warm_up
+
 DSL_TIMESERIES_FUNCS = {
     "timeWindow":     (_timeWindow, (3, 4)),
     "movingAvg":      (_movingAvg, (2, 2)),
+    "rollingMin":     (_rollingMin, (2, 2)),
+    "rollingMax":     (_rollingMax, (2, 2)),
+    "rollingStd":     (_rollingStd, (2, 2)),
     "exponentialAvg": (_exponentialAvg, (2, 2)),
     "rate":           (_rate, (3, 3)),
     "downsample":     (_downsample, (2, 2)),
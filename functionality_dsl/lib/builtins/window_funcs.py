@@ -1,4 +1,53 @@
-from typing import Callable, Iterable
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+def _windowIter(xs: Iterable, size: int, step: int = 1) -> "_Windows":
+    """
+    Lazily yield sliding windows over array.
+    Reads the input once per pass and holds at most `size` items at a time, so
+    it can feed map/filter/find over large inputs without building every window.
+    Re-iterable: each consumer (e.g. two attributes sharing the call after
+    common-subexpression hoisting) gets every window, as long as `xs` is a
+    collection rather than a one-shot iterator.
+
+    Example: map(windowIter(readings, 60), w -> avg(w))
+    """
+    if xs is None:
+        raise TypeError("_windowIter() received None")
+    if size <= 0:
+        raise ValueError("windowIter() size must be positive")
+    if step <= 0:
+        raise ValueError("windowIter() step must be positive")
+    return _Windows(xs, size, step)
+
+class _Windows:
+    """The windows of `xs`, produced anew by every iteration."""
+
+    __slots__ = ("xs", "size", "step")
+
+    def __init__(self, xs: Iterable, size: int, step: int):
+        self.xs = xs
+        self.size = size
+        self.step = step
+
+    def __iter__(self) -> Iterator[list]:
+        return _iter_windows(iter(self.xs), self.size, self.step)
+
+def _iter_windows(it: Iterator, size: int, step: int) -> Iterator[list]:
+    buf = deque(islice(it, size), maxlen=size)
+    while len(buf) == size:
+        yield list(buf)
+        if step >= size:
+            # No overlap: drop the gap between windows and refill
+            buf.clear()
+            deque(islice(it, step - size), maxlen=0)
+            buf.extend(islice(it, size))
+        else:
+            fresh = list(islice(it, step))
+            if len(fresh) < step:
+                return
+            buf.extend(fresh)
 
 def _window(xs: Iterable, size: int, step: int = 1):
     """
@@ -15,13 +64,7 @@ def _window(xs: Iterable, size: int, step: int = 1):
     if step <= 0:
         raise ValueError("window() step must be positive")
 
-    xs_list = list(xs)
-    result = []
-
-    for i in range(0, len(xs_list) - size + 1, step):
-        result.append(xs_list[i:i + size])
-
-    return result
+    return list(_iter_windows(iter(xs), size, step))
 
 def _tumblingWindow(xs: Iterable, size: int):
     """
@@ -53,16 +96,27 @@ def _distinctCount(xs: Iterable, field: str = None) -> int:
         else:
             val = item
 
-        # Handle unhashable types
         try:
             seen.add(val)
         except TypeError:
-            # For unhashable types, do linear search
-            if val not in [v for v in seen]:
-                seen.add(str(val))  # Convert to string for hashing
+            seen.add(_freeze(val))
 
     return len(seen)
 
+# Tags keep frozen containers from colliding with real tuples/frozensets
+_DICT_TAG, _LIST_TAG, _SET_TAG = object(), object(), object()
+
+def _freeze(val):
+    """Hashable stand-in for unhashable values (dict, list, set), equal iff the values are equal."""
+    if isinstance(val, dict):
+        return (_DICT_TAG, frozenset((k, _freeze(v)) for k, v in val.items()))
+    if isinstance(val, (list, tuple)):
+        frozen = tuple(_freeze(v) for v in val)
+        return (_LIST_TAG, frozen) if isinstance(val, list) else frozen
+    if isinstance(val, (set, frozenset)):
+        return (_SET_TAG, frozenset(_freeze(v) for v in val))
+    return val
+
 def _sample(xs: Iterable, n: int):
     """
     Randomly sample n elements from array (without replacement).
@@ -105,8 +159,9 @@ def _partition(xs: Iterable, predicate: Callable):
 
 DSL_WINDOW_FUNCS = {
     "window":          (_window, (2, 3)),
+    "windowIter":      (_windowIter, (2, 3)),
     "tumblingWindow":  (_tumblingWindow, (2, 2)),
     "distinctCount":   (_distinctCount, (1, 2)),
-    "sample":          (_sample, (2, 2)),
+    "sample":          (_sample, (2, 2), "impure"),
     "partition":       (_partition, (2, 2)),
 }
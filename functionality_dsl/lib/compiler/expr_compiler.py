@@ -1,6 +1,8 @@
 import ast
 import logging
 
+from functionality_dsl.lib.builtins.registry import IMPURE_FUNCTIONS
+
 _logger = logging.getLogger("fdsl.gen.expr_compiler")
 
 # ---------------- AST safety ----------------
@@ -24,7 +26,7 @@ def _assert_safe_ast(tree: ast.AST):
 
 # ---------------- Compiler ----------------
 
-def compile_expr_to_python(expr, validate_context=None) -> str:
+def compile_expr_to_python(expr, validate_context=None, optimize=True) -> str:
     """
     Compile DSL expression to Python code using AST nodes.
 
@@ -36,6 +38,8 @@ def compile_expr_to_python(expr, validate_context=None) -> str:
         validate_context: Optional dict of valid identifiers for semantic validation.
                          If provided, validates all Name nodes exist in context.
                          Format: {'entity_name': True, 'source_name': True, ...}
+        optimize: Fold constant subexpressions, drop dead conditional branches and
+                  fuse nested image builtins into a single image_pipeline() call.
     """
 
     SKIP_KEYS = {"parent", "parent_ref", "parent_obj", "model", "_tx_fqn", "_tx_position"}
@@ -401,6 +405,9 @@ def compile_expr_to_python(expr, validate_context=None) -> str:
             # Raise the first error (they're all location-aware)
             raise validation_errors[0]
 
+    if optimize:
+        expr_node = _optimize_tree(expr_node)
+
     # Convert AST to Python code string
     py_code = ast.unparse(expr_node.body)
 
@@ -519,4 +526,357 @@ def _find_similar_names(target: str, candidates: list[str], max_suggestions: int
 
     # Sort by distance and return top suggestions
     similar.sort(key=lambda x: x[1])
-    return [name for name, _ in similar[:max_suggestions]]
\ No newline at end of file
+    return [name for name, _ in similar[:max_suggestions]]
+
+# ---------------- Optimizer ----------------
+
+# Folded constants larger than this stay as expressions (avoids bloating generated code).
+_MAX_FOLDED_LEN = 256
+
+_BIN_OPS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.Mod: lambda a, b: a % b,
+}
+
+_CMP_OPS = {
+    ast.Eq: lambda a, b: a == b,
+    ast.NotEq: lambda a, b: a != b,
+    ast.Lt: lambda a, b: a < b,
+    ast.LtE: lambda a, b: a <= b,
+    ast.Gt: lambda a, b: a > b,
+    ast.GtE: lambda a, b: a >= b,
+}
+
+
+def _is_const(node) -> bool:
+    return isinstance(node, ast.Constant)
+
+
+def _foldable(value) -> bool:
+    """Only emit constants that unparse back to the same value."""
+    if isinstance(value, bool) or value is None:
+        return True
+    if isinstance(value, int):
+        return len(str(value)) <= _MAX_FOLDED_LEN
+    if isinstance(value, float):
+        return value == value and value not in (float("inf"), float("-inf"))
+    if isinstance(value, str):
+        return len(value) <= _MAX_FOLDED_LEN
+    return False
+
+
+def _too_large_to_fold(op, left, right) -> bool:
+    """Whether evaluating a literal operation could build a huge value (e.g. "x" * 10**9)."""
+    if isinstance(op, ast.Mult):
+        for seq, count in ((left, right), (right, left)):
+            if isinstance(seq, str) and isinstance(count, int):
+                return len(seq) * count > _MAX_FOLDED_LEN
+    # printf-style formatting can pad to any width ("%1000000000d" % 1)
+    return isinstance(op, ast.Mod) and isinstance(left, str)
+
+
+class _ConstantFolder(ast.NodeTransformer):
+    """
+    Fold operations on literal operands and remove branches whose condition is a literal.
+
+    Any operation that would raise (e.g. 1 / 0, "a" < 1) is left in place so the
+    error still surfaces at runtime, and so is one whose result could be too
+    large to build at compile time.
+    """
+
+    def _const(self, value, node):
+        if not _foldable(value):
+            return node
+        return ast.copy_location(ast.Constant(value=value), node)
+
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        op = _BIN_OPS.get(type(node.op))
+        if op and _is_const(node.left) and _is_const(node.right):
+            if _too_large_to_fold(node.op, node.left.value, node.right.value):
+                return node
+            try:
+                return self._const(op(node.left.value, node.right.value), node)
+            except Exception:
+                return node
+        return node
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if _is_const(node.operand):
+            try:
+                if isinstance(node.op, ast.Not):
+                    return self._const(not node.operand.value, node)
+                if isinstance(node.op, ast.USub):
+                    return self._const(-node.operand.value, node)
+            except Exception:
+                return node
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        operands = [node.left, *node.comparators]
+        # The compiler wraps plain operands in operator-less Compare nodes
+        if not node.ops or not all(_is_const(o) for o in operands):
+            return node
+        try:
+            result = all(
+                _CMP_OPS[type(op)](a.value, b.value)
+                for op, a, b in zip(node.ops, operands, operands[1:])
+            )
+        except Exception:
+            return node
+        return self._const(result, node)
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        is_and = isinstance(node.op, ast.And)
+        values = list(node.values)
+        # Leading literals decide the result or are skipped; later ones must stay
+        # because `x and True` evaluates to x, not True.
+        while values and _is_const(values[0]):
+            head = values[0]
+            if bool(head.value) != is_and or len(values) == 1:
+                return head
+            values.pop(0)
+        if len(values) == 1:
+            return values[0]
+        node.values = values
+        return node
+
+    def visit_IfExp(self, node):
+        self.generic_visit(node)
+        if _is_const(node.test):
+            return node.body if node.test.value else node.orelse
+        return node
+
+
+# Image builtins that map image bytes to image bytes (binary_funcs.IMAGE_OPS).
+# Nested calls are fused into one image_pipeline() so the image is decoded and
+# encoded once instead of once per builtin.
+_IMAGE_OPS = {"image_invert", "image_grayscale", "image_resize", "image_rotate"}
+
+
+def _dsl_call_name(node):
+    if _is_dsl_call(node) and isinstance(node.func.slice, ast.Constant) and not node.keywords:
+        return node.func.slice.value
+    return None
+
+
+def _dsl_call(name: str, args: list) -> ast.Call:
+    func = ast.Subscript(value=ast.Name(id="dsl_funcs", ctx=ast.Load()), slice=ast.Constant(value=name), ctx=ast.Load())
+    return ast.Call(func=func, args=args, keywords=[])
+
+
+class _ImageChainFuser(ast.NodeTransformer):
+    """
+    Rewrite image_b(image_a(x, ...), ...) into
+    image_pipeline(x, [['image_a', ...], ['image_b', ...]]), and fold an outer
+    image_encode(chain, format, quality) into the pipeline's encoder arguments.
+    """
+
+    @staticmethod
+    def _as_pipeline(node):
+        """(source, steps) if node already is, or can become, an open pipeline."""
+        name = _dsl_call_name(node)
+        if name == "image_pipeline" and len(node.args) == 2 and isinstance(node.args[1], ast.List):
+            return node.args[0], node.args[1].elts
+        if name in _IMAGE_OPS and node.args:
+            return node.args[0], [ast.List(elts=[ast.Constant(value=name), *node.args[1:]], ctx=ast.Load())]
+        return None
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        name = _dsl_call_name(node)
+        if name not in _IMAGE_OPS and name != "image_encode":
+            return node
+        if not node.args or _dsl_call_name(node.args[0]) not in (_IMAGE_OPS | {"image_pipeline"}):
+            return node
+        inner = self._as_pipeline(node.args[0])
+        if inner is None:
+            return node
+        source, steps = inner
+
+        if name == "image_encode":
+            args = [source, ast.List(elts=steps, ctx=ast.Load()), *node.args[1:]]
+        else:
+            step = ast.List(elts=[ast.Constant(value=name), *node.args[1:]], ctx=ast.Load())
+            args = [source, ast.List(elts=[*steps, step], ctx=ast.Load())]
+        return ast.copy_location(_dsl_call("image_pipeline", args), node)
+
+
+def _optimize_tree(tree):
+    tree = _ConstantFolder().visit(tree)
+    tree = _ImageChainFuser().visit(tree)
+    return ast.fix_missing_locations(tree)
+
+
+def optimize_expr(py_code: str) -> str:
+    """Optimize an already compiled expression string."""
+    tree = _optimize_tree(ast.parse(py_code, mode="eval"))
+    return ast.unparse(tree.body)
+
+
+def _is_dsl_call(node) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Subscript)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "dsl_funcs"
+    )
+
+
+def called_builtins(py_code: str) -> set[str]:
+    """Names of the builtins a compiled expression calls (dsl_funcs['name'](...))."""
+    tree = ast.parse(py_code, mode="eval")
+    return {
+        node.func.slice.value
+        for node in ast.walk(tree)
+        if _is_dsl_call(node) and isinstance(node.func.slice, ast.Constant)
+    }
+
+
+def _cse_candidate(node, entity_name: str) -> bool:
+    """A subexpression may be shared if it calls a builtin, calls no builtin tagged
+    "impure" in the registry (clock, randomness), and does not read the entity
+    being built (whose attributes change between evaluations)."""
+    has_call = False
+    for sub in ast.walk(node):
+        if isinstance(sub, ast.Name) and sub.id == entity_name:
+            return False
+        if _is_dsl_call(sub):
+            fname = sub.func.slice
+            if not isinstance(fname, ast.Constant) or fname.value in IMPURE_FUNCTIONS:
+                return False
+            has_call = True
+    return has_call and not isinstance(node, ast.Lambda)
+
+
+def _collect_occurrences(tree, entity_name: str, pos: int, out: dict):
+    """
+    Record every candidate subexpression as key -> [(pos, eager)].
+
+    eager is False inside conditional branches and right-hand BoolOp operands,
+    which may never run. Lambda bodies are skipped: their names are bound per call.
+    """
+    def walk(node, eager):
+        if isinstance(node, ast.Lambda):
+            return
+        if isinstance(node, ast.expr) and _cse_candidate(node, entity_name):
+            out.setdefault(ast.dump(node), []).append((pos, eager))
+        if isinstance(node, ast.IfExp):
+            walk(node.test, eager)
+            walk(node.body, False)
+            walk(node.orelse, False)
+        elif isinstance(node, ast.BoolOp):
+            walk(node.values[0], eager)
+            for v in node.values[1:]:
+                walk(v, False)
+        else:
+            for child in ast.iter_child_nodes(node):
+                walk(child, eager)
+
+    walk(tree, True)
+
+
+class _ReplaceSubexpr(ast.NodeTransformer):
+    def __init__(self, key: str, name: str):
+        self.key = key
+        self.name = name
+
+    def visit(self, node):
+        if isinstance(node, ast.expr) and ast.dump(node) == self.key:
+            return ast.copy_location(ast.Name(id=self.name, ctx=ast.Load()), node)
+        if isinstance(node, ast.Lambda):
+            return node
+        return self.generic_visit(node)
+
+
+def hoist_common_subexpressions(entity_name: str, attributes: list) -> list:
+    """
+    Share repeated builtin calls across the computed attributes of one entity.
+
+    Args:
+        entity_name: Entity whose attributes are being compiled
+        attributes: [{"name": str, "expr": str}, ...] in evaluation order
+
+    Returns:
+        New attribute list where each repeated subexpression is computed once into a
+        temporary ({"name": "_cseN", "expr": str, "temp": True, "used_by": str})
+        placed just before its first use; used_by names the first attribute that
+        needs it, so evaluation errors are reported against that attribute. A
+        subexpression is only hoisted if that first use is unconditional, so
+        hoisting never evaluates something the original skipped.
+    """
+    entries = [
+        {"name": a["name"], "tree": ast.parse(a["expr"], mode="eval").body, "temp": False}
+        for a in attributes
+    ]
+    counter = 0
+
+    while True:
+        occurrences: dict = {}
+        for pos, entry in enumerate(entries):
+            _collect_occurrences(entry["tree"], entity_name, pos, occurrences)
+
+        # Largest repeated expression first, so inner pieces are only hoisted
+        # when they also occur outside it.
+        shared = [
+            (key, uses) for key, uses in occurrences.items()
+            if len(uses) > 1 and any(eager for pos, eager in uses if pos == uses[0][0])
+        ]
+        if not shared:
+            break
+        key, uses = max(shared, key=lambda item: len(item[0]))
+
+        temp_name = f"_cse{counter}"
+        counter += 1
+        first_pos = uses[0][0]
+        template = None
+        for entry in entries:
+            for sub in ast.walk(entry["tree"]):
+                if isinstance(sub, ast.expr) and ast.dump(sub) == key:
+                    template = sub
+                    break
+            if template is not None:
+                break
+
+        replacer = _ReplaceSubexpr(key, temp_name)
+        for entry in entries:
+            entry["tree"] = replacer.visit(entry["tree"])
+        entries.insert(first_pos, {"name": temp_name, "tree": template, "temp": True})
+
+    used_by = _temp_users(entries)
+    result = []
+    for entry in entries:
+        item = {"name": entry["name"], "expr": ast.unparse(entry["tree"])}
+        if entry["temp"]:
+            item["temp"] = True
+            item["used_by"] = used_by.get(entry["name"], entry["name"])
+        result.append(item)
+    return result
+
+
+def _temp_users(entries: list) -> dict:
+    """First attribute (not temporary) needing each temporary, directly or through another one."""
+    temps = {entry["name"] for entry in entries if entry["temp"]}
+    reads = {
+        entry["name"]: {n.id for n in ast.walk(entry["tree"]) if isinstance(n, ast.Name) and n.id in temps}
+        for entry in entries
+    }
+    used_by = {}
+    for entry in entries:
+        if entry["temp"]:
+            continue
+        needed, pending = set(), list(reads[entry["name"]])
+        while pending:
+            temp = pending.pop()
+            if temp not in needed:
+                needed.add(temp)
+                pending.extend(reads[temp])
+        for temp in needed:
+            used_by.setdefault(temp, entry["name"])
+    return used_by
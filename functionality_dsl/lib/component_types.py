@@ -567,6 +567,8 @@ class LiveChartComponent(_BaseComponent):
             "xLabel": self.xLabel,
             "yLabel": self.yLabel,
             "windowSize": self.windowSize,
+            # Ask for recent history only where the channel keeps it
+            "replay": bool(getattr(self.entity_ref, "replay", None)),
             "height": self.height,
             "fullWidth": self.fullWidth,
         }
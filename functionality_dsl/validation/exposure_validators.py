@@ -38,6 +38,21 @@ def _find_source_in_parents(parents):
     return None
 
 
+def _find_ws_sourced_parents(parents):
+    """Ancestors that read a WebSocket source directly (the sources a composite joins)."""
+    sourced = []
+    for parent in parents:
+        source = getattr(parent, "source", None)
+        if source is not None:
+            if getattr(source, "kind", None) == "WS" and parent not in sourced:
+                sourced.append(parent)
+            continue
+        for ancestor in _find_ws_sourced_parents(_get_parent_entities(parent)):
+            if ancestor not in sourced:
+                sourced.append(ancestor)
+    return sourced
+
+
 def _validate_exposure_blocks(model, metamodel=None):
     """
     Validate entity exposure (access-based).
@@ -84,6 +99,9 @@ def _validate_ws_entities(model, metamodel=None):
 
     Channels are ALWAYS auto-generated from entity name.
     Path pattern: /ws/{entity_name_lowercase}
+
+    Channel options (delta:, maxRate:, conflate:, batchMs:, join:, filters:, replay:) are
+    only valid on inbound entities.
     """
     entities = get_children_of_type("Entity", model)
 
@@ -123,6 +141,80 @@ def _validate_ws_entities(model, metamodel=None):
             # Outbound entities can have source (for sending) or be standalone (for client publish)
             pass  # No additional validation required
 
+    # Channel options only shape what subscribers receive
+    for entity in entities:
+        for option in ("delta", "maxRate", "conflate", "batchMs", "join", "filters", "replay"):
+            if getattr(entity, option, None) and getattr(entity, "flow", None) != "inbound":
+                raise TextXSemanticError(
+                    f"Entity '{entity.name}': '{option}:' is only valid on 'flow: inbound' entities "
+                    f"(it changes the frames sent to subscribers).",
+                    **get_location(entity),
+                )
+
+        for option in ("maxRate", "batchMs", "joinWindowMs"):
+            value = getattr(entity, option, None) or 0
+            if value < 0:
+                raise TextXSemanticError(
+                    f"Entity '{entity.name}': '{option}:' must be a positive integer, got {value}.",
+                    **get_location(entity),
+                )
+
+        attribute_names = [a.name for a in getattr(entity, "attributes", []) or []]
+        conflate = getattr(entity, "conflate", None)
+        if conflate and conflate not in attribute_names:
+            raise TextXSemanticError(
+                f"Entity '{entity.name}': 'conflate: {conflate}' must name one of its attributes.",
+                **get_location(entity),
+            )
+        for field in getattr(entity, "filters", None) or []:
+            if field not in attribute_names:
+                raise TextXSemanticError(
+                    f"Entity '{entity.name}': filter '{field}' must name one of its attributes.",
+                    **get_location(entity),
+                )
+
+        join = getattr(entity, "join", None)
+        if join and len(_find_ws_sourced_parents(_get_parent_entities(entity))) < 2:
+            raise TextXSemanticError(
+                f"Entity '{entity.name}': 'join:' only applies to entities composed from "
+                f"several WebSocket sources.",
+                **get_location(entity),
+            )
+        if (join == "window") != bool(getattr(entity, "joinWindowMs", None)):
+            raise TextXSemanticError(
+                f"Entity '{entity.name}': 'join: window' and 'joinWindowMs:' must be used together.",
+                **get_location(entity),
+            )
+
+        replay = getattr(entity, "replay", None)
+        if replay and int(replay.rstrip("smh")) == 0:
+            raise TextXSemanticError(
+                f"Entity '{entity.name}': 'replay: {replay}' must keep at least one message or second.",
+                **get_location(entity),
+            )
+
+        if replay:
+            # Channels are /ws/{entity name lowercased}; a publisher there turns off shared joins
+            publishers = [
+                other.name for other in entities
+                if other is not entity
+                and getattr(other, "flow", None) == "outbound"
+                and other.name.lower() == entity.name.lower()
+            ]
+            if publishers:
+                raise TextXSemanticError(
+                    f"Entity '{entity.name}': 'replay:' is not supported on channel '/ws/{entity.name.lower()}', "
+                    f"which also publishes ({', '.join(publishers)}).",
+                    **get_location(entity),
+                )
+
+        if getattr(entity, "delta", None) and getattr(entity, "batchMs", None):
+            raise TextXSemanticError(
+                f"Entity '{entity.name}': 'delta:' and 'batchMs:' cannot be combined "
+                f"(batched frames carry several messages, not an entity state).",
+                **get_location(entity),
+            )
+
 
 def _validate_entity_access_blocks(model, metamodel=None):
     """
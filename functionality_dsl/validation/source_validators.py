@@ -3,6 +3,9 @@ Source validation rules for REST and WebSocket sources.
 Enforces operations constraints and syntax requirements.
 """
 
+import json
+import re
+
 from textx import get_location, get_children_of_type
 from textx.exceptions import TextXSemanticError
 
@@ -23,16 +26,25 @@ def validate_source_syntax(model, metamodel=None):
     4. WS operations can only be: subscribe, publish
     5. At least one operation must be defined
     6. Source auth references MUST have 'secret:' field (for outbound auth)
+    7. Entities of a `stream: true` REST source MUST wrap its array: no
+       parents and a single schema-only array attribute
+    8. WS `subscribeMessage:` values MUST be JSON, and their {placeholders}
+       MUST be declared source params
     """
+    entities = get_children_of_type("Entity", model)
+
     # Validate REST sources
     for source in get_children_of_type("SourceREST", model):
         _validate_rest_source(source)
         _validate_source_auth(source)
+        if getattr(source, "stream", False):
+            _validate_stream_source(source, entities)
 
     # Validate WS sources
     for source in get_children_of_type("SourceWS", model):
         _validate_ws_source(source)
         _validate_source_auth(source)
+        _validate_subscribe_messages(source)
 
 
 def _validate_rest_source(source):
@@ -66,6 +78,27 @@ def _validate_rest_source(source):
             )
 
 
+def _validate_stream_source(source, entities):
+    """Validate that every entity of a streamed REST source wraps its array."""
+    for entity in entities:
+        if getattr(entity, "source", None) is not source:
+            continue
+        attributes = getattr(entity, "attributes", []) or []
+        attr = attributes[0] if len(attributes) == 1 else None
+        type_spec = getattr(attr, "type", None)
+        is_array = type_spec is not None and (
+            getattr(type_spec, "baseType", None) == "array"
+            or getattr(type_spec, "itemEntity", None) is not None
+        )
+        if getattr(entity, "parents", None) or not is_array or getattr(attr, "expr", None) is not None:
+            raise TextXSemanticError(
+                f"Entity '{entity.name}' uses Source<REST> '{source.name}' which has 'stream: true'. "
+                f"Streamed sources return a JSON array: the entity must have no parents and "
+                f"a single attribute without an expression, e.g. '- items: array<Item>;'.",
+                **get_location(entity)
+            )
+
+
 def _validate_ws_source(source):
     """Validate a single WebSocket source."""
     # Check channel/url is present (should be enforced by grammar, but double-check)
@@ -97,6 +130,29 @@ def _validate_ws_source(source):
             )
 
 
+def _validate_subscribe_messages(source):
+    """Validate the messages a WS source sends after each (re)connect."""
+    params_list = getattr(source, "params", None)
+    declared = set(getattr(params_list, "params", None) or [])
+
+    for message in getattr(source, "subscribeMessages", None) or []:
+        for placeholder in re.findall(r"\{(\w+)\}", message):
+            if placeholder not in declared:
+                raise TextXSemanticError(
+                    f"Source<WS> '{source.name}': subscribeMessage uses '{{{placeholder}}}', "
+                    f"which is not in its 'params:'.",
+                    **get_location(source)
+                )
+        try:
+            # Placeholders are replaced by param values at runtime
+            json.loads(re.sub(r"\{\w+\}", "0", message))
+        except ValueError as e:
+            raise TextXSemanticError(
+                f"Source<WS> '{source.name}': subscribeMessage is not valid JSON ({e}).",
+                **get_location(source)
+            )
+
+
 def _extract_operations(source):
     """Extract operations list from source."""
     operations_obj = getattr(source, "operations", None)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark the generated backend's JSON codec (orjson) against the stdlib backend.
+
+Each case is one step of a request as the generated app performs it: parsing
+a REST source response, rendering the API response, parsing and sending a
+WebSocket frame. Both backends run the same app/core/json_codec.py (the
+stdlib one via FDSL_JSON_BACKEND=stdlib), and their results are checked for
+equality.
+
+Usage:
+    python scripts/bench_json_codec.py [--items 1 50 1000] [--repeat 5]
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import timeit
+from pathlib import Path
+
+CODEC_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "functionality_dsl" / "base" / "backend" / "app" / "core" / "json_codec.py"
+)
+
+
+def load_codec(backend):
+    os.environ["FDSL_JSON_BACKEND"] = backend
+    spec = importlib.util.spec_from_file_location(f"json_codec_{backend}", CODEC_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_payload(n, rng):
+    return [
+        {
+            "id": i,
+            "name": f"sensor-{i}",
+            "location": {"lat": rng.uniform(-90, 90), "lon": rng.uniform(-180, 180)},
+            "temperature": round(rng.uniform(-20, 45), 2),
+            "tags": ["outdoor", "v2", "ΔT"],
+            "online": rng.random() > 0.1,
+        }
+        for i in range(n)
+    ]
+
+
+def cases(codec, payload):
+    body = codec.dumpb(payload)
+    frame = codec.dumps(payload[0])
+    response = codec.JSONResponse(content=None)
+    return [
+        ("source response", lambda: codec.loads(body)),
+        ("API response", lambda: response.render(payload)),
+        ("WS frame in", lambda: codec.loads(frame)),
+        ("WS frame out", lambda: codec.dumps(payload[0])),
+    ]
+
+
+def best_of(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 50, 1_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stdlib = load_codec("stdlib")
+    fast = load_codec("auto")
+    if fast.BACKEND == "stdlib":
+        print("orjson is not installed - only the stdlib backend can run.")
+        return
+
+    rng = random.Random(0)
+    print(f"{'step':<18}{'items':>6}{'stdlib (us)':>13}{'orjson (us)':>13}{'speedup':>9}  identical")
+
+    for n in args.items:
+        payload = make_payload(n, rng)
+        total_slow = total_fast = 0.0
+        for (name, slow_fn), (_, fast_fn) in zip(cases(stdlib, payload), cases(fast, payload)):
+            slow = best_of(slow_fn, args.repeat)
+            quick = best_of(fast_fn, args.repeat)
+            total_slow += slow
+            total_fast += quick
+            print(
+                f"{name:<18}{n:>6}{slow * 1e6:>13.1f}{quick * 1e6:>13.1f}"
+                f"{slow / quick:>8.1f}x  {slow_fn() == fast_fn()}"
+            )
+        print(
+            f"{'per request':<18}{n:>6}{total_slow * 1e6:>13.1f}{total_fast * 1e6:>13.1f}"
+            f"{total_slow / total_fast:>8.1f}x  saves {(total_slow - total_fast) * 1e6:.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
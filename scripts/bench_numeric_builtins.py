@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark the NumPy fast paths of the numeric builtins against pure Python.
+
+Each builtin is timed with the NumPy path forced off and forced on, and the
+two results are checked for equality.
+
+Usage:
+    python scripts/bench_numeric_builtins.py [--sizes 1000 10000 100000] [--repeat 5]
+"""
+
+import argparse
+import random
+import timeit
+
+from functionality_dsl.lib.builtins import numpy_backend
+from functionality_dsl.lib.builtins.registry import DSL_FUNCTION_REGISTRY
+
+
+def make_cases(n, rng):
+    ints = [rng.randint(-10_000, 10_000) for _ in range(n)]
+    floats = [rng.uniform(-1e3, 1e3) for _ in range(n)]
+    readings = [{"v": v, "ts": i} for i, v in enumerate(ints)]
+    return [
+        ("stddev", "ints", (ints,)),
+        ("percentile", "ints", (ints, 95)),
+        ("percentile", "floats", (floats, 95)),
+        ("movingAvg", "ints", (ints, 50)),
+        ("rate", "readings", (readings, "v", "ts")),
+    ]
+
+
+def best_of(func, args, repeat):
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not numpy_backend.NUMPY_AVAILABLE:
+        print("NumPy is not installed - only the pure-Python path can run.")
+        return
+
+    rng = random.Random(0)
+    print(f"{'builtin':<16}{'data':<10}{'n':>8}{'python (ms)':>14}{'numpy (ms)':>13}{'speedup':>9}  identical")
+
+    for n in args.sizes:
+        for name, data, call_args in make_cases(n, rng):
+            func = DSL_FUNCTION_REGISTRY[name]
+
+            numpy_backend.NUMPY_AVAILABLE = False
+            slow_result = func(*call_args)
+            slow = best_of(func, call_args, args.repeat)
+
+            numpy_backend.NUMPY_AVAILABLE = True
+            numpy_backend.NUMPY_MIN_SIZE = 0
+            fast_result = func(*call_args)
+            fast = best_of(func, call_args, args.repeat)
+
+            print(
+                f"{name:<16}{data:<10}{n:>8}{slow * 1e3:>14.3f}{fast * 1e3:>13.3f}"
+                f"{slow / fast:>8.1f}x  {fast_result == slow_result}"
+            )
+
+
+if __name__ == "__main__":
+    main()
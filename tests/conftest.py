@@ -2,6 +2,9 @@
 Pytest configuration and shared fixtures for FDSL v2 test suite.
 """
 
+import importlib
+import sys
+
 import pytest
 import tempfile
 import shutil
@@ -10,6 +13,51 @@ from pathlib import Path
 from functionality_dsl.language import build_model, build_model_str, get_metamodel
 
 
+@pytest.fixture(scope="session", autouse=True)
+def fdsl_cache_dir(tmp_path_factory):
+    """Keep the fdsl user cache (templates, validated models) out of the home directory."""
+    mp = pytest.MonkeyPatch()
+    cache = tmp_path_factory.mktemp("fdsl_cache")
+    mp.setenv("FDSL_CACHE_DIR", str(cache))
+    yield cache
+    mp.undo()
+
+
+def _drop_app_modules():
+    for name in [m for m in sys.modules if m == "app" or m.startswith("app.")]:
+        del sys.modules[name]
+
+
+@pytest.fixture
+def backend_app():
+    """
+    Import modules of a backend tree as `app.*` for one test.
+
+    Call as backend_app("app.core.ws_join") for the base backend, or with
+    root=<generated backend dir> for generated code. Skips the test when the
+    backend's dependencies (pydantic-settings, ...) are not installed.
+    """
+    roots = []
+
+    def _import(module: str, root: Path = None):
+        root = str(root or Path(__file__).parent.parent / "functionality_dsl" / "base" / "backend")
+        if root not in roots:
+            _drop_app_modules()
+            sys.path.insert(0, root)
+            roots.append(root)
+        try:
+            return importlib.import_module(module)
+        except ModuleNotFoundError as e:
+            if e.name and e.name.split(".")[0] == "app":
+                raise
+            pytest.skip(f"backend dependency not installed: {e.name}")
+
+    yield _import
+    for root in roots:
+        sys.path.remove(root)
+    _drop_app_modules()
+
+
 @pytest.fixture(scope="session")
 def project_root():
     """Return the project root directory."""
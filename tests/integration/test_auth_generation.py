@@ -5,6 +5,10 @@ Tests that FDSL Auth declarations correctly generate authentication middleware,
 database modules, and password hashing utilities.
 """
 
+import asyncio
+import secrets
+from datetime import datetime, timezone
+
 import pytest
 from pathlib import Path
 
@@ -141,6 +145,366 @@ class TestAuthModuleGeneration:
         auth_file = temp_output_dir / "app" / "core" / "auth.py"
         assert auth_file.exists(), "Auth module should be generated"
 
+    def test_multi_auth_uses_rbac_decision_table(self, temp_output_dir):
+        """Test that multi-auth routes resolve access from the precomputed RBAC table."""
+        fdsl = """
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Auth<http> BasicAuth
+          scheme: basic
+        end
+
+        Auth<http> BearerAuth
+          scheme: bearer
+        end
+
+        Role admin uses BasicAuth
+        Role user uses BearerAuth
+
+        Source<REST> DataAPI
+          url: "http://test/data"
+          operations: [read]
+        end
+
+        Entity Data
+          source: DataAPI
+          attributes:
+            - id: integer;
+          access: [admin, user]
+        end
+        """
+
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        rbac_file = temp_output_dir / "app" / "core" / "rbac.py"
+        assert rbac_file.exists(), "RBAC decision table should be generated"
+        rbac_code = rbac_file.read_text()
+        compile(rbac_code, "rbac.py", "exec")
+
+        # Cheap token lookup is tried before the password-hashing scheme
+        assert rbac_code.index('("BearerAuth"') < rbac_code.index('("BasicAuth"')
+
+        router_code = (temp_output_dir / "app" / "api" / "routers" / "data_router.py").read_text()
+        assert 'require_access("Data", "read")' in router_code
+        assert "Depends(get_optional_user_" not in router_code
+
+    def test_credential_checks_use_session_store(self, temp_output_dir):
+        """Test that bearer and API key validation consult the session store first."""
+        fdsl = """
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Auth<http> BearerAuth
+          scheme: bearer
+        end
+
+        Auth<apikey> SessionAuth
+          in: cookie
+          name: "session_id"
+        end
+
+        Role user uses BearerAuth
+        Role member uses SessionAuth
+
+        Source<REST> DataAPI
+          url: "http://test/data"
+          operations: [read]
+        end
+
+        Entity Data
+          source: DataAPI
+          attributes:
+            - id: integer;
+          access: [user, member]
+        end
+        """
+
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        core_dir = temp_output_dir / "app" / "core"
+        for name in ("auth_bearerauth.py", "auth_sessionauth.py"):
+            code = (core_dir / name).read_text()
+            assert "get_session_store" in code
+            assert "store.set(store_key" in code
+            compile(code, name, "exec")
+
+
+class TestRBACDecisionTableBehavior:
+    """Test the generated app/core/rbac.py by importing and calling it."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Auth<http> BearerAuth
+      scheme: bearer
+    end
+
+    Auth<http> BasicAuth
+      scheme: basic
+    end
+
+    Role admin uses BearerAuth
+    Role user uses BasicAuth
+
+    Source<REST> DataAPI
+      url: "http://test/data"
+      operations: [read, create]
+    end
+
+    Entity Data
+      source: DataAPI
+      attributes:
+        - id: integer;
+      access:
+        read: public
+        create: [admin, user]
+    end
+    """
+
+    @pytest.fixture
+    def rbac(self, temp_output_dir, backend_app, monkeypatch):
+        from functionality_dsl.api.generators.core.infrastructure import scaffold_backend_from_model
+
+        package_dir = Path(__file__).parent.parent.parent / "functionality_dsl"
+        model = build_model_str(self.FDSL)
+        scaffold_backend_from_model(
+            model,
+            base_backend_dir=package_dir / "base" / "backend",
+            templates_backend_dir=package_dir / "templates" / "backend",
+            out_dir=temp_output_dir,
+        )
+        render_domain_files(model, package_dir / "templates" / "backend", temp_output_dir)
+        monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
+        # Every test imports a freshly generated app.db: forget the previous tables
+        pytest.importorskip("sqlmodel").SQLModel.metadata.clear()
+        return backend_app("app.core.rbac", root=temp_output_dir)
+
+    @staticmethod
+    def _request(headers=()):
+        from starlette.requests import Request
+
+        return Request({
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": b"",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+        })
+
+
+    def test_public_operation_needs_no_credentials(self, rbac):
+        """Test that a public rule lets an anonymous request through."""
+        check = rbac.require_access("Data", "read")
+
+        assert asyncio.run(check(self._request(), db=None)) is None
+
+    def test_missing_rule_fails_closed(self, rbac):
+        """Test that an entity or operation missing from the table is an error, not public."""
+        with pytest.raises(LookupError, match="Data.delete"):
+            rbac.require_access("Data", "delete")
+        with pytest.raises(LookupError, match="Orders.read"):
+            rbac.require_access("Orders", "read")
+
+    def test_no_credentials_is_401(self, rbac):
+        """Test that a protected operation without credentials is rejected as unauthenticated."""
+        from fastapi import HTTPException
+
+        check = rbac.require_access("Data", "create")
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(check(self._request(), db=None))
+
+        assert exc_info.value.status_code == 401
+        assert "BearerAuth (roles: admin), BasicAuth (roles: user)" in exc_info.value.detail
+
+    def test_wrong_role_is_403_and_first_grant_wins(self, rbac):
+        """Test the order of evaluation: 403 for authenticated users without a role, first grant stops."""
+        from fastapi import HTTPException
+
+        calls = []
+
+        def scheme(name, roles):
+            def authenticate(request, db):
+                calls.append(name)
+                return rbac.TokenPayload(user_id="u1", roles=roles) if roles is not None else None
+            return authenticate
+
+        # Authenticated by both schemes, allowed by neither
+        options = (
+            ("A", scheme("A", ["viewer"]), frozenset({"admin"})),
+            ("B", scheme("B", ["viewer"]), frozenset({"user"})),
+        )
+        with pytest.raises(HTTPException) as exc_info:
+            rbac.authorize(self._request(), None, options)
+        assert exc_info.value.status_code == 403
+        assert calls == ["A", "B"]
+
+        # The first scheme grants access: the second is never tried
+        calls.clear()
+        options = (
+            ("A", scheme("A", None), frozenset({"admin"})),
+            ("B", scheme("B", ["admin"]), frozenset({"admin"})),
+            ("C", scheme("C", ["admin"]), None),
+        )
+        user = rbac.authorize(self._request(), None, options)
+        assert user.roles == ["admin"]
+        assert calls == ["A", "B"]
+
+
+class TestCredentialRevocation:
+    """Test that revoked credentials are not served from the session store."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Auth<http> BearerAuth
+      scheme: bearer
+    end
+
+    Auth<apikey> KeyAuth
+      in: header
+      name: "X-API-Key"
+    end
+
+    Role user uses BearerAuth
+    Role member uses KeyAuth
+
+    Source<REST> DataAPI
+      url: "http://test/data"
+      operations: [read]
+    end
+
+    Entity Data
+      source: DataAPI
+      attributes:
+        - id: integer;
+      access: [user, member]
+    end
+    """
+
+    @pytest.fixture
+    def generated(self, temp_output_dir):
+        from functionality_dsl.api.generators.core.infrastructure import scaffold_backend_from_model
+
+        package_dir = Path(__file__).parent.parent.parent / "functionality_dsl"
+        model = build_model_str(self.FDSL)
+        scaffold_backend_from_model(
+            model,
+            base_backend_dir=package_dir / "base" / "backend",
+            templates_backend_dir=package_dir / "templates" / "backend",
+            out_dir=temp_output_dir,
+        )
+        render_domain_files(model, package_dir / "templates" / "backend", temp_output_dir)
+        return temp_output_dir
+
+    @pytest.fixture
+    def backend(self, generated, backend_app, monkeypatch):
+        temp_output_dir = generated
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{temp_output_dir / 'auth.db'}")
+        # Every test imports a freshly generated app.db: forget the previous tables and mappers
+        sqlmodel = pytest.importorskip("sqlmodel")
+        sqlmodel.SQLModel.metadata.clear()
+        sqlmodel.main.default_registry.dispose()
+
+        database = backend_app("app.db.database", root=temp_output_dir)
+        database.init_db()
+        session_store = backend_app("app.core.session_store", root=temp_output_dir)
+        monkeypatch.setattr(session_store, "_store", session_store.InMemorySessionStore(ttl=300))
+        return (
+            database,
+            backend_app("app.core.auth_bearerauth", root=temp_output_dir),
+            backend_app("app.core.auth_keyauth", root=temp_output_dir),
+        )
+
+    @staticmethod
+    def _token(database, db, user_id):
+        token = database.Token(token=secrets.token_urlsafe(16), user_id=user_id, roles="user",
+                               created_at=datetime.now(timezone.utc))
+        db.add(token)
+        db.commit()
+        return token.token
+
+    def test_session_store_is_opt_in(self, generated):
+        """Test that generated backends do not cache credentials unless configured to."""
+        env = (generated / ".env").read_text()
+
+        assert "SESSION_STORE_BACKEND=none" in env
+
+    def test_revoked_token_is_rejected_while_cached(self, backend):
+        """Test that revoke_token() drops the cached token as well as deactivating it."""
+        from fastapi import HTTPException
+        from sqlmodel import Session
+
+        database, bearer, _ = backend
+        with Session(database.engine) as db:
+            token = self._token(database, db, "u1")
+            assert bearer.verify_token(token, db).user_id == "u1"  # now cached
+
+            assert bearer.revoke_token(token, db)
+            with pytest.raises(HTTPException) as exc_info:
+                bearer.verify_token(token, db)
+            assert exc_info.value.status_code == 401
+
+    def test_revoked_user_tokens_are_rejected(self, backend):
+        """Test that revoking a user's tokens covers every cached token of that user."""
+        from fastapi import HTTPException
+        from sqlmodel import Session
+
+        database, bearer, _ = backend
+        with Session(database.engine) as db:
+            tokens = [self._token(database, db, "u1") for _ in range(2)]
+            other = self._token(database, db, "u2")
+            for token in (*tokens, other):
+                bearer.verify_token(token, db)
+
+            assert bearer.revoke_user_tokens("u1", db) == 2
+            for token in tokens:
+                with pytest.raises(HTTPException):
+                    bearer.verify_token(token, db)
+            assert bearer.verify_token(other, db).user_id == "u2"
+
+    def test_revoked_api_key_is_rejected_while_cached(self, backend):
+        """Test that revoke_api_key() and revoke_user_api_keys() drop cached keys."""
+        from sqlmodel import Session
+
+        database, _, apikey = backend
+        with Session(database.engine) as db:
+            user = database.User(email="a@example.com", password_hash="x", role="member",
+                                 created_at=datetime.now(timezone.utc))
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+            keys = []
+            for key in ("key-1", "key-2"):
+                db.add(database.APIKey(key=key, user_id=user.id, created_at=datetime.now(timezone.utc)))
+                keys.append(key)
+            db.commit()
+            for key in keys:
+                assert apikey.validate_api_key(db, key) == (user.id, "member")  # now cached
+
+            assert apikey.revoke_api_key(db, "key-1")
+            assert apikey.validate_api_key(db, "key-1") is None
+            assert apikey.validate_api_key(db, "key-2") == (user.id, "member")
+
+            assert apikey.revoke_user_api_keys(db, user.id) == 1
+            assert apikey.validate_api_key(db, "key-2") is None
+
 
 class TestDatabaseModuleGeneration:
     """Test database module generation for auth storage."""
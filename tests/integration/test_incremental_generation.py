@@ -0,0 +1,172 @@
+"""
+Integration tests for incremental generation.
+
+Tests that regenerating into an existing output directory only rewrites
+files whose content changed, that the manifest tracks stale outputs, and
+that watch mode only re-renders entities whose inputs changed.
+"""
+
+from pathlib import Path
+
+from functionality_dsl.language import build_model_str
+from functionality_dsl.api import generator
+from functionality_dsl.api.generator import render_domain_files
+from functionality_dsl.api.exposure_map import diff_exposure, entity_signatures
+from functionality_dsl.api.manifest import generation_session, outputs_up_to_date
+
+
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+FDSL = """
+Server API
+  host: "localhost"
+  port: 8080
+end
+
+Source<REST> ProductsAPI
+  url: "http://test/products"
+  operations: [read]
+end
+
+Source<REST> OrdersAPI
+  url: "http://test/orders"
+  operations: [read]
+end
+
+Entity Products
+  source: ProductsAPI
+  attributes:
+    - items: array;
+  access: public
+end
+
+Entity Orders
+  source: OrdersAPI
+  attributes:
+    - items: array;
+  access: public
+end
+"""
+
+
+def _generate(fdsl, out_dir, fingerprint="v1", force=False):
+    with generation_session(out_dir, fingerprint=fingerprint, force=force) as session:
+        render_domain_files(build_model_str(fdsl), TEMPLATES_DIR, out_dir)
+    return session.summary()
+
+
+class TestIncrementalGeneration:
+    """Test manifest-based skipping of unchanged outputs."""
+
+    def test_unchanged_outputs_are_not_rewritten(self, temp_output_dir):
+        """Test that a second identical run leaves every file (and its mtime) alone."""
+        first = _generate(FDSL, temp_output_dir)
+        router = temp_output_dir / "app" / "api" / "routers" / "orders_router.py"
+        mtime = router.stat().st_mtime_ns
+
+        second = _generate(FDSL, temp_output_dir)
+
+        assert first["created"] and not first["updated"]
+        assert second["created"] == second["updated"] == second["removed"] == []
+        assert sorted(second["unchanged"]) == sorted(first["created"])
+        assert router.stat().st_mtime_ns == mtime
+
+    def test_only_affected_files_are_updated(self, temp_output_dir):
+        """Test that changing one source rewrites its client, not unrelated entities."""
+        _generate(FDSL, temp_output_dir)
+        summary = _generate(FDSL.replace("http://test/orders", "http://test/v2/orders"), temp_output_dir)
+
+        assert "app/sources/ordersapi_source.py" in summary["updated"]
+        assert "app/sources/productsapi_source.py" in summary["unchanged"]
+        assert "app/api/routers/products_router.py" in summary["unchanged"]
+
+    def test_outputs_no_longer_generated_are_removed(self, temp_output_dir):
+        """Test that dropping an entity removes its stale router, but keeps hand-edited files."""
+        _generate(FDSL, temp_output_dir)
+        service = temp_output_dir / "app" / "services" / "orders_service.py"
+        service.write_text(service.read_text() + "\n# local change\n")
+
+        without_orders = FDSL.split("Entity Orders")[0].replace(
+            'Source<REST> OrdersAPI\n  url: "http://test/orders"\n  operations: [read]\nend\n', ""
+        )
+        summary = _generate(without_orders, temp_output_dir)
+
+        assert "app/api/routers/orders_router.py" in summary["removed"]
+        assert not (temp_output_dir / "app" / "api" / "routers" / "orders_router.py").exists()
+        assert service.exists()
+
+    def test_force_rewrites_everything(self, temp_output_dir):
+        """Test that force=True writes every output even if unchanged."""
+        _generate(FDSL, temp_output_dir)
+        summary = _generate(FDSL, temp_output_dir, force=True)
+
+        assert summary["unchanged"] == []
+        assert summary["updated"]
+
+    def test_up_to_date_check_uses_fingerprint_and_files(self, temp_output_dir):
+        """Test that the fast path requires the same fingerprint and untouched outputs."""
+        _generate(FDSL, temp_output_dir, fingerprint="abc")
+
+        assert outputs_up_to_date(temp_output_dir, "abc")
+        assert not outputs_up_to_date(temp_output_dir, "def")
+
+        (temp_output_dir / "app" / "api" / "routers" / "orders_router.py").unlink()
+        assert not outputs_up_to_date(temp_output_dir, "abc")
+
+
+class TestParallelGeneration:
+    """Test that the per-entity worker pool produces the same output as a serial run."""
+
+    def test_parallel_output_matches_serial(self, temp_output_dir, monkeypatch):
+        """Test that forked workers write identical files in the same order."""
+        monkeypatch.setattr(generator, "PARALLEL_MIN_TASKS", 0)
+
+        serial_dir = temp_output_dir / "serial"
+        parallel_dir = temp_output_dir / "parallel"
+        with generation_session(serial_dir) as serial:
+            render_domain_files(build_model_str(FDSL), TEMPLATES_DIR, serial_dir, workers=1)
+        with generation_session(parallel_dir) as parallel:
+            render_domain_files(build_model_str(FDSL), TEMPLATES_DIR, parallel_dir, workers=2)
+
+        assert parallel.created == serial.created
+        for key in serial.created:
+            assert (parallel_dir / key).read_bytes() == (serial_dir / key).read_bytes(), key
+
+
+class TestRenderCache:
+    """Test reuse of per-entity renders across runs (watch mode)."""
+
+    def _render(self, fdsl, out_dir, render_cache, monkeypatch):
+        rendered = []
+        render_task = generator._render_task
+
+        def counting(task):
+            rendered.append(task)
+            render_task(task)
+
+        monkeypatch.setattr(generator, "_render_task", counting)
+        with generation_session(out_dir) as session:
+            render_domain_files(build_model_str(fdsl), TEMPLATES_DIR, out_dir, workers=1, render_cache=render_cache)
+        return rendered, session.summary()
+
+    def test_unchanged_entities_are_not_rerendered(self, temp_output_dir, monkeypatch):
+        """Test that only the changed source and its entity are rendered again."""
+        cache = {}
+        first, _ = self._render(FDSL, temp_output_dir, cache, monkeypatch)
+        second, summary = self._render(
+            FDSL.replace("http://test/orders", "http://test/v2/orders"), temp_output_dir, cache, monkeypatch
+        )
+
+        assert ("service", "Products") in first
+        assert sorted(second) == [("rest_source", "OrdersAPI"), ("router", "Orders"), ("service", "Orders")]
+        assert "app/sources/ordersapi_source.py" in summary["updated"]
+        assert "app/api/routers/products_router.py" in summary["unchanged"]
+        assert summary["removed"] == []
+
+    def test_exposure_diff(self):
+        """Test that signatures change for the edited entity and its source only."""
+        before = entity_signatures(build_model_str(FDSL))
+        after = entity_signatures(build_model_str(FDSL.replace("http://test/orders", "http://test/v2/orders")))
+
+        assert diff_exposure(before, after) == {"added": [], "removed": [], "changed": ["Orders"]}
+        assert diff_exposure({}, before)["added"] == ["Orders", "Products"]
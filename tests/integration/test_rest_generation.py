@@ -583,3 +583,354 @@ class TestCompositeEntities:
             assert "@router.post(" not in router_code
             assert "@router.put(" not in router_code
             assert "@router.delete(" not in router_code
+
+
+class TestTransformOffload:
+    """Test that transforms calling heavy builtins are dispatched to the transform pool."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<REST> PhotoAPI
+      url: "http://test/photo"
+      operations: [read]
+    end
+
+    Entity Photo
+      source: PhotoAPI
+      attributes:
+        - image: binary;
+        - caption: string;
+      access: public
+    end
+
+    Entity Thumbnail(Photo)
+      attributes:
+        - image: binary = image_resize(Photo.image, 64, 64);
+        - caption: string = upper(Photo.caption);
+      access: public
+    end
+
+    Entity Caption(Photo)
+      attributes:
+        - text: string = upper(Photo.caption);
+      access: public
+    end
+    """
+
+    def test_heavy_transform_runs_in_pool(self, temp_output_dir):
+        """Test that only the entity calling image_resize offloads its transform."""
+        model = build_model_str(self.FDSL)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        services_dir = temp_output_dir / "app" / "services"
+        heavy = (services_dir / "thumbnail_service.py").read_text()
+        light = (services_dir / "caption_service.py").read_text()
+
+        assert "from app.core.offload import run_transform" in heavy
+        assert "await run_transform(self._transform_entity, data)" in heavy
+        assert "@staticmethod" in heavy
+
+        assert "run_transform" not in light
+        assert "await self.transform(" in light
+        compile(heavy, "thumbnail_service.py", "exec")
+        compile(light, "caption_service.py", "exec")
+
+
+class TestPdfJobs:
+    """Test that entities rendering a PDF expose background export jobs."""
+
+    def test_pdf_entity_gets_job_endpoints(self, temp_output_dir):
+        """Test ?job=true on read plus job status and download routes."""
+        fdsl = """
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Source<REST> OrdersAPI
+          url: "http://test/orders"
+          operations: [read]
+        end
+
+        Entity Orders
+          source: OrdersAPI
+          attributes:
+            - items: array;
+          access: public
+        end
+
+        Entity OrdersReport(Orders)
+          attributes:
+            - pdf: binary = toPdf(Orders.items, "Orders");
+          access: public
+        end
+        """
+
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        routers_dir = temp_output_dir / "app" / "api" / "routers"
+        report = (routers_dir / "ordersreport_router.py").read_text()
+        orders = (routers_dir / "orders_router.py").read_text()
+
+        assert "job: bool = Query(False" in report
+        assert "return _submit_pdf_job(service.get_ordersreport, owner)" in report
+        assert "Public exports are not tied to a user" in report
+        assert "return entity.pdf" in report
+        assert '"/jobs/{job_id}"' in report
+        assert '"/jobs/{job_id}/download"' in report
+        compile(report, "ordersreport_router.py", "exec")
+
+        assert "app.core.jobs" not in orders
+
+    def test_protected_jobs_belong_to_their_submitter(self, temp_output_dir):
+        """Test that a protected export authorizes through _job_owner and scopes jobs to the user."""
+        fdsl = """
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Auth<http> BearerAuth
+          scheme: bearer
+        end
+
+        Role analyst uses BearerAuth
+
+        Source<REST> OrdersAPI
+          url: "http://test/orders"
+          operations: [read]
+        end
+
+        Entity Orders
+          source: OrdersAPI
+          attributes:
+            - items: array;
+          access: public
+        end
+
+        Entity OrdersReport(Orders)
+          attributes:
+            - pdf: binary = toPdf(Orders.items, "Orders");
+          access: [analyst]
+        end
+        """
+
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+        report = (temp_output_dir / "app" / "api" / "routers" / "ordersreport_router.py").read_text()
+
+        assert "user: Any = Depends(require_roles_bearerauth(['analyst']))" in report
+        assert "return str(user.user_id) if user is not None else None" in report
+        assert report.count("owner: Optional[str] = Depends(_job_owner)") == 3
+        assert "return job_status(job_id, _JOBS_PATH, owner)" in report
+        assert "return job_download(job_id, request, owner)" in report
+        # Authorized once, through _job_owner, not again as a route dependency
+        assert "dependencies=[" not in report
+        compile(report, "ordersreport_router.py", "exec")
+
+
+class TestBinaryPassthrough:
+    """Test that binary entities backed by a REST source stream the source body."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<REST> SnapshotAPI
+      url: "http://test/camera/{camera}/snapshot"
+      params: [camera]
+      operations: [read]
+    end
+
+    Entity Snapshot
+      source: SnapshotAPI
+      attributes:
+        - image: binary;
+      access: public
+    end
+
+    Entity Thumbnail(Snapshot)
+      attributes:
+        - image: binary = image_resize(Snapshot.image, 160, 120);
+      access: public
+    end
+    """
+
+    def test_passthrough_read_streams_source_body(self, temp_output_dir):
+        """Test the router relays the upstream body and the source opens it unread."""
+        model = build_model_str(self.FDSL)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        router = (temp_output_dir / "app" / "api" / "routers" / "snapshot_router.py").read_text()
+        service = (temp_output_dir / "app" / "services" / "snapshot_service.py").read_text()
+        source = (temp_output_dir / "app" / "sources" / "snapshotapi_source.py").read_text()
+
+        assert "response_class=StreamingResponse" in router
+        assert "return _stream_body(await service.stream_snapshot(params))" in router
+        assert "async def stream_snapshot(self, params: Dict[str, Any]) -> httpx.Response:" in service
+        assert "await client.send(request, stream=True)" in source
+        assert "background=BackgroundTask(upstream.aclose)" in router
+        # Composition (Thumbnail) still reads the whole body, as raw bytes
+        assert "raw_data = await self.source.read(params, raw=True)" in service
+        assert "return response.content if raw else loads(response.content)" in source
+        for name, code in (("router", router), ("service", service), ("source", source)):
+            compile(code, name, "exec")
+
+    def test_other_entities_on_the_source_still_parse_json(self, temp_output_dir):
+        """Test that only the binary entity reads the shared source body raw."""
+        fdsl = self.FDSL.replace("Entity Thumbnail", """Entity SnapshotMeta
+      source: SnapshotAPI
+      attributes:
+        - width: integer;
+      access: public
+    end
+
+    Entity Thumbnail""")
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        service = (temp_output_dir / "app" / "services" / "snapshotmeta_service.py").read_text()
+        assert "raw_data = await self.source.read(params)" in service
+        assert "raw=True" not in service
+
+    def test_computed_binary_entity_is_not_streamed(self, temp_output_dir):
+        """Test that an entity computing its binary attribute keeps the model response."""
+        model = build_model_str(self.FDSL)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        router = (temp_output_dir / "app" / "api" / "routers" / "thumbnail_router.py").read_text()
+        assert "StreamingResponse" not in router
+        assert "response_model=Thumbnail" in router
+
+
+class TestStreamedSource:
+    """Test that array entities of `stream: true` sources parse and write items incrementally."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<REST> ReadingsAPI
+      url: "http://test/readings"
+      operations: [read]
+      stream: true
+    end
+
+    Entity Reading
+      attributes:
+        - id: integer;
+        - value: number;
+    end
+
+    Entity Readings
+      source: ReadingsAPI
+      attributes:
+        - items: array<Reading>;
+      access: public
+    end
+    """
+
+    def test_streamed_read_parses_items_incrementally(self, temp_output_dir):
+        """Test the source is opened unread and the router writes validated batches."""
+        model = build_model_str(self.FDSL)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+        render_domain_files(model, templates_dir, temp_output_dir)
+
+        router = (temp_output_dir / "app" / "api" / "routers" / "readings_router.py").read_text()
+        service = (temp_output_dir / "app" / "services" / "readings_service.py").read_text()
+        source = (temp_output_dir / "app" / "sources" / "readingsapi_source.py").read_text()
+
+        assert "response_model=Readings" in router
+        assert "return _stream_items(await service.stream_readings())" in router
+        assert 'iter_json_array(upstream.aiter_bytes(), key="items")' in service
+        assert 'TypeAdapter(Readings.model_fields["items"].annotation)' in service
+        assert "await client.send(request, stream=True)" in source
+        for name, code in (("router", router), ("service", service), ("source", source)):
+            compile(code, name, "exec")
+
+
+class TestBuiltinPruning:
+    """Test that generated backends only load and install the builtins their model calls."""
+
+    def _scaffold(self, fdsl, out_dir):
+        from functionality_dsl.api.generators.core.infrastructure import scaffold_backend_from_model
+
+        package_dir = Path(__file__).parent.parent.parent / "functionality_dsl"
+        model = build_model_str(fdsl)
+        scaffold_backend_from_model(
+            model,
+            base_backend_dir=package_dir / "base" / "backend",
+            templates_backend_dir=package_dir / "templates" / "backend",
+            out_dir=out_dir,
+        )
+        selection = (out_dir / "app" / "core" / "builtins" / "selection.py").read_text()
+        pyproject = (out_dir / "pyproject.toml").read_text()
+        return selection, pyproject
+
+    def test_image_model_keeps_pillow_only(self, temp_output_dir):
+        """Test that an image-only model without auth drops reportlab and the auth/db stack."""
+        selection, pyproject = self._scaffold(TestTransformOffload.FDSL, temp_output_dir)
+
+        namespace = {}
+        exec(selection, namespace)
+        assert namespace["ENABLED_GROUPS"] == ("core_funcs", "string_funcs", "binary_funcs")
+
+        assert '"Pillow>=10.0.0"' in pyproject
+        assert '"fastapi>=0.111.0"' in pyproject
+        for dist in ("reportlab", "pyjwt", "sqlmodel", "psycopg2-binary", "bcrypt"):
+            assert f'"{dist}' not in pyproject
+
+    def test_plain_model_drops_optional_builtin_dependencies(self, temp_output_dir):
+        """Test that a model calling no image or PDF builtins installs neither Pillow nor reportlab."""
+        fdsl = """
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Source<REST> OrdersAPI
+          url: "http://test/orders"
+          operations: [read]
+        end
+
+        Entity Orders
+          source: OrdersAPI
+          attributes:
+            - items: array;
+          access: public
+        end
+
+        Entity OrderTotals(Orders)
+          attributes:
+            - total: number = sum(map(Orders.items, i => i["price"]));
+          access: public
+        end
+        """
+        selection, pyproject = self._scaffold(fdsl, temp_output_dir)
+
+        assert "binary_funcs" not in selection
+        assert "pdf_funcs" not in selection
+        assert "Pillow" not in pyproject
+        assert "reportlab" not in pyproject
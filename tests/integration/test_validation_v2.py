@@ -678,6 +678,60 @@ class TestSourceValidation:
         model = build_model_str(fdsl_code)
         assert model is not None
 
+    def test_stream_source_requires_array_entity(self):
+        """Test that a `stream: true` source cannot back an entity with more than its array."""
+        fdsl_code = """
+        Server TestServer
+          host: "localhost"
+          port: 8080
+        end
+
+        Source<REST> Readings
+          url: "http://api.example.com/readings"
+          operations: [read]
+          stream: true
+        end
+
+        Entity ReadingList
+          source: Readings
+          attributes:
+            - items: array;
+            - total: integer;
+          access: public
+        end
+        """
+        with pytest.raises(TextXSemanticError) as exc_info:
+            build_model_str(fdsl_code)
+
+        assert "stream: true" in str(exc_info.value)
+
+    def test_ws_subscribe_message_placeholders_must_be_params(self):
+        """Test that subscribeMessage placeholders refer to declared source params."""
+        fdsl_code = """
+        Server TestServer
+          host: "localhost"
+          port: 8080
+        end
+
+        Source<WS> Trades
+          channel: "wss://stream.example.com"
+          operations: [subscribe]
+          subscribeMessage: '{"type": "subscribe", "symbol": "{symbol}"}'
+        end
+
+        Entity Trade
+          flow: inbound
+          source: Trades
+          attributes:
+            - price: number;
+          access: public
+        end
+        """
+        with pytest.raises(TextXSemanticError) as exc_info:
+            build_model_str(fdsl_code)
+
+        assert "'{symbol}'" in str(exc_info.value)
+
 
 # =============================================================================
 # Syntax Error Tests
@@ -723,3 +777,123 @@ class TestSyntaxErrors:
         """
         with pytest.raises((TextXSyntaxError, TextXSemanticError)):
             build_model_str(fdsl_code)
+
+
+# =============================================================================
+# Import Tests
+# =============================================================================
+
+IMPORT_MAIN = """import lib
+import shared
+
+Server API
+  host: "localhost"
+  port: 8080
+end
+"""
+
+IMPORT_SHARED = """Source<REST> DataAPI
+  url: "http://api.example.com/data"
+  operations: [read]
+end
+"""
+
+IMPORT_LIB = """import shared
+
+Entity Data
+  source: DataAPI
+  attributes:
+    - value: {type};
+  access: public
+end
+"""
+
+
+class TestImports:
+    """Test import expansion and error locations in imported files."""
+
+    def _write(self, tmp_path, value_type="string"):
+        (tmp_path / "main.fdsl").write_text(IMPORT_MAIN)
+        (tmp_path / "shared.fdsl").write_text(IMPORT_SHARED)
+        (tmp_path / "lib.fdsl").write_text(IMPORT_LIB.format(type=value_type))
+        return tmp_path / "main.fdsl"
+
+    def test_shared_import_is_inlined_once(self, tmp_path):
+        """Test that a file imported from two places is inlined once."""
+        from functionality_dsl.language import build_model, _expand_imports
+
+        main = self._write(tmp_path)
+
+        assert _expand_imports(str(main)).count("Source<REST> DataAPI") == 1
+        assert [e.name for e in build_model(str(main)).entities] == ["Data"]
+
+    def test_errors_point_at_imported_file(self, tmp_path):
+        """Test that an error in an imported file reports that file and line."""
+        from functionality_dsl.language import build_model
+
+        main = self._write(tmp_path, value_type="strng")
+
+        with pytest.raises(TextXSyntaxError) as exc_info:
+            build_model(str(main))
+        assert exc_info.value.filename == str(tmp_path / "lib.fdsl")
+        assert exc_info.value.line == 6
+
+    def test_origins_map_lines_to_files(self, tmp_path):
+        """Test that every expanded line maps back to its file and line."""
+        from functionality_dsl.language import _expand_imports
+
+        main = self._write(tmp_path)
+        origins = []
+        lines = _expand_imports(str(main), origins=origins).split("\n")
+
+        assert len(origins) == len(lines)
+        for line, (path, lineno) in zip(lines, origins):
+            if not line.startswith("// =========="):
+                assert path.read_text().split("\n")[lineno - 1] == line
+
+
+# =============================================================================
+# Validation Cache Tests
+# =============================================================================
+
+class TestValidationCache:
+    """Test that model texts which passed validation skip it on the next build."""
+
+    def test_known_valid_model_skips_validators(self, minimal_v2_fdsl, tmp_path, monkeypatch):
+        """Test that the second build of the same text does not run the validators."""
+        from functionality_dsl import language
+
+        monkeypatch.setenv("FDSL_CACHE_DIR", str(tmp_path))
+        calls = []
+        validate_model = language._validate_model
+        monkeypatch.setattr(language, "_validate_model", lambda m: calls.append(m) or validate_model(m))
+
+        first = build_model_str(minimal_v2_fdsl)
+        second = build_model_str(minimal_v2_fdsl)
+
+        assert len(calls) == 1
+        assert [e.name for e in second.aggregated_entities] == [e.name for e in first.aggregated_entities]
+
+    def test_invalid_model_is_never_cached(self, tmp_path, monkeypatch):
+        """Test that a rejected text is validated (and rejected) again."""
+        monkeypatch.setenv("FDSL_CACHE_DIR", str(tmp_path))
+        fdsl_code = """
+        Server TestServer
+          host: "localhost"
+          port: 8080
+        end
+
+        Entity Data
+          attributes:
+            - value: string;
+        end
+
+        Entity Data
+          attributes:
+            - value: string;
+        end
+        """
+        for _ in range(2):
+            with pytest.raises(TextXSemanticError):
+                build_model_str(fdsl_code)
+        assert not (tmp_path / "models").exists()
@@ -7,6 +7,7 @@ WebSocket routers with correct connection handling, message routing, and flow di
 
 import pytest
 from pathlib import Path
+from textx.exceptions import TextXSemanticError
 
 from functionality_dsl.language import build_model_str
 from functionality_dsl.api.generator import render_domain_files
@@ -409,6 +410,43 @@ class TestWebSocketSourceClient:
             client_code = source_files[0].read_text()
             assert "websockets" in client_code or "ws" in client_code.lower()
 
+    def test_source_client_reconnects_and_resubscribes(self, temp_output_dir):
+        """Test that subscriptions run through a reconnecting link that replays subscribeMessage."""
+        fdsl = """
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Source<WS> Trades
+          channel: "wss://stream.example.com"
+          params: [symbol]
+          operations: [subscribe]
+          subscribeMessage: '{"type": "subscribe", "symbol": "{symbol}"}'
+        end
+
+        Entity Trade
+          flow: inbound
+          source: Trades
+          attributes:
+            - price: number;
+          access: public
+        end
+        """
+
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+        render_domain_files(model, templates_dir, temp_output_dir)
+        client_code = (temp_output_dir / "app" / "sources" / "trades_source.py").read_text()
+
+        assert """self.subscribe_messages = ['{"type": "subscribe", "symbol": "{symbol}"}']""" in client_code
+        assert "link = UpstreamLink(" in client_code
+        assert "websockets.connect(url, **ping_options())" in client_code
+        assert "on_connect=send_subscription," in client_code
+        assert "message = format_subscribe_message(message, params)" in client_code
+        assert "message.replace(" not in client_code
+        compile(client_code, "trades_source.py", "exec")
+
 
 class TestWebSocketAccessControl:
     """Test access control in WebSocket handlers."""
@@ -536,3 +574,416 @@ class TestWebSocketService:
         if services_dir.exists():
             service_files = list(services_dir.glob("*_service.py"))
             assert len(service_files) > 0, "Service files should be generated"
+
+
+class TestWebSocketDeltaMode:
+    """Test `delta:` subscribe channels."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<WS> QuoteStream
+      channel: "ws://test/quotes"
+      operations: [subscribe]
+    end
+
+    Entity Quote
+      flow: inbound
+      source: QuoteStream
+      attributes:
+        - symbol: string;
+        - price: number;
+      access: public
+    end
+
+    Entity QuoteView(Quote)
+      flow: inbound
+      delta: patch
+      attributes:
+        - symbol: string = Quote.symbol;
+        - price: number = Quote.price;
+      access: public
+    end
+    """
+
+    def _router(self, fdsl, out_dir, name):
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+        render_domain_files(model, templates_dir, out_dir)
+        return (out_dir / "app" / "api" / "routers" / f"{name}_ws.py").read_text()
+
+    def test_delta_channel_sends_encoded_frames(self, temp_output_dir):
+        """Test that the subscriber gets frames from a per-connection DeltaEncoder."""
+        code = self._router(self.FDSL, temp_output_dir, "quoteview")
+
+        assert 'delta = DeltaEncoder("patch")' in code
+        assert "frame = delta.encode(payload)" in code
+        assert "send_text(dumps(payload))" not in code
+        compile(code, "quoteview_ws.py", "exec")
+
+    def test_channels_without_delta_send_full_messages(self, temp_output_dir):
+        """Test that channels without the option are unchanged."""
+        code = self._router(self.FDSL, temp_output_dir, "quote")
+
+        assert "DeltaEncoder" not in code
+        assert "await websocket.send_text(dumps(payload))" in code
+
+    def test_delta_on_outbound_entity_fails(self):
+        """Test that delta frames are rejected on publish entities."""
+        fdsl = """
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Source<WS> CommandChannel
+          channel: "ws://test/commands"
+          operations: [publish]
+        end
+
+        Entity Command
+          flow: outbound
+          source: CommandChannel
+          delta: keys
+          attributes:
+            - action: string;
+          access: public
+        end
+        """
+
+        with pytest.raises(TextXSemanticError, match="'delta:' is only valid"):
+            build_model_str(fdsl)
+
+
+class TestWebSocketRateControl:
+    """Test `maxRate:`, `conflate:` and `batchMs:` subscribe channels."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<WS> TradeStream
+      channel: "ws://test/trades"
+      operations: [subscribe]
+    end
+
+    Entity Trade
+      flow: inbound
+      source: TradeStream
+      attributes:
+        - symbol: string;
+        - price: number;
+      access: public
+    end
+
+    Entity TradeTicker(Trade)
+      flow: inbound
+      maxRate: 30
+      conflate: symbol
+      attributes:
+        - symbol: string = Trade.symbol;
+        - price: number = Trade.price;
+      access: public
+    end
+
+    Entity TradeBatch(Trade)
+      flow: inbound
+      batchMs: 100
+      attributes:
+        - symbol: string = Trade.symbol;
+        - price: number = Trade.price;
+      access: public
+    end
+    """
+
+    def _router(self, fdsl, out_dir, name):
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+        render_domain_files(model, templates_dir, out_dir)
+        return (out_dir / "app" / "api" / "routers" / f"{name}_ws.py").read_text()
+
+    def test_conflated_channel_queues_through_outbox(self, temp_output_dir):
+        """Test that messages are handed to a paced, conflating outbox."""
+        code = self._router(self.FDSL, temp_output_dir, "tradeticker")
+
+        assert "from app.core.ws_outbox import ChannelOutbox" in code
+        assert "max_rate=30," in code
+        assert 'conflate="symbol",' in code
+        assert "batch_ms=None," in code
+        assert "outbox.put(transformed_message)" in code
+        assert "outbox.close()" in code
+        compile(code, "tradeticker_ws.py", "exec")
+
+    def test_batched_channel_sends_batch_frames(self, temp_output_dir):
+        """Test that batching sends each window as one $batch frame, so list payloads stay distinct."""
+        code = self._router(self.FDSL, temp_output_dir, "tradebatch")
+
+        assert "send_batch," in code
+        assert "batch_ms=100," in code
+        assert 'await websocket.send_text(dumps({"$batch": batch}))' in code
+        compile(code, "tradebatch_ws.py", "exec")
+
+    def test_batched_binary_payloads_get_their_own_frames(self, temp_output_dir):
+        """Test that binary payloads in a window are sent as bytes, not passed to dumps."""
+        code = self._router(self.FDSL, temp_output_dir, "tradebatch")
+        send_batch = code[code.index("async def send_batch"):code.index("outbox = ChannelOutbox(")]
+
+        assert "is_binary, payload = extract_binary_payload(message)" in send_batch
+        assert "await websocket.send_bytes(payload)" in send_batch
+
+    def test_channels_without_rate_control_send_directly(self, temp_output_dir):
+        """Test that channels without the options await each send."""
+        code = self._router(self.FDSL, temp_output_dir, "trade")
+
+        assert "ChannelOutbox" not in code
+        assert "await send_message(transformed_message)" in code
+
+    def test_conflate_key_must_be_an_attribute(self):
+        """Test that the conflation key is checked against the entity."""
+        fdsl = self.FDSL.replace("conflate: symbol", "conflate: ticker")
+
+        with pytest.raises(TextXSemanticError, match="'conflate: ticker' must name one of its attributes"):
+            build_model_str(fdsl)
+
+    def test_batching_with_delta_fails(self):
+        """Test that batched arrays cannot be delta-encoded."""
+        fdsl = self.FDSL.replace("batchMs: 100", "delta: patch\n      batchMs: 100")
+
+        with pytest.raises(TextXSemanticError, match="cannot be combined"):
+            build_model_str(fdsl)
+
+
+class TestWebSocketStreamJoin:
+    """Test entities composed from several WebSocket sources."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<WS> BidStream
+      channel: "ws://test/bids"
+      operations: [subscribe]
+    end
+
+    Source<WS> AskStream
+      channel: "ws://test/asks"
+      operations: [subscribe]
+    end
+
+    Entity Bid
+      flow: inbound
+      source: BidStream
+      attributes:
+        - price: number;
+    end
+
+    Entity Ask
+      flow: inbound
+      source: AskStream
+      attributes:
+        - price: number;
+    end
+
+    Entity Spread(Bid, Ask)
+      flow: inbound
+      join: zip
+      attributes:
+        - bid: number = Bid.price;
+        - ask: number = Ask.price;
+        - spread: number = Ask.price - Bid.price;
+      access: public
+    end
+    """
+
+    def _render(self, fdsl, out_dir):
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+        render_domain_files(model, templates_dir, out_dir)
+        return out_dir / "app"
+
+    def test_sources_are_joined_once_per_channel(self, temp_output_dir):
+        """Test that subscribers share one StreamJoin instead of a per-connection lock."""
+        app_dir = self._render(self.FDSL, temp_output_dir)
+        code = (app_dir / "api" / "routers" / "spread_ws.py").read_text()
+
+        assert "from app.core.ws_join import JoinError, StreamJoin, get_join" in code
+        assert '"Bid": lambda: BidStreamSource().subscribe(),' in code
+        assert 'mode="zip",' in code
+        assert "async with join.subscribe() as messages:" in code
+        assert "subscribe_service.transform_changed(latest, changed, cache)" in code
+        assert "message_lock" not in code
+        compile(code, "spread_ws.py", "exec")
+
+    def test_service_recomputes_changed_attributes(self, temp_output_dir):
+        """Test that the composite service passes the changed sources to the transform."""
+        app_dir = self._render(self.FDSL, temp_output_dir)
+        code = (app_dir / "services" / "spread_service.py").read_text()
+
+        assert "async def transform_changed(self, data: dict, changed: set, cache: dict)" in code
+        assert "changed=changed," in code
+        compile(code, "spread_service.py", "exec")
+
+    def test_window_join_requires_window(self):
+        """Test that 'join: window' needs joinWindowMs."""
+        fdsl = self.FDSL.replace("join: zip", "join: window")
+
+        with pytest.raises(TextXSemanticError, match="must be used together"):
+            build_model_str(fdsl)
+
+    def test_join_on_single_source_entity_fails(self):
+        """Test that join semantics are rejected where nothing is joined."""
+        fdsl = self.FDSL.replace(
+            "Entity Bid\n      flow: inbound\n      source: BidStream",
+            "Entity Bid\n      flow: inbound\n      source: BidStream\n      join: latest",
+        )
+
+        with pytest.raises(TextXSemanticError, match="several WebSocket sources"):
+            build_model_str(fdsl)
+
+
+class TestWebSocketSubscriptionFilters:
+    """Test `filters:` on subscribe channels."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<WS> TradeStream
+      channel: "ws://test/trades"
+      operations: [subscribe]
+    end
+
+    Entity Trade
+      flow: inbound
+      source: TradeStream
+      filters: [symbol, price]
+      attributes:
+        - symbol: string;
+        - price: number;
+      access: public
+    end
+    """
+
+    def _router(self, fdsl, out_dir):
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+        render_domain_files(model, templates_dir, out_dir)
+        return (out_dir / "app" / "api" / "routers" / "trade_ws.py").read_text()
+
+    def test_subscribers_register_their_filter_with_the_join(self, temp_output_dir):
+        """Test that filtering happens in the shared index, not per message per client."""
+        code = self._router(self.FDSL, temp_output_dir)
+
+        assert "SubscriptionFilter.from_query(websocket.query_params, ['symbol', 'price'])" in code
+        assert "async with join.subscribe(subscription_filter) as messages:" in code
+        assert "message_matches_filters" not in code
+        compile(code, "trade_ws.py", "exec")
+
+    def test_single_source_channel_is_shared(self, temp_output_dir):
+        """Test that a single-source channel is read once for all subscribers."""
+        code = self._router(self.FDSL, temp_output_dir)
+
+        assert '"Trade": lambda: TradeStreamSource().subscribe(),' in code
+        assert 'return await subscribe_service.transform(latest["Trade"])' in code
+        assert "raise transformed_message.error" in code
+
+    def test_filter_must_be_an_attribute(self):
+        """Test that filter fields are checked against the entity."""
+        fdsl = self.FDSL.replace("filters: [symbol, price]", "filters: [symbol, venue]")
+
+        with pytest.raises(TextXSemanticError, match="filter 'venue' must name one of its attributes"):
+            build_model_str(fdsl)
+
+
+class TestWebSocketReplay:
+    """Test `replay:` buffers on subscribe channels."""
+
+    FDSL = """
+    Server API
+      host: "localhost"
+      port: 8080
+    end
+
+    Source<WS> TradeStream
+      channel: "ws://test/trades"
+      operations: [subscribe]
+    end
+
+    Entity Trade
+      flow: inbound
+      source: TradeStream
+      filters: [symbol]
+      replay: 5m
+      attributes:
+        - symbol: string;
+        - price: number;
+      access: public
+    end
+    """
+
+    def _router(self, fdsl, out_dir):
+        model = build_model_str(fdsl)
+        templates_dir = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+        render_domain_files(model, templates_dir, out_dir)
+        return (out_dir / "app" / "api" / "routers" / "trade_ws.py").read_text()
+
+    def test_join_keeps_a_replay_buffer(self, temp_output_dir):
+        """Test that the channel's join buffers messages for late joiners."""
+        code = self._router(self.FDSL, temp_output_dir)
+
+        assert "replay=get_replay_buffer(join_key, count=None, seconds=300, fields=['symbol'])," in code
+        assert "replay = parse_window(websocket.query_params[\"replay\"])" in code
+        assert "async with join.subscribe(subscription_filter, replay=replay) as messages:" in code
+        assert "await websocket.send_text(replay_frame(messages.replayed))" in code
+        compile(code, "trade_ws.py", "exec")
+
+    def test_count_replay(self, temp_output_dir):
+        """Test that a plain number keeps that many messages."""
+        fdsl = self.FDSL.replace("replay: 5m", "replay: 500")
+        code = self._router(fdsl, temp_output_dir)
+
+        assert "get_replay_buffer(join_key, count=500, seconds=None" in code
+
+    def test_no_replay_by_default(self, temp_output_dir):
+        """Test that channels without `replay:` do not buffer."""
+        fdsl = self.FDSL.replace("replay: 5m", "")
+        code = self._router(fdsl, temp_output_dir)
+
+        assert "ws_replay" not in code
+        assert "async with join.subscribe(subscription_filter) as messages:" in code
+
+    def test_empty_replay_is_rejected(self):
+        """Test that a replay window must keep something."""
+        fdsl = self.FDSL.replace("replay: 5m", "replay: 0s")
+
+        with pytest.raises(TextXSemanticError, match="must keep at least one message or second"):
+            build_model_str(fdsl)
+
+    def test_replay_on_a_publishing_channel_is_rejected(self):
+        """Test that replay is refused on a channel that also has a publish entity."""
+        fdsl = self.FDSL + """
+        Source<WS> OrderStream
+          channel: "ws://test/orders"
+          operations: [publish]
+        end
+
+        Entity TRADE
+          flow: outbound
+          source: OrderStream
+          attributes:
+            - symbol: string;
+          access: public
+        end
+        """
+
+        with pytest.raises(TextXSemanticError, match=r"not supported on channel '/ws/trade', which also publishes \(TRADE\)"):
+            build_model_str(fdsl)
@@ -262,3 +262,285 @@ class TestFunctionChaining:
         text = "  HELLO WORLD  "
         result = lower_func(text.strip())
         assert result == "hello world"
+
+
+class TestRegistryCostTags:
+    """Test the optional cost tag on registry entries."""
+
+    def test_heavy_builtins_are_tagged(self):
+        from functionality_dsl.lib.builtins.registry import DSL_FUNCTION_COST, HEAVY_FUNCTIONS
+        assert {"image_resize", "image_rotate", "binary_compress_bz2", "toPdf"} <= HEAVY_FUNCTIONS
+        assert DSL_FUNCTION_COST["upper"] == "light"
+        assert set(DSL_FUNCTION_COST) == set(DSL_FUNCTION_REGISTRY)
+
+    def test_clock_and_random_builtins_are_impure(self):
+        from functionality_dsl.lib.builtins.registry import DSL_FUNCTION_COST, IMPURE_FUNCTIONS
+        assert {"now", "today", "time", "hour", "sample"} <= IMPURE_FUNCTIONS
+        assert "upper" not in IMPURE_FUNCTIONS
+        assert DSL_FUNCTION_COST["sample"] == "light"
+
+    def test_signatures_ignore_cost_tag(self):
+        from functionality_dsl.lib.builtins.registry import DSL_FUNCTION_SIG
+        assert DSL_FUNCTION_SIG["image_resize"] == (3, 3)
+        assert DSL_FUNCTION_SIG["toPdf"] == (1, 3)
+
+
+class TestBinaryInputs:
+    """Test that binary builtins accept zero-copy views (e.g. of uploaded files)."""
+
+    def test_memoryview_input(self):
+        from functionality_dsl.lib.builtins.binary_funcs import binary_compress_gzip, binary_decompress_gzip, binary_size
+        data = b"frame" * 100
+        view = memoryview(bytearray(data))
+        assert binary_size(view) == len(data)
+        assert binary_decompress_gzip(binary_compress_gzip(view)) == data
+
+    def test_non_binary_input_is_rejected(self):
+        from functionality_dsl.lib.builtins.binary_funcs import binary_size
+        with pytest.raises(ValueError):
+            binary_size("not bytes")
+
+
+class TestRegistryWarmUp:
+    """Test the builtin groups and the startup warm-up hook."""
+
+    def test_every_builtin_belongs_to_a_group(self):
+        from functionality_dsl.lib.builtins.registry import BUILTIN_GROUPS, DSL_FUNCTION_GROUP
+        assert set(DSL_FUNCTION_GROUP) == set(DSL_FUNCTION_REGISTRY)
+        assert set(DSL_FUNCTION_GROUP.values()) <= {name for name, _ in BUILTIN_GROUPS}
+        assert DSL_FUNCTION_GROUP["toPdf"] == "pdf_funcs"
+
+    def test_requirements_name_registered_builtins(self):
+        from functionality_dsl.lib.builtins.registry import BUILTIN_REQUIREMENTS
+        for names in BUILTIN_REQUIREMENTS.values():
+            assert names <= set(DSL_FUNCTION_REGISTRY)
+
+    def test_warm_up_runs_group_hooks(self):
+        from functionality_dsl.lib.builtins.registry import warm_up_builtins
+        warmed = warm_up_builtins()
+        assert {"math_funcs", "timeseries_funcs", "binary_funcs", "pdf_funcs"} <= set(warmed)
+
+
+class TestNumpyBackends:
+    """The NumPy fast paths must return exactly what the pure-Python builtins return."""
+
+    @pytest.fixture
+    def backend(self):
+        pytest.importorskip("numpy")
+        from functionality_dsl.lib.builtins import numpy_backend
+        return numpy_backend
+
+    def _both(self, backend, monkeypatch, name, *args):
+        """Run a builtin once with the NumPy path forced on and once forced off."""
+        func = DSL_FUNCTION_REGISTRY[name]
+        monkeypatch.setattr(backend, "NUMPY_MIN_SIZE", 0)
+        fast = func(*args)
+        monkeypatch.setattr(backend, "NUMPY_AVAILABLE", False)
+        slow = func(*args)
+        monkeypatch.setattr(backend, "NUMPY_AVAILABLE", True)
+        return fast, slow
+
+    @pytest.fixture
+    def datasets(self):
+        import random
+        rng = random.Random(1234)
+        return {
+            "ints": [rng.randint(-10_000, 10_000) for _ in range(5000)],
+            "floats": [rng.uniform(-1e3, 1e3) for _ in range(5000)],
+            "mixed": [rng.choice([rng.randint(0, 100), rng.random() * 100]) for _ in range(5000)],
+            "big_ints": [2 ** 62 + i for i in range(100)],
+        }
+
+    @pytest.mark.parametrize("kind", ["ints", "floats", "mixed", "big_ints"])
+    def test_aggregates_identical(self, backend, monkeypatch, datasets, kind):
+        xs = datasets[kind]
+        for name, args in [
+            ("avg", (xs,)),
+            ("stddev", (xs,)),
+            ("percentile", (xs, 0)),
+            ("percentile", (xs, 37.5)),
+            ("percentile", (xs, 95)),
+            ("percentile", (xs, 100)),
+        ]:
+            fast, slow = self._both(backend, monkeypatch, name, *args)
+            assert fast == slow, f"{name}{args[1:]} differs on {kind}"
+            assert type(fast) is type(slow)
+
+    @pytest.mark.parametrize("kind", ["ints", "floats", "mixed"])
+    def test_series_identical(self, backend, monkeypatch, datasets, kind):
+        xs = datasets[kind]
+        for name, args in [
+            ("movingAvg", (xs, 1)),
+            ("movingAvg", (xs, 25)),
+            ("exponentialAvg", (xs, 0.3)),
+            ("downsample", (xs, 7)),
+        ]:
+            fast, slow = self._both(backend, monkeypatch, name, *args)
+            assert fast == slow, f"{name} differs on {kind}"
+
+    def test_rate_identical(self, backend, monkeypatch, datasets):
+        values = datasets["mixed"]
+        readings = [{"v": v, "ts": i // 3} for i, v in enumerate(values)]
+        fast, slow = self._both(backend, monkeypatch, "rate", readings, "v", "ts")
+        assert fast == slow
+        assert [type(r) for r in fast] == [type(r) for r in slow]
+
+    def test_rate_with_missing_values_falls_back(self, backend, monkeypatch):
+        readings = [{"v": 1, "ts": 0}, {"v": None, "ts": 1}, {"v": 3, "ts": 2}]
+        fast, slow = self._both(backend, monkeypatch, "rate", readings, "v", "ts")
+        assert fast == slow == [None, None]
+
+
+class TestStreamingWindows:
+    """Window and rolling builtins must match a naive per-window recomputation."""
+
+    @staticmethod
+    def _trailing(xs, w):
+        return [xs[max(0, i - w + 1):i + 1] for i in range(len(xs))]
+
+    @pytest.fixture
+    def series(self):
+        import random
+        rng = random.Random(42)
+        return {
+            "ints": [rng.randint(-100, 100) for _ in range(500)],
+            "floats": [rng.uniform(-1e3, 1e3) for _ in range(500)],
+        }
+
+    @pytest.mark.parametrize("size,step", [(1, 1), (3, 1), (3, 2), (2, 5), (4, 4), (20, 1)])
+    def test_window_matches_slices(self, size, step):
+        window = DSL_FUNCTION_REGISTRY["window"]
+        xs = list(range(17))
+        expected = [xs[i:i + size] for i in range(0, len(xs) - size + 1, step)]
+        assert window(xs, size, step) == expected
+        assert list(DSL_FUNCTION_REGISTRY["windowIter"](iter(xs), size, step)) == expected
+
+    def test_window_iter_is_lazy(self):
+        import itertools
+        window_iter = DSL_FUNCTION_REGISTRY["windowIter"]
+        first = next(iter(window_iter(itertools.count(), 3)))
+        assert first == [0, 1, 2]
+
+    def test_window_iter_serves_every_consumer(self):
+        """Two expressions sharing one windowIter() call (CSE) both see every window."""
+        from functionality_dsl.lib.compiler.expr_compiler import hoist_common_subexpressions
+        windows = "dsl_funcs['windowIter'](Src['xs'], 3)"
+        attributes = [
+            {"name": "avgs", "expr": f"dsl_funcs['map']({windows}, lambda w: dsl_funcs['avg'](w))"},
+            {"name": "maxes", "expr": f"dsl_funcs['map']({windows}, lambda w: dsl_funcs['max'](w))"},
+        ]
+        optimized = hoist_common_subexpressions("Stats", attributes)
+        assert any(a.get("temp") for a in optimized)
+
+        context = {"dsl_funcs": DSL_FUNCTION_REGISTRY, "Src": {"xs": [1, 2, 3, 4, 5]}}
+        values = {}
+        for attr in optimized:
+            value = eval(attr["expr"], {"__builtins__": {}, **context, **values})
+            values[attr["name"]] = value if attr.get("temp") else list(value)
+        assert values["avgs"] == [2, 3, 4]
+        assert values["maxes"] == [3, 4, 5]
+
+    def test_distinct_count_unhashable(self):
+        distinct = DSL_FUNCTION_REGISTRY["distinctCount"]
+        items = [{"a": 1, "b": [1, 2]}, {"b": [1, 2], "a": 1}, [1, 2], (1, 2), {"a": 2}]
+        assert distinct(items) == 4
+        assert distinct([{"tags": ["x"]}, {"tags": ["x"]}, {"tags": ["y"]}], "tags") == 2
+
+    @pytest.mark.parametrize("w", [1, 2, 7, 64, 1000])
+    def test_moving_avg(self, series, w):
+        moving_avg = DSL_FUNCTION_REGISTRY["movingAvg"]
+        ints = series["ints"]
+        assert moving_avg(ints, w) == [sum(win) / len(win) for win in self._trailing(ints, w)]
+        floats = series["floats"]
+        expected = [sum(win) / len(win) for win in self._trailing(floats, w)]
+        assert moving_avg(floats, w) == pytest.approx(expected, abs=1e-9)
+
+    @pytest.mark.parametrize("w", [1, 2, 7, 64, 1000])
+    def test_rolling_min_max(self, series, w):
+        for xs in series.values():
+            windows = self._trailing(xs, w)
+            assert DSL_FUNCTION_REGISTRY["rollingMin"](xs, w) == [min(win) for win in windows]
+            assert DSL_FUNCTION_REGISTRY["rollingMax"](xs, w) == [max(win) for win in windows]
+
+    @pytest.mark.parametrize("w", [1, 2, 7, 64])
+    def test_rolling_std(self, series, w):
+        import statistics
+        rolling_std = DSL_FUNCTION_REGISTRY["rollingStd"]
+        for xs in series.values():
+            expected = [statistics.stdev(win) if len(win) > 1 else None for win in self._trailing(xs, w)]
+            result = rolling_std(xs, w)
+            assert [r is None for r in result] == [e is None for e in expected]
+            assert [r for r in result if r is not None] == pytest.approx(
+                [e for e in expected if e is not None], abs=1e-6
+            )
+
+    def test_rolling_std_constant_series(self):
+        assert DSL_FUNCTION_REGISTRY["rollingStd"]([5, 5, 5, 5], 3) == [None, 0.0, 0.0, 0.0]
+
+
+class TestImagePipeline:
+    """Fused image pipelines must match the equivalent chain of image builtins."""
+
+    @pytest.fixture
+    def pil(self):
+        return pytest.importorskip("PIL.Image")
+
+    def _image(self, pil, fmt, size=(320, 240)):
+        import io
+        img = pil.new("RGB", size)
+        img.putdata([(x % 256, y % 256, (x * y) % 256) for y in range(size[1]) for x in range(size[0])])
+        out = io.BytesIO()
+        img.save(out, format=fmt)
+        return out.getvalue()
+
+    def _open(self, pil, data):
+        import io
+        return pil.open(io.BytesIO(data))
+
+    def test_lossless_pipeline_matches_chain(self, pil):
+        png = self._image(pil, "PNG")
+        R = DSL_FUNCTION_REGISTRY
+        chained = R["image_rotate"](R["image_grayscale"](R["image_invert"](png)), 90)
+        fused = R["image_pipeline"](png, [["image_invert"], ["image_grayscale"], ["image_rotate", 90]])
+        assert self._open(pil, fused).tobytes() == self._open(pil, chained).tobytes()
+
+    def test_jpeg_resize_uses_single_decode(self, pil):
+        jpeg = self._image(pil, "JPEG", size=(1280, 960))
+        fused = DSL_FUNCTION_REGISTRY["image_pipeline"](jpeg, [["image_resize", 160, 120], ["image_grayscale"]])
+        img = self._open(pil, fused)
+        assert img.format == "JPEG"
+        assert img.size == (160, 120)
+        assert img.mode == "L"
+
+    def test_encoder_format_and_quality(self, pil):
+        jpeg = self._image(pil, "JPEG")
+        R = DSL_FUNCTION_REGISTRY
+        assert self._open(pil, R["image_encode"](jpeg, "PNG")).format == "PNG"
+        low = R["image_pipeline"](jpeg, [["image_invert"]], "JPEG", 20)
+        high = R["image_pipeline"](jpeg, [["image_invert"]], "JPEG", 95)
+        assert len(low) < len(high)
+
+    def test_invalid_steps_raise(self, pil):
+        png = self._image(pil, "PNG")
+        with pytest.raises(ValueError):
+            DSL_FUNCTION_REGISTRY["image_pipeline"](png, [["image_size"]])
+        with pytest.raises(ValueError):
+            DSL_FUNCTION_REGISTRY["image_pipeline"](png, [["image_resize", 0, 10]])
+
+
+class TestPdfRenderCache:
+    """toPdf() renders identical input once per process."""
+
+    def test_identical_input_is_cached(self):
+        pytest.importorskip("reportlab")
+        to_pdf = DSL_FUNCTION_REGISTRY["toPdf"]
+        rows = [{"id": i, "name": f"item {i}"} for i in range(20)]
+        first = to_pdf(rows, "Items")
+        assert first.startswith(b"%PDF")
+        assert to_pdf([dict(r) for r in rows], "Items") is first
+        assert to_pdf(rows, "Other title") is not first
+
+    def test_content_key_ignores_key_order(self):
+        from functionality_dsl.lib.builtins.pdf_funcs import pdf_content_key
+        assert pdf_content_key({"a": 1, "b": 2}) == pdf_content_key({"b": 2, "a": 1})
+        assert pdf_content_key({"a": 1}) != pdf_content_key({"a": 1}, "title")
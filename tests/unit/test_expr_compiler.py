@@ -220,3 +220,200 @@ class TestExpressionCompiler:
         result = compiler('obj["key"]')
         assert "obj" in result
         assert '["key"]' in result or "['key']" in result
+
+
+class TestExpressionOptimizer:
+    """Test constant folding and common subexpression hoisting.
+
+    Every optimized form is evaluated against the original to prove the
+    rewrite does not change results.
+    """
+
+    CONTEXT = {
+        "Src": {"items": [{"p": 3}, {"p": 1}, {"p": 8}], "name": "abc", "flag": False},
+    }
+
+    def _eval(self, code, context=None):
+        from functionality_dsl.lib.runtime.safe_eval import safe_globals
+        return eval(code, {**safe_globals, **(context if context is not None else self.CONTEXT)}, {})
+
+    def _transform(self, entity_name, attributes):
+        """Mimic the generated service transform: attributes may read earlier ones."""
+        context = dict(self.CONTEXT)
+        data = {}
+        context[entity_name] = data
+        for attr in attributes:
+            value = self._eval(attr["expr"], context)
+            if attr.get("temp"):
+                context[attr["name"]] = value
+            else:
+                data[attr["name"]] = value
+        return data
+
+    @pytest.mark.parametrize("code", [
+        "1 + 2 * 3",
+        "(10 - 4) / 4 % 2",
+        "-(2 + 3)",
+        "not (1 < 2 <= 2)",
+        "'ab' + 'cd' == 'abcd'",
+        "1 if 2 > 1 else Src['missing']",
+        "Src['missing'] if False else 'fallback'",
+        "True and Src['name']",
+        "False or Src['flag']",
+        "0 and Src['missing']",
+        "Src['flag'] and True",
+        "dsl_funcs['len'](Src['items']) + 2 * 5",
+    ])
+    def test_constant_folding_is_equivalent(self, code):
+        from functionality_dsl.lib.compiler.expr_compiler import optimize_expr
+        assert self._eval(optimize_expr(code)) == self._eval(code)
+
+    def test_literal_arithmetic_is_folded(self):
+        from functionality_dsl.lib.compiler.expr_compiler import optimize_expr
+        assert optimize_expr("1 + 2 * 3") == "7"
+        assert optimize_expr("'a' + 'b'") == "'ab'"
+
+    def test_dead_branch_is_removed(self):
+        from functionality_dsl.lib.compiler.expr_compiler import optimize_expr
+        assert optimize_expr("Src['a'] if 1 > 2 else Src['b']") == "Src['b']"
+        assert optimize_expr("True and Src['a']") == "Src['a']"
+        assert optimize_expr("Src['a'] and True") == "Src['a'] and True"
+
+    def test_plain_literals_survive_optimization(self):
+        """The compiler wraps operands in operator-less Compare nodes; they are not comparisons."""
+        from textx import get_children_of_type
+        from functionality_dsl.language import build_model_str
+
+        model = build_model_str("""
+        Server API
+          host: "localhost"
+          port: 8080
+        end
+
+        Source<REST> DataAPI
+          url: "http://test/data"
+          operations: [read]
+        end
+
+        Entity Data
+          source: DataAPI
+          attributes:
+            - value: integer;
+          access: public
+        end
+
+        Entity Scaled(Data)
+          attributes:
+            - size: integer = 64;
+            - rounded: number = round(Data.value, 2);
+          access: public
+        end
+        """)
+        scaled = next(e for e in get_children_of_type("Entity", model) if e.name == "Scaled")
+        compiled = {a.name: compile_expr_to_python(a.expr) for a in scaled.attributes}
+        assert compiled["size"] == "64"
+        assert compiled["rounded"] == "dsl_funcs['round'](Data.get('value'), 2)"
+
+    def test_nested_image_builtins_are_fused(self):
+        from functionality_dsl.lib.compiler.expr_compiler import optimize_expr
+        code = "dsl_funcs['image_grayscale'](dsl_funcs['image_resize'](Cam['frame'], 640, 480))"
+        assert optimize_expr(code) == (
+            "dsl_funcs['image_pipeline'](Cam['frame'], [['image_resize', 640, 480], ['image_grayscale']])"
+        )
+        code = "dsl_funcs['image_encode'](dsl_funcs['image_rotate'](dsl_funcs['image_invert'](x), 90), 'WEBP', 80)"
+        assert optimize_expr(code) == (
+            "dsl_funcs['image_pipeline'](x, [['image_invert'], ['image_rotate', 90]], 'WEBP', 80)"
+        )
+
+    def test_single_image_builtin_is_not_fused(self):
+        from functionality_dsl.lib.compiler.expr_compiler import optimize_expr
+        code = "dsl_funcs['image_resize'](Cam['frame'], 640, 480)"
+        assert optimize_expr(code) == code
+
+    def test_failing_operations_are_not_folded(self):
+        from functionality_dsl.lib.compiler.expr_compiler import optimize_expr
+        assert optimize_expr("1 / 0") == "1 / 0"
+        assert optimize_expr("'a' < 1") == "'a' < 1"
+
+    def test_oversized_results_are_not_built(self):
+        """Folding must not allocate huge values at compile time."""
+        from functionality_dsl.lib.compiler.expr_compiler import optimize_expr
+        assert optimize_expr("'x' * 1000000000") == "'x' * 1000000000"
+        assert optimize_expr("1000000000 * 'x'") == "1000000000 * 'x'"
+        assert optimize_expr("'%1000000000d' % 1") == "'%1000000000d' % 1"
+        assert optimize_expr("'ab' * 3") == "'ababab'"
+
+    def test_common_subexpressions_are_hoisted_and_equivalent(self):
+        from functionality_dsl.lib.compiler.expr_compiler import hoist_common_subexpressions
+        prices = "dsl_funcs['map'](Src['items'], lambda i: i['p'])"
+        attributes = [
+            {"name": "avgPrice", "expr": f"dsl_funcs['avg']({prices})"},
+            {"name": "maxPrice", "expr": f"dsl_funcs['max']({prices})"},
+            {"name": "spread", "expr": f"dsl_funcs['max']({prices}) - dsl_funcs['min']({prices})"},
+            {"name": "label", "expr": "dsl_funcs['upper'](Src['name'])"},
+        ]
+
+        optimized = hoist_common_subexpressions("Stats", attributes)
+
+        temps = [a for a in optimized if a.get("temp")]
+        assert temps, "Repeated map() should be hoisted into a temporary"
+        assert sum(prices in a["expr"] for a in optimized) == 1
+        assert [a["name"] for a in optimized if not a.get("temp")] == [a["name"] for a in attributes]
+        assert self._transform("Stats", optimized) == self._transform("Stats", attributes)
+
+    def test_conditional_first_use_is_not_hoisted(self):
+        from functionality_dsl.lib.compiler.expr_compiler import hoist_common_subexpressions
+        risky = "dsl_funcs['len'](Src['missing'])"
+        attributes = [
+            {"name": "a", "expr": f"{risky} if Src['flag'] else 0"},
+            {"name": "b", "expr": f"{risky} if Src['flag'] else 1"},
+        ]
+
+        optimized = hoist_common_subexpressions("Guarded", attributes)
+
+        assert optimized == attributes
+        assert self._transform("Guarded", optimized) == {"a": 0, "b": 1}
+
+    def test_self_references_and_impure_calls_are_not_shared(self):
+        from functionality_dsl.lib.compiler.expr_compiler import hoist_common_subexpressions
+        attributes = [
+            {"name": "n", "expr": "dsl_funcs['len'](Src['items'])"},
+            {"name": "double", "expr": "dsl_funcs['abs'](Self['n']) * 2"},
+            {"name": "triple", "expr": "dsl_funcs['abs'](Self['n']) * 3"},
+            {"name": "t1", "expr": "dsl_funcs['now']()"},
+            {"name": "t2", "expr": "dsl_funcs['now']()"},
+        ]
+
+        optimized = hoist_common_subexpressions("Self", attributes)
+
+        assert optimized == attributes
+
+    def test_random_builtins_are_not_shared(self):
+        """sample() is tagged impure in the registry: each attribute draws on its own."""
+        from functionality_dsl.lib.compiler.expr_compiler import hoist_common_subexpressions
+        attributes = [
+            {"name": "s1", "expr": "dsl_funcs['sample'](Src['items'], 2)"},
+            {"name": "s2", "expr": "dsl_funcs['sample'](Src['items'], 2)"},
+            {"name": "n1", "expr": "dsl_funcs['len'](dsl_funcs['sample'](Src['items'], 2)) + 1"},
+            {"name": "n2", "expr": "dsl_funcs['len'](dsl_funcs['sample'](Src['items'], 2)) + 2"},
+        ]
+
+        assert hoist_common_subexpressions("Draws", attributes) == attributes
+
+    def test_temporaries_name_the_attribute_that_needs_them(self):
+        """Errors in a hoisted subexpression are reported against its first user, not _cseN."""
+        from functionality_dsl.lib.compiler.expr_compiler import hoist_common_subexpressions
+        inner = "dsl_funcs['map'](Src['items'], lambda i: i['p'])"
+        outer = f"dsl_funcs['sum']({inner})"
+        attributes = [
+            {"name": "label", "expr": "dsl_funcs['upper'](Src['name'])"},
+            {"name": "total", "expr": f"{outer} + 1"},
+            {"name": "total2", "expr": f"{outer} * 2"},
+            {"name": "top", "expr": f"dsl_funcs['max']({inner})"},
+        ]
+
+        optimized = hoist_common_subexpressions("Stats", attributes)
+
+        temps = [a for a in optimized if a.get("temp")]
+        assert len(temps) == 2
+        assert {a["used_by"] for a in temps} == {"total"}
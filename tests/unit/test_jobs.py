@@ -0,0 +1,71 @@
+"""
+Unit tests for the generated backend's background job store (app/core/jobs.py).
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def jobs(backend_app):
+    module = backend_app("app.core.jobs")
+    yield module
+    module._store = None
+
+
+def _request(headers=()):
+    from starlette.requests import Request
+
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers],
+    })
+
+
+class TestJobOwnership:
+    """Test that jobs are only visible to the user who submitted them."""
+
+    def _finished_job(self, jobs, owner):
+        async def render():
+            return b"%PDF-1.4"
+
+        async def scenario():
+            job = jobs.get_job_store().submit(render, media_type="application/pdf", filename="r.pdf", owner=owner)
+            while job.status not in (jobs.DONE, jobs.FAILED):
+                await asyncio.sleep(0)
+            return job
+
+        return asyncio.run(scenario())
+
+    def test_owner_can_poll_and_download(self, jobs):
+        """Test that the submitter sees the status and gets the bytes."""
+        job = self._finished_job(jobs, owner="alice")
+
+        assert jobs.job_status(job.id, "/api/report/jobs", "alice")["status"] == jobs.DONE
+        response = jobs.job_download(job.id, _request(), "alice")
+        assert response.body == b"%PDF-1.4"
+
+    @pytest.mark.parametrize("requester", ["bob", None])
+    def test_other_requesters_get_404(self, jobs, requester):
+        """Test that another user (or an anonymous caller) cannot tell the job exists."""
+        from fastapi import HTTPException
+
+        job = self._finished_job(jobs, owner="alice")
+
+        for call in (
+            lambda: jobs.job_status(job.id, "/api/report/jobs", requester),
+            lambda: jobs.job_download(job.id, _request(), requester),
+        ):
+            with pytest.raises(HTTPException) as exc_info:
+                call()
+            assert exc_info.value.status_code == 404
+
+    def test_public_jobs_have_no_owner(self, jobs):
+        """Test that exports from public routes stay reachable by job id."""
+        job = self._finished_job(jobs, owner=None)
+
+        assert jobs.job_download(job.id, _request()).body == b"%PDF-1.4"
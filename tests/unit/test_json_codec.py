@@ -0,0 +1,101 @@
+"""
+Unit tests for the generated backend's JSON codec (app/core/json_codec.py):
+the orjson and standard-library backends must agree.
+"""
+
+import importlib.util
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+
+@pytest.fixture
+def codecs(backend_app, monkeypatch):
+    """The codec loaded twice: with orjson, and with the orjson import failing."""
+    pytest.importorskip("orjson")
+    monkeypatch.delenv("FDSL_JSON_BACKEND", raising=False)
+    fast = backend_app("app.core.json_codec")
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    spec = importlib.util.spec_from_file_location("json_codec_stdlib", fast.__file__)
+    stdlib = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(stdlib)
+
+    assert (fast.BACKEND, stdlib.BACKEND) == ("orjson", "stdlib")
+    return fast, stdlib
+
+
+NAN = float("nan")
+INF = float("inf")
+
+VALUES = [
+    {"id": 1, "name": "café ☕", "tags": ["a", "b"], "ok": True, "none": None},
+    [0, -1, 2**63 - 1, -(2**63), 2**64 - 1, 0.1, -0.0, 1.5, 123.456],
+    {"nested": {"deep": [{"x": [1, [2, [3]]]}]}, "empty": {}, "list": []},
+    {1: "int key", "quote": 'say "hi"\n\t\\', "ctrl": "\x00\x1f"},
+    # Non-finite floats are written as null
+    [NAN, INF, -INF],
+    {"reading": {"value": NAN, "history": [1.0, INF]}},
+    # Integers beyond 64 bits are written in full (orjson falls back)
+    2**64,
+    {"big": [-(2**70), 2**100], "nan": NAN},
+    # Types encoded through _default
+    {"price": Decimal("12.50"), "missing": Decimal("NaN"), "tags": {"only"}, "set_nan": frozenset([NAN])},
+    {"id": UUID("12345678-1234-5678-1234-567812345678")},
+    {"at": datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc), "naive": datetime(2024, 1, 2)},
+    (1, (2, 3)),
+]
+
+
+class TestBackendParity:
+    """Test that both backends produce the same output."""
+
+    @pytest.mark.parametrize("value", VALUES)
+    def test_dumps_is_identical(self, codecs, value):
+        """Test that dumps and dumpb give byte-identical output."""
+        fast, stdlib = codecs
+        assert fast.dumps(value) == stdlib.dumps(value)
+        assert fast.dumpb(value) == stdlib.dumpb(value)
+
+    def test_non_finite_and_big_values(self, codecs):
+        """Test the values where the backends' defaults differ."""
+        for codec in codecs:
+            assert codec.dumps([NAN, INF, Decimal("-Infinity")]) == "[null,null,null]"
+            assert codec.dumps({"n": 2**80}) == '{"n":%d}' % 2**80
+
+    @pytest.mark.parametrize("value", [1e16, 1e-7, [1.5e300, 1e22]])
+    def test_float_exponents_parse_to_the_same_value(self, codecs, value):
+        """Test that exponent spelling differs but the value does not."""
+        fast, stdlib = codecs
+        assert fast.loads(fast.dumps(value)) == stdlib.loads(stdlib.dumps(value)) == value
+
+    @pytest.mark.parametrize("value", VALUES)
+    def test_round_trip_is_identical(self, codecs, value):
+        """Test that both backends parse each other's output to the same value."""
+        fast, stdlib = codecs
+        text = stdlib.dumps(value)
+        assert fast.loads(text) == stdlib.loads(text)
+
+    @pytest.mark.parametrize("wrap", [str, lambda s: s.encode(), lambda s: bytearray(s.encode()),
+                                      lambda s: memoryview(s.encode())])
+    def test_loads_accepts_the_same_inputs(self, codecs, wrap):
+        """Test that text and UTF-8 bytes-likes parse the same."""
+        fast, stdlib = codecs
+        text = '{"a":[1,2.5,"é",null,true]}'
+        assert fast.loads(wrap(text)) == stdlib.loads(wrap(text)) == {"a": [1, 2.5, "é", None, True]}
+
+    @pytest.mark.parametrize("data", ["NaN", "[Infinity]", '{"a": -Infinity}', b"\xff", "[1,", ""])
+    def test_loads_rejects_the_same_inputs(self, codecs, data):
+        """Test that invalid JSON (including NaN literals and bad UTF-8) fails on both."""
+        for codec in codecs:
+            with pytest.raises(codec.JSONDecodeError):
+                codec.loads(data)
+
+    def test_unserializable_type_raises(self, codecs):
+        """Test that unknown types raise TypeError on both backends."""
+        for codec in codecs:
+            with pytest.raises(TypeError):
+                codec.dumps({"x": object()})
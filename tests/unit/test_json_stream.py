@@ -0,0 +1,109 @@
+"""
+Unit tests for the generated backend's incremental JSON array parser
+(app/core/json_stream.py).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+
+FIXTURES = [
+    b'[1, 12.5, 3e4, {"a": 1.25}, 7]',
+    b'[-12, 0, 1E+2, 2.5e-3, -0.5, true, false, null]',
+    b'["say \\"hi\\"", "[not] {an} array,", "\\\\", "\\\\\\"", "\\u00e9"]',
+    b'[{"a": {"b": [1, {"c": "]"}]}}, [], {}, [[[-0.5e-3]]], {"k": "}"}]',
+    b'  [ 1 ,\n2\t,\r\n 3 ]  ',
+    '["café", "☕", {"ключ": "值"}]'.encode(),
+    b'[]',
+    b'[100000]',
+]
+
+
+def _feed(parser, chunks):
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    items.extend(parser.close())
+    return items
+
+
+@pytest.fixture
+def json_stream(backend_app):
+    return backend_app("app.core.json_stream")
+
+
+class TestChunking:
+    """Test that items do not depend on where the body is split."""
+
+    @pytest.mark.parametrize("fixture", FIXTURES)
+    def test_split_at_every_offset(self, json_stream, fixture):
+        """Test that a body fed in two pieces, split anywhere, gives the same items."""
+        expected = json.loads(fixture)
+        for offset in range(len(fixture) + 1):
+            parser = json_stream.JSONArrayParser()
+            assert _feed(parser, [fixture[:offset], fixture[offset:]]) == expected, offset
+
+    @pytest.mark.parametrize("fixture", FIXTURES)
+    def test_one_byte_at_a_time(self, json_stream, fixture):
+        """Test that a body fed byte by byte gives the same items."""
+        chunks = [fixture[i:i + 1] for i in range(len(fixture))]
+        assert _feed(json_stream.JSONArrayParser(), chunks) == json.loads(fixture)
+
+    def test_numbers_wait_for_their_delimiter(self, json_stream):
+        """Test that a number cut at the chunk boundary is not returned early."""
+        parser = json_stream.JSONArrayParser()
+        assert parser.feed(b"[12.") == []
+        assert parser.feed(b"5, 3e") == [12.5]
+        assert parser.feed(b"4") == []
+        assert parser.feed(b"]") == [30000.0]
+        assert parser.close() == []
+
+    def test_object_with_key_at_every_offset(self, json_stream):
+        """Test that a wrapper object is buffered and its array returned."""
+        fixture = b'{"total": 2, "items": [1.5, {"a": "]"}]}'
+        for offset in range(len(fixture) + 1):
+            parser = json_stream.JSONArrayParser(key="items")
+            assert _feed(parser, [fixture[:offset], fixture[offset:]]) == [1.5, {"a": "]"}]
+
+
+class TestMalformed:
+    """Test that malformed or incomplete arrays raise ValueError."""
+
+    @pytest.mark.parametrize("fixture", [b"[12.x]", b"[1 2]", b"[3e]", b'{"a": 1}', b"[1]]", b"7"])
+    def test_malformed(self, json_stream, fixture):
+        """Test that invalid documents raise, whole or byte by byte."""
+        for chunks in ([fixture], [fixture[i:i + 1] for i in range(len(fixture))]):
+            with pytest.raises(ValueError):
+                _feed(json_stream.JSONArrayParser(), chunks)
+
+    @pytest.mark.parametrize("fixture", [b"[1, 2", b"[12.", b'["abc', b""])
+    def test_truncated(self, json_stream, fixture):
+        """Test that a body ending inside the array raises on close()."""
+        with pytest.raises(ValueError):
+            _feed(json_stream.JSONArrayParser(), [fixture])
+
+    def test_item_size_limit(self, json_stream):
+        """Test that an item growing past max_item_size raises while feeding."""
+        parser = json_stream.JSONArrayParser(max_item_size=10)
+        with pytest.raises(ValueError, match="exceeds 10"):
+            for i in range(20):
+                parser.feed(b'["' if i == 0 else b"x")
+
+
+class TestIterJsonArray:
+    """Test that iter_json_array batches the parsed items."""
+
+    def test_batches(self, json_stream):
+        """Test that items are yielded in lists of up to batch_size."""
+        fixture = FIXTURES[0]
+
+        async def chunks():
+            for i in range(len(fixture)):
+                yield fixture[i:i + 1]
+
+        async def collect():
+            return [batch async for batch in json_stream.iter_json_array(chunks(), batch_size=2, max_item_size=100)]
+
+        assert asyncio.run(collect()) == [[1, 12.5], [30000.0, {"a": 1.25}], [7]]
@@ -0,0 +1,179 @@
+"""
+Unit tests for the generated backend's streaming multipart parser
+(app/core/content_handler.py: MultipartParser, UploadedFile, parse_multipart_stream).
+"""
+
+import asyncio
+
+import pytest
+
+
+BOUNDARY = "----FormBoundaryTest"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _body(*parts, preamble=b"", epilogue=b""):
+    """Build a multipart body from (name, value, filename) parts."""
+    out = bytearray(preamble)
+    for name, value, filename in parts:
+        out += b"--" + BOUNDARY.encode() + b"\r\n"
+        disposition = f'Content-Disposition: form-data; name="{name}"'
+        if filename:
+            disposition += f'; filename="{filename}"\r\nContent-Type: application/octet-stream'
+        out += disposition.encode() + b"\r\n\r\n" + value + b"\r\n"
+    out += b"--" + BOUNDARY.encode() + b"--\r\n" + epilogue
+    return bytes(out)
+
+
+# Boundary-like bytes inside the content must not end the part early
+BODY = _body(
+    ("title", b"hello\r\n--not-the-boundary", None),
+    ("upload", b"\x00\x01\r\n------FormBoundaryTes\xff" * 8, "data.bin"),
+)
+
+
+def _parse(handler, body, chunk_size=None, **limits):
+    async def chunks():
+        size = chunk_size or len(body) or 1
+        for start in range(0, len(body), size):
+            yield body[start:start + size]
+
+    return asyncio.run(handler.ContentTypeHandler.parse_multipart_stream(chunks(), CONTENT_TYPE, **limits))
+
+
+@pytest.fixture
+def handler(backend_app):
+    return backend_app("app.core.content_handler")
+
+
+class TestChunking:
+    """Test that the result does not depend on how the body is chunked."""
+
+    def _expected(self, handler):
+        fields = _parse(handler, BODY)
+        return fields["title"], fields["upload"].read()
+
+    def test_boundary_split_at_every_offset(self, handler):
+        """Test that a body fed in two pieces, split anywhere, parses the same."""
+        expected = self._expected(handler)
+        for offset in range(1, len(BODY)):
+            parser = handler.MultipartParser(BOUNDARY)
+            parser.feed(BODY[:offset])
+            parser.feed(BODY[offset:])
+            fields = parser.close()
+            assert (fields["title"], fields["upload"].read()) == expected, offset
+
+    def test_one_byte_chunks(self, handler):
+        """Test that a body fed one byte at a time parses the same."""
+        fields = _parse(handler, BODY, chunk_size=1)
+        assert (fields["title"], fields["upload"].read()) == self._expected(handler)
+        assert fields["title"] == "hello\r\n--not-the-boundary"
+        assert fields["filename"] == "data.bin"
+
+    def test_preamble_and_epilogue_are_ignored(self, handler):
+        """Test that text before the first and after the closing boundary is dropped."""
+        body = _body(
+            ("a", b"1", None),
+            preamble=b"This is a preamble.\r\n",
+            epilogue=b"trailing epilogue --" + BOUNDARY.encode(),
+        )
+        for chunk_size in (None, 1, 7):
+            assert _parse(handler, body, chunk_size=chunk_size) == {"a": "1"}
+
+
+class TestSpooling:
+    """Test that file parts move to disk above the spool threshold."""
+
+    def test_small_file_stays_in_memory(self, handler):
+        """Test that a file up to the threshold is kept in memory."""
+        upload = _parse(handler, _body(("f", b"x" * 64, "f.bin")), spool_threshold=64)["f"]
+        assert upload.in_memory
+        assert upload.read() == b"x" * 64
+
+    def test_large_file_is_spooled(self, handler):
+        """Test that a file over the threshold is written to a temporary file."""
+        content = bytes(range(256)) * 40
+        upload = _parse(handler, _body(("f", content, "f.bin")), chunk_size=100, spool_threshold=1000)["f"]
+        try:
+            assert not upload.in_memory
+            assert upload.size == len(content)
+            assert upload.file.read() == content
+            with upload.view() as view:
+                assert view.tobytes() == content
+        finally:
+            upload.close()
+
+
+class TestLimits:
+    """Test that every size limit raises PayloadTooLarge while reading."""
+
+    @pytest.mark.parametrize("limits, body", [
+        ({"max_file_size": 10}, _body(("f", b"x" * 11, "f.bin"))),
+        ({"max_field_size": 10}, _body(("t", b"x" * 11, None))),
+        ({"max_body_size": 50}, _body(("t", b"x" * 100, None))),
+        ({"max_parts": 2}, _body(("a", b"1", None), ("b", b"2", None), ("c", b"3", None))),
+    ])
+    def test_limit_raises(self, handler, limits, body):
+        """Test that exceeding the limit raises PayloadTooLarge."""
+        for chunk_size in (None, 1):
+            with pytest.raises(handler.PayloadTooLarge):
+                _parse(handler, body, chunk_size=chunk_size, **limits)
+
+    def test_limits_at_the_boundary_pass(self, handler):
+        """Test that content exactly at a limit is accepted."""
+        body = _body(("f", b"x" * 10, "f.bin"), ("t", b"y" * 10, None))
+        fields = _parse(handler, body, max_file_size=10, max_field_size=10, max_body_size=len(body), max_parts=2)
+        assert fields["t"] == "y" * 10
+
+    def test_open_part_is_closed_on_error(self, handler, monkeypatch):
+        """Test that the file being read when a limit trips is released."""
+        closed = []
+        monkeypatch.setattr(handler.UploadedFile, "close", lambda self: closed.append(self.filename))
+
+        body = _body(("done", b"x" * 4, "done.bin"), ("big", b"x" * 100, "big.bin"))
+        with pytest.raises(handler.PayloadTooLarge):
+            _parse(handler, body, chunk_size=16, max_file_size=50)
+
+        assert sorted(closed) == ["big.bin", "done.bin"]
+
+    def test_route_returns_413(self, handler, backend_app):
+        """Test that parse_request_stream turns a limit into a 413 response."""
+        from fastapi import FastAPI, Request
+        from fastapi.testclient import TestClient
+
+        settings = backend_app("app.core.config").settings
+        app = FastAPI()
+
+        @app.post("/upload")
+        async def upload(request: Request):
+            fields = await handler.ContentTypeHandler.parse_request_stream(request)
+            return {"fields": sorted(fields)}
+
+        client = TestClient(app)
+        body = _body(("t", b"x" * 100, None))
+        headers = {"content-type": CONTENT_TYPE}
+
+        assert client.post("/upload", content=body, headers=headers).json() == {"fields": ["t"]}
+
+        original = settings.MULTIPART_MAX_FIELD_SIZE
+        settings.MULTIPART_MAX_FIELD_SIZE = 10
+        try:
+            response = client.post("/upload", content=body, headers=headers)
+        finally:
+            settings.MULTIPART_MAX_FIELD_SIZE = original
+        assert response.status_code == 413
+
+
+class TestMalformed:
+    """Test that incomplete bodies are rejected."""
+
+    @pytest.mark.parametrize("cut", [10, 60, -20, -3])
+    def test_truncated_body_raises(self, handler, cut):
+        """Test that a body cut before the closing boundary raises ValueError."""
+        with pytest.raises(ValueError, match="Truncated"):
+            _parse(handler, BODY[:cut])
+
+    def test_missing_boundary_parameter(self, handler):
+        """Test that a Content-Type without a boundary is rejected."""
+        with pytest.raises(ValueError, match="boundary"):
+            handler.MultipartParser.boundary_from("multipart/form-data")
@@ -0,0 +1,105 @@
+"""
+Unit tests for the generated backend's transform helper (app/core/service_helpers.py).
+
+The helper reads builtin metadata from app/core/builtins, which only a
+scaffolded backend has (with the builtin groups its model uses), so each test
+scaffolds one into a temp directory.
+"""
+
+import logging
+from pathlib import Path
+
+import pytest
+
+from functionality_dsl.language import build_model_str
+
+FDSL = """
+Server API
+  host: "localhost"
+  port: 8080
+end
+
+Source<REST> QuoteAPI
+  url: "http://test/quote"
+  operations: [read]
+end
+
+Entity Quote
+  source: QuoteAPI
+  attributes:
+    - name: string;
+    - price: number;
+  access: public
+end
+
+Entity Ticker(Quote)
+  attributes:
+    - name: string = upper(Quote.name);
+    - at: integer = now();
+  access: public
+end
+"""
+
+
+@pytest.fixture
+def backend(temp_output_dir, backend_app):
+    from functionality_dsl.api.generators.core.infrastructure import scaffold_backend_from_model
+
+    package_dir = Path(__file__).parent.parent.parent / "functionality_dsl"
+    scaffold_backend_from_model(
+        build_model_str(FDSL),
+        base_backend_dir=package_dir / "base" / "backend",
+        templates_backend_dir=package_dir / "templates" / "backend",
+        out_dir=temp_output_dir,
+    )
+    helpers = backend_app("app.core.service_helpers", root=temp_output_dir)
+    safe_eval = backend_app("app.core.runtime.safe_eval", root=temp_output_dir)
+    return helpers, safe_eval
+
+
+class TestIncrementalTransform:
+    """Test which attributes the stream-join path reuses from its cache."""
+
+    def test_impure_builtins_are_always_reevaluated(self, backend):
+        """Test that now() is called on every state while unchanged pure attributes are reused."""
+        helpers, safe_eval = backend
+        calls = {"now": 0, "upper": 0}
+
+        def counted(name):
+            fn = safe_eval.safe_globals["dsl_funcs"][name]
+
+            def wrapper(*args):
+                calls[name] += 1
+                return fn(*args)
+
+            return wrapper
+
+        safe_globals = {
+            **safe_eval.safe_globals,
+            "dsl_funcs": {**safe_eval.safe_globals["dsl_funcs"], "now": counted("now"), "upper": counted("upper")},
+        }
+        attributes = [
+            {"name": "name", "expr": "dsl_funcs['upper'](Info['name'])"},
+            {"name": "price", "expr": "Quote['price']"},
+            {"name": "at", "expr": "dsl_funcs['now']()"},
+        ]
+        cache = {}
+
+        def transform(quote, changed):
+            return helpers.transform_entity_data(
+                "Ticker",
+                attributes,
+                {"Info": {"name": "acme"}, "Quote": {"price": quote}},
+                safe_globals,
+                safe_eval.compile_safe,
+                logging.getLogger("test"),
+                changed=changed,
+                cache=cache,
+            )
+
+        first = transform(1, {"Info", "Quote"})
+        second = transform(2, {"Quote"})
+
+        assert first["name"] == second["name"] == "ACME"
+        assert second["price"] == 2
+        assert calls == {"now": 2, "upper": 1}
@@ -0,0 +1,133 @@
+"""
+Unit tests for the generated backend's session store (app/core/session_store.py).
+
+Covers LRU and TTL eviction of the in-memory front cache and the write-behind
+behaviour of the tiered store against a temporary SQLite file.
+"""
+
+import time
+
+import pytest
+
+
+@pytest.fixture
+def session_store(backend_app):
+    return backend_app("app.core.session_store")
+
+
+def test_store_interface_is_abstract(session_store):
+    """Test that a store missing get/set/delete cannot be created."""
+    class Partial(session_store.SessionStore):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+class TestInMemorySessionStore:
+    """Test the bounded LRU front cache."""
+
+    def test_least_recently_used_entry_is_evicted(self, session_store):
+        """Test that reading an entry protects it from eviction."""
+        store = session_store.InMemorySessionStore(max_entries=2, ttl=60)
+        store.set("a", {"user": 1})
+        store.set("b", {"user": 2})
+        assert store.get("a") == {"user": 1}
+
+        store.set("c", {"user": 3})
+
+        assert store.get("b") is None
+        assert store.get("a") == {"user": 1}
+        assert store.get("c") == {"user": 3}
+        assert len(store) == 2
+
+    def test_expired_entry_is_not_served(self, session_store):
+        """Test that an entry past its TTL is dropped on read."""
+        store = session_store.InMemorySessionStore(max_entries=10, ttl=60)
+        store.set("short", "x", ttl=0.01)
+        store.set("long", "y")
+        time.sleep(0.02)
+
+        assert store.get("short") is None
+        assert store.get("long") == "y"
+        assert len(store) == 1
+
+    def test_sweep_removes_expired_entries(self, session_store):
+        """Test that the sweep drops expired entries without touching live ones."""
+        store = session_store.InMemorySessionStore(max_entries=10, ttl=60)
+        store.set("a", 1, ttl=0)
+        store.set("b", 2, ttl=0)
+        store.set("c", 3)
+
+        assert store.sweep() == 2
+        assert len(store) == 1
+        assert store.get("c") == 3
+
+
+class TestTieredSessionStore:
+    """Test the LRU front over a SQLite backend."""
+
+    @pytest.fixture
+    def tiered(self, session_store, tmp_path):
+        back = session_store.SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl=60)
+        store = session_store.TieredSessionStore(session_store.InMemorySessionStore(max_entries=10, ttl=60), back)
+        yield store
+        store.close()
+
+    def test_writes_reach_sqlite_on_flush(self, tiered):
+        """Test that writes are served from the front at once and written behind."""
+        tiered.set("token", {"user_id": "1", "roles": ["admin"]})
+
+        assert tiered.get("token") == {"user_id": "1", "roles": ["admin"]}
+        assert tiered.back.get("token") is None
+
+        assert tiered.flush() == 1
+        assert tiered.back.get("token") == {"user_id": "1", "roles": ["admin"]}
+        assert tiered.flush() == 0
+
+    def test_backend_hit_populates_front(self, tiered):
+        """Test that a credential only in SQLite (e.g. after a restart) is cached in front."""
+        tiered.back.set("token", "persisted")
+
+        assert tiered.front.get("token") is None
+        assert tiered.get("token") == "persisted"
+        assert tiered.front.get("token") == "persisted"
+
+    def test_delete_goes_through_both_tiers(self, tiered):
+        """Test that a revoked credential is not served from SQLite or a pending write."""
+        tiered.set("token", "value")
+        tiered.flush()
+        tiered.set("token", "newer")
+
+        tiered.delete("token")
+        tiered.flush()
+
+        assert tiered.get("token") is None
+        assert tiered.back.get("token") is None
+
+    def test_sweep_flushes_and_removes_expired(self, tiered):
+        """Test that the sweep writes pending entries and drops expired ones in both tiers."""
+        tiered.back.set("stale", "old", ttl=-1)
+        tiered.set("expired", "x", ttl=0)
+        tiered.set("live", "y")
+
+        # stale (SQLite) + expired (front and, once flushed, SQLite)
+        assert tiered.sweep() == 3
+        assert tiered.get("live") == "y"
+        assert tiered.back.get("live") == "y"
+        assert tiered.get("expired") is None
+        assert tiered.get("stale") is None
+
+    def test_sqlite_file_survives_reopen(self, session_store, tmp_path):
+        """Test that flushed sessions are read back by a new store on the same file."""
+        path = str(tmp_path / "sessions.db")
+        first = session_store.SQLiteSessionStore(path, ttl=60)
+        first.set("token", {"user_id": "7"})
+        first.close()
+
+        second = session_store.SQLiteSessionStore(path, ttl=60)
+        try:
+            assert second.get("token") == {"user_id": "7"}
+        finally:
+            second.close()
@@ -0,0 +1,59 @@
+"""
+Unit tests for the shared Jinja environments used by the generators.
+"""
+
+from pathlib import Path
+
+from functionality_dsl.api.templating import get_environment, preload_templates
+
+
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / "functionality_dsl" / "templates" / "backend"
+
+
+class TestSharedEnvironment:
+    """Test environment sharing and the on-disk bytecode cache."""
+
+    def test_environment_is_shared_per_options(self, tmp_path, monkeypatch):
+        """Test that generators asking for the same options get one environment."""
+        monkeypatch.setenv("FDSL_CACHE_DIR", str(tmp_path))
+
+        env = get_environment(TEMPLATES_DIR)
+
+        assert get_environment(str(TEMPLATES_DIR)) is env
+        assert get_environment(TEMPLATES_DIR, trim=True) is not env
+        assert get_environment(TEMPLATES_DIR, trim=True, strict=True) is not get_environment(TEMPLATES_DIR, trim=True)
+
+    def test_templates_are_compiled_once(self, tmp_path, monkeypatch):
+        """Test that a template is compiled once and then served from memory."""
+        monkeypatch.setenv("FDSL_CACHE_DIR", str(tmp_path))
+        env = get_environment(TEMPLATES_DIR)
+
+        assert env.get_template("entity_router.py.jinja") is env.get_template("entity_router.py.jinja")
+
+    def test_bytecode_cache_is_written_per_option_set(self, tmp_path, monkeypatch):
+        """Test that compiled templates land in the user cache, separated by compile options."""
+        monkeypatch.setenv("FDSL_CACHE_DIR", str(tmp_path))
+
+        assert preload_templates(get_environment(TEMPLATES_DIR), ["entity_router.py.jinja"]) == 1
+        preload_templates(get_environment(TEMPLATES_DIR, trim=True), ["entity_router.py.jinja"])
+
+        cache_dirs = sorted((tmp_path / "jinja").iterdir())
+        assert len(cache_dirs) == 2
+        assert all(list(d.glob("__jinja2_*.cache")) for d in cache_dirs)
+
+    def test_cache_can_be_disabled(self, monkeypatch):
+        """Test that an empty FDSL_CACHE_DIR turns off the on-disk cache."""
+        monkeypatch.setenv("FDSL_CACHE_DIR", "")
+
+        assert get_environment(TEMPLATES_DIR).bytecode_cache is None
+
+    def test_shared_filters_are_opt_in(self, tmp_path, monkeypatch):
+        """Test that the unicode tojson filter only replaces Jinja's where requested."""
+        monkeypatch.setenv("FDSL_CACHE_DIR", str(tmp_path))
+        source = "{{ value | tojson }}"
+
+        plain = get_environment(TEMPLATES_DIR).from_string(source)
+        unicode = get_environment(TEMPLATES_DIR, filters=("tojson",)).from_string(source)
+
+        assert plain.render(value="20°") == '"20\\u00b0"'
+        assert unicode.render(value="20°") == '"20°"'
@@ -0,0 +1,170 @@
+"""
+Unit tests for the generated backend's delta frames (app/core/ws_delta.py):
+every patch is applied with an RFC 6902 applier and must rebuild the new message.
+"""
+
+import copy
+import json
+
+import pytest
+
+
+def _tokens(path):
+    return [token.replace("~1", "/").replace("~0", "~") for token in path.split("/")[1:]]
+
+
+def apply_patch(document, patch):
+    """Minimal RFC 6902 applier (add, remove, replace)."""
+    document = copy.deepcopy(document)
+    for op in patch:
+        tokens = _tokens(op["path"])
+        if not tokens:
+            assert op["op"] in ("add", "replace")
+            document = copy.deepcopy(op["value"])
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            if op["op"] == "add":
+                index = len(parent) if last == "-" else int(last)
+                assert 0 <= index <= len(parent)
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[int(last)]
+            else:
+                assert op["op"] == "replace"
+                parent[int(last)] = copy.deepcopy(op["value"])
+        else:
+            if op["op"] == "remove":
+                del parent[last]
+            elif op["op"] == "replace":
+                assert last in parent
+                parent[last] = copy.deepcopy(op["value"])
+            else:
+                assert op["op"] == "add"
+                parent[last] = copy.deepcopy(op["value"])
+    return document
+
+
+def strict(value):
+    """JSON text of a value, so 1, 1.0 and True compare as different."""
+    return json.dumps(value, sort_keys=True)
+
+
+CHANGES = [
+    ({"a": 1}, {"a": 1.0}),
+    ({"a": 1}, {"a": True}),
+    ({"a": 0}, {"a": False}),
+    ({"a": None}, {"a": 0}),
+    ([1, [1]], [1, [True]]),
+    ({"a": "1"}, {"a": 1}),
+    ([1, 2, 3], [1, 2]),
+    ([1, 2, 3, 4], [2, 3]),
+    ([1, 2, 3], [2, 3, 4, 5]),
+    ([1, 2, 3], []),
+    ([], [1]),
+    (list(range(40)), []),
+    (list(range(40)), list(range(10, 50))),
+    ([1, 2, 3], [3, 2, 1]),
+    ({"a/b": 1, "c~d": 2}, {"a/b": 2}),
+    ({"x": {"y": [{"z": 1}]}}, {"x": {"y": [{"z": 1}, {"z": 2}]}, "n": 1}),
+    ({"x": {"y": [1, 2, 3]}, "k": "v"}, {"x": {"y": [1, 2]}, "k": "v"}),
+    ({"x": [1.0, 2]}, {"x": [1, 2]}),
+    ({"x": 1}, [1]),
+]
+
+
+@pytest.fixture
+def ws_delta(backend_app):
+    return backend_app("app.core.ws_delta")
+
+
+class TestJsonPatch:
+    """Test that json_patch produces valid, minimal RFC 6902 patches."""
+
+    @pytest.mark.parametrize("old, new", CHANGES)
+    def test_patch_rebuilds_new_value(self, ws_delta, old, new):
+        """Test that applying the patch to the old value gives the new one exactly."""
+        patch = ws_delta.json_patch(old, new)
+        assert strict(apply_patch(old, patch)) == strict(new)
+
+    def test_numeric_type_changes_are_replaced(self, ws_delta):
+        """Test that 1 -> 1.0 and 1 -> True are changes, not equal values."""
+        assert ws_delta.json_patch({"a": 1}, {"a": 1.0}) == [{"op": "replace", "path": "/a", "value": 1.0}]
+        assert ws_delta.json_patch({"a": 1}, {"a": True}) == [{"op": "replace", "path": "/a", "value": True}]
+        assert ws_delta.json_patch({"a": [1]}, {"a": [1]}) == []
+
+    def test_truncation_is_a_single_remove(self, ws_delta):
+        """Test that dropping the last item is one remove, not remove + add."""
+        assert ws_delta.json_patch([1, 2, 3], [1, 2]) == [{"op": "remove", "path": "/2"}]
+        assert ws_delta.json_patch({"w": [1, 2, 3, 4]}, {"w": [2, 3]}) == [
+            {"op": "remove", "path": "/w/0"},
+            {"op": "remove", "path": "/w/2"},
+        ]
+
+    def test_rolling_window_shifts(self, ws_delta):
+        """Test that a window dropping its oldest item and appending one stays small."""
+        patch = ws_delta.json_patch([1, 2, 3], [2, 3, 4])
+        assert patch == [{"op": "remove", "path": "/0"}, {"op": "add", "path": "/-", "value": 4}]
+
+
+def _decode(frames):
+    """Rebuild the messages a client sees from delta frames."""
+    state = None
+    seq = -1
+    for frame in frames:
+        msg = json.loads(frame)
+        assert msg["seq"] == seq + 1
+        seq = msg["seq"]
+        if msg["$delta"] == "snapshot":
+            state = msg["data"]
+        elif msg["$delta"] == "patch":
+            state = apply_patch(state, msg["patch"])
+        else:
+            state = {**state, **msg["set"]}
+            for key in msg["unset"]:
+                del state[key]
+        yield state
+
+
+MESSAGES = [
+    {"id": 1, "price": 10, "series": [1, 2, 3], "meta": {"ok": True, "tag": "a"}},
+    {"id": 1, "price": 10.0, "series": [1, 2, 3], "meta": {"ok": True, "tag": "a"}},
+    {"id": 1, "price": 10.0, "series": [2, 3, 4], "meta": {"ok": 1, "tag": "a"}},
+    {"id": 1, "price": 11, "series": [2, 3], "meta": {"ok": 1, "tag": "a"}},
+    {"id": 1, "price": 11, "series": [2, 3], "meta": {"ok": 1}, "extra": None},
+    {"id": True, "price": 11, "series": [2, 3], "meta": {"ok": 1}},
+    {"id": True, "price": 11, "series": [], "meta": {"ok": 1}},
+]
+
+
+class TestDeltaEncoder:
+    """Test that delta frames rebuild every message."""
+
+    @pytest.mark.parametrize("mode", ["patch", "keys"])
+    @pytest.mark.parametrize("snapshot_every", [1, 3, 100])
+    def test_frames_rebuild_messages(self, ws_delta, mode, snapshot_every):
+        """Test that applying each frame gives the message it encoded."""
+        encoder = ws_delta.DeltaEncoder(mode, snapshot_every=snapshot_every)
+        frames = [encoder.encode(message) for message in MESSAGES]
+
+        assert all(frame is not None for frame in frames)
+        assert [strict(state) for state in _decode(frames)] == [strict(message) for message in MESSAGES]
+
+    @pytest.mark.parametrize("mode", ["patch", "keys"])
+    def test_only_identical_messages_are_skipped(self, ws_delta, mode):
+        """Test that a repeat is dropped but a 1 -> True change is sent."""
+        encoder = ws_delta.DeltaEncoder(mode, snapshot_every=100)
+        assert encoder.encode({"v": 1, "w": [1, 2]}) is not None
+        assert encoder.encode({"v": 1, "w": [1, 2]}) is None
+        assert encoder.encode({"v": True, "w": [1, 2]}) is not None
+        assert encoder.encode({"v": True, "w": [1.0, 2]}) is not None
+
+    def test_reset_sends_a_snapshot(self, ws_delta):
+        """Test that the frame after reset() is a snapshot."""
+        encoder = ws_delta.DeltaEncoder("patch", snapshot_every=100)
+        encoder.encode(MESSAGES[0])
+        encoder.reset()
+        assert json.loads(encoder.encode(MESSAGES[2]))["$delta"] == "snapshot"
@@ -0,0 +1,134 @@
+"""
+Unit tests for the generated backend's subscriber filters (app/core/ws_filter.py):
+SubscriptionIndex must give the same subscribers as checking every filter.
+"""
+
+import random
+
+import pytest
+
+
+@pytest.fixture
+def ws_filter(backend_app):
+    return backend_app("app.core.ws_filter")
+
+
+FIELDS = ["symbol", "side", "price", "live"]
+
+MESSAGES = [
+    {"symbol": "AAPL", "side": "buy", "price": 10, "live": True},
+    {"symbol": "MSFT", "side": "sell", "price": 19.5, "live": False},
+    {"symbol": "AAPL", "price": 25.0},
+    {"side": "buy"},
+    {"symbol": "GOOG", "side": "buy", "price": "12"},
+    {"symbol": 7, "price": None},
+    {},
+    "not a dict",
+    [{"symbol": "AAPL"}],
+]
+
+
+def _brute_force(filters, message):
+    return {subscriber for subscriber, subscription_filter in filters.items() if subscription_filter.matches(message)}
+
+
+def _random_filter(ws_filter, rng):
+    query = {}
+    if rng.random() < 0.6:
+        query["symbol"] = ",".join(rng.sample(["AAPL", "MSFT", "GOOG", "7"], rng.randint(1, 3)))
+    if rng.random() < 0.4:
+        query["side"] = rng.choice(["buy", "sell", "buy,sell"])
+    if rng.random() < 0.2:
+        query["live"] = rng.choice(["true", "false"])
+    if rng.random() < 0.4:
+        query[f"price.{rng.choice(['gt', 'gte', 'lt', 'lte'])}"] = str(rng.choice([0, 10, 15, 20, 25]))
+    return ws_filter.SubscriptionFilter.from_query(query, FIELDS)
+
+
+class TestSubscriptionIndex:
+    """Test that index lookups agree with SubscriptionFilter.matches."""
+
+    def _check(self, index, filters):
+        for message in MESSAGES:
+            matched = index.match(message)
+            assert len(matched) == len(set(matched)), message
+            assert set(matched) == _brute_force(filters, message), message
+
+    def test_random_filters_match_brute_force(self, ws_filter):
+        """Test many mixed filters, through adds and removes, against checking each one."""
+        rng = random.Random(1234)
+        index = ws_filter.SubscriptionIndex()
+        filters = {}
+
+        for subscriber in range(200):
+            filters[subscriber] = _random_filter(ws_filter, rng)
+            index.add(subscriber, filters[subscriber])
+            if subscriber % 10 == 0:
+                self._check(index, filters)
+
+        for subscriber in rng.sample(list(filters), 150):
+            index.remove(subscriber)
+            del filters[subscriber]
+            self._check(index, filters)
+        assert len(index) == len(filters)
+        assert set(index) == set(filters)
+
+    def test_equality_lookup(self, ws_filter):
+        """Test that equality and set filters pick the subscribers of the message's value."""
+        index = ws_filter.SubscriptionIndex()
+        query = ws_filter.SubscriptionFilter.from_query
+        index.add("apple", query({"symbol": "AAPL"}, FIELDS))
+        index.add("tech", query({"symbol": "AAPL,MSFT"}, FIELDS))
+        index.add("apple-buys", query({"symbol": "AAPL", "side": "buy"}, FIELDS))
+        index.add("live", query({"live": "true"}, FIELDS))
+        index.add("seven", query({"symbol": "7"}, FIELDS))
+
+        assert sorted(index.match({"symbol": "AAPL", "side": "sell"})) == ["apple", "tech"]
+        assert sorted(index.match({"symbol": "AAPL", "side": "buy", "live": True})) == [
+            "apple", "apple-buys", "live", "tech",
+        ]
+        assert index.match({"symbol": "MSFT"}) == ["tech"]
+        # Values are compared as query text
+        assert index.match({"symbol": 7.0}) == ["seven"]
+
+    def test_subscribers_without_filter_get_everything(self, ws_filter):
+        """Test that unfiltered subscribers match every message, dicts or not."""
+        index = ws_filter.SubscriptionIndex()
+        index.add("all")
+        index.add("empty", ws_filter.SubscriptionFilter.from_query({"other": "x"}, FIELDS))
+        index.add("apple", ws_filter.SubscriptionFilter.from_query({"symbol": "AAPL"}, FIELDS))
+
+        for message in MESSAGES:
+            assert {"all", "empty"} <= set(index.match(message))
+
+    def test_missing_fields_match_no_filter_on_them(self, ws_filter):
+        """Test that a message lacking a filtered field matches neither value nor range filters."""
+        index = ws_filter.SubscriptionIndex()
+        query = ws_filter.SubscriptionFilter.from_query
+        index.add("apple", query({"symbol": "AAPL"}, FIELDS))
+        index.add("cheap", query({"price.lt": "20"}, FIELDS))
+        index.add("apple-cheap", query({"symbol": "AAPL", "price.lt": "20"}, FIELDS))
+
+        assert index.match({"side": "buy"}) == []
+        assert index.match({"symbol": "AAPL"}) == ["apple"]
+        assert sorted(index.match({"symbol": "AAPL", "price": 5})) == ["apple", "apple-cheap", "cheap"]
+        # Non-numeric values never satisfy a range
+        assert index.match({"price": "5"}) == []
+
+    def test_remove_cleans_up(self, ws_filter):
+        """Test that removed subscribers stop matching and unknown ones are ignored."""
+        index = ws_filter.SubscriptionIndex()
+        index.add("apple", ws_filter.SubscriptionFilter.from_query({"symbol": "AAPL,MSFT"}, FIELDS))
+        index.add("all")
+        index.remove("apple")
+        index.remove("all")
+        index.remove("never-added")
+
+        assert len(index) == 0
+        assert index.match({"symbol": "AAPL"}) == []
+        assert index._by_value == {}
+
+    def test_range_bound_must_be_numeric(self, ws_filter):
+        """Test that a non-numeric range bound is rejected."""
+        with pytest.raises(ValueError, match="price.gt"):
+            ws_filter.SubscriptionFilter.from_query({"price.gt": "cheap"}, FIELDS)
@@ -0,0 +1,255 @@
+"""
+Unit tests for the generated backend's stream join (app/core/ws_join.py).
+
+Sources are plain async generators, so no upstream server is needed.
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def ws_join(backend_app):
+    module = backend_app("app.core.ws_join")
+    yield module
+    module._joins.clear()
+
+
+async def _identity(state, changed, cache):
+    return state
+
+
+class TestStreamJoinSourceFailure:
+    """Test that a failed source does not leave a dead join behind."""
+
+    def test_failed_source_closes_subscribers_and_evicts_join(self, ws_join):
+        """Test that subscribers get the error, then the end of the stream, and the key is free again."""
+        attempts = []
+
+        def ticker():
+            async def messages():
+                attempts.append(len(attempts))
+                yield {"n": 1}
+                raise ConnectionError("upstream gone")
+
+            return messages()
+
+        def build():
+            return ws_join.StreamJoin("ch", {"Ticker": ticker}, _identity, max_pending=10)
+
+        async def scenario():
+            join = ws_join.get_join("ch", build)
+            async with join.subscribe() as messages:
+                received = [message async for message in messages]
+
+            assert received[0] == {"Ticker": {"n": 1}}
+            assert isinstance(received[1], ws_join.JoinError)
+            assert received[1].fatal
+            assert str(received[1].error) == "upstream gone"
+            assert "ch" not in ws_join._joins
+
+            fresh = ws_join.get_join("ch", build)
+            assert fresh is not join
+            async with fresh.subscribe() as messages:
+                assert await messages.__anext__() == {"Ticker": {"n": 1}}
+
+        asyncio.run(scenario())
+        assert attempts == [0, 1]
+
+    def test_transform_error_keeps_the_join_running(self, ws_join):
+        """Test that a failed transform is reported without stopping the sources."""
+        failed = asyncio.Event()
+
+        async def transform(state, changed, cache):
+            if state["Ticker"]["n"] == 1:
+                failed.set()
+                raise ValueError("bad message")
+            return state
+
+        def ticker():
+            async def messages():
+                yield {"n": 1}
+                # Messages arriving before the transform runs are coalesced
+                await failed.wait()
+                yield {"n": 2}
+                await asyncio.Event().wait()
+
+            return messages()
+
+        async def scenario():
+            join = ws_join.get_join("ch", lambda: ws_join.StreamJoin("ch", {"Ticker": ticker}, transform, max_pending=10))
+            async with join.subscribe() as messages:
+                error = await messages.__anext__()
+                assert isinstance(error, ws_join.JoinError) and not error.fatal
+                assert await messages.__anext__() == {"Ticker": {"n": 2}}
+                assert ws_join._joins["ch"] is join
+            assert "ch" not in ws_join._joins
+
+        asyncio.run(scenario())
+
+
+class Feeds:
+    """Sources fed by the test: push() hands a message to the source's reader."""
+
+    def __init__(self, *names):
+        self._queues = {name: asyncio.Queue() for name in names}
+
+    def sources(self):
+        return {name: (lambda name=name: self._messages(name)) for name in self._queues}
+
+    async def _messages(self, name):
+        while True:
+            yield await self._queues[name].get()
+
+    def push(self, name, *messages):
+        for message in messages:
+            self._queues[name].put_nowait(message)
+
+    def waiting(self, name):
+        return self._queues[name].qsize()
+
+
+class Recorder:
+    """Transform recording its (state, changed, cache) arguments."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, state, changed, cache):
+        cache["calls"] = cache.get("calls", 0) + 1
+        self.calls.append((state, changed, cache, cache["calls"]))
+        return state
+
+
+async def _settle(seconds=0.0):
+    await asyncio.sleep(seconds)
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestStreamJoinEmit:
+    """Test when each join mode emits, and what the transform is given."""
+
+    def _join(self, ws_join, feeds, transform, **options):
+        return ws_join.StreamJoin("ch", feeds.sources(), transform, **options)
+
+    def test_latest_waits_for_every_source_then_coalesces(self, ws_join):
+        """Test that latest emits once all sources have sent, with only the newest state."""
+        feeds, transform = Feeds("A", "B"), Recorder()
+
+        async def scenario():
+            join = self._join(ws_join, feeds, transform, max_pending=10)
+            async with join.subscribe():
+                feeds.push("A", 1)
+                await _settle()
+                assert transform.calls == []
+
+                feeds.push("B", 1)
+                await _settle()
+                feeds.push("A", 2)
+                await _settle()
+                # Arriving together, these are one emission of the final state
+                feeds.push("A", 3, 4)
+                feeds.push("B", 2)
+                await _settle()
+
+        asyncio.run(scenario())
+        assert [(state, changed) for state, changed, _, _ in transform.calls] == [
+            ({"A": 1, "B": 1}, {"A", "B"}),
+            ({"A": 2, "B": 1}, {"A"}),
+            ({"A": 4, "B": 2}, {"A", "B"}),
+        ]
+
+    def test_zip_joins_the_nth_messages(self, ws_join):
+        """Test that zip emits every row, in order, only when all sources have a message."""
+        feeds, transform = Feeds("A", "B"), Recorder()
+
+        async def scenario():
+            join = self._join(ws_join, feeds, transform, mode="zip", max_pending=10)
+            async with join.subscribe():
+                feeds.push("A", 1, 2)
+                await _settle()
+                assert transform.calls == []
+                feeds.push("B", 1)
+                await _settle()
+                feeds.push("B", 2, 3)
+                feeds.push("A", 3)
+                await _settle()
+
+        asyncio.run(scenario())
+        assert [(state, changed) for state, changed, _, _ in transform.calls] == [
+            ({"A": 1, "B": 1}, {"A", "B"}),
+            ({"A": 2, "B": 2}, {"A", "B"}),
+            ({"A": 3, "B": 3}, {"A", "B"}),
+        ]
+
+    def test_zip_queue_is_bounded(self, ws_join):
+        """Test that a source max_pending messages ahead waits instead of queueing more."""
+        feeds, transform = Feeds("A", "B"), Recorder()
+
+        async def scenario():
+            join = self._join(ws_join, feeds, transform, mode="zip", max_pending=2)
+            async with join.subscribe():
+                feeds.push("A", *range(5))
+                await _settle()
+                assert join._unzipped["A"].qsize() == 2
+                # One more is held by the blocked reader, the rest stay upstream
+                assert feeds.waiting("A") == 2
+
+                feeds.push("B", *range(5))
+                await _settle()
+
+        asyncio.run(scenario())
+        assert [state for state, _, _, _ in transform.calls] == [{"A": n, "B": n} for n in range(5)]
+
+    def test_window_skips_stale_states(self, ws_join):
+        """Test that window only emits while every latest message is recent enough."""
+        feeds, transform = Feeds("A", "B"), Recorder()
+
+        async def scenario():
+            join = self._join(ws_join, feeds, transform, mode="window", window_ms=50, max_pending=10)
+            async with join.subscribe():
+                feeds.push("A", 1)
+                feeds.push("B", 1)
+                await _settle()
+                await _settle(0.1)
+                # B's latest message is too old: no emission
+                feeds.push("A", 2)
+                await _settle()
+                assert len(transform.calls) == 1
+                feeds.push("B", 2)
+                await _settle()
+
+        asyncio.run(scenario())
+        assert [(state, changed) for state, changed, _, _ in transform.calls] == [
+            ({"A": 1, "B": 1}, {"A", "B"}),
+            # Changes are accumulated across the skipped state
+            ({"A": 2, "B": 2}, {"A", "B"}),
+        ]
+
+    def test_cache_is_kept_between_calls_and_cleared_on_error(self, ws_join):
+        """Test that the transform gets the same cache dict, emptied after a failure."""
+        feeds = Feeds("A")
+        recorder = Recorder()
+
+        async def transform(state, changed, cache):
+            if state["A"] == "bad":
+                cache["calls"] = 99
+                raise ValueError("bad message")
+            return await recorder(state, changed, cache)
+
+        async def scenario():
+            join = self._join(ws_join, feeds, transform, max_pending=10)
+            async with join.subscribe() as messages:
+                for message in (1, 2, "bad", 3):
+                    feeds.push("A", message)
+                    await _settle()
+                received = [await messages.__anext__() for _ in range(4)]
+            assert isinstance(received[2], ws_join.JoinError)
+            assert received[2].source == "A"
+
+        asyncio.run(scenario())
+        caches = [cache for _, _, cache, _ in recorder.calls]
+        assert all(cache is caches[0] for cache in caches)
+        assert [count for _, _, _, count in recorder.calls] == [1, 2, 1]
@@ -0,0 +1,192 @@
+"""
+Unit tests for the generated backend's per-subscriber send queue
+(app/core/ws_outbox.py), driven with a fake send.
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def ws_outbox(backend_app):
+    return backend_app("app.core.ws_outbox")
+
+
+class FakeSend:
+    """Records each frame with the loop time it was sent at."""
+
+    def __init__(self, fail_on=None):
+        self.frames = []
+        self.times = []
+        self._fail_on = fail_on
+
+    async def __call__(self, frame):
+        if self._fail_on is not None and len(self.frames) == self._fail_on:
+            raise ConnectionError("client gone")
+        self.frames.append(frame)
+        self.times.append(asyncio.get_running_loop().time())
+
+
+async def _settle(seconds=0.0):
+    """Let the outbox task run (and wait out any window or rate delay)."""
+    await asyncio.sleep(seconds)
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+
+class TestConflation:
+    """Test latest-value-wins per conflate key."""
+
+    def test_latest_per_key_keeps_its_place(self, ws_outbox):
+        """Test that a newer message replaces the pending one with the same key."""
+        send = FakeSend()
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, conflate="symbol", max_pending=10)
+            outbox.put({"symbol": "A", "price": 1})
+            outbox.put({"symbol": "B", "price": 1})
+            outbox.put({"symbol": "A", "price": 2})
+            outbox.start()
+            await _settle()
+            outbox.close()
+            return outbox
+
+        outbox = _run(scenario)
+        assert send.frames == [{"symbol": "A", "price": 2}, {"symbol": "B", "price": 1}]
+        assert (outbox.sent, outbox.superseded, outbox.dropped) == (2, 1, 0)
+
+    def test_max_pending_drops_oldest_key(self, ws_outbox):
+        """Test that a full pending set drops the oldest key."""
+        send = FakeSend()
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, conflate="symbol", max_pending=2)
+            for symbol in "ABC":
+                outbox.put({"symbol": symbol})
+            outbox.start()
+            await _settle()
+            outbox.close()
+            return outbox
+
+        outbox = _run(scenario)
+        assert send.frames == [{"symbol": "B"}, {"symbol": "C"}]
+        assert outbox.dropped == 1
+
+
+class TestBatching:
+    """Test that batchMs windows are sent as one list."""
+
+    def test_window_is_sent_as_one_batch(self, ws_outbox):
+        """Test that every message of a window is sent, in order, in one call."""
+        send = FakeSend()
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, batch_ms=20, max_pending=10)
+            outbox.start()
+            for value in (1, 2, 2, 3):
+                outbox.put(value)
+            await _settle(0.05)
+            outbox.put(4)
+            await _settle(0.05)
+            outbox.close()
+
+        _run(scenario)
+        assert send.frames == [[1, 2, 2, 3], [4]]
+
+    def test_conflated_batch_holds_latest_per_key(self, ws_outbox):
+        """Test that conflate + batchMs sends the latest message of each key."""
+        send = FakeSend()
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, conflate="k", batch_ms=20, max_pending=10)
+            outbox.start()
+            for k, v in (("a", 1), ("b", 1), ("a", 2)):
+                outbox.put({"k": k, "v": v})
+            await _settle(0.05)
+            outbox.close()
+
+        _run(scenario)
+        assert send.frames == [[{"k": "a", "v": 2}, {"k": "b", "v": 1}]]
+
+    def test_max_pending_drops_oldest_message(self, ws_outbox):
+        """Test that an unkeyed window keeps only the newest max_pending messages."""
+        send = FakeSend()
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, batch_ms=20, max_pending=2)
+            outbox.start()
+            for value in (1, 2, 3):
+                outbox.put(value)
+            await _settle(0.05)
+            outbox.close()
+            return outbox
+
+        assert _run(scenario).dropped == 1
+        assert send.frames == [[2, 3]]
+
+
+class TestRateLimit:
+    """Test that maxRate spaces frames and keeps only the latest message."""
+
+    def test_frames_are_spaced_by_the_interval(self, ws_outbox):
+        """Test that frames are at least 1 / max_rate apart and stale messages are skipped."""
+        send = FakeSend()
+        interval = 1 / 20
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, max_rate=20, max_pending=10)
+            outbox.start()
+            outbox.put(1)
+            await _settle()
+            for value in (2, 3, 4):
+                outbox.put(value)
+            await _settle(interval * 1.5)
+            outbox.put(5)
+            await _settle(interval * 1.5)
+            outbox.close()
+            return outbox
+
+        outbox = _run(scenario)
+        assert send.frames == [1, 4, 5]
+        assert outbox.superseded == 2
+        gaps = [b - a for a, b in zip(send.times, send.times[1:])]
+        assert all(gap >= interval * 0.9 for gap in gaps), gaps
+
+
+class TestFailures:
+    """Test that a failed send reaches the producer."""
+
+    def test_send_error_is_raised_by_next_put(self, ws_outbox):
+        """Test that put() re-raises the error that stopped the outbox."""
+        send = FakeSend(fail_on=0)
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, conflate="k", max_pending=10)
+            outbox.start()
+            outbox.put({"k": 1})
+            await _settle()
+            with pytest.raises(ConnectionError):
+                outbox.put({"k": 2})
+            outbox.close()
+
+        _run(scenario)
+
+    def test_close_discards_pending(self, ws_outbox):
+        """Test that nothing is sent after close()."""
+        send = FakeSend()
+
+        async def scenario():
+            outbox = ws_outbox.ChannelOutbox(send, batch_ms=20, max_pending=10)
+            outbox.start()
+            outbox.put(1)
+            await _settle()
+            outbox.close()
+            await _settle(0.05)
+
+        _run(scenario)
+        assert send.frames == []
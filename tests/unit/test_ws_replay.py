@@ -0,0 +1,79 @@
+"""
+Unit tests for the generated backend's replay buffers (app/core/ws_replay.py).
+"""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def ws_replay(backend_app, monkeypatch):
+    settings = backend_app("app.core.config").settings
+    monkeypatch.setattr(settings, "WS_REPLAY_GRACE_SECONDS", 60.0)
+    monkeypatch.setattr(settings, "WS_REPLAY_MAX_BUFFERS", 3)
+    module = backend_app("app.core.ws_replay")
+    yield module
+    module._buffers.clear()
+
+
+class TestReplayBufferRegistry:
+    """Test that buffers keyed by client-supplied params stay bounded."""
+
+    def test_buffer_survives_a_restart_within_the_grace_period(self, ws_replay):
+        """Test that a join starting again soon after the last one stopped gets the old history."""
+        buffer = ws_replay.get_replay_buffer("ch", count=10, now=0)
+        buffer.append({"n": 1}, now=0)
+        ws_replay.release_replay_buffer(buffer, now=1)
+
+        assert ws_replay.get_replay_buffer("ch", count=10, now=30) is buffer
+        assert len(buffer) == 1
+
+    def test_released_buffer_expires_after_the_grace_period(self, ws_replay):
+        """Test that a buffer without a join is dropped once the grace period is over."""
+        buffer = ws_replay.get_replay_buffer("old", count=10, now=0)
+        ws_replay.release_replay_buffer(buffer, now=0)
+
+        ws_replay.get_replay_buffer("new", count=10, now=61)
+
+        assert list(ws_replay._buffers) == ["new"]
+
+    def test_cap_evicts_released_buffers_first(self, ws_replay):
+        """Test that beyond WS_REPLAY_MAX_BUFFERS buffers without a join go first, then the oldest."""
+        a = ws_replay.get_replay_buffer("a", now=0)
+        ws_replay.get_replay_buffer("b", now=0)
+        c = ws_replay.get_replay_buffer("c", now=0)
+        ws_replay.release_replay_buffer(c, now=0)
+
+        ws_replay.get_replay_buffer("d", now=1)
+        assert list(ws_replay._buffers) == ["a", "b", "d"]
+
+        ws_replay.get_replay_buffer("e", now=2)
+        assert list(ws_replay._buffers) == ["b", "d", "e"]
+        assert a not in ws_replay._buffers.values()
+
+    def test_stopped_join_releases_its_buffer(self, ws_replay, backend_app):
+        """Test that the buffer's grace period starts when the channel's last subscriber leaves."""
+        ws_join = backend_app("app.core.ws_join")
+
+        def ticker():
+            async def messages():
+                yield {"n": 1}
+                await asyncio.Event().wait()
+
+            return messages()
+
+        async def identity(state, changed, cache):
+            return state
+
+        async def scenario():
+            buffer = ws_replay.get_replay_buffer("ch", count=10)
+            join = ws_join.get_join("ch", lambda: ws_join.StreamJoin("ch", {"Ticker": ticker}, identity, replay=buffer))
+            async with join.subscribe() as messages:
+                await messages.__anext__()
+                assert buffer.released_at is None
+            return buffer
+
+        buffer = asyncio.run(scenario())
+        assert buffer.released_at is not None
+        assert len(buffer) == 1
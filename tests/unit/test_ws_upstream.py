@@ -0,0 +1,109 @@
+"""
+Unit tests for the generated backend's upstream links (app/core/ws_upstream.py).
+"""
+
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.fixture
+def ws_upstream(backend_app):
+    return backend_app("app.core.ws_upstream")
+
+
+class TestFormatSubscribeMessage:
+    """Test that source params cannot change the structure of a subscription message."""
+
+    MESSAGE = '{"type": "subscribe", "symbol": "{symbol}"}'
+
+    def test_params_are_substituted(self, ws_upstream):
+        """Test that a placeholder inside a JSON string is filled in."""
+        message = ws_upstream.format_subscribe_message(self.MESSAGE, {"symbol": "BTC"})
+        assert json.loads(message) == {"type": "subscribe", "symbol": "BTC"}
+
+    def test_value_with_quotes_stays_one_string(self, ws_upstream):
+        """Test that quotes in a client value do not inject JSON members."""
+        value = 'BTC", "type": "unsubscribe_all'
+        message = ws_upstream.format_subscribe_message(self.MESSAGE, {"symbol": value})
+        assert json.loads(message) == {"type": "subscribe", "symbol": value}
+
+    def test_placeholder_outside_a_string_is_escaped(self, ws_upstream):
+        """Test that a message that is not JSON before substitution gets JSON-escaped values."""
+        value = '1, "admin": true'
+        message = ws_upstream.format_subscribe_message('{"depth": "{depth}", "n": {n}}', {"depth": "a\\b", "n": value})
+        assert message == '{"depth": "a\\\\b", "n": 1, \\"admin\\": true}'
+
+    def test_messages_without_params_are_sent_as_is(self, ws_upstream):
+        """Test that messages are not re-serialized when there is nothing to fill in."""
+        assert ws_upstream.format_subscribe_message(self.MESSAGE, None) == self.MESSAGE
+        assert ws_upstream.format_subscribe_message("ping", {"symbol": "BTC"}) == "ping"
+
+
+class _Connection:
+    """A fake upstream connection that sends `messages` and then closes."""
+
+    def __init__(self, messages=()):
+        self._messages = list(messages)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._messages:
+            raise StopAsyncIteration
+        return self._messages.pop(0)
+
+    async def close(self):
+        pass
+
+
+class TestUpstreamLinkBackoff:
+    """Test when a reconnecting link resets its backoff."""
+
+    @pytest.fixture
+    def delays(self, ws_upstream, monkeypatch):
+        attempts = []
+
+        def backoff_delay(attempt, initial, maximum):
+            attempts.append(attempt)
+            return 0
+
+        monkeypatch.setattr(ws_upstream, "backoff_delay", backoff_delay)
+        return attempts
+
+    def test_flapping_upstream_keeps_backing_off(self, ws_upstream, delays):
+        """Test that connections dropped before any message do not reset the backoff."""
+        connects = []
+
+        async def connect():
+            connects.append(len(connects))
+            return _Connection()
+
+        async def scenario():
+            link = ws_upstream.UpstreamLink("Flappy", connect, max_retries=3, initial_delay=0.5, max_delay=30)
+            with pytest.raises(ConnectionError, match="after 3 reconnect attempts"):
+                async for _ in link.messages():
+                    pass
+
+        asyncio.run(scenario())
+        assert delays == [0, 1, 2]
+        assert len(connects) == 4
+
+    def test_delivered_message_resets_the_backoff(self, ws_upstream, delays):
+        """Test that a connection that delivered a message starts a new run of retries."""
+        async def connect():
+            return _Connection(["tick"])
+
+        async def scenario():
+            link = ws_upstream.UpstreamLink("Ticker", connect, max_retries=1, initial_delay=0.5, max_delay=30)
+            received = []
+            async for message in link.messages():
+                received.append(message)
+                if len(received) == 3:
+                    break
+            return received
+
+        assert asyncio.run(scenario()) == ["tick"] * 3
+        assert delays == [0, 0]